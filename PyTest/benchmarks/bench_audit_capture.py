@@ -0,0 +1,139 @@
+# PyTest/benchmarks/bench_audit_capture.py
+"""
+Benchmark: before_flush audit capture on wide vihaddata rows.
+
+"legacy" reproduces the previous capture (jsonable_encoder for every column,
+full payloads); "compact" is the opt-in AUDIT_COMPACT_PAYLOADS=true capture
+(cached column lists and per-type serializers, non-null columns on CREATE,
+real changes on UPDATE). Full payloads remain the default.
+
+Run:  python PyTest/benchmarks/bench_audit_capture.py
+"""
+import json
+import types
+from datetime import date
+
+from _helpers import make_session, report, timed
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect
+
+import app.services.audit_service as audit_module
+from app.models.vihara import ViharaData
+from app.services.audit_service import audit_service, capture_audit_events
+
+_current_collect_update_changes = audit_module._collect_update_changes
+
+ROWS = 200
+ITERATIONS = 20
+
+
+def _legacy_collect(self, mapper, instance, *, columns=None, skip_none=False):
+    result = {}
+    for attr in mapper.column_attrs:
+        if columns and attr.key not in columns:
+            continue
+        result[attr.key] = _legacy_serialize(self, getattr(instance, attr.key, None))
+    return result
+
+
+def _legacy_serialize(self, value):
+    try:
+        return jsonable_encoder(value)
+    except TypeError:
+        return json.loads(json.dumps(value, default=str))
+
+
+def _legacy_collect_update_changes(instance):
+    state = inspect(instance)
+    old_values, new_values, changed_fields = {}, {}, []
+    for attr in state.mapper.column_attrs:
+        hist = state.attrs[attr.key].history
+        if not hist.has_changes():
+            continue
+        old_val = hist.deleted[0] if hist.deleted else None
+        new_val = hist.added[0] if hist.added else getattr(instance, attr.key, None)
+        old_values[attr.key] = _legacy_serialize(None, old_val)
+        new_values[attr.key] = _legacy_serialize(None, new_val)
+        changed_fields.append(attr.key)
+    return old_values, new_values, changed_fields
+
+
+def use_legacy(enabled: bool) -> None:
+    if enabled:
+        audit_service._collect_instance_payload = types.MethodType(_legacy_collect, audit_service)
+        audit_service._serialize_value = types.MethodType(_legacy_serialize, audit_service)
+        audit_module._collect_update_changes = _legacy_collect_update_changes
+        audit_service.compact_payloads = False
+    else:
+        audit_service.__dict__.pop("_collect_instance_payload", None)
+        audit_service.__dict__.pop("_serialize_value", None)
+        audit_module._collect_update_changes = _current_collect_update_changes
+        audit_service.compact_payloads = True
+
+
+def make_vihara(i: int) -> ViharaData:
+    # A typical record: identity, address and a handful of dates filled in
+    return ViharaData(
+        vh_trn=f"TRN{i:07d}", vh_vname=f"Temple {i}", vh_addrs=f"{i} Temple Road",
+        vh_mobile="0771234567", vh_email=f"t{i}@example.com", vh_typ="VIHARA",
+        vh_fmlycnt=120, vh_bgndate=date(1950, 1, 1), vh_parshawa="PR001",
+        vh_ssbmcode="SS001", vh_province="WP", vh_district="DC001",
+        vh_syojakarmdate=date(2001, 5, 5), vh_pralesigdate=date(2002, 6, 6),
+        vh_workflow_status="PENDING", vh_created_by="UA0000001",
+    )
+
+
+def bench_create(db):
+    rows = []
+    db.add_all([make_vihara(i) for i in range(ROWS)])
+    for label, legacy in (("CREATE legacy", True), ("CREATE compact", False)):
+        use_legacy(legacy)
+        timings = {}
+        with timed(label, timings):
+            for _ in range(ITERATIONS):
+                db.info.pop("_audit_entries", None)
+                capture_audit_events(db, None, None)
+        entries = db.info.pop("_audit_entries")
+        size = sum(len(json.dumps(e["new_values"])) for e in entries) // len(entries)
+        rows.append((f"{label} ({size} B/row)", ROWS, timings[label] / ITERATIONS))
+    db.commit()
+    return rows
+
+
+def bench_update(db):
+    rows = []
+    records = db.query(ViharaData).all()
+    for record in records:
+        record.vh_vname = record.vh_vname + " (updated)"
+        record.vh_mobile = "0770000000"
+        record.vh_typ = "VIHARA"  # unchanged value re-assigned
+    for label, legacy in (("UPDATE legacy", True), ("UPDATE compact", False)):
+        use_legacy(legacy)
+        timings = {}
+        with timed(label, timings):
+            for _ in range(ITERATIONS):
+                db.info.pop("_audit_entries", None)
+                capture_audit_events(db, None, None)
+        entries = db.info.pop("_audit_entries")
+        fields = sum(len(e["changed_fields"]) for e in entries) // len(entries)
+        rows.append((f"{label} ({fields} fields/row)", ROWS, timings[label] / ITERATIONS))
+    db.rollback()
+    return rows
+
+
+def main():
+    db = make_session(ViharaData)
+    columns = len(ViharaData.__mapper__.column_attrs)
+    rows = bench_create(db) + bench_update(db)
+    use_legacy(False)
+    report(
+        f"before_flush capture, {ROWS} vihaddata rows x {columns} columns "
+        f"(mean of {ITERATIONS} runs)",
+        rows,
+        count_label="rows",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# PyTest/benchmarks/bench_permission_resolution.py
+"""
+Benchmark: effective permission resolution for a user with 10 roles and 50 overrides.
+
+Compares the previous per-role / per-override resolution against the
+single-statement get_user_permissions.
+
+Run:  python PyTest/benchmarks/bench_permission_resolution.py
+"""
+from datetime import datetime
+
+from _helpers import QueryCounter, make_session, report, timed
+
+from sqlalchemy import and_
+
+from app.api.auth_dependencies import get_user_permissions
+from app.models import (
+    DistrictBranch,
+    Group,
+    MainBranch,
+    Permission,
+    Role,
+    RolePermission,
+    UserAccount,
+    UserPermission,
+    UserRole,
+)
+
+ROLES = 10
+PERMS_PER_ROLE = 20
+OVERRIDES = 50
+ITERATIONS = 50
+
+
+def legacy_get_user_permissions(db, user):
+    """The N+1 resolution get_user_permissions used before the set-based query."""
+    current_time = datetime.utcnow()
+    permissions_set = set()
+    user_roles = db.query(UserRole).filter(
+        and_(
+            UserRole.ur_user_id == user.ua_user_id,
+            UserRole.ur_is_active == True,
+            UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time)
+        )
+    ).all()
+    for user_role in user_roles:
+        for perm in db.query(Permission).join(
+            RolePermission, RolePermission.rp_permission_id == Permission.pe_permission_id
+        ).filter(
+            RolePermission.rp_role_id == user_role.ur_role_id, RolePermission.rp_granted == True
+        ).all():
+            permissions_set.add(perm.pe_name)
+    user_permissions = db.query(UserPermission).join(
+        Permission, Permission.pe_permission_id == UserPermission.up_permission_id
+    ).filter(
+        UserPermission.up_user_id == user.ua_user_id,
+        UserPermission.up_is_active == True,
+        UserPermission.up_expires_date.is_(None) | (UserPermission.up_expires_date > current_time)
+    ).all()
+    for user_perm in user_permissions:
+        perm_name = db.query(Permission.pe_name).filter(
+            Permission.pe_permission_id == user_perm.up_permission_id
+        ).scalar()
+        if user_perm.up_granted:
+            permissions_set.add(perm_name)
+        else:
+            permissions_set.discard(perm_name)
+    return list(permissions_set)
+
+
+def seed(db):
+    db.add(Group(group_id=1, group_name="Bench", group_type="SYSTEM"))
+    user = UserAccount(
+        ua_user_id="UA0000001", ua_username="bench", ua_email="bench@example.com",
+        ua_password_hash="x", ua_salt="x", ua_status="active",
+    )
+    db.add(user)
+    total_perms = ROLES * PERMS_PER_ROLE + OVERRIDES
+    for pid in range(1, total_perms + 1):
+        db.add(Permission(
+            pe_permission_id=pid, pe_name=f"res{pid}:read", pe_resource=f"res{pid}",
+            pe_action="read", group_id=1,
+        ))
+    for r in range(ROLES):
+        role_id = f"RO{r:03d}"
+        db.add(Role(ro_role_id=role_id, ro_role_name=f"Role {r}", ro_level="DATA_ENTRY"))
+        db.add(UserRole(ur_user_id=user.ua_user_id, ur_role_id=role_id, ur_is_active=True))
+        # Overlapping ranges so several roles grant the same permission
+        for offset in range(PERMS_PER_ROLE):
+            pid = r * PERMS_PER_ROLE // 2 + offset + 1
+            db.add(RolePermission(rp_role_id=role_id, rp_permission_id=pid, rp_granted=True))
+    # Half the overrides deny role permissions, half grant extra ones
+    for i in range(OVERRIDES):
+        granted = i % 2 == 1
+        pid = ROLES * PERMS_PER_ROLE + i + 1 if granted else i * 2 + 1
+        db.add(UserPermission(
+            up_user_id=user.ua_user_id, up_permission_id=pid, up_granted=granted, up_is_active=True,
+        ))
+    db.commit()
+    return user
+
+
+def main():
+    db = make_session(
+        MainBranch, DistrictBranch, Group, UserAccount, Role, Permission,
+        RolePermission, UserRole, UserPermission,
+    )
+    user = seed(db)
+
+    legacy = sorted(legacy_get_user_permissions(db, user))
+    current = sorted(get_user_permissions(db, user))
+    assert legacy == current, "set-based resolution diverges from the legacy result"
+
+    timings = {}
+    rows = []
+    for label, func in (("legacy (N+1)", legacy_get_user_permissions),
+                        ("single statement", get_user_permissions)):
+        with QueryCounter(db) as counter:
+            func(db, user)
+        with timed(label, timings):
+            for _ in range(ITERATIONS):
+                func(db, user)
+        rows.append((label, counter.count, timings[label] / ITERATIONS))
+
+    report(
+        f"Effective permissions: {ROLES} roles, {OVERRIDES} overrides, "
+        f"{len(current)} resulting permissions (mean of {ITERATIONS} runs)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
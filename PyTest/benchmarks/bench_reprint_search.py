@@ -0,0 +1,136 @@
+# PyTest/benchmarks/bench_reprint_search.py
+"""
+Benchmark: reprint search (no entity_type) page 1 versus page 50.
+
+Seven entity tables with ROWS_PER_TYPE completed registrations each, indexed
+in registration_index. Compares, for page 1 and page 50 of PAGE_SIZE rows:
+
+  offset   search_all_entities(skip=..., limit=...)
+  keyset   search_all_entities(keyset=True, cursor=...) with the cursor of page 49
+
+Both return exact pages in (regn, entity type, id) order and run the same
+exact count, timed on its own as "count". Hydration is one query per entity
+type on the page, so the query count does not grow with the page number;
+with OFFSET the skipped index rows are still read, with a cursor they are not.
+
+Run:  python PyTest/benchmarks/bench_reprint_search.py [rows_per_type]
+"""
+import sys
+from datetime import date
+
+from _helpers import QueryCounter, make_session, report, timed
+
+from sqlalchemy import insert
+
+from app.models.arama import AramaData
+from app.models.bhikku import Bhikku
+from app.models.bhikku_high import BhikkuHighRegist
+from app.models.devala import DevalaData
+from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.registration_index import RegistrationIndex
+from app.models.silmatha_regist import SilmathaRegist
+from app.models.status import StatusData
+from app.models.vihara import ViharaData
+from app.services import registration_index
+from app.services.reprint_search_service import reprint_search_service
+
+ROWS_PER_TYPE = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+PAGE_SIZE = 50
+DEEP_PAGE = 50
+
+MODELS = (
+    AramaData, Bhikku, BhikkuHighRegist, DevalaData, DirectBhikkuHigh,
+    RegistrationIndex, SilmathaRegist, StatusData, ViharaData,
+)
+
+# (model, registration number prefix, fixed column values)
+SEED = (
+    (Bhikku, "BH", {"br_reqstdate": date(2024, 1, 1), "br_currstat": "ST01", "br_parshawaya": "PR01"}),
+    (SilmathaRegist, "SIL", {"sil_reqstdate": date(2024, 1, 1), "sil_currstat": "ST01"}),
+    (BhikkuHighRegist, "UPS", {}),
+    (DirectBhikkuHigh, "DBH", {}),
+    (ViharaData, "TRN", {}),
+    (AramaData, "ARN", {}),
+    (DevalaData, "DVL", {}),
+)
+
+
+def _placeholder(column, i):
+    python_type = column.type.python_type
+    if python_type is str:
+        value = f"{i}"
+        return value[-column.type.length:] if getattr(column.type, "length", None) else value
+    if python_type is date:
+        return date(2024, 1, 1)
+    if python_type is bool:
+        return False
+    return 0
+
+
+def seed(db) -> None:
+    for model, prefix, fixed in SEED:
+        source = next(s for s in registration_index.SOURCES.values() if s.model is model)
+        table = model.__table__
+        regn_key = next(key for key in source.keys if key.endswith(("_regn", "_trn")))
+        status_key = next(key for key in source.keys if key.endswith("_workflow_status"))
+        required = [
+            column for column in table.columns
+            if not column.nullable and column.default is None and column.server_default is None
+            and not column.primary_key
+        ]
+        rows = []
+        for i in range(1, ROWS_PER_TYPE + 1):
+            row = {column.key: _placeholder(column, i) for column in required}
+            row.update(fixed)
+            row[source.id_attr] = i
+            row[regn_key] = f"{prefix}{i:07d}"
+            row[status_key] = "COMPLETED"
+            rows.append(row)
+        db.execute(insert(table), rows)
+        db.execute(insert(RegistrationIndex).from_select(list(registration_index.INDEX_COLUMNS), source.rows()))
+    db.commit()
+
+
+def measure(db, label, results, rows, **kwargs):
+    with QueryCounter(db) as counter, timed(label, results):
+        page, _ = reprint_search_service.search_all_entities(db, limit=PAGE_SIZE, **kwargs)
+    items = page.items if kwargs.get("keyset") else page
+    rows.append((label, counter.count, results[label]))
+    assert len(items) == PAGE_SIZE, label
+    return page
+
+
+def main():
+    db = make_session(*MODELS)
+    seed(db)
+
+    # Cursor of the page before DEEP_PAGE, found by walking the keyset pages
+    page, _ = reprint_search_service.search_all_entities(db, limit=PAGE_SIZE, keyset=True)
+    for _ in range(DEEP_PAGE - 2):
+        page, _ = reprint_search_service.search_all_entities(
+            db, limit=PAGE_SIZE, keyset=True, cursor=page.next_cursor
+        )
+    deep_cursor = page.next_cursor
+
+    results, rows = {}, []
+    for _ in range(2):  # first round warms SQLite's page cache
+        results.clear()
+        rows.clear()
+        with QueryCounter(db) as counter, timed("count", results):
+            registration_index.search(db).count()
+        rows.append(("count", counter.count, results["count"]))
+        measure(db, "offset page 1", results, rows, skip=0)
+        offset_deep = measure(db, f"offset page {DEEP_PAGE}", results, rows, skip=(DEEP_PAGE - 1) * PAGE_SIZE)
+        measure(db, "keyset page 1", results, rows, keyset=True)
+        keyset_deep = measure(db, f"keyset page {DEEP_PAGE}", results, rows, keyset=True, cursor=deep_cursor)
+
+    assert [i.registration_number for i in offset_deep] == [i.registration_number for i in keyset_deep.items]
+    report(
+        f"Reprint search, {ROWS_PER_TYPE * len(SEED)} registrations, {PAGE_SIZE} per page "
+        f"(page timings include the count)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
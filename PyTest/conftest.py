@@ -0,0 +1,50 @@
+# PyTest/conftest.py
+"""
+Shared fixtures: in-memory SQLite databases holding only the tables a test
+needs, and a counter of the SQL statements a block of code issues.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture(scope="function")
+def sqlite_engine():
+    """
+    sqlite_engine(*models) -> an in-memory engine with the models' tables.
+    StaticPool keeps every session on the one connection (and database).
+    Engines are disposed after the test.
+    """
+    engines: List[Engine] = []
+
+    def make(*models) -> Engine:
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+        for model in models:
+            model.__table__.create(engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@contextmanager
+def _count_statements(engine: Engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+    listener = lambda *args, **kwargs: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.fixture(scope="function")
+def count_statements():
+    """`with count_statements(engine) as statements:` collects the SQL run on `engine` in the block."""
+    return _count_statements
@@ -0,0 +1,117 @@
+# PyTest/test_audit_writer.py
+"""
+Tests for replaying the audit spill file (app/services/audit_writer.py):
+undecodable lines are dead-lettered, the rest is still written, and rows
+already written are not replayed again.
+"""
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from app.services import audit_writer
+from app.services.audit_writer import AuditLogWriter
+
+
+class _Engine:
+    """Stands in for the database engine; records the rows inserted, failing from `fail_after` rows on."""
+
+    def __init__(self):
+        self.rows = []
+        self.fail_after = None
+
+    @contextmanager
+    def begin(self):
+        engine = self
+
+        class Connection:
+            def execute(self, stmt, rows):
+                if engine.fail_after is not None and len(engine.rows) >= engine.fail_after:
+                    raise ConnectionError("database unavailable")
+                engine.rows.extend(rows)
+
+        yield Connection()
+
+
+@pytest.fixture(scope="function")
+def engine(monkeypatch):
+    engine = _Engine()
+    monkeypatch.setattr(audit_writer, "engine", engine)
+    return engine
+
+
+@pytest.fixture(scope="function")
+def writer(engine, tmp_path):
+    return AuditLogWriter(
+        max_queue_size=10, batch_size=2, flush_interval_ms=10, spill_path=str(tmp_path / "audit.spill")
+    )
+
+
+def _row(n):
+    return {"al_record_id": str(n), "al_timestamp": "2026-10-16T06:00:00+00:00"}
+
+
+class TestSpillReplay:
+    def test_truncated_line_is_rejected_and_the_rest_replayed(self, writer, engine, tmp_path):
+        spill = tmp_path / "audit.spill"
+        # The second line was cut off by a crash mid-append
+        spill.write_text(json.dumps(_row(1)) + "\n" + json.dumps(_row(2))[:20] + "\n" + json.dumps(_row(3)) + "\n")
+
+        writer._replay_spill()
+
+        assert [row["al_record_id"] for row in engine.rows] == ["1", "3"]
+        assert (writer.metrics["replayed"], writer.metrics["rejected"]) == (2, 1)
+        assert (tmp_path / "audit.spill.rejected").read_text() == json.dumps(_row(2))[:20] + "\n"
+        assert not spill.exists() and not (tmp_path / "audit.spill.replay").exists()
+
+    def test_leftover_replay_file_is_finished_first(self, writer, engine, tmp_path):
+        (tmp_path / "audit.spill.replay").write_text(json.dumps(_row(1)) + "\n")
+        (tmp_path / "audit.spill").write_text(json.dumps(_row(2)) + "\n")
+
+        writer._replay_spill()
+        writer._replay_spill()
+
+        assert [row["al_record_id"] for row in engine.rows] == ["1", "2"]
+
+    def test_unspillable_rest_keeps_only_unwritten_rows(self, writer, engine, tmp_path, monkeypatch):
+        spill = tmp_path / "audit.spill"
+        spill.write_text("".join(json.dumps(_row(n)) + "\n" for n in range(1, 7)) + "{truncated\n")
+        engine.fail_after = 2
+        # The spill file cannot be appended to either
+        monkeypatch.setattr(writer, "_spill", lambda rows: False)
+
+        writer._replay_spill()
+
+        replay = tmp_path / "audit.spill.replay"
+        assert [row["al_record_id"] for row in engine.rows] == ["1", "2"]
+        assert [json.loads(line)["al_record_id"] for line in replay.read_text().splitlines()] == ["3", "4", "5", "6"]
+
+        engine.fail_after = None
+        writer._replay_spill()
+        assert [row["al_record_id"] for row in engine.rows] == ["1", "2", "3", "4", "5", "6"]
+        assert writer.metrics["rejected"] == 1 and not replay.exists()
+
+    def test_spilled_chunk_is_not_kept_in_the_replay_file(self, writer, engine, tmp_path, monkeypatch):
+        spill = tmp_path / "audit.spill"
+        spill.write_text("".join(json.dumps(_row(n)) + "\n" for n in range(1, 7)))
+        engine.fail_after = 2
+        # The failed chunk is spilled again, then the spill file stops accepting rows
+        spill_rows, calls = writer._spill, []
+
+        def spill_once(rows):
+            calls.append(rows)
+            return len(calls) == 1 and spill_rows(rows)
+
+        monkeypatch.setattr(writer, "_spill", spill_once)
+
+        writer._replay_spill()
+
+        replay = tmp_path / "audit.spill.replay"
+        assert [json.loads(line)["al_record_id"] for line in spill.read_text().splitlines()] == ["3", "4"]
+        assert [json.loads(line)["al_record_id"] for line in replay.read_text().splitlines()] == ["5", "6"]
+
+        engine.fail_after = None
+        writer._replay_spill()
+        writer._replay_spill()
+        assert sorted(row["al_record_id"] for row in engine.rows) == ["1", "2", "3", "4", "5", "6"]
+        assert not spill.exists() and not replay.exists()
@@ -0,0 +1,148 @@
+# PyTest/test_bhikku_enrichment_queries.py
+"""
+Query-count and output regression tests for bhikku list enrichment.
+enrich_bhikku_dicts must render a page exactly as enrich_bhikku_dict renders
+each row, with one query per referenced table however many rows there are.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bhikku import Bhikku
+from app.models.bhikku_category import BhikkuCategory
+from app.models.district import District
+from app.models.divisional_secretariat import DivisionalSecretariat
+from app.models.gramasewaka import Gramasewaka
+from app.models.nikaya import NikayaData
+from app.models.parshawadata import ParshawaData
+from app.models.province import Province
+from app.models.status import StatusData
+from app.models.temp_reference import ENTITY_BHIKKU, KIND_BHIKKU, KIND_VIHARA, TempReference
+from app.models.temporary_bhikku import TemporaryBhikku
+from app.models.temporary_vihara import TemporaryVihara
+from app.models.vihara import ViharaData
+from app.services.bhikku_service import bhikku_service
+from app.services.reference_cache import reference_cache
+
+MODELS = (
+    Bhikku, BhikkuCategory, District, DivisionalSecretariat, Gramasewaka, NikayaData,
+    ParshawaData, Province, StatusData, TempReference, TemporaryBhikku, TemporaryVihara, ViharaData,
+)
+# Eight reference tables (cold reference cache snapshots), an IN query each
+# for the dangling status and nikaya codes the cache does not know, bhikku
+# and vihara IN queries and one temp_reference join for temporary records
+QUERIES_PER_PAGE = 13
+
+
+@pytest.fixture(scope="function")
+def engine(sqlite_engine):
+    engine = sqlite_engine(*MODELS)
+
+    with Session(engine) as session:
+        session.add(Province(cp_code="P1", cp_name="Western"))
+        session.add(District(dd_dcode="D1", dd_dname="Colombo", dd_prcode="P1"))
+        session.add(DivisionalSecretariat(dv_dvcode="DV1", dv_distrcd="D1", dv_dvname="Maharagama"))
+        session.add(Gramasewaka(gn_gnc="GN1", gn_gnname="Pannipitiya", gn_dvcode="DV1"))
+        session.add(StatusData(st_statcd="ST01", st_descr="Active"))
+        session.add(ParshawaData(pr_prn="PR01", pr_pname="Parshawa", pr_nayakahimi="BH0000"))
+        session.add(BhikkuCategory(cc_code="C1", cc_catogry="Samanera"))
+        session.add(NikayaData(nk_nkn="NK1", nk_nname="Siyam"))
+        for i in range(10):
+            session.add(Bhikku(
+                br_id=100 + i, br_regn=f"BH{i:04d}", br_mahananame=f"Bhikku {i}",
+                br_reqstdate=date(2024, 1, 1), br_currstat="ST01", br_parshawaya="PR01",
+                br_is_deleted=i == 9,
+            ))
+        for i in range(5):
+            session.add(ViharaData(vh_trn=f"TRN{i}", vh_vname=f"Temple {i}", vh_addrs=f"Road {i}"))
+        for i in range(1, 4):
+            session.add(TemporaryBhikku(tb_id=i, tb_name=f"Temp bhikku {i}"))
+            session.add(TemporaryVihara(tv_id=i, tv_name=f"Temp vihara {i}"))
+        for i in range(1, 51):
+            session.add(Bhikku(
+                br_id=i, br_regn=f"BR{i:04d}", br_reqstdate=date(2024, 1, 1),
+                br_province="P1", br_district="D1", br_division="DV1", br_gndiv="GN1",
+                # Odd rows carry a status code that no longer exists
+                br_currstat="ST01" if i % 2 == 0 else "ST-GONE",
+                br_parshawaya="PR01", br_cat="C1", br_nikaya="NK-GONE",
+                br_livtemple=f"TRN{i % 5}", br_mahanatemple="TRN-GONE",
+                br_robing_tutor_residence=f"TRN{(i + 1) % 5}",
+                br_mahanaacharyacd=f"BH{i % 9:04d}", br_viharadhipathi="BH-UNKNOWN",
+                br_mahanayaka_name="BH0002",
+                # BH0009 is deleted and BH-UNKNOWN missing: only BH0001 is named
+                br_multi_mahanaacharyacd="BH0001, BH0009, BH-UNKNOWN",
+                br_remarks="",
+            ))
+            session.add(TempReference(
+                tr_entity=ENTITY_BHIKKU, tr_entity_id=i, tr_field="br_viharadhipathi",
+                tr_temp_kind=KIND_BHIKKU, tr_temp_id=i % 3 + 1,
+            ))
+            session.add(TempReference(
+                tr_entity=ENTITY_BHIKKU, tr_entity_id=i, tr_field="br_robing_after_residence_temple",
+                tr_temp_kind=KIND_VIHARA, tr_temp_id=i % 3 + 1,
+            ))
+            # Temporary record that no longer exists: the column value is returned
+            session.add(TempReference(
+                tr_entity=ENTITY_BHIKKU, tr_entity_id=i, tr_field="br_livtemple",
+                tr_temp_kind=KIND_VIHARA, tr_temp_id=99,
+            ))
+        session.commit()
+    return engine
+
+
+@pytest.fixture(scope="function")
+def enrich_page(engine, count_statements):
+    """enrich_page(rows, enrich) -> (enriched page, queries issued by the enrichment)"""
+    def run(rows: int, enrich):
+        reference_cache.invalidate()
+        with Session(engine) as session:
+            records = (
+                session.query(Bhikku).filter(Bhikku.br_regn.like("BR%"))
+                .order_by(Bhikku.br_id).limit(rows).all()
+            )
+            with count_statements(engine) as statements:
+                data = enrich(records, session)
+        return data, len(statements)
+    return run
+
+
+class TestBhikkuPageEnrichment:
+    def test_query_count_is_constant(self, enrich_page):
+        _, small = enrich_page(5, bhikku_service.enrich_bhikku_dicts)
+        data, full = enrich_page(50, bhikku_service.enrich_bhikku_dicts)
+        assert len(data) == 50
+        assert small == full == QUERIES_PER_PAGE
+
+    def test_references_resolved(self, enrich_page):
+        data, _ = enrich_page(2, bhikku_service.enrich_bhikku_dicts)
+        first, second = data
+        assert first["br_province"] == {"cp_code": "P1", "cp_name": "Western"}
+        assert first["br_district"] == {"dd_dcode": "D1", "dd_dname": "Colombo"}
+        assert first["br_division"] == {"dv_dvcode": "DV1", "dv_dvname": "Maharagama"}
+        assert first["br_gndiv"] == {"gn_gnc": "GN1", "gn_gnname": "Pannipitiya"}
+        assert first["br_parshawaya"] == {"code": "PR01", "name": "Parshawa"}
+        assert first["br_cat"] == {"cc_code": "C1", "cc_catogry": "Samanera"}
+        assert first["br_livtemple"] == {"vh_trn": "TRN1", "vh_vname": "Temple 1", "vh_addrs": "Road 1"}
+        assert first["br_robing_tutor_residence"] == {"vh_trn": "TRN2", "vh_vname": "Temple 2", "vh_addrs": "Road 2"}
+        assert first["br_mahanaacharyacd"] == {"br_regn": "BH0001", "br_mahananame": "Bhikku 1", "br_upasampadaname": ""}
+        assert first["br_mahanayaka_name"] == "Bhikku 2"
+        assert first["br_multi_mahanaacharyacd"] == "Bhikku 1"
+        assert first["br_remarks"] is None
+        # Dangling codes fall back to the column value
+        assert first["br_currstat"] == "ST-GONE"
+        assert second["br_currstat"] == {"st_statcd": "ST01", "st_descr": "Active"}
+        assert first["br_nikaya"] == "NK-GONE"
+        assert first["br_mahanatemple"] == "TRN-GONE"
+        # Temporary references win over the column value
+        assert first["br_viharadhipathi"] == {
+            "br_regn": "TEMP-2", "br_mahananame": "Temp bhikku 2", "br_upasampadaname": "",
+        }
+        assert first["br_robing_after_residence_temple"] == {"vh_trn": "TEMP-2", "vh_vname": "Temp vihara 2"}
+
+    def test_single_record_matches_page(self, enrich_page):
+        page, _ = enrich_page(10, bhikku_service.enrich_bhikku_dicts)
+        single, _ = enrich_page(
+            10, lambda records, db: [bhikku_service.enrich_bhikku_dict(r, db) for r in records],
+        )
+        assert page == single
@@ -0,0 +1,148 @@
+# PyTest/test_bhikku_high_enrichment_queries.py
+"""
+Query-count regression tests for bhikku_high READ_ALL enrichment.
+A page of bhikku_high_regist / direct_bhikku_high rows must be enriched with
+one query per referenced table, however many rows the page has.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bhikku import Bhikku
+from app.models.bhikku_high import BhikkuHighRegist
+from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.parshawadata import ParshawaData
+from app.models.status import StatusData
+from app.models.temp_reference import (
+    ENTITY_BHIKKU_HIGH, ENTITY_DIRECT_BHIKKU_HIGH, KIND_BHIKKU, KIND_VIHARA, TempReference,
+)
+from app.models.temporary_bhikku import TemporaryBhikku
+from app.models.temporary_vihara import TemporaryVihara
+from app.models.vihara import ViharaData
+from app.services.bhikku_high_service import bhikku_high_service
+from app.services.reference_cache import reference_cache
+
+MODELS = (
+    Bhikku, BhikkuHighRegist, DirectBhikkuHigh, ParshawaData,
+    StatusData, TempReference, TemporaryBhikku, TemporaryVihara, ViharaData,
+)
+# Referenced tables: bhikku, vihara, status, parshawa (cold reference cache
+# snapshots) and one temp_reference join for temporary bhikkus / viharas
+QUERIES_PER_PAGE = 5
+
+
+def _references(prefix: str, i: int) -> dict:
+    refs = {
+        f"{prefix}_karmacharya_name": f"BH{i % 10:04d}",
+        f"{prefix}_upaddhyaya_name": f"BH{(i + 1) % 10:04d}",
+        f"{prefix}_tutors_tutor_regn": f"BH{(i + 2) % 10:04d}",
+        f"{prefix}_presiding_bhikshu_regn": "BH-UNKNOWN",
+        f"{prefix}_livtemple": f"TRN{i % 5}",
+        f"{prefix}_residence_permanent_trn": f"TRN{(i + 1) % 5}",
+        f"{prefix}_currstat": "ST01",
+        f"{prefix}_parshawaya": "PR01",
+        f"{prefix}_remarks": "note",
+    }
+    if prefix == "bhr":
+        refs["bhr_candidate_regn"] = f"BH{(i + 3) % 10:04d}"
+    return refs
+
+
+@pytest.fixture(scope="function")
+def engine(sqlite_engine):
+    engine = sqlite_engine(*MODELS)
+
+    with Session(engine) as session:
+        session.add(StatusData(st_statcd="ST01", st_descr="Active"))
+        session.add(ParshawaData(pr_prn="PR01", pr_pname="Parshawa", pr_nayakahimi="BH0000"))
+        for i in range(10):
+            session.add(Bhikku(
+                br_regn=f"BH{i:04d}", br_mahananame=f"Bhikku {i}", br_reqstdate=date(2024, 1, 1),
+                br_currstat="ST01", br_parshawaya="PR01",
+            ))
+        for i in range(5):
+            session.add(ViharaData(vh_trn=f"TRN{i}", vh_vname=f"Temple {i}"))
+        for i in range(1, 4):
+            session.add(TemporaryBhikku(tb_id=i, tb_name=f"Temp bhikku {i}"))
+            session.add(TemporaryVihara(tv_id=i, tv_name=f"Temp vihara {i}"))
+        for i in range(1, 51):
+            session.add(BhikkuHighRegist(bhr_id=i, bhr_regn=f"BHR{i}", **_references("bhr", i)))
+            session.add(DirectBhikkuHigh(
+                dbh_id=i, dbh_regn=f"DBH{i}", dbh_reqstdate=date(2024, 1, 1), **_references("dbh", i)
+            ))
+            for entity, prefix in ((ENTITY_BHIKKU_HIGH, "bhr"), (ENTITY_DIRECT_BHIKKU_HIGH, "dbh")):
+                session.add(TempReference(
+                    tr_entity=entity, tr_entity_id=i, tr_field=f"{prefix}_samanera_serial_no",
+                    tr_temp_kind=KIND_BHIKKU, tr_temp_id=i % 3 + 1,
+                ))
+                session.add(TempReference(
+                    tr_entity=entity, tr_entity_id=i, tr_field=f"{prefix}_higher_ordination_place",
+                    tr_temp_kind=KIND_VIHARA, tr_temp_id=i % 3 + 1,
+                ))
+                # Temporary record that no longer exists: the column value is returned
+                session.add(TempReference(
+                    tr_entity=entity, tr_entity_id=i, tr_field=f"{prefix}_livtemple",
+                    tr_temp_kind=KIND_VIHARA, tr_temp_id=99,
+                ))
+        session.commit()
+    return engine
+
+
+@pytest.fixture(scope="function")
+def enrich_page(engine, count_statements):
+    """enrich_page(model, rows, enrich) -> (enriched page, queries issued by the enrichment)"""
+    def run(model, rows: int, enrich):
+        reference_cache.invalidate()
+        with Session(engine) as session:
+            records = session.query(model).limit(rows).all()
+            with count_statements(engine) as statements:
+                data = enrich(records, session)
+        return data, len(statements)
+    return run
+
+
+class TestBhikkuHighPageEnrichment:
+    def test_query_count_is_constant(self, enrich_page):
+        enrich = bhikku_high_service.enrich_bhikku_high_dicts
+        _, small = enrich_page(BhikkuHighRegist, 5, enrich)
+        data, full = enrich_page(BhikkuHighRegist, 50, enrich)
+        assert len(data) == 50
+        assert small == full == QUERIES_PER_PAGE
+
+    def test_references_resolved(self, enrich_page):
+        data, _ = enrich_page(BhikkuHighRegist, 50, bhikku_high_service.enrich_bhikku_high_dicts)
+        first = data[0]
+        assert first["bhr_karmacharya_name"] == {"br_regn": "BH0001", "br_mahananame": "Bhikku 1", "br_upasampadaname": ""}
+        assert first["bhr_presiding_bhikshu_regn"] == "BH-UNKNOWN"
+        assert first["bhr_livtemple"] == {"vh_trn": "TRN1", "vh_vname": "Temple 1"}
+        assert first["bhr_samanera_serial_no"]["br_regn"] == "TEMP-2"
+        assert first["bhr_higher_ordination_place"] == {"vh_trn": "TEMP-2", "vh_vname": "Temp vihara 2"}
+        assert first["bhr_currstat"] == {"st_statcd": "ST01", "st_descr": "Active"}
+        assert first["bhr_parshawaya"] == {"code": "PR01", "name": "Parshawa"}
+        assert first["bhr_remarks"] == "note"
+
+    def test_single_record_matches_page(self, enrich_page):
+        page, _ = enrich_page(BhikkuHighRegist, 5, bhikku_high_service.enrich_bhikku_high_dicts)
+        single, _ = enrich_page(
+            BhikkuHighRegist, 5,
+            lambda records, db: [bhikku_high_service.enrich_bhikku_high_dict(r) for r in records],
+        )
+        assert page == single
+
+
+class TestDirectBhikkuHighPageEnrichment:
+    def test_query_count_is_constant(self, enrich_page):
+        enrich = bhikku_high_service.convert_direct_to_bhikku_high_dicts
+        _, small = enrich_page(DirectBhikkuHigh, 5, enrich)
+        data, full = enrich_page(DirectBhikkuHigh, 50, enrich)
+        assert len(data) == 50
+        assert small == full == QUERIES_PER_PAGE
+
+    def test_converted_shape(self, enrich_page):
+        data, _ = enrich_page(DirectBhikkuHigh, 1, bhikku_high_service.convert_direct_to_bhikku_high_dicts)
+        first = data[0]
+        assert first["form_type"] == "direct"
+        assert first["bhr_candidate_regn"] is None
+        assert first["bhr_upaddhyaya_name"]["br_mahananame"] == "Bhikku 2"
+        assert first["bhr_samanera_serial_no"]["br_regn"] == "TEMP-2"
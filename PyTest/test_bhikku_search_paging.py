@@ -0,0 +1,51 @@
+# PyTest/test_bhikku_search_paging.py
+"""
+Keyset paging of bhikku search results ordered by rank: rows tied on the
+rank across a page boundary are neither repeated nor skipped.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import Float, cast
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.bhikku import Bhikku
+from app.services.bhikku_search import apply_search
+from app.utils.pagination import keyset_paginate
+
+
+@pytest.fixture(scope="function")
+def db(sqlite_engine):
+    session = Session(sqlite_engine(Bhikku))
+    session.add_all([
+        Bhikku(
+            br_id=i, br_regn=f"BH20250{i:05d}", br_reqstdate=date(2024, 1, 1),
+            br_currstat="ST01", br_parshawaya="PR01",
+        )
+        for i in range(1, 26)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_rank_is_double_precision():
+    _, rank = apply_search(Session().query(Bhikku), "sumana")
+    compiled = str(rank.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("CAST(ts_rank(") and compiled.endswith("AS FLOAT(53))")
+
+
+def test_ties_on_rank_span_pages(db):
+    # Every row ranks the same, at a value with no exact binary form
+    rank = cast(Bhikku.br_id * 0 + 0.1, Float(53))
+    order = [(rank, True), (Bhikku.br_id, False)]
+
+    seen, cursor = [], None
+    for _ in range(10):
+        page = keyset_paginate(db.query(Bhikku), order, 10, cursor)
+        seen.extend(bhikku.br_id for bhikku in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == list(range(1, 26))
@@ -0,0 +1,65 @@
+# PyTest/test_blob_store.py
+"""
+Tests for the content-addressed blob store behind FileStorageService
+(app/utils/blob_store.py) and the dedup tool (app/utils/dedup_storage.py).
+"""
+import asyncio
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.dedup_storage import dedup_storage
+from app.utils.file_storage import FileStorageService
+
+
+@pytest.fixture(scope="function")
+def storage(tmp_path):
+    return FileStorageService(base_storage_path=str(tmp_path))
+
+
+def _store(storage, content: bytes, regn: str = "BH2025000001"):
+    upload = UploadFile(file=io.BytesIO(content), filename="scan.pdf")
+    return asyncio.run(storage.store_file(upload, regn, "scanned_document", "bhikku_regist"))
+
+
+class TestBlobStore:
+    def test_identical_uploads_share_one_blob(self, storage):
+        first = _store(storage, b"%PDF-1.4 page")
+        second = _store(storage, b"%PDF-1.4 page", regn="BH2025000002")
+        other = _store(storage, b"%PDF-1.4 other page")
+
+        assert (first.deduplicated, second.deduplicated, other.deduplicated) == (False, True, False)
+        assert os.path.samefile(first.absolute_path, second.absolute_path)
+        assert os.path.samefile(first.absolute_path, storage.blobs.path(first.sha256))
+        assert storage.blobs.refcount(first.sha256) == 2
+
+        assert storage.delete_file(first.relative_path)
+        assert Path(second.absolute_path).read_bytes() == b"%PDF-1.4 page"
+        assert storage.blobs.refcount(first.sha256) == 1
+
+        storage.delete_file(second.relative_path)
+        assert [path for path, _ in storage.blobs.unreferenced()] == [storage.blobs.path(first.sha256)]
+        assert storage.blobs.prune(grace_seconds=0) == (1, len(b"%PDF-1.4 page"))
+        assert storage.blobs.refcount(other.sha256) == 1
+
+    def test_dedup_tool_links_existing_files(self, storage, tmp_path):
+        content = b"\x89PNG photo" * 100
+        for name in ("2024/01/02/BH1/photo_a.png", "2024/03/04/BH2/photo_b.png", "unique.pdf"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_bytes(b"unique" if name == "unique.pdf" else content)
+
+        dry = dedup_storage(storage, dry_run=True)
+        assert (dry.files, dry.duplicates, dry.bytes_saved) == (3, 1, len(content))
+        assert not storage.blobs.root.exists()
+
+        report = dedup_storage(storage)
+        assert (report.new_blobs, report.duplicates, report.bytes_saved) == (2, 1, len(content))
+        assert storage.blobs.refcount(hashlib.sha256(content).hexdigest()) == 2
+        assert (tmp_path / "2024/03/04/BH2/photo_b.png").read_bytes() == content
+
+        again = dedup_storage(storage)
+        assert (again.files, again.linked, again.bytes_saved) == (3, 3, 0)
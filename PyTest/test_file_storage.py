@@ -0,0 +1,58 @@
+# PyTest/test_file_storage.py
+"""
+Tests for the chunked upload path of FileStorageService (app/utils/file_storage.py).
+"""
+import asyncio
+import hashlib
+import io
+import stat
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.utils.blob_store import BLOB_DIRECTORY, FILE_MODE
+from app.utils.file_storage import FileStorageService, upload_size
+
+
+@pytest.fixture(scope="function")
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileStorageService, "CHUNK_SIZE", 4)
+    return FileStorageService(base_storage_path=str(tmp_path))
+
+
+def _upload(content: bytes, filename: str = "scan.pdf") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def _files(root: Path):
+    return sorted(p.name for p in root.rglob("*") if p.is_file() and BLOB_DIRECTORY not in p.parts)
+
+
+class TestFileStorage:
+    def test_store_file_copies_in_chunks(self, storage, tmp_path):
+        content = b"%PDF-1.4 scanned page"
+        stored = asyncio.run(storage.store_file(_upload(content), "BH2025000001", "scanned_document", "bhikku_regist"))
+
+        assert stored.relative_path.startswith("/storage/bhikku_regist/")
+        assert Path(stored.absolute_path).read_bytes() == content
+        assert (stored.size, stored.sha256) == (len(content), hashlib.sha256(content).hexdigest())
+        assert _files(tmp_path) == [Path(stored.absolute_path).name]
+        # Not the 0600 of the temporary file it was written to
+        assert stat.S_IMODE(Path(stored.absolute_path).stat().st_mode) == FILE_MODE
+
+    def test_oversized_and_empty_uploads_leave_nothing(self, storage, tmp_path):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(storage.save_file(_upload(b"x" * 11), "BH2025000001", max_size=10))
+        assert exc.value.status_code == 400 and "too large" in exc.value.detail
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(storage.save_file(_upload(b""), "BH2025000001"))
+        assert exc.value.detail == "File is empty"
+        assert _files(tmp_path) == []
+
+    def test_upload_size_does_not_move_the_file(self):
+        upload = _upload(b"12345")
+        upload.file.seek(2)
+        assert upload_size(upload) == 5
+        assert upload.file.tell() == 2
@@ -0,0 +1,47 @@
+# PyTest/test_image_derivatives.py
+"""
+Tests for the thumbnails of uploaded images (app/utils/image_derivatives.py).
+"""
+import io
+
+import pytest
+
+from app.utils.file_storage import FileStorageService
+from app.utils.image_derivatives import ImageDerivatives, derivative_url, derivative_urls
+
+PHOTO = "/storage/bhikku_id/2025/11/15/BH202500001/applicant_photo_x.jpg"
+
+
+@pytest.fixture(scope="function")
+def derivatives(tmp_path):
+    original = tmp_path / PHOTO[len("/storage/"):]
+    original.parent.mkdir(parents=True)
+    original.write_bytes(b"not decoded unless Pillow is installed")
+    return ImageDerivatives(FileStorageService(base_storage_path=str(tmp_path)))
+
+
+class TestImageDerivatives:
+    def test_urls_follow_from_the_original_path(self, derivatives):
+        thumb = derivative_url(PHOTO, "thumb")
+        assert thumb.startswith("/storage/_derivatives/thumb/bhikku_id/2025/11/15/BH202500001/applicant_photo_x.jpg.")
+        assert set(derivative_urls(PHOTO)) == {"thumb", "preview"}
+        assert derivative_urls("/storage/bhikku_regist/scanned_document_x.pdf") is None
+        assert derivative_urls(None) is None
+
+        path = thumb[len("/storage/_derivatives/thumb/"):]
+        assert derivatives.original_of("thumb", path) == PHOTO
+        assert derivatives.original_of("huge", path) is None
+        assert derivatives.original_of("thumb", "../../etc/passwd.jpg" + path[path.rindex("."):]) is None
+        assert derivatives.original_of("thumb", path.replace("applicant_photo_x", "missing")) is None
+
+    def test_renders_every_variant_once(self, derivatives, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 900), "white").save(buffer, "JPEG")
+        (tmp_path / PHOTO[len("/storage/"):]).write_bytes(buffer.getvalue())
+
+        rendered = derivatives.generate(PHOTO)
+        assert set(rendered) == {"thumb", "preview"}
+        with Image.open(rendered["thumb"]) as thumb:
+            assert max(thumb.size) == 160
+        assert derivatives.ensure(PHOTO, "preview") == rendered["preview"]
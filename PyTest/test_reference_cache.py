@@ -0,0 +1,81 @@
+# PyTest/test_reference_cache.py
+"""
+Tests for the process-wide reference data cache (app/services/reference_cache.py):
+snapshot hits and misses, invalidation on commit and the uncommitted-write bypass.
+"""
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.district import District
+from app.models.province import Province
+from app.models.report_view_state import ReportViewDirtyMark
+from app.models.status import StatusData
+from app.services.reference_cache import reference_cache
+from app.utils.batch_loading import load_by_keys
+
+
+@pytest.fixture(scope="function")
+def db(sqlite_engine):
+    # statusdata writes also mark the bhikku report views stale (report_view_dirty_mark)
+    engine = sqlite_engine(Province, District, StatusData, ReportViewDirtyMark)
+    # SessionLocal carries the cache invalidation listeners
+    session = SessionLocal(bind=engine)
+    session.add_all([
+        Province(cp_code="WP", cp_name="Western"),
+        Province(cp_code="CP", cp_name="Central"),
+        StatusData(st_statcd="ST01", st_descr="Active"),
+        StatusData(st_statcd="ST02", st_descr="Retired", st_is_deleted=True),
+    ])
+    session.commit()
+    reference_cache.invalidate()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="function")
+def count_queries(db, count_statements):
+    """count_queries(fn) -> (fn(), statements it ran)"""
+    def count(fn):
+        with count_statements(db.get_bind()) as statements:
+            result = fn()
+        return result, len(statements)
+    return count
+
+
+class TestReferenceCache:
+    def test_snapshot_is_loaded_once(self, db, count_queries):
+        before = dict(reference_cache.metrics)
+        _, first = count_queries(lambda: reference_cache.has(db, "cmm_province", "cp_code", "WP"))
+        _, second = count_queries(lambda: reference_cache.has(db, "cmm_province", "cp_code", "CP"))
+        assert (first, second) == (1, 0)
+        assert reference_cache.metrics["misses"] == before["misses"] + 1
+        assert reference_cache.metrics["hits"] == before["hits"] + 1
+
+    def test_deleted_rows(self, db):
+        assert reference_cache.has(db, "statusdata", "st_statcd", "ST02")
+        assert not reference_cache.has(db, "statusdata", "st_statcd", "ST02", include_deleted=False)
+        assert [row["st_statcd"] for row in reference_cache.rows(db, "status")] == ["ST01"]
+
+    def test_unknown_codes_fall_back_to_database(self, db, count_queries):
+        assert not reference_cache.has(db, "cmm_province", "cp_code", "NOPE")
+        found, queries = count_queries(lambda: load_by_keys(db, Province, "cp_code", ["WP", "NOPE"]))
+        assert set(found) == {"WP"}
+        assert found["WP"].cp_name == "Western"
+        assert queries == 1  # only "NOPE" is queried
+
+    def test_commit_invalidates_snapshot(self, db):
+        assert not reference_cache.has(db, "cmm_province", "cp_code", "SP")
+        db.add(Province(cp_code="SP", cp_name="Southern"))
+        db.flush()
+        # Uncommitted reference changes bypass the cache
+        assert not reference_cache.has(db, "cmm_province", "cp_code", "SP")
+        db.commit()
+        assert reference_cache.has(db, "cmm_province", "cp_code", "SP")
+
+    def test_rollback_keeps_snapshot(self, db, count_queries):
+        reference_cache.rows(db, "province")
+        db.add(Province(cp_code="NP", cp_name="Northern"))
+        db.flush()
+        db.rollback()
+        _, queries = count_queries(lambda: reference_cache.rows(db, "province"))
+        assert queries == 0
@@ -0,0 +1,60 @@
+# PyTest/test_registration_export.py
+"""
+Tests for the streamed registry exports (app/services/registration_export.py):
+READ_ALL filters, batching and name enrichment.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.district import District
+from app.models.province import Province
+from app.models.vihara import ViharaData
+from app.repositories.vihara_repo import vihara_repo
+from app.services import registration_export
+from app.services.reference_cache import reference_cache
+from app.utils.streaming import csv_chunks
+
+
+@pytest.fixture(scope="function")
+def db(monkeypatch, sqlite_engine):
+    engine = sqlite_engine(District, Province, ViharaData)
+    session = Session(engine)
+    session.add_all([
+        Province(cp_code="WP", cp_name="Western"),
+        Province(cp_code="CP", cp_name="Central"),
+        District(dd_dcode="DC001", dd_dname="Colombo", dd_prcode="WP"),
+    ])
+    session.add_all([
+        ViharaData(
+            vh_id=i, vh_trn=f"TRN{i:07d}", vh_vname=f"Temple {i}", vh_workflow_status="COMPLETED",
+            vh_province="WP" if i % 2 else "CP", vh_district="DC001" if i % 2 else None,
+        )
+        for i in range(1, 8)
+    ])
+    session.commit()
+    reference_cache.invalidate()
+    monkeypatch.setattr(registration_export, "SessionLocal", lambda: Session(engine))
+    monkeypatch.setattr(registration_export, "EXPORT_BATCH_SIZE", 2)
+    yield session
+    session.close()
+    reference_cache.invalidate()
+
+
+class TestRegistrationExport:
+    def test_streams_filtered_rows_with_names(self, db):
+        query = vihara_repo.list(db, province="WP", unpaged=True)
+        assert registration_export.count(query) == 4
+
+        rows = list(registration_export.stream("vihara", query))
+        assert [row["vh_trn"] for row in rows] == ["TRN0000001", "TRN0000003", "TRN0000005", "TRN0000007"]
+        assert {(row["vh_province_name"], row["vh_district_name"]) for row in rows} == {("Western", "Colombo")}
+        assert rows[0]["vh_nikaya"] is None and rows[0]["vh_nikaya_name"] is None
+
+    def test_csv_header_follows_export_columns(self, db):
+        columns = registration_export.EXPORTS["vihara"].columns
+        assert columns.index("vh_province_name") == columns.index("vh_province") + 1
+
+        rows = registration_export.stream("vihara", vihara_repo.list(db, search="Temple 2", unpaged=True))
+        lines = b"".join(csv_chunks(columns, rows)).decode("utf-8").splitlines()
+        assert lines[0] == "﻿" + ",".join(columns)
+        assert len(lines) == 2 and "Central" in lines[1].split(",")
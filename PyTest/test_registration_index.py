@@ -0,0 +1,121 @@
+# PyTest/test_registration_index.py
+"""
+Tests for the registration number index (app/services/registration_index.py):
+maintenance on insert / update / delete, QR lookup and reprint search paging.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session, noload
+
+from app.models.arama import AramaData
+from app.models.bhikku import Bhikku
+from app.models.bhikku_high import BhikkuHighRegist
+from app.models.devala import DevalaData
+from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.registration_index import RegistrationIndex
+from app.models.silmatha_regist import SilmathaRegist
+from app.models.status import StatusData
+from app.models.vihara import ViharaData
+from app.services import registration_index
+from app.services.reprint_search_service import reprint_search_service
+
+MODELS = (
+    AramaData, Bhikku, BhikkuHighRegist, DevalaData, DirectBhikkuHigh,
+    RegistrationIndex, SilmathaRegist, StatusData, ViharaData,
+)
+
+
+@pytest.fixture(scope="function")
+def db(sqlite_engine):
+    session = Session(sqlite_engine(*MODELS))
+    event.listen(session, "after_flush", registration_index.sync_registration_index)
+    session.add_all([
+        Bhikku(
+            br_id=1, br_regn="BH2025001", br_mahananame="Sumana", br_gihiname="Sunil",
+            br_dofb=date(1990, 1, 15), br_reqstdate=date(2024, 1, 1), br_currstat="ST01",
+            br_parshawaya="PR01", br_workflow_status="COMPLETED",
+        ),
+        BhikkuHighRegist(
+            bhr_id=1, bhr_regn="UPS2025001", bhr_candidate_regn="BH2025001",
+            bhr_assumed_name="Sumana Thera", bhr_workflow_status="COMPLETED",
+        ),
+        SilmathaRegist(
+            sil_id=1, sil_regn="SIL2025001", sil_mahananame="Dhamma", sil_reqstdate=date(2024, 1, 1),
+            sil_currstat="ST01", sil_workflow_status="PENDING",
+        ),
+    ])
+    session.add_all([
+        ViharaData(vh_id=i, vh_trn=f"TRN{i:07d}", vh_vname=f"Temple {i}", vh_workflow_status="COMPLETED")
+        for i in range(1, 31)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _entry(db, entity_type, entity_id):
+    return db.get(RegistrationIndex, (entity_type, entity_id))
+
+
+class TestRegistrationIndex:
+    def test_rows_follow_writes(self, db):
+        entry = _entry(db, "high_bhikku", 1)
+        assert (entry.ri_regn, entry.ri_display_name, entry.ri_dob) == ("UPS2025001", "Sumana Thera", date(1990, 1, 15))
+
+        # The candidate's date of birth is copied into the high bhikku row
+        db.get(Bhikku, 1).br_dofb = date(1991, 2, 16)
+        db.get(SilmathaRegist, 1, options=[noload("*")]).sil_workflow_status = "COMPLETED"
+        db.commit()
+        db.expire_all()
+        assert _entry(db, "high_bhikku", 1).ri_dob == date(1991, 2, 16)
+        assert _entry(db, "silmatha", 1).ri_workflow_status == "COMPLETED"
+
+        db.get(ViharaData, 30).vh_is_deleted = True
+        db.commit()
+        db.expire_all()
+        assert _entry(db, "vihara", 30).ri_is_deleted is True
+
+    def test_lookup_prefers_given_type_order(self, db):
+        assert registration_index.lookup(db, "UPS2025001").ri_entity_type == "high_bhikku"
+        assert registration_index.lookup(db, "BH2025001", registration_index.QR_ENTITY_TYPES).ri_entity_id == 1
+        assert registration_index.lookup(db, "UPS2025001", ("bhikku",)) is None
+
+    def test_reprint_search_pages_across_types(self, db):
+        page, total = reprint_search_service.search_all_entities(db, skip=0, limit=10)
+        assert total == 32  # bhikku, high bhikku and 30 viharas; the silmatha is still pending
+        assert [item.registration_number for item in page][:2] == ["BH2025001", "TRN0000001"]
+
+        seen = []
+        for skip in range(0, total, 10):
+            items, _ = reprint_search_service.search_all_entities(db, skip=skip, limit=10)
+            seen.extend((item.entity_type, item.registration_number) for item in items)
+        assert len(seen) == len(set(seen)) == total
+        assert seen[-1] == ("high_bhikku", "UPS2025001")
+
+    def test_reprint_search_keyset_matches_offset_pages(self, db):
+        offset_items, _ = reprint_search_service.search_all_entities(db, skip=0, limit=100)
+        walked, cursor = [], None
+        while True:
+            page, total = reprint_search_service.search_all_entities(db, limit=7, keyset=True, cursor=cursor)
+            walked.extend(page.items)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+        assert total == 32
+        assert [item.registration_number for item in walked] == [item.registration_number for item in offset_items]
+
+        back, _ = reprint_search_service.search_all_entities(db, limit=7, keyset=True, cursor=page.prev_cursor)
+        assert [item.registration_number for item in back.items] == [
+            item.registration_number for item in walked[-len(page.items) - 7:-len(page.items)]
+        ]
+
+    def test_reprint_search_filters(self, db):
+        items, total = reprint_search_service.search_all_entities(db, name="sunil")
+        assert total == 1 and items[0].birth_name == "Sunil"
+        items, total = reprint_search_service.search_all_entities(
+            db, birth_date=date(1990, 1, 15), entity_type="high_bhikku"
+        )
+        assert total == 1 and items[0].date_of_birth == date(1990, 1, 15)
+        assert reprint_search_service.search_all_entities(db, entity_type="unknown") == ([], 0)
@@ -0,0 +1,127 @@
+# PyTest/test_report_views.py
+"""
+Tests for the bhikku report views (app/services/report_views.py): the dirty
+marks that trigger refreshes of the materialized copies, and paged, filtered
+and streamed reads.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models import District, DivisionalSecretariat, Gramasewaka, NikayaData, Province
+from app.models.bhikku import Bhikku
+from app.models.bhikku_regist_old import BhikkuRegistOld
+from app.models.report_view_state import ReportViewDirtyMark, ReportViewState
+from app.models.vihara import ViharaData
+from app.services import report_views
+from app.services.report_views import ReportViewQuery
+from app.utils.streaming import csv_chunks
+
+
+@pytest.fixture(scope="function")
+def db(sqlite_engine):
+    session = Session(sqlite_engine(
+        Bhikku, BhikkuRegistOld, ReportViewDirtyMark,
+        Province, District, DivisionalSecretariat, Gramasewaka, NikayaData, ViharaData,
+    ))
+    event.listen(session, "after_flush", report_views.mark_report_views_dirty)
+    yield session
+    session.close()
+
+
+def _marks(db):
+    return db.execute(select(func.count()).select_from(ReportViewDirtyMark)).scalar()
+
+
+def _marked_tables(db):
+    return sorted(db.execute(select(ReportViewDirtyMark.rvd_table)).scalars())
+
+
+def _bhikku(br_id):
+    return BhikkuRegistOld(
+        br_id=br_id, br_regn=f"BH20250{br_id:05d}", br_reqstdate=date(2024, 1, 1), br_gndiv="GN01",
+        br_currstat="ST01", br_parshawaya="PR01", br_mahanatemple="TRN0000001", br_mahanaacharyacd="BH2025000001",
+    )
+
+
+class TestReportViewDirtyMarks:
+    def test_one_mark_per_transaction(self, db):
+        db.add(_bhikku(1))
+        db.flush()
+        db.add(_bhikku(2))
+        db.flush()
+        db.commit()
+        assert _marks(db) == 1
+
+        db.get(BhikkuRegistOld, 1).br_mahananame = "Sumana"
+        db.commit()
+        assert _marks(db) == 2
+
+    def test_vihara_writes_mark_their_table(self, db):
+        db.add(ViharaData(vh_trn="TRN0000001", vh_vname="Sri Maha Viharaya"))
+        db.flush()
+        db.add(_bhikku(1))
+        db.commit()
+        assert _marked_tables(db) == ["bhikku_regist_old", "vihaddata"]
+
+    def test_unrelated_writes_do_not_mark(self, db):
+        # No report view reads bhikku_regist
+        db.add(Bhikku(
+            br_id=1, br_regn="BH2025000001", br_reqstdate=date(2024, 1, 1), br_currstat="ST01", br_parshawaya="PR01",
+        ))
+        db.commit()
+        assert _marks(db) == 0
+
+    def test_rolled_back_mark_is_discarded(self, db):
+        db.add(_bhikku(1))
+        db.flush()
+        db.rollback()
+        assert _marks(db) == 0
+
+
+@pytest.fixture(scope="function")
+def district_summary(db, monkeypatch):
+    """mv_bikkusumm_district_list stand-in with five districts, refreshed at a fixed time."""
+    engine = db.get_bind()
+    ReportViewState.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE mv_bikkusumm_district_list (dcode TEXT, dname TEXT, totalbikku INTEGER)")
+        conn.exec_driver_sql(
+            "INSERT INTO mv_bikkusumm_district_list VALUES "
+            "('04', 'Kandy', 30), ('02', 'Gampaha', 25), ('01', 'Colombo', 40), "
+            "('05', 'Matale', 8), ('03', 'Kalutara', 12)"
+        )
+    db.add(ReportViewState(rvs_view="bikkusumm_district_list", rvs_refreshed_at=datetime(2026, 1, 1, 6, 0)))
+    db.commit()
+    monkeypatch.setattr(report_views, "SessionLocal", lambda: Session(engine))
+    return db
+
+
+class TestReportViewReads:
+    def test_read_pages_filters_and_searches(self, district_summary):
+        report = report_views.read(district_summary, "bikkusumm_district_list")
+        assert [row["dcode"] for row in report.rows] == ["01", "02", "03", "04", "05"]
+        assert report.total is None and report.as_of == datetime(2026, 1, 1, 6, 0)
+
+        page = report_views.read(district_summary, "bikkusumm_district_list", ReportViewQuery(offset=2, limit=2))
+        assert ([row["dname"] for row in page.rows], page.total) == (["Kalutara", "Kandy"], 5)
+
+        found = report_views.read(
+            district_summary, "bikkusumm_district_list", ReportViewQuery(search="KA", limit=10)
+        )
+        assert ([row["dcode"] for row in found.rows], found.total) == (["03", "04"], 2)
+        exact = report_views.read(
+            district_summary, "bikkusumm_district_list", ReportViewQuery(filters={"totalbikku": "30"})
+        )
+        assert [row["dname"] for row in exact.rows] == ["Kandy"]
+
+    def test_stream_encodes_csv_in_view_order(self, district_summary):
+        columns = report_views.REPORT_VIEWS["bikkusumm_district_list"].columns
+        rows = report_views.stream("bikkusumm_district_list", ReportViewQuery(search="a"))
+        body = b"".join(csv_chunks(columns, rows)).decode("utf-8")
+        assert body.splitlines() == [
+            "﻿dcode,dname,totalbikku",
+            "02,Gampaha,25", "03,Kalutara,12", "04,Kandy,30", "05,Matale,8",
+        ]
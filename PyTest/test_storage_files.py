@@ -0,0 +1,64 @@
+# PyTest/test_storage_files.py
+"""
+Tests for /storage file serving (app/utils/storage_files.py): content-hash
+ETags, conditional requests, byte ranges and cache headers.
+"""
+import hashlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.utils.storage_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StorageFiles
+
+CONTENT = bytes(range(256)) * 40
+UPLOAD = "bhikku_regist/2025/11/23/BH2025000011/scanned_document_20251123_101500_0a1b2c3d.pdf"
+
+
+@pytest.fixture(scope="function")
+def client(tmp_path):
+    (tmp_path / UPLOAD).parent.mkdir(parents=True)
+    (tmp_path / UPLOAD).write_bytes(CONTENT)
+    (tmp_path / "legacy.pdf").write_bytes(CONTENT)
+    (tmp_path / "_blobs").mkdir()
+    (tmp_path / "_blobs" / "secret").write_bytes(b"blob")
+    (tmp_path / ".upload_x.part").write_bytes(b"partial")
+    app = Starlette(routes=[Mount("/storage", app=StorageFiles(directory=str(tmp_path)))])
+    return TestClient(app)
+
+
+class TestStorageFiles:
+    def test_etag_and_conditional_requests(self, client):
+        response = client.get(f"/storage/{UPLOAD}")
+        etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+        assert response.status_code == 200 and response.content == CONTENT
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["content-type"] == "application/pdf"
+
+        legacy = client.get("/storage/legacy.pdf")
+        assert legacy.headers["etag"] == etag
+        assert legacy.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+        not_modified = client.get("/storage/legacy.pdf", headers={"If-None-Match": f'"other", {etag}'})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+
+    def test_byte_ranges(self, client):
+        partial = client.get(f"/storage/{UPLOAD}", headers={"Range": "bytes=100-199"})
+        assert partial.status_code == 206 and partial.content == CONTENT[100:200]
+        assert partial.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+
+        tail = client.get(f"/storage/{UPLOAD}", headers={"Range": "bytes=-10"})
+        assert tail.status_code == 206 and tail.content == CONTENT[-10:]
+
+        stale = client.get(f"/storage/{UPLOAD}", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert stale.status_code == 200 and stale.content == CONTENT
+
+        beyond = client.get(f"/storage/{UPLOAD}", headers={"Range": f"bytes={len(CONTENT)}-"})
+        assert beyond.status_code == 416 and beyond.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    def test_hidden_paths(self, client):
+        for path in ("/storage/_blobs/secret", "/storage/.upload_x.part", "/storage/%2e%2e/etc/passwd", "/storage/x.pdf"):
+            assert client.get(path).status_code == 404
+        assert client.post("/storage/legacy.pdf").status_code == 405
@@ -0,0 +1,75 @@
+# PyTest/test_storage_gc.py
+"""
+Tests for the storage garbage collector and usage report (app/utils/storage_gc.py).
+"""
+import asyncio
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.file_storage import FileStorageService
+from app.utils.storage_gc import FOREIGN, KEPT, REFERENCED, UNREFERENCED, collect_garbage
+
+
+@pytest.fixture(scope="function")
+def storage(tmp_path):
+    return FileStorageService(base_storage_path=str(tmp_path))
+
+
+def _store(storage, content: bytes, file_type: str, subdirectory: str):
+    upload = UploadFile(file=io.BytesIO(content), filename="scan.jpg")
+    return asyncio.run(storage.store_file(upload, "BH2025000001", file_type, subdirectory))
+
+
+class TestStorageGC:
+    def test_reports_and_deletes_unreferenced_files(self, storage, tmp_path):
+        live = _store(storage, b"document", "scanned_document", "bhikku_regist")
+        replaced = _store(storage, b"old document", "scanned_document", "bhikku_regist")
+        shared = _store(storage, b"document", "scanned_document", "vihara_data")
+        signature = _store(storage, b"signature", "signature", "bhikku_id")
+        archived = tmp_path / "vihara_data" / "scanned_document_20250101_120000_0123abcd_v1.pdf"
+        archived.write_bytes(b"archived")
+        thumbnail = tmp_path / "_derivatives" / "thumb" / (replaced.relative_path[len("/storage/"):] + ".webp")
+        thumbnail.parent.mkdir(parents=True)
+        thumbnail.write_bytes(b"thumb")
+        references = {live.relative_path[len("/storage/"):], "bhikku_regist/gone.pdf"}
+
+        report = collect_garbage(storage, references, grace_seconds=3600)
+        assert report.entities["bhikku_regist"][REFERENCED].files == 1
+        assert report.entities["bhikku_regist"][UNREFERENCED].files == 1
+        assert report.entities["bhikku_id"][KEPT].files == 1
+        assert report.entities["vihara_data"][KEPT].files == 1
+        assert report.entities["vihara_data"][UNREFERENCED].files == 1
+        assert report.entities["_derivatives"][REFERENCED].files == 1
+        assert report.missing == ["bhikku_regist/gone.pdf"]
+        assert report.recent.files == 2 and report.deleted.files == 0
+
+        # Everything is "old" against a grace period reaching into the future
+        report = collect_garbage(storage, references, delete=True, grace_seconds=-3600)
+        assert report.deleted.files == 3
+        assert not os.path.exists(replaced.absolute_path) and not os.path.exists(shared.absolute_path)
+        assert not thumbnail.exists() and not thumbnail.parent.parent.exists()
+        assert os.path.exists(live.absolute_path) and os.path.exists(signature.absolute_path) and archived.exists()
+        # "old document" lost its last reference; "document" is still linked from the live path
+        assert report.pruned_blobs.files == 1
+        assert storage.blobs.refcount(live.sha256) == 1
+
+    def test_never_deletes_foreign_files(self, storage, tmp_path):
+        # The default STORAGE_DIR (app/storage) is also a Python package
+        module = tmp_path / "local.py"
+        module.write_text("x = 1\n")
+        cache = tmp_path / "__pycache__" / "local.cpython-311.pyc"
+        cache.parent.mkdir()
+        cache.write_bytes(b"pyc")
+        stale = _store(storage, b"document", "scanned_document", "bhikku_regist")
+        interrupted = tmp_path / "bhikku_regist" / ".upload_abc123.part"
+        interrupted.write_bytes(b"partial")
+
+        report = collect_garbage(storage, set(), delete=True, grace_seconds=-3600)
+        assert report.entities["(no subdirectory)"][FOREIGN].files == 1
+        assert report.entities["__pycache__"][FOREIGN].files == 1
+        assert report.deleted.files == 2
+        assert module.exists() and cache.exists()
+        assert not os.path.exists(stale.absolute_path) and not interrupted.exists()
@@ -0,0 +1,158 @@
+# PyTest/test_user_activity_rollup.py
+"""
+Tests for the incremental user-activity rollups (app/services/user_activity_rollup.py):
+late audit_log ids below the high-water mark, settling of open login
+sessions, and report reads split between rollup days and raw rows.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.models.user import LoginHistory
+from app.models.user_activity_rollup import ActivityRollupState, UserActivityDaily, UserLoginDaily
+from app.services import user_activity_rollup as rollup
+
+
+# audit_log's PostgreSQL-only column types, for the in-memory SQLite database
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+DAY = date(2026, 10, 15)
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+@pytest.fixture(scope="function")
+def db(sqlite_engine, monkeypatch):
+    # SQLite cannot autoincrement a composite primary key; the tests set al_id themselves
+    monkeypatch.setattr(AuditLog.__table__.c.al_id, "autoincrement", False)
+    engine = sqlite_engine(AuditLog, LoginHistory, UserActivityDaily, UserLoginDaily, ActivityRollupState)
+    session = Session(engine)
+    yield session
+    session.close()
+
+
+def _audit(db, al_id, timestamp, table="vihaddata", operation="UPDATE"):
+    db.add(AuditLog(
+        al_id=al_id, al_timestamp=timestamp, al_table_name=table, al_record_id=str(al_id),
+        al_operation=operation, al_user_id="U1",
+    ))
+    db.commit()
+
+
+def _login(db, lh_id, login, logout=None):
+    db.add(LoginHistory(
+        lh_id=lh_id, lh_user_id="U1", lh_session_id=f"S{lh_id}", lh_login_time=login,
+        lh_logout_time=logout, lh_success=True,
+    ))
+    db.commit()
+
+
+def _rolled_up_count(db):
+    return db.execute(select(func.coalesce(func.sum(UserActivityDaily.uad_count), 0))).scalar()
+
+
+def _login_day(db):
+    return db.execute(select(UserLoginDaily.uld_sessions, UserLoginDaily.uld_working_seconds)).first()
+
+
+class TestAuditRollup:
+    def test_late_id_below_the_mark_is_folded_once(self, db):
+        for al_id in (1, 2, 4):
+            _audit(db, al_id, _at(DAY, 10))
+        rollup.refresh_audit_rollup(db, now=_at(DAY, 11))
+        assert _rolled_up_count(db) == 3
+        assert rollup.get_state(db, rollup.AUDIT_SOURCE)[0] == 4
+        assert rollup._pending_ids(db, rollup.AUDIT_SOURCE) == [3]
+
+        # Id 3's transaction commits after the run that moved the mark past it
+        _audit(db, 3, _at(DAY, 10))
+        _audit(db, 5, _at(DAY, 10, 30))
+        rollup.refresh_audit_rollup(db, now=_at(DAY, 12))
+        rollup.refresh_audit_rollup(db, now=_at(DAY, 13))
+
+        assert _rolled_up_count(db) == 5
+        assert rollup._pending_ids(db, rollup.AUDIT_SOURCE) == []
+
+    def test_request_rows_are_not_record_activity(self, db):
+        _audit(db, 1, _at(DAY, 10), table="__api_call__", operation="READ")
+        _audit(db, 2, _at(DAY, 10))
+        rollup.refresh_audit_rollup(db, now=_at(DAY, 11))
+        assert _rolled_up_count(db) == 1
+
+
+class TestLoginRollup:
+    def test_open_session_waits_for_logout(self, db):
+        _login(db, 1, _at(DAY, 8), _at(DAY, 9))
+        _login(db, 2, _at(DAY, 10))
+        _login(db, 3, _at(DAY, 11), _at(DAY, 12))
+
+        rollup.refresh_login_rollup(db, now=_at(DAY, 13))
+        assert _login_day(db) == (1, 3600)
+        last_id, complete_until = rollup.get_state(db, rollup.LOGIN_SOURCE)
+        assert (last_id, complete_until) == (1, _at(DAY, 10))
+
+        db.get(LoginHistory, 2).lh_logout_time = _at(DAY, 14)
+        db.commit()
+        rollup.refresh_login_rollup(db, now=_at(DAY, 15))
+        assert _login_day(db) == (3, 3600 + 4 * 3600 + 3600)
+        assert rollup.get_state(db, rollup.LOGIN_SOURCE)[0] == 3
+
+    def test_open_session_is_folded_after_the_settle_period(self, db, monkeypatch):
+        monkeypatch.setattr(rollup.settings, "ACTIVITY_ROLLUP_LOGIN_SETTLE_HOURS", 24)
+        _login(db, 1, _at(DAY, 10))
+
+        rollup.refresh_login_rollup(db, now=_at(DAY + timedelta(days=1), 9))
+        assert _login_day(db) is None
+
+        rollup.refresh_login_rollup(db, now=_at(DAY + timedelta(days=1), 11))
+        assert _login_day(db) == (1, 0)
+
+
+class TestReportSplit:
+    def test_rollup_days_plus_raw_rows_match_raw_counts(self, db):
+        yesterday = DAY - timedelta(days=1)
+        _audit(db, 1, _at(yesterday, 9))
+        _audit(db, 2, _at(yesterday, 23, 50), operation="CREATE")
+        _audit(db, 3, _at(DAY, 8))
+        _login(db, 1, _at(yesterday, 9), _at(yesterday, 17))
+        _login(db, 2, _at(DAY, 8), _at(DAY, 9))
+        rollup.refresh_rollups(db, now=_at(DAY, 10))
+        # After the run: raw rows only, on both sides of the complete_until day
+        _audit(db, 4, _at(DAY, 11))
+        _audit(db, 5, _at(DAY + timedelta(days=1), 9))
+        _login(db, 3, _at(DAY, 11), _at(DAY, 12))
+        assert rollup.get_state(db, rollup.AUDIT_SOURCE)[1].date() == DAY
+
+        ranges = [(None, None), (yesterday, DAY), (DAY, DAY), (yesterday, yesterday), (DAY, None)]
+        split = [
+            (
+                sorted(rollup.get_record_counts(db, ["U1"], ["vihaddata"], date_from, date_to)),
+                rollup.get_login_totals(db, ["U1"], date_from, date_to),
+            )
+            for date_from, date_to in ranges
+        ]
+
+        # Without rollup state the report reads raw rows only
+        db.execute(delete(ActivityRollupState))
+        db.commit()
+        raw = [
+            (
+                sorted(rollup.get_record_counts(db, ["U1"], ["vihaddata"], date_from, date_to)),
+                rollup.get_login_totals(db, ["U1"], date_from, date_to),
+            )
+            for date_from, date_to in ranges
+        ]
+        assert split == raw
+        assert split[1][0] == [("U1", "vihaddata", "CREATE", 1), ("U1", "vihaddata", "UPDATE", 3)]
+        assert split[1][1]["U1"].total_sessions == 3
@@ -0,0 +1,126 @@
+"""Partition audit_log by month on al_timestamp
+
+Recreates audit_log as a RANGE-partitioned table (one partition per
+calendar month plus a DEFAULT partition), copies the existing rows and
+adds partitioned indexes on al_timestamp, (al_user_id, al_timestamp) and
+(al_table_name, al_timestamp) so date-range reports only scan the months
+they need. New months are created ahead of time by
+app/utils/audit_log_maintenance.py, which also applies retention.
+
+The primary key becomes (al_id, al_timestamp) because PostgreSQL requires
+the partition key in every unique constraint.
+
+Revision ID: 20261016000001
+Revises: 20260302000004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000001"
+down_revision = "20260302000004"
+branch_labels = None
+depends_on = None
+
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "al_id, al_table_name, al_record_id, al_operation, al_old_values, al_new_values, "
+    "al_changed_fields, al_user_id, al_session_id, al_ip_address, al_user_agent, "
+    "al_timestamp, al_transaction_id"
+)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_unpartitioned")
+    op.execute("ALTER TABLE audit_log_unpartitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_unpartitioned_pkey")
+    # Keep the existing id sequence so al_id values continue without gaps or reuse
+    op.execute("ALTER SEQUENCE audit_log_al_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            al_id BIGINT NOT NULL DEFAULT nextval('audit_log_al_id_seq'),
+            al_table_name VARCHAR(50) NOT NULL,
+            al_record_id VARCHAR(50) NOT NULL,
+            al_operation VARCHAR(10) NOT NULL,
+            al_old_values JSONB,
+            al_new_values JSONB,
+            al_changed_fields VARCHAR[],
+            al_user_id VARCHAR(10) REFERENCES user_accounts (ua_user_id) ON DELETE RESTRICT,
+            al_session_id VARCHAR(100),
+            al_ip_address VARCHAR(45),
+            al_user_agent VARCHAR(500),
+            al_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+            al_transaction_id VARCHAR(100),
+            CONSTRAINT audit_log_pkey PRIMARY KEY (al_id, al_timestamp)
+        ) PARTITION BY RANGE (al_timestamp)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_log_al_id_seq OWNED BY audit_log.al_id")
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+    # One partition per month from the oldest existing row to MONTHS_AHEAD months out
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start DATE;
+            last_month DATE := date_trunc('month', now() + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            SELECT COALESCE(date_trunc('month', min(al_timestamp))::date, date_trunc('month', now())::date)
+              INTO month_start
+              FROM audit_log_unpartitioned;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+                    'audit_log_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    # Partitioned indexes cascade to every current and future partition
+    op.execute("CREATE INDEX ix_audit_log_timestamp ON audit_log (al_timestamp)")
+    op.execute("CREATE INDEX ix_audit_log_user_timestamp ON audit_log (al_user_id, al_timestamp)")
+    op.execute("CREATE INDEX ix_audit_log_table_timestamp ON audit_log (al_table_name, al_timestamp)")
+
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_unpartitioned")
+    op.execute("DROP TABLE audit_log_unpartitioned")
+    op.execute("ANALYZE audit_log")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute("ALTER TABLE audit_log_partitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_partitioned_pkey")
+    op.execute("ALTER SEQUENCE audit_log_al_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            al_id BIGINT NOT NULL DEFAULT nextval('audit_log_al_id_seq'),
+            al_table_name VARCHAR(50) NOT NULL,
+            al_record_id VARCHAR(50) NOT NULL,
+            al_operation VARCHAR(10) NOT NULL,
+            al_old_values JSONB,
+            al_new_values JSONB,
+            al_changed_fields VARCHAR[],
+            al_user_id VARCHAR(10) REFERENCES user_accounts (ua_user_id) ON DELETE RESTRICT,
+            al_session_id VARCHAR(100),
+            al_ip_address VARCHAR(45),
+            al_user_agent VARCHAR(500),
+            al_timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+            al_transaction_id VARCHAR(100),
+            CONSTRAINT audit_log_pkey PRIMARY KEY (al_id)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_log_al_id_seq OWNED BY audit_log.al_id")
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_partitioned")
+    op.execute("DROP TABLE audit_log_partitioned CASCADE")
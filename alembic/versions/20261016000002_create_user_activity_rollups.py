@@ -0,0 +1,63 @@
+"""Create daily user-activity rollup tables
+
+user_activity_daily and user_login_daily hold per-user, per-day aggregates
+of audit_log and login_history; activity_rollup_state keeps the al_id /
+lh_id high-water marks used by app/utils/refresh_activity_rollup.py, and
+the al_ids below the mark that were still in flight.
+
+Revision ID: 20261016000002
+Revises: 20261016000001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000002"
+down_revision = "20261016000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_activity_daily",
+        sa.Column("uad_user_id", sa.String(10), primary_key=True),
+        sa.Column("uad_day", sa.Date, primary_key=True),
+        sa.Column("uad_table_name", sa.String(50), primary_key=True),
+        sa.Column("uad_operation", sa.String(10), primary_key=True),
+        sa.Column("uad_count", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+    )
+    op.create_table(
+        "user_login_daily",
+        sa.Column("uld_user_id", sa.String(20), primary_key=True),
+        sa.Column("uld_day", sa.Date, primary_key=True),
+        sa.Column("uld_sessions", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("uld_working_seconds", sa.Numeric(14, 2), nullable=False, server_default=sa.text("0")),
+        sa.Column("uld_first_login", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("uld_last_login", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "activity_rollup_state",
+        sa.Column("ars_source", sa.String(30), primary_key=True),
+        sa.Column("ars_last_id", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("ars_complete_until", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("ars_pending_ids", sa.JSON, nullable=True),
+        sa.Column("ars_updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+    # High-water mark scans on login_history walk lh_id with the success/logout filters
+    op.create_index(
+        "ix_login_history_open_sessions",
+        "login_history",
+        ["lh_id"],
+        postgresql_where=sa.text("lh_success AND lh_logout_time IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_login_history_open_sessions", table_name="login_history")
+    op.drop_table("activity_rollup_state")
+    op.drop_table("user_login_daily")
+    op.drop_table("user_activity_daily")
@@ -0,0 +1,73 @@
+"""Create bhikku_search side table with trigram and full-text indexes
+
+Holds one search document per bhikku_regist row (searchable bhikku columns
+plus living/mahana temple name and address, joined with a unit separator).
+bs_document carries a pg_trgm GIN index for substring ILIKE, bs_tsv a GIN
+full-text index used for ranking. Existing rows are backfilled here; the
+application keeps documents in sync on flush (app/services/bhikku_search.py).
+
+Revision ID: 20261016000003
+Revises: 20261016000002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000003"
+down_revision = "20261016000002"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = (
+    "br_regn", "br_upasampada_serial_no", "br_gihiname", "br_fathrname", "br_mahananame",
+    "br_birthpls", "br_province", "br_district", "br_korale", "br_pattu", "br_division",
+    "br_vilage", "br_gndiv", "br_mobile", "br_email", "br_fathrsaddrs", "br_fathrsmobile",
+    "br_parshawaya", "br_livtemple", "br_mahanatemple", "br_mahanaacharyacd", "br_currstat",
+    "br_cat",
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "bhikku_search",
+        sa.Column(
+            "bs_br_id",
+            sa.Integer,
+            sa.ForeignKey("bhikku_regist.br_id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("bs_document", sa.Text, nullable=False),
+        sa.Column(
+            "bs_tsv",
+            postgresql.TSVECTOR,
+            sa.Computed("to_tsvector('simple', bs_document)", persisted=True),
+        ),
+        sa.Column("bs_updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+
+    bhikku_fields = ", ".join(f"b.{col}" for col in SEARCH_COLUMNS)
+    op.execute(
+        f"""
+        INSERT INTO bhikku_search (bs_br_id, bs_document)
+        SELECT b.br_id,
+               concat_ws(E'\\x1f', {bhikku_fields},
+                         lv.vh_vname, lv.vh_addrs, mv.vh_vname, mv.vh_addrs)
+        FROM bhikku_regist b
+        LEFT JOIN vihaddata lv ON lv.vh_trn = b.br_livtemple
+        LEFT JOIN vihaddata mv ON mv.vh_trn = b.br_mahanatemple
+        """
+    )
+
+    op.execute("CREATE INDEX ix_bhikku_search_document_trgm ON bhikku_search USING gin (bs_document gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_bhikku_search_tsv ON bhikku_search USING gin (bs_tsv)")
+    op.execute("ANALYZE bhikku_search")
+
+
+def downgrade() -> None:
+    op.drop_table("bhikku_search")
@@ -0,0 +1,125 @@
+"""Create temp_reference for references to temporary bhikku / vihara records
+
+Fields of bhikku_regist, bhikku_high_regist and direct_bhikku_high that point
+at a temporary record were kept as [TEMP_<PREFIX>_<FIELD>:<id>] markers in
+the remarks column and regex-parsed on every read. They become one
+temp_reference row per (entity, entity id, field). Existing markers are
+backfilled (the first marker per field wins, as on read) and removed from
+the remarks; downgrade writes them back.
+
+Revision ID: 20261016000004
+Revises: 20261016000003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000004"
+down_revision = "20261016000003"
+branch_labels = None
+depends_on = None
+
+
+TEMP_BHIKKU_TAGS = (
+    "CANDIDATE_REGN", "KARMACHARYA_NAME", "UPADDHYAYA_NAME", "TUTORS_TUTOR_REGN",
+    "PRESIDING_BHIKSHU_REGN", "SAMANERA_SERIAL_NO",
+)
+TEMP_VIHARA_TAGS = (
+    "LIVTEMPLE", "RESIDENCE_HIGHER_ORDINATION_TRN", "RESIDENCE_PERMANENT_TRN", "HIGHER_ORDINATION_PLACE",
+)
+
+# (tr_entity, table, id column, remarks column, marker prefix, {tag: temp kind})
+SOURCES = (
+    (
+        "bhikku", "bhikku_regist", "br_id", "br_remarks", "BR",
+        {
+            "VIHARADHIPATHI": "bhikku", "MAHANAACHARYACD": "bhikku",
+            "LIVTEMPLE": "vihara", "MAHANATEMPLE": "vihara",
+            "ROBING_TUTOR_RESIDENCE": "vihara", "ROBING_AFTER_RESIDENCE_TEMPLE": "vihara",
+        },
+    ),
+    (
+        "bhikku_high", "bhikku_high_regist", "bhr_id", "bhr_remarks", "BHR",
+        {**{tag: "bhikku" for tag in TEMP_BHIKKU_TAGS}, **{tag: "vihara" for tag in TEMP_VIHARA_TAGS}},
+    ),
+    (
+        "direct_bhikku_high", "direct_bhikku_high", "dbh_id", "dbh_remarks", "DBH",
+        {
+            **{tag: "bhikku" for tag in TEMP_BHIKKU_TAGS if tag != "CANDIDATE_REGN"},
+            **{tag: "vihara" for tag in TEMP_VIHARA_TAGS},
+        },
+    ),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "temp_reference",
+        sa.Column("tr_id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("tr_entity", sa.String(30), nullable=False),
+        sa.Column("tr_entity_id", sa.Integer, nullable=False),
+        sa.Column("tr_field", sa.String(60), nullable=False),
+        sa.Column("tr_temp_kind", sa.String(10), nullable=False),
+        sa.Column("tr_temp_id", sa.Integer, nullable=False),
+        sa.Column("tr_created_at", sa.TIMESTAMP, server_default=sa.func.now(), nullable=False),
+        sa.Column("tr_updated_at", sa.TIMESTAMP, nullable=True),
+        sa.UniqueConstraint("tr_entity", "tr_entity_id", "tr_field", name="uq_temp_reference_entity_field"),
+    )
+    op.create_index("ix_temp_reference_temp", "temp_reference", ["tr_temp_kind", "tr_temp_id"])
+
+    for entity, table, id_column, remarks_column, prefix, tags in SOURCES:
+        marker = rf"\[TEMP_{prefix}_([A-Z_]+):(\d+)\]"
+        fields = ", ".join(
+            f"('{tag}', '{prefix.lower()}_{tag.lower()}', '{kind}')" for tag, kind in tags.items()
+        )
+        op.execute(
+            f"""
+            INSERT INTO temp_reference (tr_entity, tr_entity_id, tr_field, tr_temp_kind, tr_temp_id)
+            SELECT DISTINCT ON (s.{id_column}, f.field)
+                   '{entity}', s.{id_column}, f.field, f.kind, m.match[2]::integer
+            FROM {table} s
+            CROSS JOIN LATERAL regexp_matches(s.{remarks_column}, '{marker}', 'g')
+                 WITH ORDINALITY AS m(match, n)
+            JOIN (VALUES {fields}) AS f(tag, field, kind) ON f.tag = m.match[1]
+            WHERE s.{remarks_column} LIKE '%TEMP_{prefix}_%'
+              AND length(m.match[2]) <= 9
+            ORDER BY s.{id_column}, f.field, m.n
+            """
+        )
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET {remarks_column} = regexp_replace(
+                    regexp_replace({remarks_column}, '\\[TEMP_{prefix}_[A-Z_]+:\\d+\\]', '', 'g'),
+                    '^\\s+|\\s+$', '', 'g')
+            WHERE {remarks_column} ~ '\\[TEMP_{prefix}_[A-Z_]+:\\d+\\]'
+            """
+        )
+
+    op.execute("ANALYZE temp_reference")
+
+
+def downgrade() -> None:
+    for entity, table, id_column, remarks_column, prefix, _ in SOURCES:
+        op.execute(
+            f"""
+            UPDATE {table} s
+            SET {remarks_column} = concat_ws(' ', NULLIF(s.{remarks_column}, ''), r.markers)
+            FROM (
+                SELECT tr_entity_id,
+                       string_agg(
+                           format('[TEMP_{prefix}_%s:%s]', upper(substr(tr_field, {len(prefix) + 2})), tr_temp_id),
+                           ' ' ORDER BY tr_id
+                       ) AS markers
+                FROM temp_reference
+                WHERE tr_entity = '{entity}'
+                GROUP BY tr_entity_id
+            ) r
+            WHERE s.{id_column} = r.tr_entity_id
+            """
+        )
+    op.drop_index("ix_temp_reference_temp", table_name="temp_reference")
+    op.drop_table("temp_reference")
@@ -0,0 +1,110 @@
+"""Create registration_index for QR lookup and reprint search
+
+One row per bhikku, silmatha, high bhikku, direct high bhikku, vihara,
+arama and devala registration: regn / trn, entity type, primary key,
+display name, searchable names (joined with a unit separator), date of
+birth, workflow status and deleted flag. ri_regn carries a btree index for
+exact lookups and ordering and, like ri_names, a pg_trgm GIN index for
+substring ILIKE. Existing rows are backfilled here; the application keeps
+the index in sync on flush (app/services/registration_index.py).
+
+Revision ID: 20261016000005
+Revises: 20261016000004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000005"
+down_revision = "20261016000004"
+branch_labels = None
+depends_on = None
+
+
+def _names(*columns: str) -> str:
+    return " || E'\\x1f' || ".join(f"coalesce({column}, '')" for column in columns)
+
+
+# (entity type, FROM clause, id, regn, display name, names, date of birth, workflow status, deleted)
+SOURCES = (
+    (
+        "bhikku", "bhikku_regist b", "b.br_id", "b.br_regn", "b.br_mahananame",
+        _names("b.br_mahananame", "b.br_gihiname"), "b.br_dofb", "b.br_workflow_status", "b.br_is_deleted",
+    ),
+    (
+        "silmatha", "silmatha_regist s", "s.sil_id", "s.sil_regn", "s.sil_mahananame",
+        _names("s.sil_mahananame", "s.sil_gihiname"), "s.sil_dofb", "s.sil_workflow_status", "s.sil_is_deleted",
+    ),
+    (
+        # Date of birth of the candidate bhikku
+        "high_bhikku",
+        "bhikku_high_regist h LEFT JOIN bhikku_regist b ON b.br_regn = h.bhr_candidate_regn",
+        "h.bhr_id", "h.bhr_regn", "h.bhr_assumed_name",
+        _names("h.bhr_assumed_name"), "b.br_dofb", "h.bhr_workflow_status", "h.bhr_is_deleted",
+    ),
+    (
+        "direct_high_bhikku", "direct_bhikku_high d", "d.dbh_id", "d.dbh_regn",
+        "coalesce(d.dbh_assumed_name, d.dbh_mahananame)",
+        _names("d.dbh_mahananame", "d.dbh_assumed_name", "d.dbh_gihiname"),
+        "d.dbh_dofb", "d.dbh_workflow_status", "d.dbh_is_deleted",
+    ),
+    (
+        "vihara", "vihaddata v", "v.vh_id", "v.vh_trn", "v.vh_vname",
+        _names("v.vh_vname"), "NULL::date", "v.vh_workflow_status", "v.vh_is_deleted",
+    ),
+    (
+        "arama", "aramadata a", "a.ar_id", "a.ar_trn", "a.ar_vname",
+        _names("a.ar_vname"), "NULL::date", "a.ar_workflow_status", "a.ar_is_deleted",
+    ),
+    (
+        "devala", "devaladata d", "d.dv_id", "d.dv_trn", "d.dv_vname",
+        _names("d.dv_vname"), "NULL::date", "d.dv_workflow_status", "d.dv_is_deleted",
+    ),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "registration_index",
+        sa.Column("ri_entity_type", sa.String(30), primary_key=True),
+        sa.Column("ri_entity_id", sa.Integer, primary_key=True),
+        sa.Column("ri_regn", sa.String(20), nullable=False),
+        sa.Column("ri_display_name", sa.String(200), nullable=True),
+        sa.Column("ri_names", sa.Text, nullable=True),
+        sa.Column("ri_dob", sa.Date, nullable=True),
+        sa.Column("ri_workflow_status", sa.String(25), nullable=True),
+        sa.Column("ri_is_deleted", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("ri_updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+
+    for entity_type, source, id_, regn, display_name, names, dob, workflow_status, deleted in SOURCES:
+        op.execute(
+            f"""
+            INSERT INTO registration_index (
+                ri_entity_type, ri_entity_id, ri_regn, ri_display_name,
+                ri_names, ri_dob, ri_workflow_status, ri_is_deleted
+            )
+            SELECT '{entity_type}', {id_}, {regn}, {display_name},
+                   {names}, {dob}, {workflow_status}, coalesce({deleted}, false)
+            FROM {source}
+            """
+        )
+
+    op.create_index(
+        "ix_registration_index_regn", "registration_index", ["ri_regn", "ri_entity_type", "ri_entity_id"]
+    )
+    op.execute(
+        "CREATE INDEX ix_registration_index_regn_trgm ON registration_index USING gin (ri_regn gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_registration_index_names_trgm ON registration_index USING gin (ri_names gin_trgm_ops)"
+    )
+    op.execute("ANALYZE registration_index")
+
+
+def downgrade() -> None:
+    op.drop_table("registration_index")
@@ -0,0 +1,125 @@
+"""Materialize the heavy bikkudtls_* / bikkusumm_* report views
+
+Each view in app/services/report_views.py REPORT_VIEWS gets a materialized
+copy mv_<view> with a unique index so it can be refreshed CONCURRENTLY: on
+the view's natural key (regn, dcode, ...) where it has one, so a refresh
+only rewrites the rows that changed; otherwise on mv_row, a row number in a
+fixed column order.
+report_view_state holds the refresh time of each copy ("as_of") and
+report_view_dirty_mark the source tables written since the last refresh.
+
+The copies select from the existing views, so view definitions stay where
+they are. Column lists are pinned here rather than imported so later edits
+to the service do not rewrite this revision.
+
+Revision ID: 20261016000006
+Revises: 20261016000005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20261016000006"
+down_revision = "20261016000005"
+branch_labels = None
+depends_on = None
+
+
+# (view, columns, natural unique key, leading mv_row order columns when there is no key)
+VIEWS = (
+    (
+        "bikkudtls_bikkullist",
+        (
+            "regn", "birthpls", "gihiname", "dofb", "fathrname", "mahanadate",
+            "mahananame", "teacher", "teachadrs", "mhanavh", "livetemple",
+            "viharadipathi", "pname", "nname", "nikayanayaka", "effctdate",
+            "curstatus", "catogry", "vadescrdtls",
+        ),
+        ("regn",),
+        (),
+    ),
+    (
+        "bikkudtls_certification_data",
+        (
+            "regno", "mahananame", "issuedate", "reqstdate", "adminautho",
+            "prtoptn", "paydate", "payamount", "usname", "adminusr",
+        ),
+        (),
+        ("regno",),
+    ),
+    (
+        "bikkudtls_certification_printnow",
+        (
+            "regno", "mahananame", "issuedate", "reqstdate", "adminautho",
+            "prtoptn", "paydate", "payamount", "usname", "adminusr",
+        ),
+        (),
+        ("regno",),
+    ),
+    ("bikkudtls_histtystatus_list", ("descr", "prvdate", "chngdate", "regno"), (), ("regno", "chngdate")),
+    (
+        "bikkudtls_id_alllist",
+        (
+            "idn", "stat", "reqstdate", "printdate", "issuedate", "mahanaacharyacd",
+            "archadrs", "achambl", "achamhndate", "acharegdt", "mahananame", "vname",
+            "addrs", "regn", "dofb", "mahanadate", "gihiname", "fathrdetails",
+        ),
+        ("regn", "idn"),
+        (),
+    ),
+    ("bikkudtls_statushystry_composit", ("regno", "vadescrdtls"), (), ("regno",)),
+    ("bikkudtls_statushystry_list", ("regno", "prvdate", "chngdate", "descr"), (), ("regno", "chngdate")),
+    ("bikkudtls_statushystry_list2", ("regno", "statchgdescr"), (), ("regno",)),
+    ("bikkusumm_currstatus_list", ("statcd", "descr", "statcnt"), ("statcd",), ()),
+    ("bikkusumm_district_list", ("dcode", "dname", "totalbikku"), ("dcode",), ()),
+    ("bikkusumm_gn_list", ("gnc", "gnname", "bikkucnt"), ("gnc",), ()),
+    ("bikkusumm_iddistrict_list", ("dcode", "dname", "idcnt"), ("dcode",), ()),
+    # GN division names repeat across divisions
+    ("bikkusumm_idgn_list", ("gnname", "idcnt"), (), ("gnname",)),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_view_state",
+        sa.Column("rvs_view", sa.String(60), primary_key=True),
+        sa.Column("rvs_refreshed_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("rvs_refresh_ms", sa.Integer, nullable=True),
+        sa.Column("rvs_updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "report_view_dirty_mark",
+        sa.Column("rvd_id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("rvd_table", sa.String(63), nullable=False),
+        sa.Column("rvd_marked_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    for view, columns, key, order in VIEWS:
+        if key:
+            op.execute(f"CREATE MATERIALIZED VIEW mv_{view} AS SELECT {', '.join(columns)} FROM {view} WITH DATA")
+            op.execute(f"CREATE UNIQUE INDEX ux_mv_{view}_key ON mv_{view} ({', '.join(key)})")
+        else:
+            row_order = order + tuple(c for c in columns if c not in order)
+            op.execute(
+                f"""
+                CREATE MATERIALIZED VIEW mv_{view} AS
+                SELECT row_number() OVER (ORDER BY {", ".join(f"{c} NULLS LAST" for c in row_order)}) AS mv_row,
+                       {", ".join(columns)}
+                FROM {view}
+                WITH DATA
+                """
+            )
+            op.execute(f"CREATE UNIQUE INDEX ux_mv_{view}_row ON mv_{view} (mv_row)")
+        op.execute(
+            f"INSERT INTO report_view_state (rvs_view, rvs_refreshed_at) VALUES ('{view}', now())"
+        )
+
+
+def downgrade() -> None:
+    for view, *_ in VIEWS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS mv_{view}")
+    op.drop_table("report_view_dirty_mark")
+    op.drop_table("report_view_state")
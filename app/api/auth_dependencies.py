@@ -4,8 +4,9 @@ Provides permission checking, role checking, and group membership verification.
 """
 from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_
-from typing import List, Optional
+from sqlalchemy import and_, inspect, select, union
+from typing import FrozenSet, List, Optional
+from dataclasses import dataclass
 from datetime import datetime
 
 from app.api.deps import get_db
@@ -18,6 +19,49 @@ from app.models.role_permissions import RolePermission
 from app.models.user_permission import UserPermission
 from app.models.roles import Role
 from app.models.district_branch import DistrictBranch
+from app.services.permission_cache import EffectivePermissions, permission_cache
+
+
+def _effective_permissions_query(user_id: str, current_time: datetime):
+    """
+    Build a single statement resolving a user's effective permission names:
+    (permissions granted by active roles - denied overrides) + granted overrides.
+    """
+    active_overrides = and_(
+        UserPermission.up_user_id == user_id,
+        UserPermission.up_is_active == True,
+        UserPermission.up_expires_date.is_(None) | (UserPermission.up_expires_date > current_time)
+    )
+
+    denied_ids = select(UserPermission.up_permission_id).where(
+        active_overrides,
+        UserPermission.up_granted == False
+    )
+
+    role_granted = select(Permission.pe_name).join(
+        RolePermission,
+        RolePermission.rp_permission_id == Permission.pe_permission_id
+    ).join(
+        UserRole,
+        UserRole.ur_role_id == RolePermission.rp_role_id
+    ).where(
+        UserRole.ur_user_id == user_id,
+        UserRole.ur_is_active == True,
+        UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time),
+        RolePermission.rp_granted == True,
+        Permission.pe_permission_id.not_in(denied_ids)
+    )
+
+    override_granted = select(Permission.pe_name).join(
+        UserPermission,
+        UserPermission.up_permission_id == Permission.pe_permission_id
+    ).where(
+        active_overrides,
+        UserPermission.up_granted == True
+    )
+
+    # UNION also de-duplicates permissions granted by several roles
+    return union(role_granted, override_granted)
 
 
 def get_user_permissions(db: Session, user: UserAccount) -> List[str]:
@@ -25,60 +69,11 @@ def get_user_permissions(db: Session, user: UserAccount) -> List[str]:
     Get all effective permissions for a user.
     Combines:
     1. Permissions from active, non-expired roles
-    2. User-specific permission overrides
+    2. User-specific permission overrides (deny removes, grant adds)
+    Resolved in a single round trip.
     """
-    current_time = datetime.utcnow()
-    permissions_set = set()
-    
-    # Get permissions from user's roles
-    user_roles = db.query(UserRole).filter(
-        and_(
-            UserRole.ur_user_id == user.ua_user_id,
-            UserRole.ur_is_active == True,
-            UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time)
-        )
-    ).all()
-    
-    for user_role in user_roles:
-        # Get permissions for this role
-        role_permissions = db.query(Permission).join(
-            RolePermission,
-            RolePermission.rp_permission_id == Permission.pe_permission_id
-        ).filter(
-            and_(
-                RolePermission.rp_role_id == user_role.ur_role_id,
-                RolePermission.rp_granted == True
-            )
-        ).all()
-        
-        for perm in role_permissions:
-            permissions_set.add(perm.pe_name)
-    
-    # Apply user-specific permission overrides
-    user_permissions = db.query(UserPermission).join(
-        Permission,
-        Permission.pe_permission_id == UserPermission.up_permission_id
-    ).filter(
-        and_(
-            UserPermission.up_user_id == user.ua_user_id,
-            UserPermission.up_is_active == True,
-            UserPermission.up_expires_date.is_(None) | (UserPermission.up_expires_date > current_time)
-        )
-    ).all()
-    
-    for user_perm in user_permissions:
-        perm_name = db.query(Permission.pe_name).filter(
-            Permission.pe_permission_id == user_perm.up_permission_id
-        ).scalar()
-        
-        if user_perm.up_granted:
-            # Grant permission (add it)
-            permissions_set.add(perm_name)
-        else:
-            # Deny permission (remove it)
-            permissions_set.discard(perm_name)
-    
-    return list(permissions_set)
+    query = _effective_permissions_query(user.ua_user_id, datetime.utcnow())
+    return list(db.execute(query).scalars().all())
 
 
 def is_super_admin(db: Session, user: UserAccount) -> bool:
@@ -100,6 +95,118 @@ def is_super_admin(db: Session, user: UserAccount) -> bool:
     return super_admin_role is not None
 
 
+def get_effective_permissions(db: Session, user: UserAccount) -> EffectivePermissions:
+    """
+    Get the user's compiled permissions, active role ids and SUPER_ADMIN flag.
+    Served from the per-user permission cache; resolved from the database
+    and cached on a miss.
+    """
+    cached = permission_cache.get(user.ua_user_id)
+    if cached is not None:
+        return cached
+
+    current_time = datetime.utcnow()
+    active_roles = db.query(UserRole.ur_role_id, Role.ro_level).join(
+        Role,
+        Role.ro_role_id == UserRole.ur_role_id
+    ).filter(
+        and_(
+            UserRole.ur_user_id == user.ua_user_id,
+            UserRole.ur_is_active == True,
+            UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time)
+        )
+    ).all()
+
+    return permission_cache.set(
+        user.ua_user_id,
+        permissions=frozenset(get_user_permissions(db, user)),
+        is_super_admin=any(level == "SUPER_ADMIN" for _, level in active_roles),
+        role_ids=frozenset(role_id for role_id, _ in active_roles),
+        role_levels=frozenset(level for _, level in active_roles if level),
+    )
+
+
+@dataclass(slots=True)
+class AuthContext:
+    """
+    Everything authorization needs to know about the caller, resolved once per request.
+    Shared by the permission dependencies, route-level checks and the
+    location filters applied in repositories.
+    """
+    user: UserAccount
+    role_ids: FrozenSet[str]
+    # ro_level of each active role (ADMIN, DATA_ENTRY, ...)
+    role_levels: FrozenSet[str]
+    permissions: FrozenSet[str]
+    is_super_admin: bool
+    district_code: Optional[str]
+
+    def allows(self, *permissions: str) -> bool:
+        """True if the user is a super admin or holds any of the given permissions."""
+        return self.is_super_admin or any(perm in self.permissions for perm in permissions)
+
+    def has_role(self, *role_ids: str) -> bool:
+        return any(role_id in self.role_ids for role_id in role_ids)
+
+    def has_role_level(self, *levels: str) -> bool:
+        return any(level in self.role_levels for level in levels)
+
+
+_AUTH_CONTEXT_KEY = "auth_context"
+
+
+def _resolve_district_code(db: Session, user: UserAccount) -> Optional[str]:
+    if user.ua_location_type != "DISTRICT_BRANCH" or not user.ua_district_branch_id:
+        return None
+    # get_current_user eager-loads the branch; only query when it was not loaded
+    if "district_branch" not in inspect(user).unloaded:
+        district_branch = user.district_branch
+    else:
+        district_branch = db.query(DistrictBranch).filter(
+            DistrictBranch.db_id == user.ua_district_branch_id
+        ).first()
+    return district_branch.db_district_code if district_branch else None
+
+
+def resolve_auth_context(db: Session, user: UserAccount) -> AuthContext:
+    """
+    Get the AuthContext for a user.
+    The context is kept on the request-scoped session (db.info), so every
+    dependency, route helper and repository sharing that session reuses it.
+    """
+    context = db.info.get(_AUTH_CONTEXT_KEY)
+    if context is not None and context.user.ua_user_id == user.ua_user_id:
+        return context
+
+    effective = get_effective_permissions(db, user)
+    context = AuthContext(
+        user=user,
+        role_ids=effective.role_ids,
+        role_levels=effective.role_levels,
+        permissions=effective.permissions,
+        is_super_admin=effective.is_super_admin,
+        district_code=_resolve_district_code(db, user),
+    )
+    db.info[_AUTH_CONTEXT_KEY] = context
+    return context
+
+
+def get_auth_context(
+    request: Request,
+    current_user: UserAccount = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> AuthContext:
+    """
+    Dependency returning the per-request AuthContext.
+    Also exposed as request.state.auth_context.
+    """
+    context = getattr(request.state, _AUTH_CONTEXT_KEY, None)
+    if context is None:
+        context = resolve_auth_context(db, current_user)
+        setattr(request.state, _AUTH_CONTEXT_KEY, context)
+    return context
+
+
 def has_permission(permission: str):
     """
     Dependency to check if current user has a specific permission.
@@ -112,18 +219,9 @@ def has_permission(permission: str):
         ):
             ...
     """
-    def permission_checker(
-        current_user: UserAccount = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)):
         # Super admins bypass all permission checks
-        if is_super_admin(db, current_user):
-            return
-        
-        # Get user's permissions
-        user_perms = get_user_permissions(db, current_user)
-        
-        if permission not in user_perms:
+        if not auth.allows(permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required permission: '{permission}'. Please contact your administrator if you need access to this resource."
@@ -143,19 +241,9 @@ def has_any_permission(*permissions: str):
         ):
             ...
     """
-    def permission_checker(
-        current_user: UserAccount = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
-        # Super admins bypass all permission checks
-        if is_super_admin(db, current_user):
-            return
-        
-        # Get user's permissions
-        user_perms = get_user_permissions(db, current_user)
-        
-        # Check if user has any of the required permissions
-        if not any(perm in user_perms for perm in permissions):
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)):
+        # Super admins bypass all permission checks; otherwise require any one of the permissions
+        if not auth.allows(*permissions):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required at least one of: {', '.join(permissions)}. Please contact your administrator."
@@ -175,22 +263,8 @@ def has_role(role_id: str):
         ):
             ...
     """
-    def role_checker(
-        current_user: UserAccount = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ):
-        current_time = datetime.utcnow()
-        
-        user_role = db.query(UserRole).filter(
-            and_(
-                UserRole.ur_user_id == current_user.ua_user_id,
-                UserRole.ur_role_id == role_id,
-                UserRole.ur_is_active == True,
-                UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time)
-            )
-        ).first()
-        
-        if not user_role:
+    def role_checker(auth: AuthContext = Depends(get_auth_context)):
+        if not auth.has_role(role_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required role: '{role_id}'. Please contact your administrator."
@@ -212,10 +286,11 @@ def in_group(group_name: str):
     """
     def group_checker(
         current_user: UserAccount = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_db),
+        auth: AuthContext = Depends(get_auth_context)
     ):
         # Super admins bypass all checks
-        if is_super_admin(db, current_user):
+        if auth.is_super_admin:
             return
         
         current_time = datetime.utcnow()
@@ -249,10 +324,15 @@ def get_user_access_context(db: Session, user: UserAccount) -> dict:
     """
     current_time = datetime.utcnow()
     
-    # Get user's active roles
-    user_roles = db.query(UserRole, Role).join(
+    from app.models.group import Group
+    
+    # Get user's active roles together with their department name
+    user_roles = db.query(UserRole, Role, Group.group_name).join(
         Role,
         Role.ro_role_id == UserRole.ur_role_id
+    ).outerjoin(
+        Group,
+        Group.group_id == Role.ro_department_id
     ).filter(
         and_(
             UserRole.ur_user_id == user.ua_user_id,
@@ -262,15 +342,7 @@ def get_user_access_context(db: Session, user: UserAccount) -> dict:
     ).all()
     
     roles_list = []
-    for user_role, role in user_roles:
-        # Get department info
-        from app.models.group import Group
-        department = None
-        if role.ro_department_id:
-            dept = db.query(Group).filter(Group.group_id == role.ro_department_id).first()
-            if dept:
-                department = dept.group_name
-        
+    for user_role, role, department in user_roles:
         # Calculate days until expiry
         days_until_expiry = None
         if user_role.ur_expires_date:
@@ -288,7 +360,6 @@ def get_user_access_context(db: Session, user: UserAccount) -> dict:
         })
     
     # Get user's active groups
-    from app.models.group import Group
     user_groups = db.query(UserGroup, Group).join(
         Group,
         Group.group_id == UserGroup.group_id
@@ -320,8 +391,8 @@ def get_user_access_context(db: Session, user: UserAccount) -> dict:
                 permission_map[resource] = []
             permission_map[resource].append(action)
     
-    # Check if super admin
-    super_admin = is_super_admin(db, user)
+    # Check if super admin (same active/non-expired role filter as is_super_admin)
+    super_admin = any(role["ro_level"] == "SUPER_ADMIN" for role in roles_list)
     
     # Check if admin (any ADMIN level role)
     is_admin = any(role["ro_level"] == "ADMIN" for role in roles_list)
@@ -349,13 +420,7 @@ def get_user_location_district_code(db: Session, user: UserAccount) -> Optional[
     Get the district code associated with user's location.
     Returns district code if user is assigned to district branch, None for main branch or no assignment.
     """
-    if user.ua_location_type == "DISTRICT_BRANCH" and user.ua_district_branch_id:
-        district_branch = db.query(DistrictBranch).filter(
-            DistrictBranch.db_id == user.ua_district_branch_id
-        ).first()
-        if district_branch:
-            return district_branch.db_district_code
-    return None
+    return resolve_auth_context(db, user).district_code
 
 
 def apply_location_filter_for_workflow(
@@ -390,8 +455,10 @@ def apply_location_filter_for_workflow(
     Workflow stages visible to everyone:
         - COMPLETED
     """
+    auth = resolve_auth_context(db, user)
+    
     # Check if user is super admin - they see everything
-    if is_super_admin(db, user):
+    if auth.is_super_admin:
         return query
     
     # Get the model class from the query
@@ -405,7 +472,7 @@ def apply_location_filter_for_workflow(
     
     # For DISTRICT_BRANCH users, filter ALL workflow stages except COMPLETED by their district
     if user.ua_location_type == "DISTRICT_BRANCH" and user.ua_district_branch_id:
-        user_district_code = get_user_location_district_code(db, user)
+        user_district_code = auth.district_code
         if user_district_code:
             # Apply location filter to all statuses EXCEPT COMPLETED
             # COMPLETED records are visible to everyone
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 from typing import List
@@ -15,6 +15,7 @@ from app.schemas.arama import (
     AramaManagementRequest,
     AramaManagementResponse,
     AramaOut,
+    AramaRequestPayload,
     AramaUpdate,
     ProvinceResponse,
     DistrictResponse,
@@ -25,11 +26,15 @@ from app.schemas.arama import (
     SilmathaResponse,
     SasanarakshakaBalaMandalayaResponse,
 )
+from app.repositories.arama_repo import arama_repo
+from app.services import registration_export
 from app.services.arama_service import arama_service
 from app.services.silmatha_regist_service import silmatha_regist_service
 from app.services.temporary_arama_service import temporary_arama_service
 from app.repositories.silmatha_regist_repo import silmatha_regist_repo
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
+from app.utils.pagination import CursorError
 
 router = APIRouter()  # Tags defined in router.py
 
@@ -103,6 +108,43 @@ def _convert_arama_to_out(arama: AramaData) -> AramaOut:
     return AramaOut(**arama_dict)
 
 
+@router.post("/export", dependencies=[has_permission("arama:read")])
+def export_aramas(
+    payload: AramaRequestPayload,
+    format: str = Query("csv", pattern=registration_export.EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: UserAccount = Depends(get_current_user),
+):
+    """
+    Download every arama matching the READ_ALL filters of `payload` (paging
+    fields are ignored) as CSV or NDJSON, with location, nikaya and parshawa names next to
+    their codes. X-Total-Count carries the number of rows. Temporary
+    arama are not included.
+    """
+    search = payload.search_key.strip() if payload.search_key else None
+    query = arama_repo.list(
+        db,
+        search=search or None,
+        ar_trn=payload.ar_trn,
+        province=payload.province,
+        district=payload.district,
+        divisional_secretariat=payload.divisional_secretariat,
+        gn_division=payload.gn_division,
+        temple=payload.temple,
+        child_temple=payload.child_temple,
+        nikaya=payload.nikaya,
+        parshawaya=payload.parshawaya,
+        category=payload.category,
+        status=payload.status,
+        ar_typ=payload.ar_typ,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        current_user=current_user,
+        unpaged=True,
+    )
+    return registration_export.response("arama", query, format)
+
+
 @router.post("/manage", response_model=AramaManagementResponse, dependencies=[has_any_permission("arama:create", "arama:read", "arama:update", "arama:delete")])
 def manage_arama_records(
     request: AramaManagementRequest,
@@ -119,19 +161,18 @@ def manage_arama_records(
     - DELETE: arama:delete
     - APPROVE, REJECT, MARK_PRINTED, MARK_SCANNED: arama:update
     """
-    from app.api.auth_dependencies import get_user_permissions, is_super_admin
+    from app.api.auth_dependencies import resolve_auth_context
     
     action = request.action
     payload = request.payload
     user_id = current_user.ua_user_id
     
     # Get user permissions
-    user_perms = get_user_permissions(db, current_user)
-    is_admin = is_super_admin(db, current_user)
+    auth = resolve_auth_context(db, current_user)
     
     # Helper function to check permission
     def check_permission(required_perm: str):
-        if not is_admin and required_perm not in user_perms:
+        if not auth.allows(required_perm):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required permission: '{required_perm}'. Please contact your administrator if you need access to this resource."
@@ -219,7 +260,16 @@ def manage_arama_records(
             "current_user": current_user,
         }
 
-        records = arama_service.list_aramas(db, **filters)
+        keyset = payload.use_cursor or bool(payload.cursor)
+        next_cursor = prev_cursor = None
+        try:
+            result = arama_service.list_aramas(db, **filters, keyset=keyset, cursor=payload.cursor)
+        except CursorError as exc:
+            raise validation_error([("payload.cursor", str(exc))]) from exc
+        if keyset:
+            records, next_cursor, prev_cursor = result.items, result.next_cursor, result.prev_cursor
+        else:
+            records = result
         total = arama_service.count_aramas(db, **{k: v for k, v in filters.items() if k not in ["skip", "limit", "current_user"]})
         
         # Convert AramaData objects to AramaOut Pydantic models with nested foreign key objects
@@ -227,7 +277,8 @@ def manage_arama_records(
         
         # Also fetch temporary aramas and include them in results
         # Only apply search filter for temporary aramas (other filters don't apply to them)
-        temp_aramas = temporary_arama_service.list_temporary_aramas(
+        # In cursor mode they are only added to the first page (the one without a prev_cursor).
+        temp_aramas = [] if prev_cursor else temporary_arama_service.list_temporary_aramas(
             db,
             skip=0,  # Get all matching temp aramas
             limit=200,  # Max allowed
@@ -278,8 +329,10 @@ def manage_arama_records(
             message="Arama records retrieved successfully.",
             data=records_list,
             totalRecords=total_with_temp,
-            page=page,
+            page=None if keyset else page,
             limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     if action == CRUDAction.UPDATE:
@@ -550,9 +603,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
         
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -560,9 +612,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        # Reset file pointer for later processing
-        await file.seek(0)
-        
         # Upload the file and update the arama record
         updated_arama = await arama_service.upload_scanned_document(
             db, ar_id=ar_id, file=file, actor_id=username
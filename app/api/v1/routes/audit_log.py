@@ -9,6 +9,8 @@ from app.api.auth_dependencies import has_permission, has_any_permission
 from app.api.deps import get_db
 from app.models.user import UserAccount
 from app.repositories.audit_log_repo import audit_log_repo
+from app.services.audit_policy import audit_policy
+from app.services.audit_writer import audit_log_writer
 from app.schemas.audit_log import (
     AuditLogManagementRequest,
     AuditLogManagementResponse,
@@ -28,6 +30,22 @@ def _is_system_user(user: UserAccount) -> bool:
         return False
 
 
+@router.get("/metrics", dependencies=[has_permission("system:view_audit_log")])
+def audit_pipeline_metrics() -> dict:
+    """
+    Request audit pipeline counters: what the policy kept versus dropped,
+    and the background writer's queue depth and written/dropped/spilled rows.
+    """
+    return {
+        "status": "success",
+        "message": "Audit metrics retrieved successfully.",
+        "data": {
+            "policy": audit_policy.get_metrics(),
+            "writer": audit_log_writer.get_metrics(),
+        },
+    }
+
+
 @router.post("/manage", response_model=AuditLogManagementResponse, dependencies=[has_any_permission("system:view_audit_log")])
 def manage_audit_log(
     request: AuditLogManagementRequest,
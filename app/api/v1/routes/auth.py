@@ -370,11 +370,12 @@ def get_my_permissions(
 ):
     """Get list of effective permissions for current user"""
     from app.api.auth_middleware import get_current_user
-    from app.api.auth_dependencies import get_user_permissions, is_super_admin
+    from app.api.auth_dependencies import resolve_auth_context
     
     current_user = get_current_user(request, db)
-    permissions = get_user_permissions(db, current_user)
-    super_admin = is_super_admin(db, current_user)
+    auth = resolve_auth_context(db, current_user)
+    permissions = sorted(auth.permissions)
+    super_admin = auth.is_super_admin
     
     permission_map = {}
     for perm in permissions:
@@ -2,35 +2,18 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from datetime import date
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_permission, has_any_permission
+from app.api.auth_dependencies import has_permission, has_any_permission, resolve_auth_context
 from app.api.deps import get_db
 from app.models.user import UserAccount
-from app.models.user_roles import UserRole
-from app.models.roles import Role
 from app.schemas import bhikku_high as schemas
 from app.services.bhikku_high_service import bhikku_high_service
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
-from app.services.permission_service import permission_service  # New service for permission check
+from app.utils.pagination import END_OF_SOURCE, CursorError, source_cursor, split_source_cursor
 from pydantic import ValidationError
 
 router = APIRouter()  # Tags defined in router.py
 
-# Check if the user has permission to perform an action on Bhikku High
-def check_permission(db: Session, user_id: str, permission_name: str):
-    # Check if user is super admin - super admins bypass all permission checks
-    user = db.query(UserAccount).filter(UserAccount.ua_user_id == user_id).first()
-    if user:
-        user_roles = db.query(UserRole).filter(UserRole.ur_user_id == user_id).all()
-        for user_role in user_roles:
-            role = db.query(Role).filter(Role.ro_role_id == user_role.ur_role_id).first()
-            if role and role.ro_level == "SUPER_ADMIN":
-                return  # Super admin has all permissions
-    
-    # For non-super admin users, check specific permissions
-    permissions = permission_service.get_user_permissions(db, user_id)
-    if permission_name not in permissions:
-        raise HTTPException(status_code=403, detail="Permission denied")
-
 @router.post("/manage", response_model=schemas.BhikkuHighManagementResponse, dependencies=[has_any_permission("bhikku:create", "bhikku:read", "bhikku:update", "bhikku:delete")])
 def manage_bhikku_high_records(
     request: schemas.BhikkuHighManagementRequest,
@@ -40,10 +23,16 @@ def manage_bhikku_high_records(
     action = request.action
     payload = request.payload
     user_id = current_user.ua_user_id  # Access user ID from the UserAccount object
+    auth = resolve_auth_context(db, current_user)
+
+    # Super admins hold every permission
+    def check_permission(permission_name: str):
+        if not auth.allows(permission_name):
+            raise HTTPException(status_code=403, detail="Permission denied")
 
     # Permission checks before CRUD actions
     if action == schemas.CRUDAction.CREATE:
-        check_permission(db, user_id, 'CREATE_BHIKKU_HIGH')
+        check_permission('CREATE_BHIKKU_HIGH')
         if not payload.data:
             raise validation_error([("payload.data", "data is required for CREATE action")])
 
@@ -80,7 +69,7 @@ def manage_bhikku_high_records(
         return schemas.BhikkuHighManagementResponse(status="success", message="Higher bhikku registration created successfully.", data=enriched_data)
 
     if action == schemas.CRUDAction.READ_ONE:
-        check_permission(db, user_id, 'READ_BHIKKU_HIGH')
+        check_permission('READ_BHIKKU_HIGH')
         if payload.bhr_id is None and not payload.bhr_regn:
             raise validation_error([("payload.bhr_id", "bhr_id or bhr_regn is required for READ_ONE action")])
 
@@ -114,7 +103,7 @@ def manage_bhikku_high_records(
         return schemas.BhikkuHighManagementResponse(status="success", message="Higher bhikku registration retrieved successfully.", data=enriched_data)
 
     if action == schemas.CRUDAction.READ_ALL:
-        check_permission(db, user_id, 'READ_BHIKKU_HIGH')
+        check_permission('READ_BHIKKU_HIGH')
         page = payload.page or 1
         limit = payload.limit
         search = payload.search_key.strip() if payload.search_key else None
@@ -138,6 +127,68 @@ def manage_bhikku_high_records(
         date_from = payload.date_from
         date_to = payload.date_to
 
+        if payload.use_cursor or payload.cursor:
+            # Cursor mode: bhikku_high_regist rows first, then direct_bhikku_high rows,
+            # each walked with its own keyset cursor tagged with the source it belongs to
+            from app.services.direct_bhikku_high_service import direct_bhikku_high_service
+
+            status_single = status[0] if status and isinstance(status, list) and len(status) > 0 else None
+            high_filters = dict(
+                search=search, vh_trn=vh_trn, province=province, district=district,
+                divisional_secretariat=divisional_secretariat, gn_division=gn_division,
+                temple=temple, child_temple=child_temple, nikaya=nikaya, parshawaya=parshawaya,
+                status=status, date_from=date_from, date_to=date_to,
+            )
+            direct_filters = dict(
+                search=search, current_user=current_user, province=province, district=district,
+                divisional_secretariat=divisional_secretariat, gn_division=gn_division,
+                parshawaya=parshawaya, status=status_single, date_from=date_from, date_to=date_to,
+            )
+            total = bhikku_high_service.count_bhikku_highs(db, **high_filters)
+            direct_total = direct_bhikku_high_service.count_direct_bhikku_highs(db, **direct_filters)
+
+            try:
+                source, inner = split_source_cursor(payload.cursor, ("high", "direct"))
+                if source == "high" and not inner and total == 0:
+                    source = "direct"
+                if source == "high":
+                    result = bhikku_high_service.list_bhikku_highs(
+                        db, limit=limit, current_user=current_user, keyset=True,
+                        cursor=inner if inner != END_OF_SOURCE else None,
+                        from_end=inner == END_OF_SOURCE, **high_filters,
+                    )
+                    data = bhikku_high_service.enrich_bhikku_high_dicts(result.items, db)
+                    if result.next_cursor:
+                        next_cursor = source_cursor("high", result.next_cursor)
+                    else:
+                        next_cursor = source_cursor("direct") if direct_total else None
+                    prev_cursor = source_cursor("high", result.prev_cursor) if result.prev_cursor else None
+                else:
+                    result = direct_bhikku_high_service.list_direct_bhikku_highs(
+                        db, limit=limit, keyset=True,
+                        cursor=inner if inner != END_OF_SOURCE else None,
+                        from_end=inner == END_OF_SOURCE, **direct_filters,
+                    )
+                    data = bhikku_high_service.convert_direct_to_bhikku_high_dicts(result.items, db)
+                    next_cursor = source_cursor("direct", result.next_cursor) if result.next_cursor else None
+                    if result.prev_cursor:
+                        prev_cursor = source_cursor("direct", result.prev_cursor)
+                    else:
+                        prev_cursor = source_cursor("high", END_OF_SOURCE) if total else None
+            except CursorError as exc:
+                raise validation_error([("payload.cursor", str(exc))])
+
+            return schemas.BhikkuHighManagementResponse(
+                status="success",
+                message="Higher bhikku registrations retrieved successfully.",
+                data=data,
+                totalRecords=total + direct_total,
+                page=None,
+                limit=limit,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
         # Get ALL records from both tables (we'll paginate after merging)
         # Fetch more records than needed to ensure we have enough after merging
         fetch_limit = limit * 2  # Fetch double to account for both sources
@@ -215,10 +266,10 @@ def manage_bhikku_high_records(
         )
 
         # Enrich all records with nested objects from candidates
-        enriched_records = [bhikku_high_service.enrich_bhikku_high_dict(record) for record in records]
+        enriched_records = bhikku_high_service.enrich_bhikku_high_dicts(records, db)
         
         # Convert and add direct_bhikku_high records
-        enriched_direct_records = [bhikku_high_service.convert_direct_to_bhikku_high_dict(record, db) for record in direct_records]
+        enriched_direct_records = bhikku_high_service.convert_direct_to_bhikku_high_dicts(direct_records, db)
         
         # Merge both lists
         all_enriched_records = enriched_records + enriched_direct_records
@@ -239,7 +290,7 @@ def manage_bhikku_high_records(
         )
 
     if action == schemas.CRUDAction.UPDATE:
-        check_permission(db, user_id, 'UPDATE_BHIKKU_HIGH')
+        check_permission('UPDATE_BHIKKU_HIGH')
         if not payload.data:
             raise validation_error([("payload.data", "data is required for UPDATE action")])
 
@@ -298,7 +349,7 @@ def manage_bhikku_high_records(
         return schemas.BhikkuHighManagementResponse(status="success", message="Higher bhikku registration updated successfully.", data=updated)
 
     if action == schemas.CRUDAction.DELETE:
-        check_permission(db, user_id, 'DELETE_BHIKKU_HIGH')
+        check_permission('DELETE_BHIKKU_HIGH')
         if payload.bhr_id is None:
             raise validation_error([("payload.bhr_id", "bhr_id is required for DELETE action")])
 
@@ -442,9 +493,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
         
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -452,9 +502,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        # Reset file pointer for later processing
-        await file.seek(0)
-        
         # Upload the file and update the bhikku high record
         updated_bhikku_high = await bhikku_high_service.upload_scanned_document(
             db, bhr_regn=bhr_regn, file=file, actor_id=username
@@ -20,6 +20,7 @@ from app.schemas.bhikku_id_card import (
     StayHistoryItem,
 )
 from app.services.bhikku_id_card_service import bhikku_id_card_service
+from app.utils.pagination import CursorError
 
 
 router = APIRouter()
@@ -82,6 +83,8 @@ async def manage_bhikku_id_card(
     limit: Optional[int] = Form(100),
     workflow_status: Optional[str] = Form(None),
     search_key: Optional[str] = Form(None),
+    use_cursor: bool = Form(False, description="Keyset pagination: true for the first page"),
+    cursor: Optional[str] = Form(None, max_length=1000, description="next_cursor / prev_cursor of a previous page"),
     
     # Dependencies
     db: Session = Depends(get_db),
@@ -119,6 +122,7 @@ async def manage_bhikku_id_card(
        - skip: 0
        - limit: 50
        - workflow_status: PENDING
+       - use_cursor: true (optional; then send back next_cursor / prev_cursor as cursor)
     """
     username = current_user.ua_username if current_user else None
     
@@ -249,19 +253,31 @@ async def manage_bhikku_id_card(
         
         # --- READ_ALL ---
         elif action_enum == BhikkuIDCardAction.READ_ALL:
-            cards, total = bhikku_id_card_service.get_all_bhikku_id_cards(
-                db,
-                skip=skip or 0,
-                limit=limit or 100,
-                workflow_status=workflow_status,
-                search_key=search_key
-            )
+            keyset = use_cursor or bool(cursor)
+            try:
+                cards, total = bhikku_id_card_service.get_all_bhikku_id_cards(
+                    db,
+                    skip=skip or 0,
+                    limit=limit or 100,
+                    workflow_status=workflow_status,
+                    search_key=search_key,
+                    keyset=keyset,
+                    cursor=cursor,
+                )
+            except CursorError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            next_cursor = prev_cursor = None
+            if keyset:
+                next_cursor, prev_cursor = cards.next_cursor, cards.prev_cursor
+                cards = cards.items
             
             return BhikkuIDCardManageResponse(
                 status="success",
                 message=f"Retrieved {len(cards)} Bhikku ID Cards",
                 data=[BhikkuIDCardResponse.from_orm(card) for card in cards],
-                total=total
+                total=total,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
             )
         
         # --- UPDATE ---
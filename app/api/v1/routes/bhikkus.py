@@ -1,18 +1,25 @@
 # app/api/v1/routes/bhikkus.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Callable, Dict, Optional
+from dataclasses import dataclass
 from datetime import date
 
 from app.api.deps import get_db
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_permission, has_any_permission, get_user_permissions
+from app.api.auth_dependencies import has_permission, has_any_permission, resolve_auth_context
 from app.models.user import UserAccount
 from app.schemas import bhikku as schemas
 from app.schemas.vihara import BhikkuViharaListResponse, BhikkuViharaManagementRequest
+from app.repositories.bhikku_repo import bhikku_repo
+from app.services import registration_export, report_views
 from app.services.bhikku_service import bhikku_service
+from app.services.report_views import ReportViewQuery, ReportViewRows
 from app.services.vihara_service import vihara_service
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
+from app.utils.pagination import CursorError
+from app.utils.streaming import stream_rows
 from pydantic import ValidationError
 
 router = APIRouter()
@@ -20,14 +27,88 @@ router = APIRouter()
 
 def check_bhikku_permission(db: Session, user: UserAccount, required_permission: str):
     """Check if user has the required permission for bhikku operations"""
-    user_permissions = get_user_permissions(db, user)
-    if required_permission not in user_permissions:
+    if required_permission not in resolve_auth_context(db, user).permissions:
         raise HTTPException(
             status_code=403,
             detail=f"Permission denied. Required permission: {required_permission}"
         )
 
 
+REPORT_VIEW_DEFAULT_LIMIT = 100
+REPORT_VIEW_MAX_LIMIT = 1000
+
+
+@dataclass
+class ReportViewParams:
+    """Paging, search and output format of a report view request."""
+    page: Optional[int]
+    limit: Optional[int]
+    search: Optional[str]
+    format: str
+    # Query parameters other than the above, matched against view columns later
+    extra: Dict[str, str]
+
+
+def report_view_params(
+    request: Request,
+    page: Optional[int] = Query(None, ge=1, description="Page number; defaults limit to 100"),
+    limit: Optional[int] = Query(None, ge=1, le=REPORT_VIEW_MAX_LIMIT, description="Rows per page"),
+    search: Optional[str] = Query(None, max_length=200, description="Match any column (case-insensitive)"),
+    format: str = Query(
+        "json",
+        pattern="^(json|ndjson|csv)$",
+        description="json (paged or whole), or ndjson / csv streamed as a download",
+    ),
+) -> ReportViewParams:
+    """
+    Query parameters shared by the view endpoints. Any other parameter named
+    after a view column filters on that column, e.g. `?dcode=01`.
+    """
+    reserved = {"page", "limit", "search", "format"}
+    extra = {key: value for key, value in request.query_params.items() if key not in reserved}
+    return ReportViewParams(page=page, limit=limit, search=search, format=format, extra=extra)
+
+
+def _report_view_response(
+    db: Session,
+    view: str,
+    fetch: Callable[..., ReportViewRows],
+    params: ReportViewParams,
+    message: str,
+):
+    """
+    Respond with a report view's rows. With neither page nor limit the JSON
+    body is the same as before (every row); csv / ndjson stream all matching
+    rows from a server-side cursor and ignore paging.
+    """
+    columns = report_views.REPORT_VIEWS[view].columns
+    query = ReportViewQuery(
+        filters={key: value for key, value in params.extra.items() if key in columns},
+        search=params.search or None,
+    )
+    if params.format != "json":
+        headers = {}
+        as_of = report_views.as_of(db, view)
+        if as_of is not None:
+            headers["X-As-Of"] = as_of.isoformat()
+        return stream_rows(params.format, columns, report_views.stream(view, query), filename=view, headers=headers)
+
+    paged = params.page is not None or params.limit is not None
+    if paged:
+        query.limit = params.limit or REPORT_VIEW_DEFAULT_LIMIT
+        query.offset = ((params.page or 1) - 1) * query.limit
+    report = fetch(db, query)
+    body = {
+        "status": "success",
+        "message": message,
+        "data": report.rows,
+        "as_of": report.as_of,
+    }
+    if paged:
+        body.update(totalRecords=report.total, page=params.page or 1, limit=query.limit)
+    return body
+
+
 @router.get(
     "/mahanayaka-list",
     response_model=schemas.BhikkuMahanayakaListResponse,
@@ -36,17 +117,19 @@ def check_bhikku_permission(db: Session, user: UserAccount, required_permission:
 def list_mahanayaka_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_mahanayakalist` database view.
     Requires: bhikku:read permission
     """
-    records = bhikku_service.list_mahanayaka_view(db)
-    return {
-        "status": "success",
-        "message": "Mahanayaka bhikku list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_mahanayakalist",
+        bhikku_service.list_mahanayaka_view,
+        params,
+        "Mahanayaka bhikku list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -57,17 +140,19 @@ def list_mahanayaka_bhikkus(
 def list_nikaya_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_nikaya_list` database view.
     Requires: bhikku:read permission
     """
-    records = bhikku_service.list_nikaya_view(db)
-    return {
-        "status": "success",
-        "message": "Nikaya bhikku list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_nikaya_list",
+        bhikku_service.list_nikaya_view,
+        params,
+        "Nikaya bhikku list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -98,16 +183,18 @@ def list_nikaya_hierarchy(
 def list_acharya_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_archarya_dtls` database view.
     """
-    records = bhikku_service.list_acharya_view(db)
-    return {
-        "status": "success",
-        "message": "Acharya bhikku list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_archarya_dtls",
+        bhikku_service.list_acharya_view,
+        params,
+        "Acharya bhikku list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -118,16 +205,19 @@ def list_acharya_bhikkus(
 def list_bhikku_details(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_bikkullist` database view.
+    Return rows from the `bikkudtls_bikkullist` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_bhikku_details_view(db)
-    return {
-        "status": "success",
-        "message": "Bhikku details list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_bikkullist",
+        bhikku_service.list_bhikku_details_view,
+        params,
+        "Bhikku details list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -138,16 +228,19 @@ def list_bhikku_details(
 def list_certification_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_certification_data` database view.
+    Return rows from the `bikkudtls_certification_data` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_certification_view(db)
-    return {
-        "status": "success",
-        "message": "Certification bhikku list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_certification_data",
+        bhikku_service.list_certification_view,
+        params,
+        "Certification bhikku list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -158,16 +251,19 @@ def list_certification_bhikkus(
 def list_certification_print_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_certification_printnow` database view.
+    Return rows from the `bikkudtls_certification_printnow` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_certification_print_view(db)
-    return {
-        "status": "success",
-        "message": "Certification print list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_certification_printnow",
+        bhikku_service.list_certification_print_view,
+        params,
+        "Certification print list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -178,16 +274,18 @@ def list_certification_print_bhikkus(
 def list_current_status_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_currstatus_list` database view.
     """
-    records = bhikku_service.list_current_status_view(db)
-    return {
-        "status": "success",
-        "message": "Current status list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_currstatus_list",
+        bhikku_service.list_current_status_view,
+        params,
+        "Current status list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -249,16 +347,18 @@ def list_bhikkus_by_vihara_body(
 def list_district_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_districtlist` database view.
     """
-    records = bhikku_service.list_district_view(db)
-    return {
-        "status": "success",
-        "message": "District list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_districtlist",
+        bhikku_service.list_district_view,
+        params,
+        "District list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -289,16 +389,18 @@ def list_province_bhikkus(
 def list_division_secretariat_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_divisionsec_dtls` database view.
     """
-    records = bhikku_service.list_division_sec_view(db)
-    return {
-        "status": "success",
-        "message": "Division secretariat list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_divisionsec_dtls",
+        bhikku_service.list_division_sec_view,
+        params,
+        "Division secretariat list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -309,16 +411,18 @@ def list_division_secretariat_bhikkus(
 def list_gn_division_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_gn_dtls` database view.
     """
-    records = bhikku_service.list_gn_view(db)
-    return {
-        "status": "success",
-        "message": "GN division list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_gn_dtls",
+        bhikku_service.list_gn_view,
+        params,
+        "GN division list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -329,16 +433,19 @@ def list_gn_division_bhikkus(
 def list_history_status_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_histtystatus_list` database view.
+    Return rows from the `bikkudtls_histtystatus_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_history_status_view(db)
-    return {
-        "status": "success",
-        "message": "History status list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_histtystatus_list",
+        bhikku_service.list_history_status_view,
+        params,
+        "History status list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -349,16 +456,19 @@ def list_history_status_bhikkus(
 def list_id_all_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_id_alllist` database view.
+    Return rows from the `bikkudtls_id_alllist` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_id_all_view(db)
-    return {
-        "status": "success",
-        "message": "ID all list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_id_alllist",
+        bhikku_service.list_id_all_view,
+        params,
+        "ID all list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -369,16 +479,18 @@ def list_id_all_bhikkus(
 def list_id_district_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_iddistrict_list` database view.
     """
-    records = bhikku_service.list_id_district_view(db)
-    return {
-        "status": "success",
-        "message": "ID district list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_iddistrict_list",
+        bhikku_service.list_id_district_view,
+        params,
+        "ID district list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -389,16 +501,18 @@ def list_id_district_bhikkus(
 def list_id_division_secretariat_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_iddvsec_list` database view.
     """
-    records = bhikku_service.list_id_division_sec_view(db)
-    return {
-        "status": "success",
-        "message": "ID division secretariat list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_iddvsec_list",
+        bhikku_service.list_id_division_sec_view,
+        params,
+        "ID division secretariat list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -409,16 +523,18 @@ def list_id_division_secretariat_bhikkus(
 def list_id_gn_division_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_idgn_list` database view.
     """
-    records = bhikku_service.list_id_gn_view(db)
-    return {
-        "status": "success",
-        "message": "ID GN division list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_idgn_list",
+        bhikku_service.list_id_gn_view,
+        params,
+        "ID GN division list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -429,16 +545,18 @@ def list_id_gn_division_bhikkus(
 def list_nikayanayaka_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_nikayanayaka_list` database view.
     """
-    records = bhikku_service.list_nikayanayaka_view(db)
-    return {
-        "status": "success",
-        "message": "Nikayanayaka list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_nikayanayaka_list",
+        bhikku_service.list_nikayanayaka_view,
+        params,
+        "Nikayanayaka list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -449,16 +567,18 @@ def list_nikayanayaka_bhikkus(
 def list_parshawa_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_parshawa_list` database view.
     """
-    records = bhikku_service.list_parshawa_view(db)
-    return {
-        "status": "success",
-        "message": "Parshawa list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_parshawa_list",
+        bhikku_service.list_parshawa_view,
+        params,
+        "Parshawa list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -469,16 +589,19 @@ def list_parshawa_bhikkus(
 def list_status_history_composite(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_statushystry_composit` database view.
+    Return rows from the `bikkudtls_statushystry_composit` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_status_history_composite(db)
-    return {
-        "status": "success",
-        "message": "Status history composite retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_statushystry_composit",
+        bhikku_service.list_status_history_composite,
+        params,
+        "Status history composite retrieved successfully.",
+    )
 
 
 @router.get(
@@ -489,16 +612,19 @@ def list_status_history_composite(
 def list_status_history(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_statushystry_list` database view.
+    Return rows from the `bikkudtls_statushystry_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_status_history_list(db)
-    return {
-        "status": "success",
-        "message": "Status history list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_statushystry_list",
+        bhikku_service.list_status_history_list,
+        params,
+        "Status history list retrieved successfully.",
+    )
 
 
 @router.get(
@@ -509,16 +635,19 @@ def list_status_history(
 def list_status_history_aggregated(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return rows from the `bikkudtls_statushystry_list2` database view.
+    Return rows from the `bikkudtls_statushystry_list2` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_status_history_list2(db)
-    return {
-        "status": "success",
-        "message": "Status history list 2 retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_statushystry_list2",
+        bhikku_service.list_status_history_list2,
+        params,
+        "Status history list 2 retrieved successfully.",
+    )
 
 
 @router.get(
@@ -529,16 +658,18 @@ def list_status_history_aggregated(
 def list_viharadipathi_bhikkus(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
     Return rows from the `bikkudtls_viharadipathi_list` database view.
     """
-    records = bhikku_service.list_viharadipathi_view(db)
-    return {
-        "status": "success",
-        "message": "Viharadipathi list retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkudtls_viharadipathi_list",
+        bhikku_service.list_viharadipathi_view,
+        params,
+        "Viharadipathi list retrieved successfully.",
+    )
 
 
 @router.post(
@@ -651,7 +782,8 @@ def get_vihara_for_bhikkus(
             "status": "success",
             "message": "Viharas retrieved successfully.",
             "data": vihara_items,
-            "totalRecords": total_count,
+            "totalRecords": total_count.total,
+            "totalIsExact": total_count.exact,
             "page": response_page,
             "limit": limit,
         }
@@ -665,16 +797,19 @@ def get_vihara_for_bhikkus(
 def list_current_status_summary(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return aggregated rows from the `bikkusumm_currstatus_list` database view.
+    Return aggregated rows from the `bikkusumm_currstatus_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_current_status_summary(db)
-    return {
-        "status": "success",
-        "message": "Current status summary retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkusumm_currstatus_list",
+        bhikku_service.list_current_status_summary,
+        params,
+        "Current status summary retrieved successfully.",
+    )
 
 
 @router.get(
@@ -685,16 +820,19 @@ def list_current_status_summary(
 def list_district_summary(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return aggregated rows from the `bikkusumm_district_list` database view.
+    Return aggregated rows from the `bikkusumm_district_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_district_summary(db)
-    return {
-        "status": "success",
-        "message": "District summary retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkusumm_district_list",
+        bhikku_service.list_district_summary,
+        params,
+        "District summary retrieved successfully.",
+    )
 
 
 @router.get(
@@ -705,16 +843,19 @@ def list_district_summary(
 def list_gn_summary(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return aggregated rows from the `bikkusumm_gn_list` database view.
+    Return aggregated rows from the `bikkusumm_gn_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_gn_summary(db)
-    return {
-        "status": "success",
-        "message": "GN summary retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkusumm_gn_list",
+        bhikku_service.list_gn_summary,
+        params,
+        "GN summary retrieved successfully.",
+    )
 
 
 @router.get(
@@ -725,16 +866,19 @@ def list_gn_summary(
 def list_id_district_summary(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return aggregated rows from the `bikkusumm_iddistrict_list` database view.
+    Return aggregated rows from the `bikkusumm_iddistrict_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_id_district_summary(db)
-    return {
-        "status": "success",
-        "message": "ID district summary retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkusumm_iddistrict_list",
+        bhikku_service.list_id_district_summary,
+        params,
+        "ID district summary retrieved successfully.",
+    )
 
 
 @router.get(
@@ -745,16 +889,59 @@ def list_id_district_summary(
 def list_id_gn_summary(
     db: Session = Depends(get_db),
     current_user: UserAccount = Depends(get_current_user),
+    params: ReportViewParams = Depends(report_view_params),
 ):
     """
-    Return aggregated rows from the `bikkusumm_idgn_list` database view.
+    Return aggregated rows from the `bikkusumm_idgn_list` database view
+    (materialized copy; `as_of` is when it was last refreshed).
     """
-    records = bhikku_service.list_id_gn_summary(db)
-    return {
-        "status": "success",
-        "message": "ID GN summary retrieved successfully.",
-        "data": records,
-    }
+    return _report_view_response(
+        db,
+        "bikkusumm_idgn_list",
+        bhikku_service.list_id_gn_summary,
+        params,
+        "ID GN summary retrieved successfully.",
+    )
+
+
+@router.post(
+    "/export",
+    dependencies=[has_permission("bhikku:read")],
+)
+def export_bhikkus(
+    payload: schemas.BhikkuRequestPayload,
+    format: str = Query("csv", pattern=registration_export.EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: UserAccount = Depends(get_current_user),
+):
+    """
+    Download every bhikku matching the READ_ALL filters of `payload` (paging
+    fields are ignored) as CSV or NDJSON, with province, status, temple, ...
+    names next to their codes. X-Total-Count carries the number of rows.
+    Requires: bhikku:read permission
+    """
+    search_key = payload.search_key.strip() if payload.search_key else None
+    query = bhikku_repo.get_all(
+        db,
+        search_key=search_key or None,
+        province=payload.province,
+        vh_trn=payload.vh_trn,
+        district=payload.district,
+        divisional_secretariat=payload.divisional_secretariat,
+        gn_division=payload.gn_division,
+        temple=payload.temple,
+        child_temple=payload.child_temple,
+        nikaya=payload.nikaya,
+        parshawaya=payload.parshawaya,
+        category=payload.category,
+        status=payload.status,
+        workflow_status=payload.workflow_status,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        current_user=current_user,
+        unpaged=True,
+    )
+    return registration_export.response("bhikku", query, format)
 
 
 @router.post(
@@ -862,27 +1049,38 @@ def manage_bhikku_records(
         skip = max(0, skip)
         
         # Get paginated bhikku records with search and filters
-        bhikkus = bhikku_service.list_bhikkus(
-            db, 
-            skip=skip, 
-            limit=limit, 
-            search=search_key,
-            province=payload.province,
-            vh_trn=payload.vh_trn,
-            district=payload.district,
-            current_user=current_user,
-            divisional_secretariat=payload.divisional_secretariat,
-            gn_division=payload.gn_division,
-            temple=payload.temple,
-            child_temple=payload.child_temple,
-            nikaya=payload.nikaya,
-            parshawaya=payload.parshawaya,
-            category=payload.category,
-            status=payload.status,
-            workflow_status=payload.workflow_status,
-            date_from=payload.date_from,
-            date_to=payload.date_to
-        )
+        keyset = payload.use_cursor or bool(payload.cursor)
+        next_cursor = prev_cursor = None
+        try:
+            result = bhikku_service.list_bhikkus(
+                db, 
+                skip=skip, 
+                limit=limit, 
+                search=search_key,
+                province=payload.province,
+                vh_trn=payload.vh_trn,
+                district=payload.district,
+                current_user=current_user,
+                divisional_secretariat=payload.divisional_secretariat,
+                gn_division=payload.gn_division,
+                temple=payload.temple,
+                child_temple=payload.child_temple,
+                nikaya=payload.nikaya,
+                parshawaya=payload.parshawaya,
+                category=payload.category,
+                status=payload.status,
+                workflow_status=payload.workflow_status,
+                date_from=payload.date_from,
+                date_to=payload.date_to,
+                keyset=keyset,
+                cursor=payload.cursor,
+            )
+        except CursorError as exc:
+            raise validation_error([("payload.cursor", str(exc))]) from exc
+        if keyset:
+            bhikkus, next_cursor, prev_cursor = result.items, result.next_cursor, result.prev_cursor
+        else:
+            bhikkus = result
         
         # Get total count for pagination
         total_count = bhikku_service.count_bhikkus(
@@ -906,15 +1104,18 @@ def manage_bhikku_records(
         )
         
         # Convert SQLAlchemy models to Pydantic schemas with enriched data (names replace codes)
-        bhikku_schemas = [schemas.Bhikku(**bhikku_service.enrich_bhikku_dict(bhikku, db=db)) for bhikku in bhikkus]
+        bhikku_schemas = [schemas.Bhikku(**data) for data in bhikku_service.enrich_bhikku_dicts(bhikkus, db=db)]
         
         return schemas.BhikkuManagementResponse(
             status="success",
             message="Bhikkus retrieved successfully.",
             data=bhikku_schemas,
-            totalRecords=total_count,
-            page=page,
+            totalRecords=total_count.total,
+            totalIsExact=total_count.exact,
+            page=None if keyset else page,
             limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     elif action == schemas.CRUDAction.UPDATE:
@@ -1477,9 +1678,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
         
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -1487,9 +1687,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        # Reset file pointer for later processing
-        await file.seek(0)
-        
         # Upload the file and update the bhikku record
         updated_bhikku = await bhikku_service.upload_scanned_document(
             db, br_regn=br_regn, file=file, actor_id=username
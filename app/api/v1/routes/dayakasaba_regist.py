@@ -4,11 +4,12 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_any_permission, get_user_permissions, is_super_admin
+from app.api.auth_dependencies import has_any_permission, resolve_auth_context
 from app.models.user import UserAccount
 from app.schemas import dayakasaba_regist as schemas
 from app.services.dayakasaba_regist_service import dayakasaba_regist_service
 from pydantic import ValidationError
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error, format_pydantic_errors
 
 router = APIRouter()
@@ -16,9 +17,7 @@ router = APIRouter()
 
 def _check_permission(db: Session, user: UserAccount, permission: str) -> None:
     """Raise 403 unless the user has the required permission or is a super admin."""
-    if is_super_admin(db, user):
-        return
-    if permission not in get_user_permissions(db, user):
+    if not resolve_auth_context(db, user).allows(permission):
         raise HTTPException(
             status_code=403,
             detail=f"Permission denied. Required: {permission}",
@@ -306,16 +305,15 @@ async def upload_scanned_document(
 
     # Client-side size guard (server re-validates inside service)
     MAX_FILE_SIZE = 5 * 1024 * 1024
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
+    file_size = upload_size(file)
+    if file_size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=400,
             detail=(
-                f"File size ({len(file_content) / 1024 / 1024:.2f} MB) "
+                f"File size ({file_size / 1024 / 1024:.2f} MB) "
                 "exceeds maximum allowed size (5 MB)."
             ),
         )
-    await file.seek(0)
 
     try:
         record = await dayakasaba_regist_service.upload_scanned_document(
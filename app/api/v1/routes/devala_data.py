@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 
@@ -12,15 +12,57 @@ from app.schemas.devala import (
     DevalaManagementRequest,
     DevalaManagementResponse,
     DevalaOut,
+    DevalaRequestPayload,
     DevalaUpdate,
 )
+from app.repositories.devala_repo import devala_repo
+from app.services import registration_export
 from app.services.devala_service import devala_service
 from app.services.temporary_devala_service import temporary_devala_service
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
+from app.utils.pagination import CursorError
 
 router = APIRouter()  # Tags defined in router.py
 
 
+@router.post("/export", dependencies=[has_permission("devala:read")])
+def export_devalas(
+    payload: DevalaRequestPayload,
+    format: str = Query("csv", pattern=registration_export.EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: UserAccount = Depends(get_current_user),
+):
+    """
+    Download every devala matching the READ_ALL filters of `payload` (paging
+    fields are ignored) as CSV or NDJSON, with location, nikaya and parshawa names next to
+    their codes. X-Total-Count carries the number of rows. Temporary
+    devala are not included.
+    """
+    search = payload.search_key.strip() if payload.search_key else None
+    query = devala_repo.list(
+        db,
+        search=search or None,
+        dv_trn=payload.dv_trn,
+        province=payload.province,
+        district=payload.district,
+        divisional_secretariat=payload.divisional_secretariat,
+        gn_division=payload.gn_division,
+        temple=payload.temple,
+        child_temple=payload.child_temple,
+        nikaya=payload.nikaya,
+        parshawaya=payload.parshawaya,
+        category=payload.category,
+        status=payload.status,
+        dv_typ=payload.dv_typ,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        current_user=current_user,
+        unpaged=True,
+    )
+    return registration_export.response("devala", query, format)
+
+
 @router.post("/manage", response_model=DevalaManagementResponse, dependencies=[has_any_permission("devala:create", "devala:read", "devala:update", "devala:delete")])
 def manage_devala_records(
     request: DevalaManagementRequest,
@@ -104,7 +146,16 @@ def manage_devala_records(
             "current_user": current_user,
         }
 
-        records = devala_service.list_devalas(db, **filters)
+        keyset = payload.use_cursor or bool(payload.cursor)
+        next_cursor = prev_cursor = None
+        try:
+            result = devala_service.list_devalas(db, **filters, keyset=keyset, cursor=payload.cursor)
+        except CursorError as exc:
+            raise validation_error([("payload.cursor", str(exc))]) from exc
+        if keyset:
+            records, next_cursor, prev_cursor = result.items, result.next_cursor, result.prev_cursor
+        else:
+            records = result
         total = devala_service.count_devalas(db, **{k: v for k, v in filters.items() if k not in ["skip", "limit", "current_user"]})
         
         # Convert records to list of dicts for modification
@@ -112,7 +163,8 @@ def manage_devala_records(
         
         # Also fetch temporary devalas and include them in results
         # Only apply search filter for temporary devalas (other filters don't apply to them)
-        temp_devalas = temporary_devala_service.list_temporary_devalas(
+        # In cursor mode they are only added to the first page (the one without a prev_cursor).
+        temp_devalas = [] if prev_cursor else temporary_devala_service.list_temporary_devalas(
             db,
             skip=0,  # Get all matching temp devalas
             limit=200,  # Max allowed
@@ -160,8 +212,10 @@ def manage_devala_records(
             message="Devala records retrieved successfully.",
             data=records_list,
             totalRecords=total_with_temp,
-            page=page,
+            page=None if keyset else page,
             limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     if action == CRUDAction.UPDATE:
@@ -416,9 +470,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
         
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -426,9 +479,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        # Reset file pointer for later processing
-        await file.seek(0)
-        
         # Upload the file and update the devala record
         updated_devala = await devala_service.upload_scanned_document(
             db, dv_id=dv_id, file=file, actor_id=username
@@ -20,6 +20,7 @@ from app.schemas.direct_bhikku_high import (
     DirectBhikkuHighUpdate,
 )
 from app.services.direct_bhikku_high_service import direct_bhikku_high_service
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
 
 router = APIRouter()
@@ -329,9 +330,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
 
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -339,9 +339,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
 
-        # Reset file pointer for later processing
-        await file.seek(0)
-
         # Upload the file and update the record
         updated_record = await direct_bhikku_high_service.upload_scanned_document(
             db, dbh_id=dbh_id, file=file, actor_id=username
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_any_permission, get_user_permissions, is_super_admin
+from app.api.auth_dependencies import has_any_permission, resolve_auth_context
 from app.models.user import UserAccount
 from app.schemas import gov_officers as schemas
 from app.services.gov_officers_service import gov_officers_service
@@ -16,9 +16,7 @@ router = APIRouter()
 
 def _check_permission(db: Session, user: UserAccount, permission: str) -> None:
     """Raise 403 unless the user has the required permission or is a super admin."""
-    if is_super_admin(db, user):
-        return
-    if permission not in get_user_permissions(db, user):
+    if not resolve_auth_context(db, user).allows(permission):
         raise HTTPException(
             status_code=403,
             detail=f"Permission denied. Required: {permission}",
@@ -1,15 +1,13 @@
 # app/api/v1/routes/reprint.py
-from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.api.auth_dependencies import is_super_admin
+from app.api.auth_dependencies import AuthContext, get_auth_context
 from app.api.auth_middleware import get_current_user
 from app.api.deps import get_db
 from app.models.user import UserAccount
-from app.models.user_roles import UserRole
 from app.schemas import reprint as schemas
 from app.services.reprint_service import reprint_service
 
@@ -33,37 +31,19 @@ DATA_ENTRY_ROLE_IDS = {
 ALLOWED_REPRINT_ROLE_IDS = ADMIN_ROLE_IDS | DATA_ENTRY_ROLE_IDS
 
 
-def _get_active_role_ids(db: Session, user_id: str) -> set[str]:
-    """Return active (non-expired) role IDs for the user."""
-    now = datetime.utcnow()
-    roles = (
-        db.query(UserRole.ur_role_id)
-        .filter(
-            UserRole.ur_user_id == user_id,
-            UserRole.ur_is_active.is_(True),
-            (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-        )
-        .all()
-    )
-    return {role.ur_role_id for role in roles}
-
-
-def require_reprint_roles(
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_user),
-):
+def require_reprint_roles(auth: AuthContext = Depends(get_auth_context)):
     """
     Ensure caller has permitted roles for reprint operations.
     Allows District / Bhikku / Silmatha / Damma School Admin & Data Entry roles and super admins.
     """
-    if is_super_admin(db, current_user):
+    if auth.is_super_admin:
         return {
             "role_ids": set(),
             "is_super_admin": True,
             "is_admin": True,
         }
 
-    role_ids = _get_active_role_ids(db, current_user.ua_user_id)
+    role_ids = set(auth.role_ids)
     if not role_ids.intersection(ALLOWED_REPRINT_ROLE_IDS):
         raise HTTPException(
             status_code=403,
@@ -102,12 +82,14 @@ def list_reprint_requests(
         page=page,
         limit=limit,
         search_key=search_key,
+        current_user=current_user,
     )
     return {
         "status": "success",
         "message": "Reprint requests retrieved successfully.",
         "data": records,
-        "totalRecords": total,
+        "totalRecords": total.total,
+        "totalIsExact": total.exact,
         "page": page,
         "limit": limit,
     }
@@ -200,12 +182,14 @@ def manage_reprint(
                 page=request.page,
                 limit=request.limit,
                 search_key=request.search_key,
+                current_user=current_user,
             )
             return {
                 "status": "success",
                 "message": "Reprint requests retrieved.",
                 "data": records,
-                "totalRecords": total,
+                "totalRecords": total.total,
+                "totalIsExact": total.exact,
                 "page": request.page,
                 "limit": request.limit,
             }
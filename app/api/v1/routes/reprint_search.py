@@ -18,6 +18,7 @@ from app.schemas.reprint_search import (
     QRStyleDetailItem
 )
 from app.services.reprint_search_service import reprint_search_service
+from app.utils.pagination import CursorError, KeysetPage
 
 router = APIRouter(prefix="/advance-search", tags=["🔎 Advance Search"])
 
@@ -59,6 +60,21 @@ def detect_entity_type(registration_id: str) -> str:
     raise ValueError(f"Unable to determine entity type from registration ID: {registration_id}")
 
 
+def _search_response(results, total: int) -> ReprintSearchResponse:
+    """Search response for an offset page (list) or a keyset page"""
+    next_cursor = prev_cursor = None
+    if isinstance(results, KeysetPage):
+        results, next_cursor, prev_cursor = results.items, results.next_cursor, results.prev_cursor
+    return ReprintSearchResponse(
+        status="success",
+        message=f"Found {total} matching record(s)",
+        total=total,
+        data=results,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
 @router.get("", response_model=ReprintSearchResponse)
 def search_all_records(
     registration_number: Optional[str] = Query(None, description="Search by registration number (partial match)"),
@@ -71,6 +87,8 @@ def search_all_records(
     ),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    use_cursor: bool = Query(False, description="Keyset pagination: true for the first page"),
+    cursor: Optional[str] = Query(None, max_length=1000, description="next_cursor / prev_cursor from a previous page"),
     db: Session = Depends(get_db),
 ):
     """
@@ -91,6 +109,11 @@ def search_all_records(
     - Search by exact birth date (applies to person records only)
     - Filter by specific entity type
     
+    **Pagination:**
+    - `skip` / `limit` for numbered pages
+    - `use_cursor=true` for the first page, then pass `next_cursor` / `prev_cursor` back
+      as `cursor`; deep pages are as fast as the first one
+    
     **Returns:**
     - Common summary data for all matching records
     - Entity type identification
@@ -112,16 +135,14 @@ def search_all_records(
             birth_date=birth_date,
             entity_type=entity_type,
             skip=skip,
-            limit=limit
-        )
-        
-        return ReprintSearchResponse(
-            status="success",
-            message=f"Found {total} matching record(s)",
-            total=total,
-            data=results
+            limit=limit,
+            keyset=use_cursor or bool(cursor),
+            cursor=cursor,
         )
+        return _search_response(results, total)
     
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -158,6 +179,8 @@ def search_all_records_post(
     }
     ```
     
+    Set `"use_cursor": true` (and then `"cursor"`) for keyset pagination.
+    
     **All fields are optional.**
     
     **Returns:**
@@ -181,16 +204,14 @@ def search_all_records_post(
             birth_date=request.birth_date,
             entity_type=request.entity_type,
             skip=request.skip,
-            limit=request.limit
-        )
-        
-        return ReprintSearchResponse(
-            status="success",
-            message=f"Found {total} matching record(s)",
-            total=total,
-            data=results
+            limit=request.limit,
+            keyset=request.use_cursor or bool(request.cursor),
+            cursor=request.cursor,
         )
+        return _search_response(results, total)
     
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -302,8 +323,11 @@ def get_record_details_by_id(
     - Show comprehensive entity data
     """
     try:
-        # Detect entity type from registration ID
-        entity_type = detect_entity_type(request.id)
+        # Resolve entity type from the registration index, falling back to the ID prefix
+        entity_type = (
+            reprint_search_service.resolve_entity_type(db, request.id)
+            or detect_entity_type(request.id)
+        )
         
         # Get record details
         details = reprint_search_service.get_entity_detail(
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_any_permission, get_user_permissions, is_super_admin
+from app.api.auth_dependencies import has_any_permission, resolve_auth_context
 from app.models.user import UserAccount
 from app.schemas import sasanarakshana_regist as schemas
 from app.services.sasanarakshana_regist_service import sasanarakshana_regist_service
@@ -16,10 +16,7 @@ router = APIRouter()
 
 def _check_permission(db: Session, user: UserAccount, permission: str):
     # Super admins bypass all permission checks
-    if is_super_admin(db, user):
-        return
-    perms = get_user_permissions(db, user)
-    if permission not in perms:
+    if not resolve_auth_context(db, user).allows(permission):
         raise HTTPException(
             status_code=403,
             detail=f"Permission denied. Required: {permission}",
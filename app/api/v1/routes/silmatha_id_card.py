@@ -20,6 +20,7 @@ from app.schemas.silmatha_id_card import (
     StayHistoryItem,
 )
 from app.services.silmatha_id_card_service import silmatha_id_card_service
+from app.utils.pagination import CursorError
 from app.services.temporary_silmatha_service import temporary_silmatha_service
 
 
@@ -83,6 +84,8 @@ async def manage_silmatha_id_card(
     limit: Optional[int] = Form(100),
     workflow_status: Optional[str] = Form(None),
     search_key: Optional[str] = Form(None),
+    use_cursor: bool = Form(False, description="Keyset pagination: true for the first page"),
+    cursor: Optional[str] = Form(None, max_length=1000, description="next_cursor / prev_cursor of a previous page"),
     
     # Dependencies
     db: Session = Depends(get_db),
@@ -120,6 +123,7 @@ async def manage_silmatha_id_card(
        - skip: 0
        - limit: 50
        - workflow_status: PENDING
+       - use_cursor: true (optional; then send back next_cursor / prev_cursor as cursor)
     """
     username = current_user.ua_username if current_user else None
     
@@ -254,20 +258,31 @@ async def manage_silmatha_id_card(
         
         # --- READ_ALL ---
         elif action_enum == SilmathaIDCardAction.READ_ALL:
-            cards, total = silmatha_id_card_service.get_all_silmatha_id_cards(
-                db,
-                skip=skip or 0,
-                limit=limit or 100,
-                workflow_status=workflow_status,
-                search_key=search_key
-            )
+            keyset = use_cursor or bool(cursor)
+            try:
+                cards, total = silmatha_id_card_service.get_all_silmatha_id_cards(
+                    db,
+                    skip=skip or 0,
+                    limit=limit or 100,
+                    workflow_status=workflow_status,
+                    search_key=search_key,
+                    keyset=keyset,
+                    cursor=cursor,
+                )
+            except CursorError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            next_cursor = prev_cursor = None
+            if keyset:
+                next_cursor, prev_cursor = cards.next_cursor, cards.prev_cursor
+                cards = cards.items
             
             # Convert cards to response format
             card_responses = [SilmathaIDCardResponse.model_validate(card) for card in cards]
             
             # Also fetch temporary silmathas and include them in results
-            # Only apply search filter for temporary silmathas (other filters don't apply to them)
-            temp_silmathas = temporary_silmatha_service.list_temporary_silmathas(
+            # Only apply search filter for temporary silmathas (other filters don't apply to them).
+            # In cursor mode they are only listed on the first page (the one without a prev_cursor).
+            temp_silmathas = [] if prev_cursor else temporary_silmatha_service.list_temporary_silmathas(
                 db,
                 skip=0,  # Get all matching temp silmathas
                 limit=200,  # Max allowed
@@ -368,7 +383,9 @@ async def manage_silmatha_id_card(
                 status="success",
                 message=f"Retrieved {len(card_responses)} Silmatha ID Cards (including temporary)",
                 data=card_responses,
-                total=total_with_temp
+                total=total_with_temp,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
             )
         
         # --- UPDATE ---
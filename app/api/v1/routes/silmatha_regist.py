@@ -1,30 +1,70 @@
 # app/api/v1/routes/silmatha_regist.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_permission, has_any_permission, get_user_permissions
+from app.api.auth_dependencies import has_permission, has_any_permission, resolve_auth_context
 from app.models.user import UserAccount
 from app.schemas import silmatha_regist as schemas
+from app.services import registration_export
 from app.services.silmatha_regist_service import silmatha_regist_service
 from app.services.arama_service import arama_service
 from app.repositories.silmatha_regist_repo import silmatha_regist_repo
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
+from app.utils.pagination import CursorError
 from pydantic import ValidationError
 
 router = APIRouter()
 
 def check_silmatha_permission(db: Session, user: UserAccount, required_permission: str):
     """Ensure the current user has the required silmatha permission."""
-    user_permissions = get_user_permissions(db, user)
-    if required_permission not in user_permissions:
+    if required_permission not in resolve_auth_context(db, user).permissions:
         raise HTTPException(
             status_code=403,
             detail=f"Permission denied. Required permission: {required_permission}"
         )
 
 
+@router.post(
+    "/export",
+    dependencies=[has_permission("silmatha:read")],
+)
+def export_silmatha_records(
+    payload: schemas.SilmathaRegistRequestPayload,
+    format: str = Query("csv", pattern=registration_export.EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: UserAccount = Depends(get_current_user),
+):
+    """
+    Download every silmatha record matching the READ_ALL filters of `payload`
+    (paging fields are ignored) as CSV or NDJSON, with location, status and
+    arama names next to their codes. X-Total-Count carries the number of rows.
+    """
+    search_key = payload.search_key.strip() if payload.search_key else None
+    query = silmatha_regist_repo.get_all(
+        db,
+        search_key=search_key or None,
+        vh_trn=payload.vh_trn,
+        province=payload.province,
+        district=payload.district,
+        divisional_secretariat=payload.divisional_secretariat,
+        gn_division=payload.gn_division,
+        temple=payload.temple,
+        child_temple=payload.child_temple,
+        parshawaya=payload.parshawaya,
+        category=payload.category,
+        status=payload.status,
+        workflow_status=payload.workflow_status,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        current_user=current_user,
+        unpaged=True,
+    )
+    return registration_export.response("silmatha", query, format)
+
+
 @router.post(
     "/manage",
     response_model=schemas.SilmathaRegistManagementResponse,
@@ -119,28 +159,38 @@ def manage_silmatha_records(
         limit = payload.limit if payload and hasattr(payload, 'limit') else 100
         page = payload.page if payload and hasattr(payload, 'page') else 1
         search_key = payload.search_key.strip() if payload and hasattr(payload, 'search_key') and payload.search_key else None
+        keyset = payload.use_cursor or bool(payload.cursor)
         
         # Get paginated silmatha records with search and filters
-        silmatha_records = silmatha_regist_repo.get_all(
-            db, 
-            skip=skip, 
-            limit=limit, 
-            search_key=search_key,
-            vh_trn=payload.vh_trn if payload and hasattr(payload, 'vh_trn') else None,
-            province=payload.province if payload and hasattr(payload, 'province') else None,
-            district=payload.district if payload and hasattr(payload, 'district') else None,
-            divisional_secretariat=payload.divisional_secretariat if payload and hasattr(payload, 'divisional_secretariat') else None,
-            gn_division=payload.gn_division if payload and hasattr(payload, 'gn_division') else None,
-            temple=payload.temple if payload and hasattr(payload, 'temple') else None,
-            child_temple=payload.child_temple if payload and hasattr(payload, 'child_temple') else None,
-            parshawaya=payload.parshawaya if payload and hasattr(payload, 'parshawaya') else None,
-            category=payload.category if payload and hasattr(payload, 'category') else None,
-            status=payload.status if payload and hasattr(payload, 'status') else None,
-            workflow_status=payload.workflow_status if payload and hasattr(payload, 'workflow_status') else None,
-            date_from=payload.date_from if payload and hasattr(payload, 'date_from') else None,
-            date_to=payload.date_to if payload and hasattr(payload, 'date_to') else None,
-            current_user=current_user
-        )
+        try:
+            silmatha_records = silmatha_regist_repo.get_all(
+                db, 
+                skip=skip, 
+                limit=limit, 
+                search_key=search_key,
+                vh_trn=payload.vh_trn if payload and hasattr(payload, 'vh_trn') else None,
+                province=payload.province if payload and hasattr(payload, 'province') else None,
+                district=payload.district if payload and hasattr(payload, 'district') else None,
+                divisional_secretariat=payload.divisional_secretariat if payload and hasattr(payload, 'divisional_secretariat') else None,
+                gn_division=payload.gn_division if payload and hasattr(payload, 'gn_division') else None,
+                temple=payload.temple if payload and hasattr(payload, 'temple') else None,
+                child_temple=payload.child_temple if payload and hasattr(payload, 'child_temple') else None,
+                parshawaya=payload.parshawaya if payload and hasattr(payload, 'parshawaya') else None,
+                category=payload.category if payload and hasattr(payload, 'category') else None,
+                status=payload.status if payload and hasattr(payload, 'status') else None,
+                workflow_status=payload.workflow_status if payload and hasattr(payload, 'workflow_status') else None,
+                date_from=payload.date_from if payload and hasattr(payload, 'date_from') else None,
+                date_to=payload.date_to if payload and hasattr(payload, 'date_to') else None,
+                current_user=current_user,
+                keyset=keyset,
+                cursor=payload.cursor,
+            )
+        except CursorError as exc:
+            raise validation_error([("payload.cursor", str(exc))])
+        next_cursor = prev_cursor = None
+        if keyset:
+            next_cursor, prev_cursor = silmatha_records.next_cursor, silmatha_records.prev_cursor
+            silmatha_records = silmatha_records.items
         
         # Get total count for pagination
         total_count = silmatha_regist_repo.get_total_count(
@@ -170,8 +220,10 @@ def manage_silmatha_records(
             message="Silmatha records retrieved successfully.",
             data=silmatha_enriched,
             totalRecords=total_count,
-            page=page,
+            page=None if keyset else page,
             limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     elif action == schemas.CRUDAction.UPDATE:
@@ -414,9 +466,8 @@ async def upload_scanned_document(
         # Validate file size (5MB = 5 * 1024 * 1024 bytes)
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
         
-        # Read file content to check size
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload, without reading it into memory
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -424,9 +475,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        # Reset file pointer for later processing
-        await file.seek(0)
-        
         # Upload the file and update the silmatha record
         updated_silmatha = await silmatha_regist_service.upload_scanned_document(
             db, sil_regn=sil_regn, file=file, actor_id=username
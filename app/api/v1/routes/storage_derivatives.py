@@ -0,0 +1,32 @@
+# app/api/v1/routes/storage_derivatives.py
+"""
+Thumbnails of stored images (app/utils/image_derivatives.py), served like
+the rest of /storage. Registered ahead of the /storage mount.
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.image_derivatives import DERIVATIVE_DIRECTORY, image_derivatives
+from app.utils.storage_files import IMMUTABLE_CACHE_CONTROL, storage_file_response
+
+router = APIRouter(prefix=f"/storage/{DERIVATIVE_DIRECTORY}", include_in_schema=False)
+
+
+@router.get("/{variant}/{path:path}")
+async def get_derivative(variant: str, path: str, request: Request):
+    """A derivative of a stored image, rendered on first request if the upload worker has not."""
+    original = await run_in_threadpool(image_derivatives.original_of, variant, path)
+    if original is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    file = await run_in_threadpool(image_derivatives.ensure, original, variant)
+    if file is None:
+        # Pillow missing or the image cannot be decoded: the original is the best we have
+        return RedirectResponse(original, status_code=307)
+    # Derivative URLs embed the original's unique path, so their content never changes
+    response = await run_in_threadpool(
+        storage_file_response, file, path, request.headers, IMMUTABLE_CACHE_CONTROL
+    )
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return response
@@ -16,14 +16,60 @@ from app.schemas.vihara import (
     ViharaManagementRequest,
     ViharaManagementResponse,
     ViharaOut,
+    ViharaRequestPayload,
     ViharaUpdate,
 )
+from app.repositories.vihara_repo import vihara_repo
+from app.services import registration_export
 from app.services.vihara_service import vihara_service
+from app.utils.file_storage import upload_size
 from app.utils.http_exceptions import validation_error
+from app.utils.pagination import CursorError
 
 router = APIRouter()  # Tags defined in router.py
 
 
+@router.post("/export", dependencies=[has_permission("vihara:read")])
+def export_viharas(
+    payload: ViharaRequestPayload,
+    format: str = Query("csv", pattern=registration_export.EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+    current_user: UserAccount = Depends(get_current_user),
+):
+    """
+    Download every vihara matching the READ_ALL filters of `payload` (paging
+    fields are ignored) as CSV or NDJSON, with location, nikaya and parshawa names next to
+    their codes. X-Total-Count carries the number of rows. Temporary
+    vihara are not included.
+    """
+    search = payload.search_key.strip() if payload.search_key else None
+    query = vihara_repo.list(
+        db,
+        search=search or None,
+        vh_trn=payload.vh_trn,
+        province=payload.province,
+        district=payload.district,
+        divisional_secretariat=payload.divisional_secretariat,
+        ssbmcode=payload.ssbmcode,
+        gn_division=payload.gn_division,
+        temple=payload.temple,
+        child_temple=payload.child_temple,
+        nikaya=payload.nikaya,
+        parshawaya=payload.parshawaya,
+        category=payload.category,
+        workflow_status=payload.workflow_status,
+        vh_typ=payload.vh_typ,
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        sort_by=payload.sort_by,
+        sort_dir=payload.sort_dir,
+        record_type=payload.record_type,
+        current_user=current_user,
+        unpaged=True,
+    )
+    return registration_export.response("vihara", query, format)
+
+
 @router.post("/manage", response_model=ViharaManagementResponse, dependencies=[has_any_permission("vihara:create", "vihara:read", "vihara:update", "vihara:delete")])
 def manage_vihara_records(
     request: ViharaManagementRequest,
@@ -488,7 +534,16 @@ def manage_vihara_records(
             "current_user": current_user,
         }
 
-        records = vihara_service.list_viharas(db, **filters)
+        keyset = payload.use_cursor or bool(payload.cursor)
+        next_cursor = prev_cursor = None
+        try:
+            result = vihara_service.list_viharas(db, **filters, keyset=keyset, cursor=payload.cursor)
+        except CursorError as exc:
+            raise validation_error([("payload.cursor", str(exc))]) from exc
+        if keyset:
+            records, next_cursor, prev_cursor = result.items, result.next_cursor, result.prev_cursor
+        else:
+            records = result
         total = vihara_service.count_viharas(db, **{k: v for k, v in filters.items() if k not in ["skip", "limit", "sort_by", "sort_dir"]})
         
         # Convert records to list of dicts for modification (serialize SQLAlchemy models)
@@ -507,9 +562,12 @@ def manage_vihara_records(
             status="success",
             message="Vihara records retrieved successfully.",
             data=records_list,
-            totalRecords=total,
-            page=page,
+            totalRecords=total.total,
+            totalIsExact=total.exact,
+            page=None if keyset else page,
             limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     if action == CRUDAction.UPDATE:
@@ -854,8 +912,7 @@ async def upload_stage1_document(
     
     try:
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-        file_content = await file.read()
-        file_size = len(file_content)
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -863,8 +920,6 @@ async def upload_stage1_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        await file.seek(0)
-        
         updated_vihara = await vihara_service.upload_stage1_document(
             db, vh_id=vh_id, file=file, actor_id=username
         )
@@ -923,8 +978,7 @@ async def upload_stage2_document(
     
     try:
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-        file_content = await file.read()
-        file_size = len(file_content)
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -932,8 +986,6 @@ async def upload_stage2_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        await file.seek(0)
-        
         updated_vihara = await vihara_service.upload_stage2_document(
             db, vh_id=vh_id, file=file, actor_id=username
         )
@@ -980,8 +1032,7 @@ async def upload_scanned_document(
     
     try:
         MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-        file_content = await file.read()
-        file_size = len(file_content)
+        file_size = upload_size(file)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -989,8 +1040,6 @@ async def upload_scanned_document(
                 detail=f"File size ({file_size / 1024 / 1024:.2f}MB) exceeds maximum allowed size (5MB)"
             )
         
-        await file.seek(0)
-        
         updated_vihara = await vihara_service.upload_scanned_document(
             db, vh_id=vh_id, file=file, actor_id=username
         )
@@ -5,25 +5,26 @@ Vihara Data-Entry User Activity Report
 Provides per-user statistics for all users holding the VIHA_DATA role:
   • Total login sessions and cumulative working time (from login_history)
   • Record counts inserted / updated in vihara-related tables (from audit_log)
-Supports optional date-range filtering.
+Supports optional date-range filtering. Whole days are read from the daily
+rollups maintained by app/utils/refresh_activity_rollup.py; only the part of
+the range the rollup has not reached yet is aggregated from raw rows.
 """
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
-from sqlalchemy import and_, case, func, literal
 from sqlalchemy.orm import Session
 
-from app.api.auth_dependencies import has_any_permission, is_super_admin
+from app.api.auth_dependencies import has_any_permission, resolve_auth_context
 from app.api.auth_middleware import get_current_user
 from app.api.deps import get_db
-from app.models.audit_log import AuditLog
 from app.models.roles import Role
-from app.models.user import LoginHistory, UserAccount
+from app.models.user import UserAccount
 from app.models.user_roles import UserRole
+from app.services.user_activity_rollup import get_login_totals, get_record_counts
 
 router = APIRouter()  # Tags defined in router.py
 
@@ -129,31 +130,12 @@ def vihara_user_activity_report(
     Only accessible by admins (VIHA_ADM) or super admins.
     """
     # ── Access check ──────────────────────────────────────────────────────
-    if not is_super_admin(db, current_user):
-        now = datetime.utcnow()
-        admin_role = (
-            db.query(UserRole)
-            .filter(
-                UserRole.ur_user_id == current_user.ua_user_id,
-                UserRole.ur_role_id == "VIHA_ADM",
-                UserRole.ur_is_active.is_(True),
-                (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-            )
-            .first()
+    auth = resolve_auth_context(db, current_user)
+    if not auth.is_super_admin and not auth.has_role("VIHA_ADM"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Only Vihara Admins or Super Admins can view this report.",
         )
-        if not admin_role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied. Only Vihara Admins or Super Admins can view this report.",
-            )
-
-    # ── Resolve date boundaries ───────────────────────────────────────────
-    ts_from: Optional[datetime] = None
-    ts_to: Optional[datetime] = None
-    if date_from:
-        ts_from = datetime.combine(date_from, datetime.min.time())
-    if date_to:
-        ts_to = datetime.combine(date_to, datetime.max.time())
 
     # ── Gather vihara data-entry users ────────────────────────────────────
     users = _get_vihara_data_entry_users(db)
@@ -170,25 +152,8 @@ def vihara_user_activity_report(
     user_ids = [u.ua_user_id for u in users]
 
     # ── Audit log stats (record counts) ───────────────────────────────────
-    audit_q = db.query(
-        AuditLog.al_user_id,
-        AuditLog.al_table_name,
-        AuditLog.al_operation,
-        func.count().label("cnt"),
-    ).filter(
-        AuditLog.al_user_id.in_(user_ids),
-        AuditLog.al_table_name.in_(VIHARA_TABLES),
-    )
-    if ts_from:
-        audit_q = audit_q.filter(AuditLog.al_timestamp >= ts_from)
-    if ts_to:
-        audit_q = audit_q.filter(AuditLog.al_timestamp <= ts_to)
-
-    audit_rows = audit_q.group_by(
-        AuditLog.al_user_id,
-        AuditLog.al_table_name,
-        AuditLog.al_operation,
-    ).all()
+    # Whole days come from the daily rollup, only the unrolled tail from audit_log
+    audit_rows = get_record_counts(db, user_ids, VIHARA_TABLES, date_from, date_to)
 
     # Build a nested dict:  { user_id: { table: [(op, cnt), ...] } }
     audit_map: dict[str, dict[str, list]] = {}
@@ -196,42 +161,13 @@ def vihara_user_activity_report(
         audit_map.setdefault(uid, {}).setdefault(table, []).append((op, cnt))
 
     # ── Login history stats ───────────────────────────────────────────────
-    login_q = db.query(
-        LoginHistory.lh_user_id,
-        func.count().label("sessions"),
-        func.sum(
-            case(
-                (
-                    and_(
-                        LoginHistory.lh_logout_time.isnot(None),
-                        LoginHistory.lh_login_time.isnot(None),
-                    ),
-                    func.extract("epoch", LoginHistory.lh_logout_time)
-                    - func.extract("epoch", LoginHistory.lh_login_time),
-                ),
-                else_=literal(0),
-            )
-        ).label("total_seconds"),
-        func.min(LoginHistory.lh_login_time).label("first_login"),
-        func.max(LoginHistory.lh_login_time).label("last_login"),
-    ).filter(
-        LoginHistory.lh_user_id.in_(user_ids),
-        LoginHistory.lh_success.is_(True),
-    )
-    if ts_from:
-        login_q = login_q.filter(LoginHistory.lh_login_time >= ts_from)
-    if ts_to:
-        login_q = login_q.filter(LoginHistory.lh_login_time <= ts_to)
-
-    login_rows = login_q.group_by(LoginHistory.lh_user_id).all()
-
     login_map: dict[str, dict] = {}
-    for uid, sessions, total_sec, first_l, last_l in login_rows:
+    for uid, totals in get_login_totals(db, user_ids, date_from, date_to).items():
         login_map[uid] = {
-            "total_sessions": sessions or 0,
-            "total_working_minutes": round((total_sec or 0) / 60, 1),
-            "first_login": first_l,
-            "last_login": last_l,
+            "total_sessions": totals.total_sessions,
+            "total_working_minutes": round(totals.total_seconds / 60, 1),
+            "first_login": totals.first_login,
+            "last_login": totals.last_login,
         }
 
     # ── Assemble response ─────────────────────────────────────────────────
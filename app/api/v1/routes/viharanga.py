@@ -2,14 +2,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status as http_status
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime
 
 from app.api.auth_middleware import get_current_user
-from app.api.auth_dependencies import has_permission, has_any_permission, get_user_permissions, is_super_admin
+from app.api.auth_dependencies import AuthContext, get_auth_context, has_permission, has_any_permission
 from app.api.deps import get_db
 from app.models.user import UserAccount
-from app.models.user_roles import UserRole
 from app.schemas.viharanga import (
     CRUDAction,
     ViharangaCreate,
@@ -24,10 +21,7 @@ from app.utils.http_exceptions import validation_error
 router = APIRouter()  # Tags defined in router.py
 
 
-def check_viharanga_access(
-    current_user: UserAccount = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def check_viharanga_access(auth: AuthContext = Depends(get_auth_context)):
     """
     Check if user has access to viharanga endpoints.
     Grants access to:
@@ -37,29 +31,15 @@ def check_viharanga_access(
     - Users with VIHA_ADM role (vihara_admin)
     """
     # Super admins bypass all checks
-    if is_super_admin(db, current_user):
+    if auth.is_super_admin:
         return
     
-    current_time = datetime.utcnow()
-    
     # Check if user has vihara roles (VIHA_DATA or VIHA_ADM)
-    vihara_role = db.query(UserRole).filter(
-        and_(
-            UserRole.ur_user_id == current_user.ua_user_id,
-            UserRole.ur_role_id.in_(["VIHA_DATA", "VIHA_ADM"]),
-            UserRole.ur_is_active == True,
-            UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > current_time)
-        )
-    ).first()
-    
-    if vihara_role:
+    if auth.has_role("VIHA_DATA", "VIHA_ADM"):
         return  # User has vihara role, grant access
     
     # Check if user has system permissions
-    user_permissions = get_user_permissions(db, current_user)
-    required_permissions = ["system:create", "system:update", "system:delete"]
-    
-    if any(perm in user_permissions for perm in required_permissions):
+    if auth.allows("system:create", "system:update", "system:delete"):
         return  # User has system permissions, grant access
     
     # User has neither vihara roles nor system permissions
@@ -55,8 +55,54 @@ class Settings:
     OTP_MAX_REQUESTS_PER_HOUR: int = int(os.getenv("OTP_MAX_REQUESTS_PER_HOUR", "5"))
     OTP_MAX_REQUESTS_PER_DAY: int = int(os.getenv("OTP_MAX_REQUESTS_PER_DAY", "10"))
     
+    # Authorization cache: seconds a user's compiled permissions stay valid (0 disables)
+    PERMISSION_CACHE_TTL_SECONDS: int = int(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "60"))
+
+    # Audit logging: request-level rows are queued and bulk-inserted by a background writer
+    AUDIT_QUEUE_MAX_SIZE: int = int(os.getenv("AUDIT_QUEUE_MAX_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL_MS: int = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "1000"))
+    # Optional JSONL file used when the queue is full or the database is unavailable
+    AUDIT_SPILL_PATH: str = os.getenv("AUDIT_SPILL_PATH", "")
+    # Request audit policy: mutating calls are always kept, READs are sampled
+    AUDIT_EXCLUDED_PREFIXES: str = os.getenv(
+        "AUDIT_EXCLUDED_PREFIXES", "/storage,/health,/docs,/redoc,/openapi.json"
+    )
+    AUDIT_READ_SAMPLE_RATE: float = float(os.getenv("AUDIT_READ_SAMPLE_RATE", "1.0"))
+    # Per-route READ sample rates, e.g. "/api/v1/bhikkus=0.1,/api/v1/dashboard=0"
+    AUDIT_ROUTE_SAMPLE_RATES: str = os.getenv("AUDIT_ROUTE_SAMPLE_RATES", "")
+    # Opt-in compact row audit payloads: only non-null columns on CREATE/DELETE, only real changes on UPDATE
+    AUDIT_COMPACT_PAYLOADS: bool = os.getenv("AUDIT_COMPACT_PAYLOADS", "false").lower() == "true"
+    AUDIT_RECORD_PREFLIGHT: bool = os.getenv("AUDIT_RECORD_PREFLIGHT", "false").lower() == "true"
+    # audit_log partition maintenance (app/utils/audit_log_maintenance.py)
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = int(os.getenv("AUDIT_LOG_PARTITION_MONTHS_AHEAD", "3"))
+    AUDIT_LOG_RETENTION_MONTHS: int = int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", "24"))
+    # Expired partitions are moved into this schema; empty drops them instead
+    AUDIT_LOG_ARCHIVE_SCHEMA: str = os.getenv("AUDIT_LOG_ARCHIVE_SCHEMA", "audit_archive")
+    # Daily user-activity rollups (app/utils/refresh_activity_rollup.py)
+    ACTIVITY_ROLLUP_LAG_MINUTES: int = int(os.getenv("ACTIVITY_ROLLUP_LAG_MINUTES", "5"))
+    ACTIVITY_ROLLUP_LOGIN_SETTLE_HOURS: int = int(os.getenv("ACTIVITY_ROLLUP_LOGIN_SETTLE_HOURS", "24"))
+    ACTIVITY_ROLLUP_BATCH_IDS: int = int(os.getenv("ACTIVITY_ROLLUP_BATCH_IDS", "200000"))
+    # Missing al_ids this close below the high-water mark are re-checked on later runs
+    ACTIVITY_ROLLUP_REFOLD_IDS: int = int(os.getenv("ACTIVITY_ROLLUP_REFOLD_IDS", "10000"))
+    # List totals (app/services/list_count.py): exact | estimate | cached, with per-list overrides
+    # such as "bhikku=estimate,vihara=cached,reprint=cached"
+    LIST_COUNT_STRATEGY: str = os.getenv("LIST_COUNT_STRATEGY", "exact")
+    LIST_COUNT_STRATEGIES: str = os.getenv("LIST_COUNT_STRATEGIES", "")
+    LIST_COUNT_ESTIMATE_THRESHOLD: int = int(os.getenv("LIST_COUNT_ESTIMATE_THRESHOLD", "50000"))
+    LIST_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("LIST_COUNT_CACHE_TTL_SECONDS", "30"))
+    # Reference data cache (app/services/reference_cache.py): seconds a table snapshot is served (0 disables)
+    REFERENCE_CACHE_TTL_SECONDS: int = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+    # Materialized bhikku report views (app/services/report_views.py): seconds between checks for
+    # bhikku writes to refresh after; 0 disables the in-process refresher (use the cron script instead)
+    REPORT_VIEW_REFRESH_INTERVAL_SECONDS: int = int(os.getenv("REPORT_VIEW_REFRESH_INTERVAL_SECONDS", "60"))
+
     # File Storage Configuration
     STORAGE_DIR: str = os.getenv("STORAGE_DIR", "app/storage")
+    # Thumbnails of uploaded images (app/utils/image_derivatives.py): webp | jpeg
+    IMAGE_DERIVATIVE_FORMAT: str = os.getenv("IMAGE_DERIVATIVE_FORMAT", "webp")
+    # Storage GC (app/utils/storage_gc.py): unreferenced files changed more recently are left alone
+    STORAGE_GC_GRACE_HOURS: int = int(os.getenv("STORAGE_GC_GRACE_HOURS", "72"))
     
     # Redis Configuration (for OTP storage in production)
     REDIS_ENABLED: bool = os.getenv("REDIS_ENABLED", "false").lower() == "true"
@@ -1,13 +1,17 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.core.config import settings
 from app.core.error_handlers import register_exception_handlers
 from app.api.v1.router import api_router
 from app.api.v1.routes import health  # <-- Import the health router
+from app.api.v1.routes import storage_derivatives
 from app.middleware.audit import AuditMiddleware
+from app.services.audit_writer import audit_log_writer
+from app.services.report_views import report_view_refresher
+from app.utils.image_derivatives import image_derivatives
+from app.utils.storage_files import StorageFiles
 
 # API Documentation Metadata
 tags_metadata = [
@@ -101,15 +105,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by browser clients of the streamed downloads (exports, report views)
+    expose_headers=["Content-Disposition", "X-Total-Count", "X-As-Of"],
 )
 app.add_middleware(AuditMiddleware)
 
 # Mount storage directory for serving uploaded files
 # This allows files to be accessed via URLs like: https://hrms.dbagovlk.com/storage/bhikku_regist/2025/11/23/BH2025000011/scanned_document_*.pdf
 # Storage path is configured via STORAGE_DIR environment variable (default: app/storage, production: /home/appuser/storage)
+# StorageFiles adds content-hash ETags, byte ranges and cache headers (app/utils/storage_files.py)
 storage_path = Path(settings.STORAGE_DIR)
 storage_path.mkdir(parents=True, exist_ok=True)
-app.mount("/storage", StaticFiles(directory=str(storage_path)), name="storage")
+# Thumbnails under /storage/_derivatives are rendered on demand, so their route goes before the mount
+app.include_router(storage_derivatives.router)
+app.mount("/storage", StorageFiles(directory=str(storage_path)), name="storage")
+
+@app.on_event("startup")
+def start_report_view_refresher():
+    if settings.REPORT_VIEW_REFRESH_INTERVAL_SECONDS > 0:
+        report_view_refresher.start()
+
+
+@app.on_event("startup")
+def start_image_derivative_worker():
+    image_derivatives.start()
+
+
+@app.on_event("shutdown")
+def flush_audit_log_writer():
+    # Write out request audit rows still queued in memory before the process exits
+    audit_log_writer.stop()
+
+
+@app.on_event("shutdown")
+def stop_report_view_refresher():
+    report_view_refresher.stop()
+
+
+@app.on_event("shutdown")
+def stop_image_derivative_worker():
+    image_derivatives.stop()
+
 
 app.include_router(health.router)  # <-- Add the health router at the root
 app.include_router(api_router, prefix="/api/v1")
@@ -3,45 +3,64 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import Request
-from fastapi.responses import Response
-from starlette.concurrency import run_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.db.session import SessionLocal
+from app.services.audit_policy import audit_policy
 from app.services.audit_service import audit_service
+from app.services.audit_writer import audit_log_writer
 from app.services.auth_service import auth_service
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        user_id = self._resolve_user_id(request)
-        session_id = self._resolve_session_id(request)
-        ip_address = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
+class AuditMiddleware:
+    """
+    Pure ASGI middleware that records one `__api_call__` audit row per HTTP request.
 
+    The audit context is bound for the lifetime of the request (so ORM flushes
+    inside handlers are attributed to the caller), and the request-level row is
+    handed to the background audit_log_writer instead of being committed inline.
+    Paths under AUDIT_EXCLUDED_PREFIXES (static /storage files, health, docs)
+    skip the middleware entirely: no context, no token decode, no row.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or audit_policy.is_excluded(scope.get("path")):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
         token, _ = audit_service.begin_request(
-            user_id=user_id,
-            session_id=session_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            route=request.url.path,
-            method=request.method,
+            user_id=self._resolve_user_id(connection),
+            session_id=self._resolve_session_id(connection),
+            ip_address=connection.client.host if connection.client else None,
+            user_agent=connection.headers.get("user-agent"),
+            route=scope.get("path"),
+            method=scope.get("method"),
         )
 
-        response: Response | None = None
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
-            status_code = response.status_code if response else 500
             try:
-                await run_in_threadpool(self._log_api_call, status_code)
+                row = audit_service.build_api_call_row(status_code=status_code)
+                if row is not None:
+                    audit_log_writer.enqueue(row)
             finally:
                 audit_service.end_request(token)
 
-    def _resolve_user_id(self, request: Request) -> Optional[str]:
-        token = request.cookies.get("access_token")
+    def _resolve_user_id(self, connection: HTTPConnection) -> Optional[str]:
+        token = connection.cookies.get("access_token")
         if not token:
             return None
         try:
@@ -49,21 +68,11 @@ class AuditMiddleware(BaseHTTPMiddleware):
         except Exception:
             return None
 
-    def _resolve_session_id(self, request: Request) -> Optional[str]:
-        if session_cookie := request.cookies.get("session_id"):
+    def _resolve_session_id(self, connection: HTTPConnection) -> Optional[str]:
+        if session_cookie := connection.cookies.get("session_id"):
             return session_cookie
-        if header_value := request.headers.get("X-Session-Id"):
+        if header_value := connection.headers.get("X-Session-Id"):
             return header_value
-        if auth_header := request.headers.get("Authorization"):
+        if auth_header := connection.headers.get("Authorization"):
             return auth_header.split(" ", 1)[-1]
         return None
-
-    def _log_api_call(self, status_code: int) -> None:
-        db = SessionLocal()
-        try:
-            db.info["skip_audit"] = True
-            audit_service.log_api_call(db, status_code=status_code)
-        except Exception:
-            db.rollback()
-        finally:
-            db.close()
@@ -5,6 +5,7 @@ from sqlalchemy import (
     BigInteger,
     Column,
     ForeignKey,
+    Index,
     String,
     TIMESTAMP,
 )
@@ -16,6 +17,13 @@ from app.db.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
+    # Monthly RANGE partitions; see app/utils/audit_log_maintenance.py
+    __table_args__ = (
+        Index("ix_audit_log_timestamp", "al_timestamp"),
+        Index("ix_audit_log_user_timestamp", "al_user_id", "al_timestamp"),
+        Index("ix_audit_log_table_timestamp", "al_table_name", "al_timestamp"),
+        {"postgresql_partition_by": "RANGE (al_timestamp)"},
+    )
 
     al_id = Column(
         BigInteger,
@@ -37,8 +45,10 @@ class AuditLog(Base):
     al_session_id = Column(String(100), nullable=True)
     al_ip_address = Column(String(45), nullable=True)
     al_user_agent = Column(String(500), nullable=True)
+    # Part of the primary key: PostgreSQL requires the partition key in unique constraints
     al_timestamp = Column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False,
     )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Computed, ForeignKey, Integer, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class BhikkuSearch(Base):
+    """
+    One search document per bhikku_regist row: the searchable bhikku columns
+    plus the names/addresses of its living and mahana temples. Maintained by
+    app/services/bhikku_search.py on every flush.
+    """
+    __tablename__ = "bhikku_search"
+
+    bs_br_id = Column(
+        Integer,
+        ForeignKey("bhikku_regist.br_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Trigram-indexed (gin_trgm_ops) so substring ILIKE avoids a sequential scan
+    bs_document = Column(Text, nullable=False)
+    bs_tsv = Column(TSVECTOR, Computed("to_tsvector('simple', bs_document)", persisted=True))
+    bs_updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+from sqlalchemy import Boolean, Column, Date, Index, Integer, String, Text, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class RegistrationIndex(Base):
+    """
+    One row per registration of the seven registrable entity types (bhikku,
+    silmatha, high / direct high bhikku, vihara, arama, devala), keyed by
+    registration number. Lets QR lookups and reprint search resolve a
+    regn / trn with one indexed probe instead of querying every table.
+    Maintained by app/services/registration_index.py on every flush.
+    """
+    __tablename__ = "registration_index"
+    __table_args__ = (
+        Index("ix_registration_index_regn", "ri_regn", "ri_entity_type", "ri_entity_id"),
+    )
+
+    # Reprint search entity types: bhikku, silmatha, high_bhikku, direct_high_bhikku, vihara, arama, devala
+    ri_entity_type = Column(String(30), primary_key=True)
+    ri_entity_id = Column(Integer, primary_key=True)
+    ri_regn = Column(String(20), nullable=False)
+    ri_display_name = Column(String(200), nullable=True)
+    # Searchable names (ordained / birth / assumed / temple name) joined with a unit separator
+    ri_names = Column(Text, nullable=True)
+    ri_dob = Column(Date, nullable=True)
+    ri_workflow_status = Column(String(25), nullable=True)
+    ri_is_deleted = Column(Boolean, nullable=False, default=False)
+    ri_updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ReportViewState(Base):
+    """
+    Refresh state of a materialized bhikku report view (mv_bikkudtls_* /
+    mv_bikkusumm_*). rvs_refreshed_at is the "as_of" time reported to clients.
+    """
+    __tablename__ = "report_view_state"
+
+    rvs_view = Column(String(60), primary_key=True)
+    rvs_refreshed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    rvs_refresh_ms = Column(Integer, nullable=True)
+    rvs_updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ReportViewDirtyMark(Base):
+    """
+    One row per transaction and report source table (rvd_table) written
+    since the last refresh. Inserted rather than flipped on a shared flag row so concurrent
+    writers never wait on each other; the refresher deletes the marks it can
+    see in the same transaction as the refresh.
+    """
+    __tablename__ = "report_view_dirty_mark"
+
+    rvd_id = Column(Integer, primary_key=True, autoincrement=True)
+    rvd_table = Column(String(63), nullable=False)
+    rvd_marked_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
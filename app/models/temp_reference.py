@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Index, Integer, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+# tr_entity values
+ENTITY_BHIKKU = "bhikku"
+ENTITY_BHIKKU_HIGH = "bhikku_high"
+ENTITY_DIRECT_BHIKKU_HIGH = "direct_bhikku_high"
+
+# tr_temp_kind values: temporary_bhikku.tb_id / temporary_vihara.tv_id
+KIND_BHIKKU = "bhikku"
+KIND_VIHARA = "vihara"
+
+
+class TempReference(Base):
+    """
+    A reference from a registration field to a temporary bhikku or vihara.
+    The field itself is left NULL (its foreign key cannot point at a
+    temporary record) and the reference is kept here instead, one row per
+    (entity, entity id, field). Maintained by app/repositories/temp_reference_repo.py.
+    """
+    __tablename__ = "temp_reference"
+    __table_args__ = (
+        UniqueConstraint("tr_entity", "tr_entity_id", "tr_field", name="uq_temp_reference_entity_field"),
+        Index("ix_temp_reference_temp", "tr_temp_kind", "tr_temp_id"),
+    )
+
+    tr_id = Column(Integer, primary_key=True, autoincrement=True)
+    # bhikku -> br_id, bhikku_high -> bhr_id, direct_bhikku_high -> dbh_id
+    tr_entity = Column(String(30), nullable=False)
+    tr_entity_id = Column(Integer, nullable=False)
+    tr_field = Column(String(60), nullable=False, comment="Column the reference stands in for, e.g. br_livtemple")
+    tr_temp_kind = Column(String(10), nullable=False)
+    tr_temp_id = Column(Integer, nullable=False)
+    tr_created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    tr_updated_at = Column(TIMESTAMP, onupdate=func.now(), nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<TempReference({self.tr_entity}:{self.tr_entity_id}.{self.tr_field}"
+            f" -> {self.tr_temp_kind}:{self.tr_temp_id})>"
+        )
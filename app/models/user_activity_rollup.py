@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, JSON, Numeric, String, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class UserActivityDaily(Base):
+    """Per-day count of audit_log rows by user, table and operation."""
+    __tablename__ = "user_activity_daily"
+
+    uad_user_id = Column(String(10), primary_key=True)
+    uad_day = Column(Date, primary_key=True)
+    uad_table_name = Column(String(50), primary_key=True)
+    uad_operation = Column(String(10), primary_key=True)
+    uad_count = Column(BigInteger, nullable=False, default=0)
+
+
+class UserLoginDaily(Base):
+    """Per-day successful login sessions and working time by user."""
+    __tablename__ = "user_login_daily"
+
+    uld_user_id = Column(String(20), primary_key=True)
+    uld_day = Column(Date, primary_key=True)
+    uld_sessions = Column(Integer, nullable=False, default=0)
+    uld_working_seconds = Column(Numeric(14, 2), nullable=False, default=0)
+    uld_first_login = Column(TIMESTAMP(timezone=True), nullable=True)
+    uld_last_login = Column(TIMESTAMP(timezone=True), nullable=True)
+
+
+class ActivityRollupState(Base):
+    """
+    High-water mark per rollup source ("audit_log" / "login_history").
+    ars_last_id is the last source id folded in; ars_complete_until is the
+    timestamp before which the rollup holds every source row.
+    ars_pending_ids lists ids at most ACTIVITY_ROLLUP_REFOLD_IDS below
+    ars_last_id that were not visible yet (transactions still in flight, or
+    rolled back); they are folded in if they show up later.
+    """
+    __tablename__ = "activity_rollup_state"
+
+    ars_source = Column(String(30), primary_key=True)
+    ars_last_id = Column(BigInteger, nullable=False, default=0)
+    ars_complete_until = Column(TIMESTAMP(timezone=True), nullable=True)
+    ars_pending_ids = Column(JSON, nullable=True)
+    ars_updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
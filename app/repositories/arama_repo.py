@@ -4,7 +4,7 @@ from datetime import datetime
 
 from sqlalchemy import func, or_, select, text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Query, Session, selectinload
 
 from app.models.arama import AramaData
 from app.models.arama_land import AramaLand
@@ -13,6 +13,7 @@ from app.models.user import UserAccount
 from app.models.roles import Role
 from app.models.user_roles import UserRole
 from app.schemas.arama import AramaCreate, AramaUpdate
+from app.utils.pagination import KeysetPage, keyset_paginate
 
 
 class AramaRepository:
@@ -117,23 +118,15 @@ class AramaRepository:
         date_from: Optional[Any] = None,
         date_to: Optional[Any] = None,
         current_user: Optional[UserAccount] = None,
-    ) -> list[AramaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        unpaged: bool = False,
+    ) -> list[AramaData] | KeysetPage | Query:
+        """
+        With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned.
+        With `unpaged=True` the ordered query is returned without skip / limit (exports).
+        """
         query = db.query(AramaData).filter(AramaData.ar_is_deleted.is_(False))
-        
-        # Eager load relationships - only direct foreign keys, no cascading
-        query = query.options(
-            selectinload(AramaData.arama_lands),
-            selectinload(AramaData.resident_silmathas),
-            selectinload(AramaData.province_ref),
-            selectinload(AramaData.district_ref),
-            selectinload(AramaData.divisional_secretariat_ref),
-            selectinload(AramaData.pradeshya_sabha_ref),
-            selectinload(AramaData.gn_division_ref),
-            selectinload(AramaData.nikaya_ref),
-            selectinload(AramaData.parshawa_ref),
-            selectinload(AramaData.owner_silmatha_ref),
-            selectinload(AramaData.viharadhipathi_ref)
-        )
 
         # General search (existing functionality)
         if search:
@@ -198,6 +191,27 @@ class AramaRepository:
             )
             order_desc = data_entry_role is not None
 
+        if unpaged:
+            return query.order_by(AramaData.ar_id.desc() if order_desc else AramaData.ar_id)
+
+        # Eager load relationships of the page - only direct foreign keys, no cascading
+        query = query.options(
+            selectinload(AramaData.arama_lands),
+            selectinload(AramaData.resident_silmathas),
+            selectinload(AramaData.province_ref),
+            selectinload(AramaData.district_ref),
+            selectinload(AramaData.divisional_secretariat_ref),
+            selectinload(AramaData.pradeshya_sabha_ref),
+            selectinload(AramaData.gn_division_ref),
+            selectinload(AramaData.nikaya_ref),
+            selectinload(AramaData.parshawa_ref),
+            selectinload(AramaData.owner_silmatha_ref),
+            selectinload(AramaData.viharadhipathi_ref)
+        )
+
+        if keyset:
+            return keyset_paginate(query, [(AramaData.ar_id, order_desc)], limit, cursor)
+
         query = query.order_by(AramaData.ar_id.desc() if order_desc else AramaData.ar_id)
 
         return query.offset(max(skip, 0)).limit(limit).all()
@@ -1,15 +1,18 @@
 # app/repositories/bhikku_high_repo.py
 from datetime import datetime
-from typing import Optional
+from typing import Mapping, Optional
 
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session, noload
 
 from app.models.bhikku_high import BhikkuHighRegist
+from app.models.temp_reference import ENTITY_BHIKKU_HIGH
 from app.models.user import UserAccount
 from app.models.roles import Role
 from app.models.user_roles import UserRole
+from app.repositories.temp_reference_repo import TempTarget, temp_reference_repo
 from app.schemas.bhikku_high import BhikkuHighCreate, BhikkuHighUpdate
+from app.utils.pagination import KeysetPage, keyset_paginate
 
 
 class BhikkuHighRepository:
@@ -131,7 +134,11 @@ class BhikkuHighRepository:
         status: Optional[list] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
-    ) -> list[BhikkuHighRegist]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        from_end: bool = False,
+    ) -> list[BhikkuHighRegist] | KeysetPage:
+        """With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned."""
         from app.models.bhikku import Bhikku
         
         # Need to join with candidate bhikku for location filters
@@ -258,6 +265,9 @@ class BhikkuHighRepository:
             )
             order_desc = data_entry_role is not None
 
+        if keyset:
+            return keyset_paginate(query, [(BhikkuHighRegist.bhr_id, order_desc)], limit, cursor, from_end)
+
         query = query.order_by(BhikkuHighRegist.bhr_id.desc() if order_desc else BhikkuHighRegist.bhr_id)
 
         return query.offset(max(skip, 0)).limit(limit).all()
@@ -375,7 +385,12 @@ class BhikkuHighRepository:
         return query.scalar() or 0
 
     def create(
-        self, db: Session, *, data: BhikkuHighCreate, actor_id: Optional[str]
+        self,
+        db: Session,
+        *,
+        data: BhikkuHighCreate,
+        actor_id: Optional[str],
+        temp_references: Optional[Mapping[str, TempTarget]] = None,
     ) -> BhikkuHighRegist:
         from sqlalchemy.exc import IntegrityError
         
@@ -399,6 +414,11 @@ class BhikkuHighRepository:
 
                 entity = BhikkuHighRegist(**payload)
                 db.add(entity)
+                if temp_references:
+                    db.flush()
+                    temp_reference_repo.apply(
+                        db, entity=ENTITY_BHIKKU_HIGH, entity_id=entity.bhr_id, changes=temp_references
+                    )
                 db.commit()
                 db.refresh(entity)
                 return entity
@@ -419,6 +439,7 @@ class BhikkuHighRepository:
         entity: BhikkuHighRegist,
         data: BhikkuHighUpdate,
         actor_id: Optional[str],
+        temp_references: Optional[Mapping[str, TempTarget]] = None,
     ) -> BhikkuHighRegist:
         update_data = data.model_dump(exclude_unset=True)
         update_data.pop("bhr_regn", None)
@@ -432,6 +453,9 @@ class BhikkuHighRepository:
         now = datetime.utcnow()
         entity.bhr_updated_at = now
         entity.bhr_version = now
+        temp_reference_repo.apply(
+            db, entity=ENTITY_BHIKKU_HIGH, entity_id=entity.bhr_id, changes=temp_references or {}
+        )
         db.commit()
         db.refresh(entity)
         return entity
@@ -5,6 +5,7 @@ from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Session
 
 from app.models.bhikku_id_card import BhikkuIDCard
+from app.utils.pagination import KeysetPage, keyset_paginate
 from app.schemas.bhikku_id_card import BhikkuIDCardCreate, BhikkuIDCardUpdate
 
 
@@ -192,7 +193,9 @@ class BhikkuIDCardRepository:
         limit: int = 100,
         workflow_status: Optional[str] = None,
         search_key: Optional[str] = None,
-    ) -> tuple[List[BhikkuIDCard], int]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[BhikkuIDCard] | KeysetPage, int]:
         """
         Get all Bhikku ID Cards with optional filtering, pagination, and search.
         
@@ -202,6 +205,8 @@ class BhikkuIDCardRepository:
             limit: Maximum number of records to return
             workflow_status: Filter by workflow status
             search_key: Search across multiple text fields
+            keyset: Return a KeysetPage fetched after/before `cursor` instead of an offset page
+            cursor: next_cursor / prev_cursor of a previous keyset page
             
         Returns:
             Tuple of (list of BhikkuIDCard records, total count)
@@ -230,6 +235,10 @@ class BhikkuIDCardRepository:
         # Get total count before pagination
         total = query.count()
         
+        if keyset:
+            order = [(BhikkuIDCard.bic_created_at, True), (BhikkuIDCard.bic_id, True)]
+            return keyset_paginate(query, order, limit, cursor), total
+
         # Apply pagination and ordering
         records = query.order_by(BhikkuIDCard.bic_created_at.desc()).offset(skip).limit(limit).all()
         
@@ -1,15 +1,16 @@
 # app/repositories/bhikku_repo.py
 from datetime import datetime
-from typing import Optional
+from typing import Mapping, Optional
 
-from sqlalchemy import func, or_
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.models import bhikku as models
-from app.models.roles import Role
-from app.models.user_roles import UserRole
+from app.models.temp_reference import ENTITY_BHIKKU
 from app.models.user import UserAccount
+from app.repositories.temp_reference_repo import TempTarget, temp_reference_repo
 from app.schemas import bhikku as schemas
+from app.services.bhikku_search import apply_search
+from app.utils.pagination import keyset_paginate
 
 
 class BhikkuRepository:
@@ -99,9 +100,15 @@ class BhikkuRepository:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         current_user: Optional[UserAccount] = None,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        unpaged: bool = False,
     ):
-        """Get paginated bhikkus with optional search functionality across all text fields and temple names."""
-        from app.models.vihara import ViharaData
+        """
+        Get paginated bhikkus with optional search functionality across all text fields and temple names.
+        With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned.
+        With `unpaged=True` the ordered query is returned without skip / limit (exports).
+        """
         query = db.query(models.Bhikku).filter(models.Bhikku.br_is_deleted.is_(False))
 
         # Apply location-based filtering for all workflow stages except COMPLETED
@@ -115,45 +122,8 @@ class BhikkuRepository:
                 workflow_status_field_name='br_workflow_status'
             )
 
-        # Apply search filter - includes temple names via join
-        if search_key and search_key.strip():
-            search_pattern = f"%{search_key.strip()}%"
-            # Join with ViharaData to search temple names
-            query = query.outerjoin(
-                ViharaData, 
-                or_(
-                    models.Bhikku.br_livtemple == ViharaData.vh_trn,
-                    models.Bhikku.br_mahanatemple == ViharaData.vh_trn
-                )
-            ).filter(
-                or_(
-                    models.Bhikku.br_regn.ilike(search_pattern),
-                    models.Bhikku.br_upasampada_serial_no.ilike(search_pattern),
-                    models.Bhikku.br_gihiname.ilike(search_pattern),
-                    models.Bhikku.br_fathrname.ilike(search_pattern),
-                    models.Bhikku.br_mahananame.ilike(search_pattern),
-                    models.Bhikku.br_birthpls.ilike(search_pattern),
-                    models.Bhikku.br_province.ilike(search_pattern),
-                    models.Bhikku.br_district.ilike(search_pattern),
-                    models.Bhikku.br_korale.ilike(search_pattern),
-                    models.Bhikku.br_pattu.ilike(search_pattern),
-                    models.Bhikku.br_division.ilike(search_pattern),
-                    models.Bhikku.br_vilage.ilike(search_pattern),
-                    models.Bhikku.br_gndiv.ilike(search_pattern),
-                    models.Bhikku.br_mobile.ilike(search_pattern),
-                    models.Bhikku.br_email.ilike(search_pattern),
-                    models.Bhikku.br_fathrsaddrs.ilike(search_pattern),
-                    models.Bhikku.br_fathrsmobile.ilike(search_pattern),
-                    models.Bhikku.br_parshawaya.ilike(search_pattern),
-                    models.Bhikku.br_livtemple.ilike(search_pattern),
-                    models.Bhikku.br_mahanatemple.ilike(search_pattern),
-                    models.Bhikku.br_mahanaacharyacd.ilike(search_pattern),
-                    models.Bhikku.br_currstat.ilike(search_pattern),
-                    models.Bhikku.br_cat.ilike(search_pattern),
-                    ViharaData.vh_vname.ilike(search_pattern),  # Search by temple name
-                    ViharaData.vh_addrs.ilike(search_pattern),  # Search by temple address
-                )
-            )
+        # Apply search filter - bhikku fields plus temple names/addresses via the search document
+        query, search_rank = apply_search(query, search_key)
 
         # Apply advanced filters
         if province:
@@ -210,25 +180,22 @@ class BhikkuRepository:
         # Data Entry users should see newest first
         order_desc = False
         if current_user:
-            now = datetime.utcnow()
-            data_entry_role = (
-                db.query(UserRole)
-                .join(Role, Role.ro_role_id == UserRole.ur_role_id)
-                .filter(
-                    UserRole.ur_user_id == current_user.ua_user_id,
-                    UserRole.ur_is_active.is_(True),
-                    (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-                    Role.ro_level == "DATA_ENTRY",
-                )
-                .first()
-            )
-            order_desc = data_entry_role is not None
+            from app.api.auth_dependencies import resolve_auth_context
+            order_desc = resolve_auth_context(db, current_user).has_role_level("DATA_ENTRY")
+
+        order = [(models.Bhikku.br_id, order_desc)]
+        if search_rank is not None:
+            order.insert(0, (search_rank, True))
 
-        query = query.order_by(models.Bhikku.br_id.desc() if order_desc else models.Bhikku.br_id)
+        if keyset:
+            return keyset_paginate(query, order, limit, cursor)
 
+        query = query.order_by(*[expr.desc() if desc else expr.asc() for expr, desc in order])
+        if unpaged:
+            return query
         return query.offset(max(skip, 0)).limit(limit).all()
 
-    def get_total_count(
+    def count_query(
         self, 
         db: Session, 
         search_key: Optional[str] = None,
@@ -248,57 +215,15 @@ class BhikkuRepository:
         date_to: Optional[str] = None,
         current_user: Optional[UserAccount] = None,
     ):
-        """Get total count of non-deleted bhikkus for pagination with optional search."""
-        from app.models.vihara import ViharaData
-        query = db.query(func.count(models.Bhikku.br_id)).filter(
-            models.Bhikku.br_is_deleted.is_(False)
-        )
-
+        """Non-deleted bhikkus matching the READ_ALL filters, as a row query for counting."""
         # Location-based access control removed - use RBAC permissions instead
         # Access control is now handled by FastAPI dependencies (has_permission, has_role, etc.)
         
         # Base query for count
         base_query = db.query(models.Bhikku).filter(models.Bhikku.br_is_deleted.is_(False))
 
-        # Apply search filter - includes temple names via join
-        if search_key and search_key.strip():
-            search_pattern = f"%{search_key.strip()}%"
-            # Join with ViharaData to search temple names
-            base_query = base_query.outerjoin(
-                ViharaData, 
-                or_(
-                    models.Bhikku.br_livtemple == ViharaData.vh_trn,
-                    models.Bhikku.br_mahanatemple == ViharaData.vh_trn
-                )
-            ).filter(
-                or_(
-                    models.Bhikku.br_regn.ilike(search_pattern),
-                    models.Bhikku.br_upasampada_serial_no.ilike(search_pattern),
-                    models.Bhikku.br_gihiname.ilike(search_pattern),
-                    models.Bhikku.br_fathrname.ilike(search_pattern),
-                    models.Bhikku.br_mahananame.ilike(search_pattern),
-                    models.Bhikku.br_birthpls.ilike(search_pattern),
-                    models.Bhikku.br_province.ilike(search_pattern),
-                    models.Bhikku.br_district.ilike(search_pattern),
-                    models.Bhikku.br_korale.ilike(search_pattern),
-                    models.Bhikku.br_pattu.ilike(search_pattern),
-                    models.Bhikku.br_division.ilike(search_pattern),
-                    models.Bhikku.br_vilage.ilike(search_pattern),
-                    models.Bhikku.br_gndiv.ilike(search_pattern),
-                    models.Bhikku.br_mobile.ilike(search_pattern),
-                    models.Bhikku.br_email.ilike(search_pattern),
-                    models.Bhikku.br_fathrsaddrs.ilike(search_pattern),
-                    models.Bhikku.br_fathrsmobile.ilike(search_pattern),
-                    models.Bhikku.br_parshawaya.ilike(search_pattern),
-                    models.Bhikku.br_livtemple.ilike(search_pattern),
-                    models.Bhikku.br_mahanatemple.ilike(search_pattern),
-                    models.Bhikku.br_mahanaacharyacd.ilike(search_pattern),
-                    models.Bhikku.br_currstat.ilike(search_pattern),
-                    models.Bhikku.br_cat.ilike(search_pattern),
-                    ViharaData.vh_vname.ilike(search_pattern),  # Search by temple name
-                    ViharaData.vh_addrs.ilike(search_pattern),  # Search by temple address
-                )
-            )
+        # Apply search filter - bhikku fields plus temple names/addresses via the search document
+        base_query, _ = apply_search(base_query, search_key)
 
         # Apply advanced filters (same as get_all)
         if province:
@@ -352,8 +277,48 @@ class BhikkuRepository:
         if date_to:
             base_query = base_query.filter(models.Bhikku.br_reqstdate <= date_to)
 
-        # Return count
-        return base_query.count()
+        return base_query
+
+    def get_total_count(
+        self, 
+        db: Session, 
+        search_key: Optional[str] = None,
+        province: Optional[str] = None,
+        vh_trn: Optional[str] = None,
+        district: Optional[str] = None,
+        divisional_secretariat: Optional[str] = None,
+        gn_division: Optional[str] = None,
+        temple: Optional[str] = None,
+        child_temple: Optional[str] = None,
+        nikaya: Optional[str] = None,
+        parshawaya: Optional[str] = None,
+        category: Optional[list[str]] = None,
+        status: Optional[list[str]] = None,
+        workflow_status: Optional[list[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        current_user: Optional[UserAccount] = None,
+    ):
+        """Get total count of non-deleted bhikkus for pagination with optional search."""
+        return self.count_query(
+            db,
+            search_key=search_key,
+            province=province,
+            vh_trn=vh_trn,
+            district=district,
+            divisional_secretariat=divisional_secretariat,
+            gn_division=gn_division,
+            temple=temple,
+            child_temple=child_temple,
+            nikaya=nikaya,
+            parshawaya=parshawaya,
+            category=category,
+            status=status,
+            workflow_status=workflow_status,
+            date_from=date_from,
+            date_to=date_to,
+            current_user=current_user,
+        ).count()
 
     def get_by_mobile(self, db: Session, br_mobile: str):
         return (
@@ -385,7 +350,12 @@ class BhikkuRepository:
             .first()
         )
 
-    def create(self, db: Session, bhikku: schemas.BhikkuCreate):
+    def create(
+        self,
+        db: Session,
+        bhikku: schemas.BhikkuCreate,
+        temp_references: Optional[Mapping[str, TempTarget]] = None,
+    ):
         # Auto-generate br_regn if not provided or empty.
         if not bhikku.br_regn or bhikku.br_regn.strip() == "":
             bhikku.br_regn = self.generate_next_regn(db)
@@ -401,11 +371,22 @@ class BhikkuRepository:
         db_bhikku.br_workflow_status = "PENDING"
 
         db.add(db_bhikku)
+        if temp_references:
+            db.flush()
+            temp_reference_repo.apply(
+                db, entity=ENTITY_BHIKKU, entity_id=db_bhikku.br_id, changes=temp_references
+            )
         db.commit()
         db.refresh(db_bhikku)
         return db_bhikku
 
-    def update(self, db: Session, br_regn: str, bhikku_update: schemas.BhikkuUpdate):
+    def update(
+        self,
+        db: Session,
+        br_regn: str,
+        bhikku_update: schemas.BhikkuUpdate,
+        temp_references: Optional[Mapping[str, TempTarget]] = None,
+    ):
         db_bhikku = self.get_by_regn(db, br_regn)
         if not db_bhikku:
             return None
@@ -421,6 +402,9 @@ class BhikkuRepository:
         now = datetime.utcnow()
         db_bhikku.br_updated_at = now
         db_bhikku.br_version = now
+        temp_reference_repo.apply(
+            db, entity=ENTITY_BHIKKU, entity_id=db_bhikku.br_id, changes=temp_references or {}
+        )
 
         db.commit()
         db.refresh(db_bhikku)
@@ -4,7 +4,7 @@ from datetime import datetime
 
 from sqlalchemy import func, or_, select, text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from app.models.devala import DevalaData
 from app.models.devala_land import DevalaLand
@@ -12,6 +12,7 @@ from app.models.user import UserAccount
 from app.models.roles import Role
 from app.models.user_roles import UserRole
 from app.schemas.devala import DevalaCreate, DevalaUpdate
+from app.utils.pagination import KeysetPage, keyset_paginate
 
 
 class DevalaRepository:
@@ -90,7 +91,14 @@ class DevalaRepository:
         date_from: Optional[Any] = None,
         date_to: Optional[Any] = None,
         current_user: Optional[UserAccount] = None,
-    ) -> list[DevalaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        unpaged: bool = False,
+    ) -> list[DevalaData] | KeysetPage | Query:
+        """
+        With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned.
+        With `unpaged=True` the ordered query is returned without skip / limit (exports).
+        """
         query = db.query(DevalaData).filter(DevalaData.dv_is_deleted.is_(False))
 
         # General search (existing functionality)
@@ -155,7 +163,12 @@ class DevalaRepository:
             )
             order_desc = data_entry_role is not None
 
+        if keyset:
+            return keyset_paginate(query, [(DevalaData.dv_id, order_desc)], limit, cursor)
+
         query = query.order_by(DevalaData.dv_id.desc() if order_desc else DevalaData.dv_id)
+        if unpaged:
+            return query
 
         return query.offset(max(skip, 0)).limit(limit).all()
 
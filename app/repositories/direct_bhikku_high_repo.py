@@ -4,17 +4,54 @@ Repository for Direct High Bhikku Registration
 Handles data access operations for combined bhikku and high bhikku records
 """
 import time
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy import func, or_, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.temp_reference import ENTITY_DIRECT_BHIKKU_HIGH, KIND_BHIKKU, KIND_VIHARA
 from app.models.user import UserAccount
 from app.models.roles import Role
 from app.models.user_roles import UserRole
+from app.repositories.temp_reference_repo import TempTarget, parse_temp_id, temp_reference_repo
 from app.schemas.direct_bhikku_high import DirectBhikkuHighCreate, DirectBhikkuHighUpdate
+from app.utils.pagination import KeysetPage, keyset_paginate
+
+
+# Fields that may reference a temporary bhikku / vihara (kept in temp_reference)
+TEMP_BHIKKU_FIELDS = (
+    "dbh_karmacharya_name",
+    "dbh_upaddhyaya_name",
+    "dbh_tutors_tutor_regn",
+    "dbh_presiding_bhikshu_regn",
+    "dbh_samanera_serial_no",
+)
+TEMP_VIHARA_FIELDS = (
+    "dbh_livtemple",
+    "dbh_residence_higher_ordination_trn",
+    "dbh_residence_permanent_trn",
+    "dbh_higher_ordination_place",
+)
+
+
+def _take_temp_references(data: Dict[str, Any]) -> Dict[str, TempTarget]:
+    """
+    Clear "TEMP-<id>" values of the reference fields in `data` and return the
+    temp_reference changes for every reference field present in `data`.
+    """
+    changes: Dict[str, TempTarget] = {}
+    for fields, kind in ((TEMP_BHIKKU_FIELDS, KIND_BHIKKU), (TEMP_VIHARA_FIELDS, KIND_VIHARA)):
+        for field in fields:
+            if field not in data:
+                continue
+            temp_id = None
+            if data[field] is not None and str(data[field]).startswith("TEMP-"):
+                temp_id = parse_temp_id(str(data[field]))
+                data[field] = None
+            changes[field] = (kind, temp_id) if temp_id is not None else None
+    return changes
 
 
 class DirectBhikkuHighRepository:
@@ -65,8 +102,14 @@ class DirectBhikkuHighRepository:
         date_from: Optional[Any] = None,
         date_to: Optional[Any] = None,
         current_user = None,
-    ) -> list[DirectBhikkuHigh]:
-        """List direct high bhikku records with filters"""
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        from_end: bool = False,
+    ) -> list[DirectBhikkuHigh] | KeysetPage:
+        """
+        List direct high bhikku records with filters.
+        With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned.
+        """
         query = db.query(DirectBhikkuHigh).filter(
             DirectBhikkuHigh.dbh_is_deleted.is_(False)
         )
@@ -141,6 +184,9 @@ class DirectBhikkuHighRepository:
             )
             order_desc = data_entry_role is not None
 
+        if keyset:
+            return keyset_paginate(query, [(DirectBhikkuHigh.dbh_id, order_desc)], limit, cursor, from_end)
+
         query = query.order_by(DirectBhikkuHigh.dbh_id.desc() if order_desc else DirectBhikkuHigh.dbh_id)
 
         return query.offset(max(skip, 0)).limit(limit).all()
@@ -213,8 +259,6 @@ class DirectBhikkuHighRepository:
         self, db: Session, *, payload: DirectBhikkuHighCreate, actor_id: str, current_user=None
     ) -> DirectBhikkuHigh:
         """Create a new direct high bhikku record"""
-        import re
-        
         # Convert payload to dict
         data = payload.model_dump(exclude_unset=True, exclude_none=False)
         
@@ -234,42 +278,10 @@ class DirectBhikkuHighRepository:
             if user_district:
                 data["dbh_created_by_district"] = user_district
 
-        # Handle temporary bhikku references (TEMP-*)
-        temp_remarks = []
-        bhikku_fk_fields = [
-            "dbh_karmacharya_name",
-            "dbh_upaddhyaya_name", 
-            "dbh_tutors_tutor_regn",
-            "dbh_presiding_bhikshu_regn",
-            "dbh_samanera_serial_no",
-        ]
-        for field in bhikku_fk_fields:
-            if field in data and data[field]:
-                value = str(data[field])
-                if value.startswith("TEMP-"):
-                    temp_id = value.replace("TEMP-", "")
-                    temp_remarks.append(f"[TEMP_DBH_{field.upper().replace('DBH_', '')}:{temp_id}]")
-                    data[field] = None
-        
-        # Handle temporary vihara references (TEMP-*)
-        vihara_fk_fields = [
-            "dbh_livtemple",
-            "dbh_residence_higher_ordination_trn",
-            "dbh_residence_permanent_trn",
-            "dbh_higher_ordination_place",
-        ]
-        for field in vihara_fk_fields:
-            if field in data and data[field]:
-                value = str(data[field])
-                if value.startswith("TEMP-"):
-                    temp_id = value.replace("TEMP-", "")
-                    temp_remarks.append(f"[TEMP_DBH_{field.upper().replace('DBH_', '')}:{temp_id}]")
-                    data[field] = None
-        
-        # Append temp references to remarks
-        if temp_remarks:
-            existing_remarks = data.get("dbh_remarks") or ""
-            data["dbh_remarks"] = (existing_remarks + " " + " ".join(temp_remarks)).strip()
+        # Handle temporary bhikku / vihara references (TEMP-*)
+        temp_references = {
+            field: target for field, target in _take_temp_references(data).items() if target
+        }
 
         entity = DirectBhikkuHigh(**data)
 
@@ -277,6 +289,11 @@ class DirectBhikkuHighRepository:
         for attempt in range(max_retries):
             try:
                 db.add(entity)
+                if temp_references:
+                    db.flush()
+                    temp_reference_repo.apply(
+                        db, entity=ENTITY_DIRECT_BHIKKU_HIGH, entity_id=entity.dbh_id, changes=temp_references
+                    )
                 db.commit()
                 db.refresh(entity)
                 return entity
@@ -307,8 +324,6 @@ class DirectBhikkuHighRepository:
         actor_id: str,
     ) -> DirectBhikkuHigh:
         """Update an existing direct high bhikku record"""
-        import re
-        
         update_data = payload.model_dump(exclude_unset=True, exclude_none=False)
         
         # Remove fields that shouldn't be updated directly
@@ -320,54 +335,9 @@ class DirectBhikkuHighRepository:
         # Set audit fields
         update_data["dbh_updated_by"] = actor_id
 
-        # Handle temporary bhikku references (TEMP-*)
-        temp_remarks = []
-        current_remarks = entity.dbh_remarks or ""
-        
-        # Remove old temp references from remarks before adding new ones
-        current_remarks = re.sub(r'\[TEMP_DBH_[A-Z_]+:\d+\]', '', current_remarks).strip()
-        
-        bhikku_fk_fields = [
-            "dbh_karmacharya_name",
-            "dbh_upaddhyaya_name",
-            "dbh_tutors_tutor_regn",
-            "dbh_presiding_bhikshu_regn",
-            "dbh_samanera_serial_no",
-        ]
-        for field in bhikku_fk_fields:
-            if field in update_data and update_data[field] is not None:
-                value = str(update_data[field])
-                if value.startswith("TEMP-"):
-                    temp_id = value.replace("TEMP-", "")
-                    temp_remarks.append(f"[TEMP_DBH_{field.upper().replace('DBH_', '')}:{temp_id}]")
-                    update_data[field] = None
-        
-        # Handle temporary vihara references (TEMP-*)
-        vihara_fk_fields = [
-            "dbh_livtemple",
-            "dbh_residence_higher_ordination_trn",
-            "dbh_residence_permanent_trn",
-            "dbh_higher_ordination_place",
-        ]
-        for field in vihara_fk_fields:
-            if field in update_data and update_data[field] is not None:
-                value = str(update_data[field])
-                if value.startswith("TEMP-"):
-                    temp_id = value.replace("TEMP-", "")
-                    temp_remarks.append(f"[TEMP_DBH_{field.upper().replace('DBH_', '')}:{temp_id}]")
-                    update_data[field] = None
-        
-        # Update remarks with temp references
-        if temp_remarks:
-            # If remarks are being updated in payload, use that as base
-            if "dbh_remarks" in update_data and update_data["dbh_remarks"]:
-                base_remarks = update_data["dbh_remarks"]
-                # Clean temp refs from new remarks too
-                base_remarks = re.sub(r'\[TEMP_DBH_[A-Z_]+:\d+\]', '', base_remarks).strip()
-            else:
-                base_remarks = current_remarks
-            update_data["dbh_remarks"] = (base_remarks + " " + " ".join(temp_remarks)).strip()
-
+        # Handle temporary bhikku / vihara references (TEMP-*). A real value
+        # (or null) for a reference field drops the field's temp reference.
+        temp_references = _take_temp_references(update_data)
 
         for field, value in update_data.items():
             setattr(entity, field, value)
@@ -376,6 +346,9 @@ class DirectBhikkuHighRepository:
         entity.dbh_version_number = (entity.dbh_version_number or 1) + 1
 
         try:
+            temp_reference_repo.apply(
+                db, entity=ENTITY_DIRECT_BHIKKU_HIGH, entity_id=entity.dbh_id, changes=temp_references
+            )
             db.commit()
             db.refresh(entity)
             return entity
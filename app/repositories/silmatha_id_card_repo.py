@@ -5,6 +5,7 @@ from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Session
 
 from app.models.silmatha_id_card import SilmathaIDCard
+from app.utils.pagination import KeysetPage, keyset_paginate
 from app.schemas.silmatha_id_card import SilmathaIDCardCreate, SilmathaIDCardUpdate
 
 
@@ -176,8 +177,10 @@ class SilmathaIDCardRepository:
         skip: int = 0,
         limit: int = 100,
         workflow_status: Optional[str] = None,
-        search_key: Optional[str] = None
-    ) -> tuple[List[SilmathaIDCard], int]:
+        search_key: Optional[str] = None,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[SilmathaIDCard] | KeysetPage, int]:
         """
         Get all Silmatha ID Cards with filtering and pagination.
         
@@ -187,6 +190,8 @@ class SilmathaIDCardRepository:
             limit: Max records to return
             workflow_status: Filter by workflow status
             search_key: Search in name, regn, form_no, national_id
+            keyset: Return a KeysetPage fetched after/before `cursor` instead of an offset page
+            cursor: next_cursor / prev_cursor of a previous keyset page
             
         Returns:
             Tuple of (list of records, total count)
@@ -213,6 +218,10 @@ class SilmathaIDCardRepository:
         # Get total count
         total = query.count()
 
+        if keyset:
+            order = [(SilmathaIDCard.sic_created_at, True), (SilmathaIDCard.sic_id, True)]
+            return keyset_paginate(query, order, limit, cursor), total
+
         # Apply pagination
         records = query.order_by(SilmathaIDCard.sic_created_at.desc()).offset(skip).limit(limit).all()
 
@@ -10,6 +10,7 @@ from app.models.user import UserAccount
 from app.models.roles import Role
 from app.models.user_roles import UserRole
 from app.schemas import silmatha_regist as schemas
+from app.utils.pagination import keyset_paginate
 
 
 class SilmathaRegistRepository:
@@ -127,8 +128,15 @@ class SilmathaRegistRepository:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         current_user: Optional[UserAccount] = None,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        unpaged: bool = False,
     ):
-        """Get paginated silmatha records with optional search functionality across all text fields."""
+        """
+        Get paginated silmatha records with optional search functionality across all text fields.
+        With `keyset=True` the page is fetched after/before `cursor` and a KeysetPage is returned.
+        With `unpaged=True` the ordered query is returned without skip / limit (exports).
+        """
         query = db.query(SilmathaRegist).filter(SilmathaRegist.sil_is_deleted.is_(False))
 
         # Apply location-based filtering for all workflow stages except COMPLETED
@@ -232,7 +240,12 @@ class SilmathaRegistRepository:
             )
             order_desc = data_entry_role is not None
 
+        if keyset:
+            return keyset_paginate(query, [(SilmathaRegist.sil_id, order_desc)], limit, cursor)
+
         query = query.order_by(SilmathaRegist.sil_id.desc() if order_desc else SilmathaRegist.sil_id)
+        if unpaged:
+            return query
 
         return query.offset(max(skip, 0)).limit(limit).all()
 
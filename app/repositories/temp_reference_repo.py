@@ -0,0 +1,124 @@
+# app/repositories/temp_reference_repo.py
+"""
+References from registration fields to temporary bhikku / vihara records.
+
+Write paths pass {field: (temp kind, temp id)} to set a reference and
+{field: None} to clear it; fields that are not mentioned keep theirs.
+Reads resolve every reference of a page, with the temporary record names,
+in one query.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.temp_reference import KIND_BHIKKU, KIND_VIHARA, TempReference
+from app.models.temporary_bhikku import TemporaryBhikku
+from app.models.temporary_vihara import TemporaryVihara
+
+# (tr_temp_kind, tr_temp_id); None clears the field's reference
+TempTarget = Optional[Tuple[str, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedTempReference:
+    kind: str
+    temp_id: int
+    name: str
+
+
+def parse_temp_id(value) -> Optional[int]:
+    """Temporary record id of a "TEMP-<id>" value, None for anything else."""
+    if isinstance(value, str) and value.startswith("TEMP-") and value[5:].isdigit():
+        return int(value[5:])
+    return None
+
+
+class TempReferenceRepository:
+    def apply(
+        self,
+        db: Session,
+        *,
+        entity: str,
+        entity_id: int,
+        changes: Mapping[str, TempTarget],
+    ) -> None:
+        """Set or clear the references of the fields in `changes`. The caller commits."""
+        if not changes:
+            return
+        existing = {
+            ref.tr_field: ref
+            for ref in db.query(TempReference).filter(
+                TempReference.tr_entity == entity,
+                TempReference.tr_entity_id == entity_id,
+                TempReference.tr_field.in_(list(changes)),
+            )
+        }
+        for field, target in changes.items():
+            ref = existing.get(field)
+            if target is None:
+                if ref is not None:
+                    db.delete(ref)
+            elif ref is None:
+                db.add(TempReference(
+                    tr_entity=entity,
+                    tr_entity_id=entity_id,
+                    tr_field=field,
+                    tr_temp_kind=target[0],
+                    tr_temp_id=target[1],
+                ))
+            else:
+                ref.tr_temp_kind, ref.tr_temp_id = target
+
+    def resolve_page(
+        self, db: Session, *, entity: str, entity_ids: Iterable[int]
+    ) -> Dict[int, Dict[str, ResolvedTempReference]]:
+        """
+        {entity id: {field: reference}} for a page of rows. References whose
+        temporary record no longer exists are left out.
+        """
+        ids = {entity_id for entity_id in entity_ids if entity_id is not None}
+        resolved: Dict[int, Dict[str, ResolvedTempReference]] = {entity_id: {} for entity_id in ids}
+        if not ids:
+            return resolved
+
+        stmt = (
+            select(
+                TempReference.tr_entity_id,
+                TempReference.tr_field,
+                TempReference.tr_temp_kind,
+                TempReference.tr_temp_id,
+                func.coalesce(TemporaryBhikku.tb_name, TemporaryVihara.tv_name),
+            )
+            .outerjoin(TemporaryBhikku, and_(
+                TempReference.tr_temp_kind == KIND_BHIKKU,
+                TemporaryBhikku.tb_id == TempReference.tr_temp_id,
+            ))
+            .outerjoin(TemporaryVihara, and_(
+                TempReference.tr_temp_kind == KIND_VIHARA,
+                TemporaryVihara.tv_id == TempReference.tr_temp_id,
+            ))
+            .where(
+                TempReference.tr_entity == entity,
+                TempReference.tr_entity_id.in_(ids),
+                or_(TemporaryBhikku.tb_id.isnot(None), TemporaryVihara.tv_id.isnot(None)),
+            )
+        )
+        for entity_id, field, kind, temp_id, name in db.execute(stmt):
+            resolved[entity_id][field] = ResolvedTempReference(kind=kind, temp_id=temp_id, name=name or "")
+        return resolved
+
+    def referencing_ids(self, *, entity: str, field: str, kind: str, temp_id: int) -> Select:
+        """SELECT of the ids of `entity` rows whose `field` references the given temporary record."""
+        return select(TempReference.tr_entity_id).where(
+            TempReference.tr_entity == entity,
+            TempReference.tr_field == field,
+            TempReference.tr_temp_kind == kind,
+            TempReference.tr_temp_id == temp_id,
+        )
+
+
+temp_reference_repo = TempReferenceRepository()
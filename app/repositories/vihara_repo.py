@@ -1,19 +1,17 @@
 import time
 from typing import Any, Optional
-from datetime import datetime
 
 from sqlalchemy import func, or_, select, text, case
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Query, Session, joinedload
 
 from app.models.vihara import ViharaData
 from app.models.temple_land import TempleLand
 from app.models.resident_bhikkhu import ResidentBhikkhu
 from app.models.vihara_land import ViharaLand
 from app.models.user import UserAccount
-from app.models.roles import Role
-from app.models.user_roles import UserRole
 from app.schemas.vihara import ViharaCreate, ViharaUpdate
+from app.utils.pagination import KeysetPage, keyset_paginate
 
 
 class ViharaRepository:
@@ -98,7 +96,15 @@ class ViharaRepository:
         sort_dir: Optional[str] = "asc",
         record_type: Optional[str] = "all",
         current_user: Optional[UserAccount] = None,
-    ) -> list[ViharaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        unpaged: bool = False,
+    ) -> list[ViharaData] | KeysetPage | Query:
+        """
+        Filtered, ordered vihara page. With `keyset=True` the page is fetched
+        after/before `cursor` instead of at `skip`, and a KeysetPage is returned.
+        With `unpaged=True` the ordered query is returned without skip / limit (exports).
+        """
         query = db.query(ViharaData).filter(ViharaData.vh_is_deleted.is_(False))
 
         # General search (existing functionality)
@@ -177,57 +183,21 @@ class ViharaRepository:
         # - Other users: See ascending order
         order_desc = False
         is_admin = False
+        auth = None
         
         if current_user:
-            now = datetime.utcnow()
-            
-            # Check for ADMIN role
-            admin_role = (
-                db.query(UserRole)
-                .join(Role, Role.ro_role_id == UserRole.ur_role_id)
-                .filter(
-                    UserRole.ur_user_id == current_user.ua_user_id,
-                    UserRole.ur_is_active.is_(True),
-                    (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-                    Role.ro_level == "ADMIN",
-                )
-                .first()
-            )
-            
-            if admin_role:
-                # Admin users see ALL records with pending approvals at the top
-                is_admin = True
-            else:
-                # Check for DATA_ENTRY role
-                data_entry_role = (
-                    db.query(UserRole)
-                    .join(Role, Role.ro_role_id == UserRole.ur_role_id)
-                    .filter(
-                        UserRole.ur_user_id == current_user.ua_user_id,
-                        UserRole.ur_is_active.is_(True),
-                        (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-                        Role.ro_level == "DATA_ENTRY",
-                    )
-                    .first()
-                )
-                order_desc = data_entry_role is not None
-        
-        # Apply ordering based on user role
+            from app.api.auth_dependencies import resolve_auth_context
+            auth = resolve_auth_context(db, current_user)
+            # Admin users see ALL records with pending approvals at the top
+            is_admin = auth.has_role_level("ADMIN")
+            if not is_admin:
+                order_desc = auth.has_role_level("DATA_ENTRY")
+        
+        # Apply ordering based on user role. `order` is a list of (expression, descending)
+        # pairs ending with vh_id so both OFFSET and keyset pages are deterministic.
         if is_admin:
             # Check if this is specifically a vihara_admin (VIHA_ADM role)
-            vihara_admin_role = (
-                db.query(UserRole)
-                .join(Role, Role.ro_role_id == UserRole.ur_role_id)
-                .filter(
-                    UserRole.ur_user_id == current_user.ua_user_id,
-                    UserRole.ur_is_active.is_(True),
-                    (UserRole.ur_expires_date.is_(None) | (UserRole.ur_expires_date > now)),
-                    Role.ro_role_id == "VIHA_ADM",  # Specifically check for vihara_admin role
-                )
-                .first()
-            )
-            
-            if vihara_admin_role:
+            if auth.has_role("VIHA_ADM"):
                 # Vihara Admin: Special ordering as requested
                 # 1. First: Stage 1 and 2 pending approval (ascending)
                 # 2. Then: Completed stage records
@@ -241,7 +211,7 @@ class ViharaRepository:
                     # Priority 2: Other stages (pending, rejected, etc.)
                     else_=2
                 )
-                query = query.order_by(priority, ViharaData.vh_id.asc())
+                order = [(priority, False), (ViharaData.vh_id, False)]
             else:
                 # Other admin users: original behavior
                 # Admin: pending approval records first (ascending), then others (ascending)
@@ -250,10 +220,10 @@ class ViharaRepository:
                     (ViharaData.vh_workflow_status.in_(["S1_PEND_APPROVAL", "S2_PEND_APPROVAL"]), 0),
                     else_=1
                 )
-                query = query.order_by(priority, ViharaData.vh_id.asc())
+                order = [(priority, False), (ViharaData.vh_id, False)]
         else:
             # DATA_ENTRY or other users
-            query = query.order_by(ViharaData.vh_id.desc() if order_desc else ViharaData.vh_id)
+            order = [(ViharaData.vh_id, order_desc)]
 
         # User-driven sort (if specified, overrides role-based defaults)
         if sort_by:
@@ -270,17 +240,21 @@ class ViharaRepository:
             
             if sort_by in sortable_columns:
                 sort_column = sortable_columns[sort_by]
-                # Reset existing ORDER BY first — SQLAlchemy Query.order_by() appends,
-                # so without this the role-based priority ordering takes precedence.
-                query = query.order_by(False)
-                if sort_dir == 'desc':
-                    query = query.order_by(sort_column.desc())
-                else:
-                    query = query.order_by(sort_column.asc())
-
+                descending = sort_dir == 'desc'
+                order = [(sort_column, descending)]
+                if sort_by != 'vh_id':
+                    # vh_id tie-breaker keeps pages stable for non-unique sort columns
+                    order.append((ViharaData.vh_id, descending))
+
+        if keyset:
+            return keyset_paginate(query, order, limit, cursor)
+
+        query = query.order_by(*[expr.desc() if desc else expr.asc() for expr, desc in order])
+        if unpaged:
+            return query
         return query.offset(max(skip, 0)).limit(limit).all()
 
-    def count(
+    def count_query(
         self, 
         db: Session, 
         *, 
@@ -302,8 +276,9 @@ class ViharaRepository:
         date_to: Optional[Any] = None,
         record_type: Optional[str] = "all",
         current_user: Optional[UserAccount] = None,
-    ) -> int:
-        query = db.query(func.count(ViharaData.vh_id)).filter(
+    ) -> Query:
+        """Non-deleted viharas matching the READ_ALL filters, as a row query for counting."""
+        query = db.query(ViharaData.vh_id).filter(
             ViharaData.vh_is_deleted.is_(False)
         )
 
@@ -379,7 +354,52 @@ class ViharaRepository:
         # The count should reflect all matching records regardless of user role
         # Ordering/prioritization is handled in the list method
 
-        return query.scalar() or 0
+        return query
+
+    def count(
+        self, 
+        db: Session, 
+        *, 
+        search: Optional[str] = None,
+        vh_trn: Optional[str] = None,
+        province: Optional[str] = None,
+        district: Optional[str] = None,
+        divisional_secretariat: Optional[str] = None,
+        ssbmcode: Optional[str] = None,
+        gn_division: Optional[str] = None,
+        temple: Optional[str] = None,
+        child_temple: Optional[str] = None,
+        nikaya: Optional[str] = None,
+        parshawaya: Optional[str] = None,
+        category: Optional[str] = None,
+        workflow_status: Optional[str] = None,
+        vh_typ: Optional[str] = None,
+        date_from: Optional[Any] = None,
+        date_to: Optional[Any] = None,
+        record_type: Optional[str] = "all",
+        current_user: Optional[UserAccount] = None,
+    ) -> int:
+        return self.count_query(
+            db,
+            search=search,
+            vh_trn=vh_trn,
+            province=province,
+            district=district,
+            divisional_secretariat=divisional_secretariat,
+            ssbmcode=ssbmcode,
+            gn_division=gn_division,
+            temple=temple,
+            child_temple=child_temple,
+            nikaya=nikaya,
+            parshawaya=parshawaya,
+            category=category,
+            workflow_status=workflow_status,
+            vh_typ=vh_typ,
+            date_from=date_from,
+            date_to=date_to,
+            record_type=record_type,
+            current_user=current_user,
+        ).count()
 
     def create(self, db: Session, *, data: ViharaCreate) -> ViharaData:
         base_payload = self._strip_strings(data.model_dump(exclude_unset=True))
@@ -443,6 +443,9 @@ class AramaRequestPayload(BaseModel):
     limit: Annotated[int, Field(ge=1, le=200)] = 10
     page_size: Annotated[Optional[int], Field(default=None, ge=1, le=200)] = None  # Alias for limit
     page: Annotated[Optional[int], Field(default=1, ge=1)] = 1
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Annotated[Optional[str], Field(default=None, max_length=1000)] = None
     
     # Search and filters
     search_key: Annotated[Optional[str], Field(default=None, max_length=200)] = None
@@ -483,6 +486,8 @@ class AramaManagementResponse(BaseModel):
     totalRecords: Optional[int] = None
     page: Optional[int] = None
     limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # Simple Arama List Schema for Bhikku endpoints
@@ -304,6 +304,9 @@ class BhikkuRequestPayload(BaseModel):
     skip: Annotated[int, Field(ge=0)] = 0
     limit: Annotated[int, Field(ge=1, le=200)] = 10
     page: Annotated[Optional[int], Field(ge=1)] = 1
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Optional[str] = Field(None, max_length=1000)
     search_key: Optional[str] = Field(default="", max_length=100)
     # Advanced filters for READ_ALL
     province: Optional[str] = Field(None, description="Province code filter")
@@ -345,6 +348,22 @@ class BhikkuManagementResponse(BaseModel):
     data: Optional[Union[Bhikku, List[Bhikku], Any]] = None
     # Optional pagination fields (only for READ_ALL)
     totalRecords: Optional[int] = None
+    # False when totalRecords is a planner estimate (show it as approximate)
+    totalIsExact: Optional[bool] = None
+    page: Optional[int] = None
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class ReportViewResponse(BaseModel):
+    """Response of a bhikku report view endpoint (bikkudtls_* / bikkusumm_*)."""
+    status: str
+    message: str
+    # When the materialized view was last refreshed (views read live have none)
+    as_of: Optional[datetime] = None
+    # Only when the request was paginated (page / limit)
+    totalRecords: Optional[int] = None
     page: Optional[int] = None
     limit: Optional[int] = None
 
@@ -357,9 +376,7 @@ class BhikkuMahanayakaListItem(BaseModel):
     addrs: Optional[str] = None
 
 
-class BhikkuMahanayakaListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuMahanayakaListResponse(ReportViewResponse):
     data: List[BhikkuMahanayakaListItem]
 
 
@@ -371,9 +388,7 @@ class BhikkuNikayaListItem(BaseModel):
     regn: str
 
 
-class BhikkuNikayaListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuNikayaListResponse(ReportViewResponse):
     data: List[BhikkuNikayaListItem]
 
 
@@ -423,9 +438,7 @@ class BhikkuAcharyaListItem(BaseModel):
     regn: str
 
 
-class BhikkuAcharyaListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuAcharyaListResponse(ReportViewResponse):
     data: List[BhikkuAcharyaListItem]
 
 
@@ -451,9 +464,7 @@ class BhikkuDetailsListItem(BaseModel):
     vadescrdtls: Optional[str] = None
 
 
-class BhikkuDetailsListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuDetailsListResponse(ReportViewResponse):
     data: List[BhikkuDetailsListItem]
 
 
@@ -470,9 +481,7 @@ class BhikkuCertificationListItem(BaseModel):
     adminusr: Optional[str] = None
 
 
-class BhikkuCertificationListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuCertificationListResponse(ReportViewResponse):
     data: List[BhikkuCertificationListItem]
 
 
@@ -489,9 +498,7 @@ class BhikkuCertificationPrintListItem(BaseModel):
     adminusr: Optional[str] = None
 
 
-class BhikkuCertificationPrintListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuCertificationPrintListResponse(ReportViewResponse):
     data: List[BhikkuCertificationPrintListItem]
 
 
@@ -501,9 +508,7 @@ class BhikkuCurrentStatusListItem(BaseModel):
     regn: str
 
 
-class BhikkuCurrentStatusListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuCurrentStatusListResponse(ReportViewResponse):
     data: List[BhikkuCurrentStatusListItem]
 
 
@@ -513,9 +518,7 @@ class BhikkuDistrictListItem(BaseModel):
     regn: str
 
 
-class BhikkuDistrictListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuDistrictListResponse(ReportViewResponse):
     data: List[BhikkuDistrictListItem]
 
 
@@ -525,9 +528,7 @@ class BhikkuDivisionSecListItem(BaseModel):
     regn: str
 
 
-class BhikkuDivisionSecListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuDivisionSecListResponse(ReportViewResponse):
     data: List[BhikkuDivisionSecListItem]
 
 
@@ -537,9 +538,7 @@ class BhikkuGNListItem(BaseModel):
     regn: str
 
 
-class BhikkuGNListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuGNListResponse(ReportViewResponse):
     data: List[BhikkuGNListItem]
 
 
@@ -561,9 +560,7 @@ class BhikkuHistoryStatusListItem(BaseModel):
     regno: str
 
 
-class BhikkuHistoryStatusListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuHistoryStatusListResponse(ReportViewResponse):
     data: List[BhikkuHistoryStatusListItem]
 
 
@@ -588,9 +585,7 @@ class BhikkuIDAllListItem(BaseModel):
     fathrdetails: Optional[str] = None
 
 
-class BhikkuIDAllListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDAllListResponse(ReportViewResponse):
     data: List[BhikkuIDAllListItem]
 
 
@@ -600,9 +595,7 @@ class BhikkuIDDistrictListItem(BaseModel):
     idn: str
 
 
-class BhikkuIDDistrictListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDDistrictListResponse(ReportViewResponse):
     data: List[BhikkuIDDistrictListItem]
 
 
@@ -612,9 +605,7 @@ class BhikkuIDDvSecListItem(BaseModel):
     idn: str
 
 
-class BhikkuIDDvSecListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDDvSecListResponse(ReportViewResponse):
     data: List[BhikkuIDDvSecListItem]
 
 
@@ -623,9 +614,7 @@ class BhikkuIDGNListItem(BaseModel):
     idn: str
 
 
-class BhikkuIDGNListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDGNListResponse(ReportViewResponse):
     data: List[BhikkuIDGNListItem]
 
 
@@ -637,9 +626,7 @@ class BhikkuNikayanayakaListItem(BaseModel):
     addrs: Optional[str] = None
 
 
-class BhikkuNikayanayakaListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuNikayanayakaListResponse(ReportViewResponse):
     data: List[BhikkuNikayanayakaListItem]
 
 
@@ -649,9 +636,7 @@ class BhikkuParshawaListItem(BaseModel):
     regn: str
 
 
-class BhikkuParshawaListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuParshawaListResponse(ReportViewResponse):
     data: List[BhikkuParshawaListItem]
 
 
@@ -660,9 +645,7 @@ class BhikkuStatusHistoryCompositeItem(BaseModel):
     vadescrdtls: Optional[str] = None
 
 
-class BhikkuStatusHistoryCompositeResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuStatusHistoryCompositeResponse(ReportViewResponse):
     data: List[BhikkuStatusHistoryCompositeItem]
 
 
@@ -673,9 +656,7 @@ class BhikkuStatusHistoryListItem(BaseModel):
     descr: Optional[str] = None
 
 
-class BhikkuStatusHistoryListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuStatusHistoryListResponse(ReportViewResponse):
     data: List[BhikkuStatusHistoryListItem]
 
 
@@ -684,9 +665,7 @@ class BhikkuStatusHistoryList2Item(BaseModel):
     statchgdescr: Optional[str] = None
 
 
-class BhikkuStatusHistoryList2Response(BaseModel):
-    status: str
-    message: str
+class BhikkuStatusHistoryList2Response(ReportViewResponse):
     data: List[BhikkuStatusHistoryList2Item]
 
 
@@ -695,9 +674,7 @@ class BhikkuViharadipathiListItem(BaseModel):
     mahananame: Optional[str] = None
 
 
-class BhikkuViharadipathiListResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuViharadipathiListResponse(ReportViewResponse):
     data: List[BhikkuViharadipathiListItem]
 
 
@@ -723,9 +700,7 @@ class BhikkuCurrentStatusSummaryItem(BaseModel):
     statcnt: int
 
 
-class BhikkuCurrentStatusSummaryResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuCurrentStatusSummaryResponse(ReportViewResponse):
     data: List[BhikkuCurrentStatusSummaryItem]
 
 
@@ -735,9 +710,7 @@ class BhikkuDistrictSummaryItem(BaseModel):
     totalbikku: int
 
 
-class BhikkuDistrictSummaryResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuDistrictSummaryResponse(ReportViewResponse):
     data: List[BhikkuDistrictSummaryItem]
 
 
@@ -747,9 +720,7 @@ class BhikkuGNSummaryItem(BaseModel):
     bikkucnt: int
 
 
-class BhikkuGNSummaryResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuGNSummaryResponse(ReportViewResponse):
     data: List[BhikkuGNSummaryItem]
 
 
@@ -759,9 +730,7 @@ class BhikkuIDDistrictSummaryItem(BaseModel):
     idcnt: int
 
 
-class BhikkuIDDistrictSummaryResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDDistrictSummaryResponse(ReportViewResponse):
     data: List[BhikkuIDDistrictSummaryItem]
 
 
@@ -770,9 +739,7 @@ class BhikkuIDGNSummaryItem(BaseModel):
     idcnt: int
 
 
-class BhikkuIDGNSummaryResponse(BaseModel):
-    status: str
-    message: str
+class BhikkuIDGNSummaryResponse(ReportViewResponse):
     data: List[BhikkuIDGNSummaryItem]
 
 
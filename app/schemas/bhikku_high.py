@@ -273,6 +273,10 @@ class BhikkuHighRequestPayload(BaseModel):
     # Date range filters
     date_from: Optional[date] = None
     date_to: Optional[date] = None
+
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Optional[str] = Field(default=None, max_length=1000)
     
     data: Optional[Any] = None  # Accept any type, will be parsed in the route
 
@@ -289,6 +293,8 @@ class BhikkuHighManagementResponse(BaseModel):
     totalRecords: Optional[int] = None
     page: Optional[int] = None
     limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # --- Workflow Action Schemas ---
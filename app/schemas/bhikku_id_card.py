@@ -1,9 +1,11 @@
 # app/schemas/bhikku_id_card.py
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, computed_field, validator
 from datetime import date, datetime
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
+from app.utils.image_derivatives import derivative_urls
+
 
 # --- Action Enum for CRUD operations ---
 class BhikkuIDCardAction(str, Enum):
@@ -268,6 +270,17 @@ class BhikkuIDCardResponse(BhikkuIDCardBase):
     bic_updated_by: Optional[str] = None
     bic_version_number: int
     
+    # Thumbnail URLs ({"thumb": ..., "preview": ...}) of the images above, for list views
+    @computed_field
+    @property
+    def bic_left_thumbprint_derivatives(self) -> Optional[Dict[str, str]]:
+        return derivative_urls(self.bic_left_thumbprint_url)
+    
+    @computed_field
+    @property
+    def bic_applicant_photo_derivatives(self) -> Optional[Dict[str, str]]:
+        return derivative_urls(self.bic_applicant_photo_url)
+    
     class Config:
         from_attributes = True
         json_schema_extra = {
@@ -354,6 +367,8 @@ class BhikkuIDCardManageResponse(BaseModel):
     message: str = Field(..., description="Human-readable message")
     data: Optional[Any] = Field(None, description="Response data (single record, list, or None)")
     total: Optional[int] = Field(None, description="Total count for READ_ALL")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (READ_ALL with use_cursor)")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of the previous page (READ_ALL with use_cursor)")
     
     class Config:
         json_schema_extra = {
@@ -362,6 +362,9 @@ class DevalaRequestPayload(BaseModel):
     skip: Annotated[int, Field(ge=0)] = 0
     limit: Annotated[int, Field(ge=1, le=200)] = 10
     page: Annotated[Optional[int], Field(default=1, ge=1)] = 1
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Annotated[Optional[str], Field(default=None, max_length=1000)] = None
     
     # Search and filters
     search_key: Annotated[Optional[str], Field(default=None, max_length=200)] = None
@@ -400,6 +403,8 @@ class DevalaManagementResponse(BaseModel):
     totalRecords: Optional[int] = None
     page: Optional[int] = None
     limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # Simple Devala List Schema for Bhikku endpoints
@@ -88,6 +88,8 @@ class ReprintRequestListResponse(BaseModel):
     message: str
     data: List[ReprintRequest]
     totalRecords: Optional[int] = None
+    # False when totalRecords is a planner estimate (show it as approximate)
+    totalIsExact: Optional[bool] = None
     page: Optional[int] = None
     limit: Optional[int] = None
 
@@ -112,6 +114,8 @@ class ReprintManageResponse(BaseModel):
     # Can return a single request, list of requests, or QR-style items (for READ_ONE by regn/id)
     data: Optional[Union[ReprintRequest, List[ReprintRequest], List[QRSearchDataItem]]] = None
     totalRecords: Optional[int] = None
+    # False when totalRecords is a planner estimate (show it as approximate)
+    totalIsExact: Optional[bool] = None
     page: Optional[int] = None
     limit: Optional[int] = None
 
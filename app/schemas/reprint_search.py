@@ -5,7 +5,7 @@ This endpoint searches across all entity types for reprint purposes.
 """
 from datetime import date, datetime
 from typing import Optional, List, Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # ============================================================================
@@ -23,6 +23,9 @@ class ReprintSearchRequest(BaseModel):
     # Pagination
     skip: int = 0
     limit: int = 50
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Optional[str] = Field(None, max_length=1000, description="next_cursor / prev_cursor from a previous page")
     
     class Config:
         json_schema_extra = {
@@ -91,6 +94,8 @@ class ReprintSearchResponse(BaseModel):
     message: str
     total: int
     data: List[ReprintSearchResultItem]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # ============================================================================
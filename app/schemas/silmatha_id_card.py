@@ -1,9 +1,11 @@
 # app/schemas/silmatha_id_card.py
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, computed_field
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 
+from app.utils.image_derivatives import derivative_urls
+
 
 # --- Action Enum for CRUD operations ---
 class SilmathaIDCardAction(str, Enum):
@@ -296,6 +298,17 @@ class SilmathaIDCardResponse(BaseModel):
     sic_updated_by: Optional[str] = None
     sic_updated_at: Optional[datetime] = None
     
+    # Thumbnail URLs ({"thumb": ..., "preview": ...}) of the images above, for list views
+    @computed_field
+    @property
+    def sic_left_thumbprint_derivatives(self) -> Optional[Dict[str, str]]:
+        return derivative_urls(self.sic_left_thumbprint_url)
+    
+    @computed_field
+    @property
+    def sic_applicant_photo_derivatives(self) -> Optional[Dict[str, str]]:
+        return derivative_urls(self.sic_applicant_photo_url)
+    
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -306,6 +319,8 @@ class SilmathaIDCardManageResponse(BaseModel):
     message: str
     data: Optional[SilmathaIDCardResponse | List[SilmathaIDCardResponse]] = None
     total: Optional[int] = Field(None, description="Total count for READ_ALL")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (READ_ALL with use_cursor)")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of the previous page (READ_ALL with use_cursor)")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -308,6 +308,10 @@ class SilmathaRegistRequestPayload(BaseModel):
     workflow_status: Optional[str] = Field(None, description="Workflow status filter")
     date_from: Optional[date] = Field(None, description="Start date for filtering by request date")
     date_to: Optional[date] = Field(None, description="End date for filtering by request date")
+
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Optional[str] = Field(None, max_length=1000, description="next_cursor / prev_cursor from a previous page")
     
     # For CREATE, UPDATE
     data: Optional[Union[SilmathaRegistCreate, SilmathaRegistUpdate]] = None
@@ -344,6 +348,8 @@ class SilmathaRegistManagementResponse(BaseModel):
     totalRecords: Optional[int] = None
     page: Optional[int] = None
     limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # --- Legacy Response Schemas (kept for backward compatibility) ---
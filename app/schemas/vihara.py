@@ -857,6 +857,9 @@ class ViharaRequestPayload(BaseModel):
     skip: Annotated[int, Field(ge=0)] = 0
     limit: Annotated[int, Field(ge=1, le=200)] = 10
     page: Annotated[Optional[int], Field(default=1, ge=1)] = 1
+    # Keyset pagination (opt-in): use_cursor=true for the first page, then send back next_cursor / prev_cursor
+    use_cursor: bool = False
+    cursor: Annotated[Optional[str], Field(default=None, max_length=1000)] = None
     
     # Search and filters (all use CODE values, not names)
     search_key: Annotated[Optional[str], Field(default=None, max_length=200)] = None
@@ -917,8 +920,12 @@ class ViharaManagementResponse(BaseModel):
     message: str
     data: Optional[Union[ViharaOut, List[ViharaOut], Any]] = None
     totalRecords: Optional[int] = None
+    # False when totalRecords is a planner estimate (show it as approximate)
+    totalIsExact: Optional[bool] = None
     page: Optional[int] = None
     limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 # Simple Vihara List Schema for Bhikku endpoints
@@ -933,6 +940,8 @@ class BhikkuViharaListResponse(BaseModel):
     message: str
     data: List[BhikkuViharaListItem]
     totalRecords: Optional[int] = None
+    # False when totalRecords is a planner estimate (show it as approximate)
+    totalIsExact: Optional[bool] = None
     page: Optional[int] = None
     limit: Optional[int] = None
 
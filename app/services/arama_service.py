@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from app.models.arama import AramaData
 from app.repositories.arama_repo import arama_repo
 from app.schemas.arama import AramaCreate, AramaCreatePayload, AramaUpdate
+from app.services.reference_cache import reference_cache
+from app.utils.pagination import KeysetPage
 
 
 class AramaService:
@@ -116,7 +118,9 @@ class AramaService:
         date_from: Optional[Any] = None,
         date_to: Optional[Any] = None,
         current_user = None,
-    ) -> list[AramaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> list[AramaData] | KeysetPage:
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
         return arama_repo.list(
@@ -139,6 +143,8 @@ class AramaService:
             date_from=date_from,
             date_to=date_to,
             current_user=current_user,
+            keyset=keyset,
+            cursor=cursor,
         )
 
     def count_aramas(
@@ -583,6 +589,8 @@ class AramaService:
         column_name: str,
         value: Any,
     ) -> bool:
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         metadata = MetaData()
         table = Table(table_name, metadata, schema=schema, autoload_with=db.get_bind())
         column = table.c.get(column_name)
@@ -0,0 +1,115 @@
+# app/services/audit_policy.py
+"""
+Decides which API calls get an `__api_call__` audit_log row.
+
+- Mutating operations (CREATE / UPDATE / DELETE) are always kept.
+- Paths under AUDIT_EXCLUDED_PREFIXES (static /storage files, /health, docs)
+  are never recorded, and neither are CORS preflight (OPTIONS) requests
+  unless AUDIT_RECORD_PREFLIGHT is enabled.
+- READ operations are sampled at AUDIT_READ_SAMPLE_RATE, overridable per
+  route prefix with AUDIT_ROUTE_SAMPLE_RATES ("/api/v1/bhikkus=0.1,...");
+  the longest matching prefix wins.
+
+Row-level ORM auditing (before_flush capture) is not affected by this policy.
+"""
+from __future__ import annotations
+
+import logging
+import random
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MUTATING_OPERATIONS = frozenset({"CREATE", "UPDATE", "DELETE"})
+
+
+def _parse_route_rates(raw: str) -> List[Tuple[str, float]]:
+    rates: List[Tuple[str, float]] = []
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        prefix, rate = item.split("=", 1)
+        prefix = prefix.strip()
+        if not prefix:
+            continue
+        try:
+            rates.append((prefix, min(max(float(rate), 0.0), 1.0)))
+        except ValueError:
+            logger.warning("Ignoring invalid audit sample rate %r for route %r", rate, prefix)
+    # Longest prefix first so the most specific override wins
+    return sorted(rates, key=lambda pair: len(pair[0]), reverse=True)
+
+
+class AuditPolicy:
+    """Route exclusion and READ sampling for request-level audit rows."""
+
+    def __init__(
+        self,
+        *,
+        excluded_prefixes: Iterable[str],
+        read_sample_rate: float,
+        route_sample_rates: Optional[List[Tuple[str, float]]] = None,
+        record_preflight: bool = False,
+    ) -> None:
+        self.excluded_prefixes = tuple(p for p in excluded_prefixes if p)
+        self.read_sample_rate = min(max(read_sample_rate, 0.0), 1.0)
+        self.route_sample_rates = route_sample_rates or []
+        self.record_preflight = record_preflight
+        self._lock = Lock()
+        self.metrics: Dict[str, int] = {
+            "kept_mutating": 0,
+            "kept_read": 0,
+            "dropped_excluded": 0,
+            "dropped_preflight": 0,
+            "dropped_sampled": 0,
+        }
+
+    def sample_rate_for(self, path: str) -> float:
+        for prefix, rate in self.route_sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.read_sample_rate
+
+    def is_excluded(self, path: Optional[str]) -> bool:
+        """True for paths never audited (counted as dropped_excluded)."""
+        if (path or "").startswith(self.excluded_prefixes):
+            return self._count("dropped_excluded", True)
+        return False
+
+    def should_record(self, method: Optional[str], path: Optional[str], operation: str) -> bool:
+        path = path or ""
+        if self.is_excluded(path):
+            return False
+        if operation in MUTATING_OPERATIONS:
+            return self._count("kept_mutating", True)
+        if (method or "").upper() == "OPTIONS" and not self.record_preflight:
+            return self._count("dropped_preflight", False)
+
+        rate = self.sample_rate_for(path)
+        if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            return self._count("kept_read", True)
+        return self._count("dropped_sampled", False)
+
+    def get_metrics(self) -> Dict[str, object]:
+        with self._lock:
+            metrics: Dict[str, object] = dict(self.metrics)
+        metrics["read_sample_rate"] = self.read_sample_rate
+        metrics["route_sample_rates"] = dict(self.route_sample_rates)
+        metrics["excluded_prefixes"] = list(self.excluded_prefixes)
+        return metrics
+
+    def _count(self, key: str, decision: bool) -> bool:
+        with self._lock:
+            self.metrics[key] += 1
+        return decision
+
+
+audit_policy = AuditPolicy(
+    excluded_prefixes=[p.strip() for p in settings.AUDIT_EXCLUDED_PREFIXES.split(",")],
+    read_sample_rate=settings.AUDIT_READ_SAMPLE_RATE,
+    route_sample_rates=_parse_route_rates(settings.AUDIT_ROUTE_SAMPLE_RATES),
+    record_preflight=settings.AUDIT_RECORD_PREFLIGHT,
+)
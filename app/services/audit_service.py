@@ -4,15 +4,28 @@ from __future__ import annotations
 import json
 from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional
-from uuid import uuid4
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID, uuid4
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import event, inspect
+from sqlalchemy import String, event, inspect
 from sqlalchemy.orm import Mapper, Session
 
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.audit_log import AuditLog
+from app.services.audit_policy import audit_policy
+
+# Width of every VARCHAR(n) audit_log column; API call rows are cut to fit
+# so one over-long header cannot fail the batch it is written with
+_STRING_LENGTHS = {
+    column.name: column.type.length
+    for column in AuditLog.__table__.columns
+    if isinstance(column.type, String) and column.type.length
+}
+_FOREIGN_KEYS = {column.name for column in AuditLog.__table__.columns if column.foreign_keys}
 
 
 @dataclass(slots=True)
@@ -27,10 +40,15 @@ class AuditContext:
 
 
 class AuditService:
-    def __init__(self) -> None:
+    def __init__(self, *, compact_payloads: bool = False) -> None:
         self._context_var: ContextVar[AuditContext | None] = ContextVar(
             "audit_context", default=None
         )
+        # Compact mode: CREATE/DELETE keep only non-null columns, UPDATE keeps
+        # only fields whose serialized value actually changed.
+        self.compact_payloads = compact_payloads
+        self._mapper_columns: dict[Mapper, tuple[str, ...]] = {}
+        self._serializers: dict[type, Callable[[Any], Any]] = {}
 
     # ------------------------------------------------------------------ #
     # Request Context Helpers
@@ -71,18 +89,24 @@ class AuditService:
     # ------------------------------------------------------------------ #
     # Logging helpers
     # ------------------------------------------------------------------ #
-    def log_api_call(
+    def build_api_call_row(
         self,
-        db: Session,
         *,
         status_code: int,
         response_payload: Optional[dict[str, Any]] = None,
-    ) -> None:
+    ) -> Optional[dict[str, Any]]:
+        """
+        Build the `__api_call__` audit_log row for the current request context.
+        Returns None when there is no context or the audit policy skips the call.
+        """
         context = self.get_context()
         if not context:
-            return
+            return None
 
         operation = self._infer_operation_from_method(context.method)
+        if not audit_policy.should_record(context.method, context.route, operation):
+            return None
+
         response_data = None
         if response_payload is not None:
             try:
@@ -91,46 +115,74 @@ class AuditService:
                 # Fallback: ensure serialization does not fail
                 response_data = json.loads(json.dumps(response_payload, default=str))
 
-        entry = AuditLog(
-            al_table_name="__api_call__",
-            al_record_id=context.route or "unknown",
-            al_operation=operation,
-            al_old_values=None,
-            al_new_values={"status_code": status_code, "response": response_data},
-            al_changed_fields=None,
-            al_user_id=context.user_id,
-            al_session_id=context.session_id,
-            al_ip_address=context.ip_address,
-            al_user_agent=context.user_agent,
-            al_transaction_id=context.transaction_id,
+        return _fit_columns({
+            "al_table_name": "__api_call__",
+            "al_record_id": context.route or "unknown",
+            "al_operation": operation,
+            "al_old_values": None,
+            "al_new_values": {"status_code": status_code, "response": response_data},
+            "al_changed_fields": None,
+            "al_user_id": context.user_id,
+            "al_session_id": context.session_id,
+            "al_ip_address": context.ip_address,
+            "al_user_agent": context.user_agent,
+            "al_transaction_id": context.transaction_id,
+            # Captured now: rows written in batches must not take the flush time
+            "al_timestamp": datetime.now(timezone.utc),
+        })
+
+    def log_api_call(
+        self,
+        db: Session,
+        *,
+        status_code: int,
+        response_payload: Optional[dict[str, Any]] = None,
+    ) -> None:
+        row = self.build_api_call_row(
+            status_code=status_code, response_payload=response_payload
         )
-        db.add(entry)
+        if row is None:
+            return
+        db.add(AuditLog(**row))
         db.commit()
 
     # ------------------------------------------------------------------ #
     # SQLAlchemy instrumentation
     # ------------------------------------------------------------------ #
+    def _column_keys(self, mapper: Mapper) -> tuple[str, ...]:
+        keys = self._mapper_columns.get(mapper)
+        if keys is None:
+            keys = tuple(attr.key for attr in mapper.column_attrs)
+            self._mapper_columns[mapper] = keys
+        return keys
+
     def _collect_instance_payload(
         self,
         mapper: Mapper,
         instance: Any,
         *,
         columns: Optional[Iterable[str]] = None,
+        skip_none: bool = False,
     ) -> dict[str, Any]:
         result: dict[str, Any] = {}
-        for attr in mapper.column_attrs:
-            key = attr.key
+        instance_dict = instance.__dict__
+        for key in self._column_keys(mapper):
             if columns and key not in columns:
                 continue
-            value = getattr(instance, key, None)
+            # Loaded values come straight from __dict__, skipping attribute instrumentation;
+            # only columns not loaded (e.g. expired) go through getattr and may lazy-load
+            value = instance_dict[key] if key in instance_dict else getattr(instance, key, None)
+            if value is None and skip_none:
+                continue
             result[key] = self._serialize_value(value)
         return result
 
     def _serialize_value(self, value: Any) -> Any:
-        try:
-            return jsonable_encoder(value)
-        except TypeError:
-            return json.loads(json.dumps(value, default=str))
+        serializer = self._serializers.get(type(value))
+        if serializer is None:
+            serializer = _serializer_for(type(value))
+            self._serializers[type(value)] = serializer
+        return serializer(value)
 
     def _infer_operation_from_method(self, method: Optional[str]) -> str:
         if not method:
@@ -147,7 +199,49 @@ class AuditService:
         return mapping.get(method.upper(), "READ")
 
 
-audit_service = AuditService()
+def _fit_columns(row: dict[str, Any]) -> dict[str, Any]:
+    for name, length in _STRING_LENGTHS.items():
+        value = row.get(name)
+        if isinstance(value, str) and len(value) > length:
+            # A cut-down key could name another row; an over-long one names none
+            row[name] = None if name in _FOREIGN_KEYS else value[:length]
+    return row
+
+
+def _encode(value: Any) -> Any:
+    try:
+        return jsonable_encoder(value)
+    except TypeError:
+        return json.loads(json.dumps(value, default=str))
+
+
+def _encode_decimal(value: Decimal) -> Any:
+    # Same rule as pydantic's decimal encoder used by jsonable_encoder
+    return int(value) if value.as_tuple().exponent >= 0 else float(value)
+
+
+def _serializer_for(value_type: type) -> Callable[[Any], Any]:
+    """Pick a serializer producing the same output as jsonable_encoder for the type."""
+    if value_type in (str, int, float, bool, type(None)):
+        return _identity
+    if value_type in (datetime, date, time):
+        return _isoformat
+    if value_type is Decimal:
+        return _encode_decimal
+    if value_type is UUID:
+        return str
+    return _encode
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+audit_service = AuditService(compact_payloads=settings.AUDIT_COMPACT_PAYLOADS)
 
 
 # ---------------------------------------------------------------------- #
@@ -164,19 +258,29 @@ def _collect_update_changes(instance) -> tuple[dict[str, Any], dict[str, Any], l
     new_values: dict[str, Any] = {}
     changed_fields: list[str] = []
 
-    for attr in mapper.column_attrs:
-        hist = state.attrs[attr.key].history
+    compact = audit_service.compact_payloads
+    # Only attributes modified since load carry history; skip the rest cheaply
+    modified = state.committed_state
+    for key in audit_service._column_keys(mapper):
+        if key not in modified:
+            continue
+        hist = state.attrs[key].history
         if not hist.has_changes():
             continue
         # Skip primary key modifications to avoid redundant records
-        if attr.key in mapper.primary_key:
+        if key in mapper.primary_key:
             continue
 
         old_val = hist.deleted[0] if hist.deleted else None
-        new_val = hist.added[0] if hist.added else getattr(instance, attr.key, None)
-        old_values[attr.key] = audit_service._serialize_value(old_val)
-        new_values[attr.key] = audit_service._serialize_value(new_val)
-        changed_fields.append(attr.key)
+        new_val = hist.added[0] if hist.added else getattr(instance, key, None)
+        old_serialized = audit_service._serialize_value(old_val)
+        new_serialized = audit_service._serialize_value(new_val)
+        if compact and old_serialized == new_serialized:
+            # Re-assigned to an equivalent value; nothing to record
+            continue
+        old_values[key] = old_serialized
+        new_values[key] = new_serialized
+        changed_fields.append(key)
 
     return old_values, new_values, changed_fields
 
@@ -211,7 +315,9 @@ def capture_audit_events(session: Session, flush_context, instances):
         if _is_audit_model(instance):
             continue
         mapper = inspect(instance).mapper
-        new_values = audit_service._collect_instance_payload(mapper, instance)
+        new_values = audit_service._collect_instance_payload(
+            mapper, instance, skip_none=audit_service.compact_payloads
+        )
         entries.append(
             {
                 "instance": instance,
@@ -265,7 +371,9 @@ def capture_audit_events(session: Session, flush_context, instances):
             continue
         state = inspect(instance)
         mapper = state.mapper
-        old_values = audit_service._collect_instance_payload(mapper, instance)
+        old_values = audit_service._collect_instance_payload(
+            mapper, instance, skip_none=audit_service.compact_payloads
+        )
         entries.append(
             {
                 "instance": instance,
@@ -0,0 +1,309 @@
+# app/services/audit_writer.py
+"""
+Asynchronous, batched writer for request-level audit_log rows.
+
+The audit middleware enqueues one row per API call without touching the
+database. A single daemon thread drains the bounded queue and bulk-inserts
+rows (one multi-row INSERT per batch) every AUDIT_FLUSH_INTERVAL_MS or as
+soon as AUDIT_BATCH_SIZE rows are waiting.
+
+Backpressure: when the queue is full, rows are appended to the spill file
+(AUDIT_SPILL_PATH) and replayed by the writer thread after each flush
+interval, with or without queued rows (and not for SPILL_RETRY_DELAY_SECONDS
+after a failed write); without a spill file they are dropped. Both outcomes
+are counted in the metrics.
+
+A batch the database rejects for its content (DataError / IntegrityError,
+e.g. an unknown al_user_id) is retried row by row; the rows that still fail
+are counted as rejected and appended to <AUDIT_SPILL_PATH>.rejected instead
+of being spilled and replayed forever. So are spilled lines that cannot be
+decoded (cut off by a crash mid-append).
+
+Replay renames the spill file to <AUDIT_SPILL_PATH>.replay and removes it
+only once every line is written, rejected or spilled again; a .replay file
+left by a crash is replayed before the next spill file. If the rows after a
+failed chunk (or the chunk itself) cannot be spilled again, the .replay file
+is rewritten to hold just those rows, so nothing is inserted twice.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Spilled rows are not replayed for this long after a failed write
+SPILL_RETRY_DELAY_SECONDS = 30.0
+
+
+class AuditLogWriter:
+    """Bounded in-process queue drained by a background bulk-insert thread."""
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval_ms: int,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(flush_interval_ms, 1) / 1000.0
+        self.spill_path = spill_path or None
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = Lock()
+        self._spill_lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._replay_not_before = 0.0
+
+        self.metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Producer side (request path)
+    # ------------------------------------------------------------------ #
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue an audit_log row without blocking. Returns False if it was not queued."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            if self._spill([row]):
+                self._incr("spilled")
+            else:
+                self._incr("dropped")
+            return False
+        self._incr("enqueued")
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+        logger.info("Audit log writer started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after flushing everything still queued."""
+        self._stop.set()
+        thread = self._thread
+        if thread:
+            thread.join(timeout=timeout)
+        self._thread = None
+        logger.info("Audit log writer stopped")
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.metrics, "queue_depth": self._queue.qsize(), "queue_capacity": self._queue.maxsize}
+
+    # ------------------------------------------------------------------ #
+    # Consumer side (writer thread)
+    # ------------------------------------------------------------------ #
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                batch = self._collect_batch()
+                if batch:
+                    self._write(batch)
+                # Not only when idle: under steady traffic the queue is never empty
+                if self.spill_path and time.monotonic() >= self._replay_not_before:
+                    self._replay_spill()
+            except Exception:
+                logger.exception("Audit log writer iteration failed")
+        # Final drain on shutdown
+        remaining = self._drain_nowait()
+        while remaining:
+            self._write(remaining[: self.batch_size])
+            remaining = remaining[self.batch_size:]
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        deadline = time.monotonic() + self.flush_interval
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain_nowait(self) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _write(self, rows: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Insert a batch. Returns None if it was written (rows the database
+        rejects on their own count as written); otherwise the rows that could
+        neither be written nor spilled, empty if the unwritten rows were spilled.
+        """
+        started = time.perf_counter()
+        try:
+            # executemany on a Core insert is sent as multi-row INSERT ... VALUES batches
+            with engine.begin() as conn:
+                conn.execute(insert(AuditLog.__table__), rows)
+        except (DataError, IntegrityError) as exc:
+            logger.warning(f"Audit log batch of {len(rows)} rows rejected, writing row by row: {exc.orig}")
+            written, unwritten = self._write_each(rows)
+        except Exception as exc:
+            return self._fail(rows, exc)
+        else:
+            written, unwritten = len(rows), None
+        with self._lock:
+            self.metrics["written"] += written
+            self.metrics["batches"] += 1
+            self.metrics["last_batch_ms"] = round((time.perf_counter() - started) * 1000.0, 2)
+        return unwritten
+
+    def _write_each(self, rows: List[Dict[str, Any]]) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+        """(rows written, None or what _fail returned if the database became unreachable) - one transaction per row."""
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(AuditLog.__table__), [row])
+            except (DataError, IntegrityError) as exc:
+                logger.error(f"Rejected audit log row (transaction {row.get('al_transaction_id')}): {exc.orig}")
+                self._incr("rejected")
+                self._reject([json.dumps(row, default=str)])
+            except Exception as exc:
+                return written, self._fail(rows[index:], exc)
+            else:
+                written += 1
+        return written, None
+
+    def _fail(self, rows: List[Dict[str, Any]], exc: Exception) -> List[Dict[str, Any]]:
+        """Spill rows that could not be written. Returns them if they could not be spilled either."""
+        logger.error(f"Failed to write {len(rows)} audit log rows: {exc}")
+        self._incr("failed", len(rows))
+        self._replay_not_before = time.monotonic() + SPILL_RETRY_DELAY_SECONDS
+        if self._spill(rows):
+            self._incr("spilled", len(rows))
+            return []
+        return rows
+
+    # ------------------------------------------------------------------ #
+    # Spill file
+    # ------------------------------------------------------------------ #
+    def _spill(self, rows: List[Dict[str, Any]]) -> bool:
+        return self._append(self.spill_path, [json.dumps(row, default=str) for row in rows])
+
+    def _reject(self, lines: List[str]) -> bool:
+        """Dead-letter encoded rows the database (or the decoder) will never accept."""
+        return self._append(f"{self.spill_path}.rejected" if self.spill_path else None, lines)
+
+    def _append(self, path: Optional[str], lines: List[str]) -> bool:
+        if not path:
+            return False
+        try:
+            with self._spill_lock, open(path, "a", encoding="utf-8") as fh:
+                for line in lines:
+                    fh.write(line + "\n")
+            return True
+        except OSError as exc:
+            logger.error(f"Failed to spill audit log rows to {path}: {exc}")
+            return False
+
+    def _replay_spill(self) -> None:
+        replay_path = f"{self.spill_path}.replay"
+        # A .replay file still there was not fully processed (crash); finish it first
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spill_path):
+                return
+            with self._spill_lock:
+                try:
+                    os.replace(self.spill_path, replay_path)
+                except OSError:
+                    return
+        rows: List[Dict[str, Any]] = []
+        with open(replay_path, encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(self._decode_spilled(line))
+                except (ValueError, TypeError, AttributeError) as exc:
+                    logger.error(f"Rejected undecodable spilled audit log row: {exc}")
+                    self._incr("rejected")
+                    self._reject([line.rstrip("\n")])
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            unspilled = self._write(chunk)
+            if unspilled is None:
+                self._incr("replayed", len(chunk))
+                continue
+            # _write re-spilled what it could of the chunk; keep the rest for the next attempt
+            rest = rows[start + self.batch_size:]
+            if unspilled or (rest and not self._spill(rest)):
+                # Keep only rows neither written nor spilled, so none is inserted twice
+                self._rewrite_replay(replay_path, unspilled + rest)
+                return
+            break
+        os.remove(replay_path)
+
+    def _rewrite_replay(self, replay_path: str, rows: List[Dict[str, Any]]) -> None:
+        temp_path = f"{replay_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as fh:
+                for row in rows:
+                    fh.write(json.dumps(row, default=str) + "\n")
+            os.replace(temp_path, replay_path)
+        except OSError as exc:
+            logger.error(f"Failed to rewrite {replay_path}; it will be replayed in full: {exc}")
+
+    @staticmethod
+    def _decode_spilled(line: str) -> Dict[str, Any]:
+        row = json.loads(line)
+        if isinstance(row.get("al_timestamp"), str):
+            row["al_timestamp"] = datetime.fromisoformat(row["al_timestamp"])
+        return row
+
+    def _incr(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.metrics[key] += amount
+
+
+audit_log_writer = AuditLogWriter(
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+    spill_path=settings.AUDIT_SPILL_PATH,
+)
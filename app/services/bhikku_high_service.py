@@ -7,12 +7,121 @@ from sqlalchemy import MetaData, Table, select
 from sqlalchemy.exc import NoSuchTableError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.models.bhikku import Bhikku
 from app.models.bhikku_high import BhikkuHighRegist
+from app.models.parshawadata import ParshawaData
+from app.models.status import StatusData
+from app.models.temp_reference import (
+    ENTITY_BHIKKU_HIGH,
+    ENTITY_DIRECT_BHIKKU_HIGH,
+    KIND_BHIKKU,
+    KIND_VIHARA,
+)
 from app.models.user import UserAccount
 from app.models.vihara import ViharaData
 from app.repositories import bhikku_repo
 from app.repositories.bhikku_high_repo import bhikku_high_repo
+from app.repositories.temp_reference_repo import (
+    ResolvedTempReference,
+    TempTarget,
+    parse_temp_id,
+    temp_reference_repo,
+)
 from app.schemas.bhikku_high import BhikkuHighCreate, BhikkuHighUpdate
+from app.services.reference_cache import reference_cache
+from app.utils.batch_loading import load_by_keys
+from app.utils.pagination import KeysetPage
+
+
+# Reference fields of both registration tables, without the bhr_/dbh_ prefix
+BHIKKU_REF_FIELDS = (
+    "candidate_regn",
+    "samanera_serial_no",
+    "karmacharya_name",
+    "upaddhyaya_name",
+    "tutors_tutor_regn",
+    "presiding_bhikshu_regn",
+)
+VIHARA_REF_FIELDS = (
+    "livtemple",
+    "higher_ordination_place",
+    "residence_higher_ordination_trn",
+    "residence_permanent_trn",
+)
+TEMP_REFERENCE_ENTITIES = {"bhr": ENTITY_BHIKKU_HIGH, "dbh": ENTITY_DIRECT_BHIKKU_HIGH}
+
+
+class _PageReferences:
+    """
+    Lookups for the references of a page of bhikku_high_regist or
+    direct_bhikku_high rows: one query per referenced table for the whole
+    page instead of one per field per row. Temporary references (kept in
+    temp_reference) win over the column.
+    Without a session nothing is resolved and raw column values are returned.
+    """
+
+    def __init__(self, db: Optional[Session], records: list, prefix: str) -> None:
+        self.prefix = prefix
+        self.bhikkus: Dict[Any, Bhikku] = {}
+        self.viharas: Dict[Any, ViharaData] = {}
+        self.statuses: Dict[Any, StatusData] = {}
+        self.parshawayas: Dict[Any, ParshawaData] = {}
+        self.temp_refs: Dict[int, Dict[str, ResolvedTempReference]] = {}
+        if db is None or not records:
+            return
+
+        def values(fields) -> set:
+            return {self._value(r, f) for r in records for f in fields if self._value(r, f)}
+
+        self.bhikkus = load_by_keys(db, Bhikku, "br_regn", values(BHIKKU_REF_FIELDS))
+        self.viharas = load_by_keys(db, ViharaData, "vh_trn", values(VIHARA_REF_FIELDS))
+        self.statuses = load_by_keys(db, StatusData, "st_statcd", values(("currstat",)))
+        self.parshawayas = load_by_keys(db, ParshawaData, "pr_prn", values(("parshawaya",)))
+        self.temp_refs = temp_reference_repo.resolve_page(
+            db, entity=TEMP_REFERENCE_ENTITIES[prefix], entity_ids=[self._value(r, "id") for r in records]
+        )
+
+    def _value(self, record, field: str):
+        return getattr(record, f"{self.prefix}_{field}", None)
+
+    def _temp(self, record, field: str, kind: str) -> Optional[ResolvedTempReference]:
+        ref = self.temp_refs.get(self._value(record, "id"), {}).get(f"{self.prefix}_{field}")
+        return ref if ref is not None and ref.kind == kind else None
+
+    def remarks(self, record) -> str:
+        return self._value(record, "remarks") or ""
+
+    def bhikku(self, record, field: str):
+        temp = self._temp(record, field, KIND_BHIKKU)
+        if temp is not None:
+            return {"br_regn": f"TEMP-{temp.temp_id}", "br_mahananame": temp.name, "br_upasampadaname": ""}
+        value = self._value(record, field)
+        found = self.bhikkus.get(value) if value else None
+        if found is not None:
+            return {"br_regn": found.br_regn, "br_mahananame": found.br_mahananame or "", "br_upasampadaname": ""}
+        return value
+
+    def vihara(self, record, field: str):
+        temp = self._temp(record, field, KIND_VIHARA)
+        if temp is not None:
+            return {"vh_trn": f"TEMP-{temp.temp_id}", "vh_vname": temp.name}
+        value = self._value(record, field)
+        found = self.viharas.get(value) if value else None
+        if found is not None:
+            return {"vh_trn": found.vh_trn, "vh_vname": found.vh_vname}
+        return value
+
+    def status(self, code):
+        found = self.statuses.get(code) if code else None
+        if found is not None:
+            return {"st_statcd": found.st_statcd, "st_descr": found.st_descr}
+        return code
+
+    def parshawaya(self, code):
+        found = self.parshawayas.get(code) if code else None
+        if found is not None:
+            return {"code": found.pr_prn, "name": found.pr_pname}
+        return code
 
 
 class BhikkuHighService:
@@ -39,35 +148,11 @@ class BhikkuHighService:
         # Preserve original candidate_regn for validation before TEMP- handling
         original_candidate_regn = payload_dict.get("bhr_candidate_regn")
 
-        # Handle temporary bhikku references - these can't be stored as FK references
-        # Store the temp references in remarks for later retrieval
-        import re
-        temp_refs = []
-        for field in ["bhr_candidate_regn", "bhr_karmacharya_name", "bhr_upaddhyaya_name", 
-                      "bhr_tutors_tutor_regn", "bhr_presiding_bhikshu_regn", "bhr_samanera_serial_no"]:
-            value = payload_dict.get(field)
-            if value and isinstance(value, str):
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    payload_dict[field] = None
-        
-        # Handle temporary vihara references
-        for field in ["bhr_livtemple", "bhr_residence_higher_ordination_trn", 
-                      "bhr_residence_permanent_trn", "bhr_higher_ordination_place"]:
-            value = payload_dict.get(field)
-            if value and isinstance(value, str):
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    payload_dict[field] = None
-        
-        # Append temp references to remarks if any
-        if temp_refs:
-            existing_remarks = payload_dict.get("bhr_remarks") or ""
-            existing_remarks = re.sub(r'\[TEMP_BHR_[A-Z_]+:\d+\]', '', existing_remarks).strip()
-            temp_refs_str = " ".join(temp_refs)
-            payload_dict["bhr_remarks"] = f"{existing_remarks} {temp_refs_str}".strip() if existing_remarks else temp_refs_str
+        # Handle temporary bhikku / vihara references - these can't be stored as FK
+        # references; they are kept in temp_reference and the field is cleared
+        temp_references = {
+            field: target for field, target in self._take_temp_references(payload_dict).items() if target
+        }
 
         # Auto-populate location from current user (location-based access control)
         if current_user and current_user.ua_location_type == "DISTRICT_BRANCH" and current_user.ua_district_branch_id:
@@ -106,7 +191,9 @@ class BhikkuHighService:
         )
 
         enriched_payload = BhikkuHighCreate(**payload_dict)
-        return bhikku_high_repo.create(db, data=enriched_payload, actor_id=actor_id)
+        return bhikku_high_repo.create(
+            db, data=enriched_payload, actor_id=actor_id, temp_references=temp_references
+        )
 
     def list_bhikku_highs(
         self,
@@ -128,7 +215,10 @@ class BhikkuHighService:
         status: Optional[list] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
-    ) -> list[BhikkuHighRegist]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        from_end: bool = False,
+    ) -> list[BhikkuHighRegist] | KeysetPage:
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
         return bhikku_high_repo.list(
@@ -149,6 +239,9 @@ class BhikkuHighService:
             status=status,
             date_from=date_from,
             date_to=date_to,
+            keyset=keyset,
+            cursor=cursor,
+            from_end=from_end,
         )
 
     def count_bhikku_highs(
@@ -197,251 +290,53 @@ class BhikkuHighService:
 
     def enrich_bhikku_high_dict(self, bhikku_high: BhikkuHighRegist) -> dict:
         """Transform BhikkuHighRegist model to dictionary with resolved nested objects"""
-        import re
-        from sqlalchemy.orm import joinedload
-        
-        # Parse temporary references from remarks
-        temp_candidate_regn_id = None
-        temp_karmacharya_id = None
-        temp_upaddhyaya_id = None
-        temp_tutors_tutor_id = None
-        temp_presiding_bhikshu_id = None
-        temp_samanera_serial_id = None
-        temp_livtemple_id = None
-        temp_residence_higher_id = None
-        temp_residence_permanent_id = None
-        temp_higher_ordination_place_id = None
-        remarks_display = bhikku_high.bhr_remarks or ""
-        
-        if remarks_display:
-            # Extract temp bhikku references
-            match = re.search(r'\[TEMP_BHR_CANDIDATE_REGN:(\d+)\]', remarks_display)
-            if match:
-                temp_candidate_regn_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_KARMACHARYA_NAME:(\d+)\]', remarks_display)
-            if match:
-                temp_karmacharya_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_UPADDHYAYA_NAME:(\d+)\]', remarks_display)
-            if match:
-                temp_upaddhyaya_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_TUTORS_TUTOR_REGN:(\d+)\]', remarks_display)
-            if match:
-                temp_tutors_tutor_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_PRESIDING_BHIKSHU_REGN:(\d+)\]', remarks_display)
-            if match:
-                temp_presiding_bhikshu_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_SAMANERA_SERIAL_NO:(\d+)\]', remarks_display)
-            if match:
-                temp_samanera_serial_id = int(match.group(1))
-            
-            # Extract temp vihara references
-            match = re.search(r'\[TEMP_BHR_LIVTEMPLE:(\d+)\]', remarks_display)
-            if match:
-                temp_livtemple_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_RESIDENCE_HIGHER_ORDINATION_TRN:(\d+)\]', remarks_display)
-            if match:
-                temp_residence_higher_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_RESIDENCE_PERMANENT_TRN:(\d+)\]', remarks_display)
-            if match:
-                temp_residence_permanent_id = int(match.group(1))
-            match = re.search(r'\[TEMP_BHR_HIGHER_ORDINATION_PLACE:(\d+)\]', remarks_display)
-            if match:
-                temp_higher_ordination_place_id = int(match.group(1))
-            
-            # Remove temp references from display remarks
-            remarks_display = re.sub(r'\[TEMP_BHR_[A-Z_]+:\d+\]', '', remarks_display).strip()
-        
-        # Manually fetch related data with explicit queries to avoid N+1
-        candidate = None
-        status_obj = None
-        parshawaya_obj = None
-        livtemple_obj = None
-        residence_higher_obj = None
-        residence_permanent_obj = None
-        tutor_obj = None
-        presiding_obj = None
-        karmacharya_obj = None
-        upaddhyaya_obj = None
-        samanera_obj = None
-        higher_ordination_place_obj = None
-        
-        # Temp data objects
-        temp_candidate_data = None
-        temp_karmacharya_data = None
-        temp_upaddhyaya_data = None
-        temp_tutors_tutor_data = None
-        temp_presiding_bhikshu_data = None
-        temp_samanera_data = None
-        temp_livtemple_data = None
-        temp_residence_higher_data = None
-        temp_residence_permanent_data = None
-        temp_higher_ordination_place_data = None
-        
-        db = bhikku_high._sa_instance_state.session
-        if db:
-            # Fetch temp bhikku data
-            if temp_candidate_regn_id or temp_karmacharya_id or temp_upaddhyaya_id or temp_tutors_tutor_id or temp_presiding_bhikshu_id or temp_samanera_serial_id:
-                from app.models.temporary_bhikku import TemporaryBhikku
-                
-                if temp_candidate_regn_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_candidate_regn_id).first()
-                    if temp_bhikku:
-                        temp_candidate_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-                
-                if temp_karmacharya_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_karmacharya_id).first()
-                    if temp_bhikku:
-                        temp_karmacharya_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-                
-                if temp_upaddhyaya_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_upaddhyaya_id).first()
-                    if temp_bhikku:
-                        temp_upaddhyaya_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-                
-                if temp_tutors_tutor_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_tutors_tutor_id).first()
-                    if temp_bhikku:
-                        temp_tutors_tutor_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-                
-                if temp_presiding_bhikshu_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_presiding_bhikshu_id).first()
-                    if temp_bhikku:
-                        temp_presiding_bhikshu_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-                
-                if temp_samanera_serial_id:
-                    temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_samanera_serial_id).first()
-                    if temp_bhikku:
-                        temp_samanera_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-            
-            # Fetch temp vihara data
-            if temp_livtemple_id or temp_residence_higher_id or temp_residence_permanent_id or temp_higher_ordination_place_id:
-                from app.models.temporary_vihara import TemporaryVihara
-                
-                if temp_livtemple_id:
-                    temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_livtemple_id).first()
-                    if temp_vihara:
-                        temp_livtemple_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-                
-                if temp_residence_higher_id:
-                    temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_residence_higher_id).first()
-                    if temp_vihara:
-                        temp_residence_higher_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-                
-                if temp_residence_permanent_id:
-                    temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_residence_permanent_id).first()
-                    if temp_vihara:
-                        temp_residence_permanent_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-                
-                if temp_higher_ordination_place_id:
-                    temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_higher_ordination_place_id).first()
-                    if temp_vihara:
-                        temp_higher_ordination_place_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-            
-            # Fetch regular related data
-            if bhikku_high.bhr_candidate_regn:
-                from app.models.bhikku import Bhikku
-                candidate = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_candidate_regn).first()
-            
-            if bhikku_high.bhr_currstat:
-                from app.models.status import StatusData
-                status_obj = db.query(StatusData).filter(StatusData.st_statcd == bhikku_high.bhr_currstat).first()
-            
-            if bhikku_high.bhr_parshawaya:
-                from app.models.parshawadata import ParshawaData
-                parshawaya_obj = db.query(ParshawaData).filter(ParshawaData.pr_prn == bhikku_high.bhr_parshawaya).first()
-            
-            if bhikku_high.bhr_livtemple:
-                from app.models.vihara import ViharaData
-                livtemple_obj = db.query(ViharaData).filter(ViharaData.vh_trn == bhikku_high.bhr_livtemple).first()
-            
-            if bhikku_high.bhr_residence_higher_ordination_trn:
-                from app.models.vihara import ViharaData
-                residence_higher_obj = db.query(ViharaData).filter(ViharaData.vh_trn == bhikku_high.bhr_residence_higher_ordination_trn).first()
-            
-            if bhikku_high.bhr_residence_permanent_trn:
-                from app.models.vihara import ViharaData
-                residence_permanent_obj = db.query(ViharaData).filter(ViharaData.vh_trn == bhikku_high.bhr_residence_permanent_trn).first()
-            
-            if bhikku_high.bhr_tutors_tutor_regn:
-                from app.models.bhikku import Bhikku
-                tutor_obj = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_tutors_tutor_regn).first()
-            
-            if bhikku_high.bhr_presiding_bhikshu_regn:
-                from app.models.bhikku import Bhikku
-                presiding_obj = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_presiding_bhikshu_regn).first()
-            
-            if bhikku_high.bhr_karmacharya_name:
-                from app.models.bhikku import Bhikku
-                karmacharya_obj = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_karmacharya_name).first()
-            
-            if bhikku_high.bhr_upaddhyaya_name:
-                from app.models.bhikku import Bhikku
-                upaddhyaya_obj = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_upaddhyaya_name).first()
-            
-            if bhikku_high.bhr_samanera_serial_no:
-                from app.models.bhikku import Bhikku
-                samanera_obj = db.query(Bhikku).filter(Bhikku.br_regn == bhikku_high.bhr_samanera_serial_no).first()
-            
-            if bhikku_high.bhr_higher_ordination_place:
-                from app.models.vihara import ViharaData
-                higher_ordination_place_obj = db.query(ViharaData).filter(ViharaData.vh_trn == bhikku_high.bhr_higher_ordination_place).first()
-        
+        return self.enrich_bhikku_high_dicts([bhikku_high])[0]
+
+    def enrich_bhikku_high_dicts(self, records: list[BhikkuHighRegist], db: Optional[Session] = None) -> list[dict]:
+        """
+        enrich_bhikku_high_dict for a page of records. Referenced bhikkus, viharas,
+        statuses, parshawayas and temporary records are loaded once for the page.
+        """
+        records = list(records)
+        if db is None and records:
+            db = records[0]._sa_instance_state.session
+        references = _PageReferences(db, records, "bhr")
+        return [self._build_bhikku_high_dict(record, references) for record in records]
+
+    def _build_bhikku_high_dict(self, bhikku_high: BhikkuHighRegist, references: "_PageReferences") -> dict:
+        bhikku_ref = lambda field: references.bhikku(bhikku_high, field)
+        vihara_ref = lambda field: references.vihara(bhikku_high, field)
+
         bhikku_high_dict = {
             "bhr_id": bhikku_high.bhr_id,
             "bhr_regn": bhikku_high.bhr_regn,
             "bhr_reqstdate": bhikku_high.bhr_reqstdate,
-            "bhr_samanera_serial_no": temp_samanera_data if temp_samanera_data else (
-                {"br_regn": samanera_obj.br_regn, "br_mahananame": samanera_obj.br_mahananame or "", "br_upasampadaname": ""} if samanera_obj else bhikku_high.bhr_samanera_serial_no
-            ),
-            "bhr_remarks": remarks_display or None,
+            "bhr_samanera_serial_no": bhikku_ref("samanera_serial_no"),
+            "bhr_remarks": references.remarks(bhikku_high) or None,
             
-            "bhr_currstat": {
-                "st_statcd": status_obj.st_statcd,
-                "st_descr": status_obj.st_descr
-            } if status_obj else bhikku_high.bhr_currstat,
+            "bhr_currstat": references.status(bhikku_high.bhr_currstat),
             
-            "bhr_parshawaya": {
-                "code": parshawaya_obj.pr_prn,
-                "name": parshawaya_obj.pr_pname
-            } if parshawaya_obj else bhikku_high.bhr_parshawaya,
+            "bhr_parshawaya": references.parshawaya(bhikku_high.bhr_parshawaya),
             
-            "bhr_livtemple": temp_livtemple_data if temp_livtemple_data else (
-                {"vh_trn": livtemple_obj.vh_trn, "vh_vname": livtemple_obj.vh_vname} if livtemple_obj else bhikku_high.bhr_livtemple
-            ),
+            "bhr_livtemple": vihara_ref("livtemple"),
             
             "bhr_cc_code": bhikku_high.bhr_cc_code,
-            "bhr_candidate_regn": temp_candidate_data if temp_candidate_data else (
-                {"br_regn": candidate.br_regn, "br_mahananame": candidate.br_mahananame or "", "br_upasampadaname": ""} if candidate else bhikku_high.bhr_candidate_regn
-            ),
-            "bhr_higher_ordination_place": temp_higher_ordination_place_data if temp_higher_ordination_place_data else (
-                {"vh_trn": higher_ordination_place_obj.vh_trn, "vh_vname": higher_ordination_place_obj.vh_vname} if higher_ordination_place_obj else bhikku_high.bhr_higher_ordination_place
-            ),
+            "bhr_candidate_regn": bhikku_ref("candidate_regn"),
+            "bhr_higher_ordination_place": vihara_ref("higher_ordination_place"),
             "bhr_higher_ordination_date": bhikku_high.bhr_higher_ordination_date,
-            "bhr_karmacharya_name": temp_karmacharya_data if temp_karmacharya_data else (
-                {"br_regn": karmacharya_obj.br_regn, "br_mahananame": karmacharya_obj.br_mahananame or "", "br_upasampadaname": ""} if karmacharya_obj else bhikku_high.bhr_karmacharya_name
-            ),
-            "bhr_upaddhyaya_name": temp_upaddhyaya_data if temp_upaddhyaya_data else (
-                {"br_regn": upaddhyaya_obj.br_regn, "br_mahananame": upaddhyaya_obj.br_mahananame or "", "br_upasampadaname": ""} if upaddhyaya_obj else bhikku_high.bhr_upaddhyaya_name
-            ),
+            "bhr_karmacharya_name": bhikku_ref("karmacharya_name"),
+            "bhr_upaddhyaya_name": bhikku_ref("upaddhyaya_name"),
             "bhr_assumed_name": bhikku_high.bhr_assumed_name,
             
-            "bhr_residence_higher_ordination_trn": temp_residence_higher_data if temp_residence_higher_data else (
-                {"vh_trn": residence_higher_obj.vh_trn, "vh_vname": residence_higher_obj.vh_vname} if residence_higher_obj else bhikku_high.bhr_residence_higher_ordination_trn
-            ),
+            "bhr_residence_higher_ordination_trn": vihara_ref("residence_higher_ordination_trn"),
             
-            "bhr_residence_permanent_trn": temp_residence_permanent_data if temp_residence_permanent_data else (
-                {"vh_trn": residence_permanent_obj.vh_trn, "vh_vname": residence_permanent_obj.vh_vname} if residence_permanent_obj else bhikku_high.bhr_residence_permanent_trn
-            ),
+            "bhr_residence_permanent_trn": vihara_ref("residence_permanent_trn"),
             
             "bhr_declaration_residence_address": bhikku_high.bhr_declaration_residence_address,
             
-            "bhr_tutors_tutor_regn": temp_tutors_tutor_data if temp_tutors_tutor_data else (
-                {"br_regn": tutor_obj.br_regn, "br_mahananame": tutor_obj.br_mahananame or "", "br_upasampadaname": ""} if tutor_obj else bhikku_high.bhr_tutors_tutor_regn
-            ),
+            "bhr_tutors_tutor_regn": bhikku_ref("tutors_tutor_regn"),
             
-            "bhr_presiding_bhikshu_regn": temp_presiding_bhikshu_data if temp_presiding_bhikshu_data else (
-                {"br_regn": presiding_obj.br_regn, "br_mahananame": presiding_obj.br_mahananame or "", "br_upasampadaname": ""} if presiding_obj else bhikku_high.bhr_presiding_bhikshu_regn
-            ),
+            "bhr_presiding_bhikshu_regn": bhikku_ref("presiding_bhikshu_regn"),
             
             "bhr_declaration_date": bhikku_high.bhr_declaration_date,
             "bhr_form_id": bhikku_high.bhr_form_id,
@@ -477,223 +372,48 @@ class BhikkuHighService:
         Convert DirectBhikkuHigh model to bhikku_high format dictionary.
         Maps direct_bhikku_high fields to bhikku_high equivalent fields.
         """
-        import re
-        from app.models.status import StatusData
-        from app.models.parshawadata import ParshawaData
-        from app.models.vihara import ViharaData
-        from app.models.bhikku import Bhikku
-        
-        # Parse temporary references from remarks
-        temp_karmacharya_id = None
-        temp_upaddhyaya_id = None
-        temp_tutors_tutor_id = None
-        temp_presiding_bhikshu_id = None
-        temp_samanera_serial_id = None
-        temp_livtemple_id = None
-        temp_residence_higher_id = None
-        temp_residence_permanent_id = None
-        temp_higher_ordination_place_id = None
-        remarks_display = direct_bhikku_high.dbh_remarks or ""
-        
-        if remarks_display:
-            # Extract temp bhikku references (using DBH prefix for direct bhikku high)
-            match = re.search(r'\[TEMP_DBH_KARMACHARYA_NAME:(\d+)\]', remarks_display)
-            if match:
-                temp_karmacharya_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_UPADDHYAYA_NAME:(\d+)\]', remarks_display)
-            if match:
-                temp_upaddhyaya_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_TUTORS_TUTOR_REGN:(\d+)\]', remarks_display)
-            if match:
-                temp_tutors_tutor_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_PRESIDING_BHIKSHU_REGN:(\d+)\]', remarks_display)
-            if match:
-                temp_presiding_bhikshu_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_SAMANERA_SERIAL_NO:(\d+)\]', remarks_display)
-            if match:
-                temp_samanera_serial_id = int(match.group(1))
-            
-            # Extract temp vihara references
-            match = re.search(r'\[TEMP_DBH_LIVTEMPLE:(\d+)\]', remarks_display)
-            if match:
-                temp_livtemple_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_RESIDENCE_HIGHER_ORDINATION_TRN:(\d+)\]', remarks_display)
-            if match:
-                temp_residence_higher_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_RESIDENCE_PERMANENT_TRN:(\d+)\]', remarks_display)
-            if match:
-                temp_residence_permanent_id = int(match.group(1))
-            match = re.search(r'\[TEMP_DBH_HIGHER_ORDINATION_PLACE:(\d+)\]', remarks_display)
-            if match:
-                temp_higher_ordination_place_id = int(match.group(1))
-            
-            # Remove temp references from display remarks
-            remarks_display = re.sub(r'\[TEMP_DBH_[A-Z_]+:\d+\]', '', remarks_display).strip()
-        
-        # Temp data objects
-        temp_karmacharya_data = None
-        temp_upaddhyaya_data = None
-        temp_tutors_tutor_data = None
-        temp_presiding_bhikshu_data = None
-        temp_samanera_data = None
-        temp_livtemple_data = None
-        temp_residence_higher_data = None
-        temp_residence_permanent_data = None
-        temp_higher_ordination_place_data = None
-        
-        # Fetch temp bhikku data
-        if temp_karmacharya_id or temp_upaddhyaya_id or temp_tutors_tutor_id or temp_presiding_bhikshu_id or temp_samanera_serial_id:
-            from app.models.temporary_bhikku import TemporaryBhikku
-            
-            if temp_karmacharya_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_karmacharya_id).first()
-                if temp_bhikku:
-                    temp_karmacharya_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-            
-            if temp_upaddhyaya_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_upaddhyaya_id).first()
-                if temp_bhikku:
-                    temp_upaddhyaya_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-            
-            if temp_tutors_tutor_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_tutors_tutor_id).first()
-                if temp_bhikku:
-                    temp_tutors_tutor_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-            
-            if temp_presiding_bhikshu_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_presiding_bhikshu_id).first()
-                if temp_bhikku:
-                    temp_presiding_bhikshu_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-            
-            if temp_samanera_serial_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(TemporaryBhikku.tb_id == temp_samanera_serial_id).first()
-                if temp_bhikku:
-                    temp_samanera_data = {"br_regn": f"TEMP-{temp_bhikku.tb_id}", "br_mahananame": temp_bhikku.tb_name or "", "br_upasampadaname": ""}
-        
-        # Fetch temp vihara data
-        if temp_livtemple_id or temp_residence_higher_id or temp_residence_permanent_id or temp_higher_ordination_place_id:
-            from app.models.temporary_vihara import TemporaryVihara
-            
-            if temp_livtemple_id:
-                temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_livtemple_id).first()
-                if temp_vihara:
-                    temp_livtemple_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-            
-            if temp_residence_higher_id:
-                temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_residence_higher_id).first()
-                if temp_vihara:
-                    temp_residence_higher_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-            
-            if temp_residence_permanent_id:
-                temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_residence_permanent_id).first()
-                if temp_vihara:
-                    temp_residence_permanent_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-            
-            if temp_higher_ordination_place_id:
-                temp_vihara = db.query(TemporaryVihara).filter(TemporaryVihara.tv_id == temp_higher_ordination_place_id).first()
-                if temp_vihara:
-                    temp_higher_ordination_place_data = {"vh_trn": f"TEMP-{temp_vihara.tv_id}", "vh_vname": temp_vihara.tv_name or ""}
-        
-        # Fetch related objects
-        status_obj = None
-        parshawaya_obj = None
-        livtemple_obj = None
-        residence_higher_obj = None
-        residence_permanent_obj = None
-        tutor_obj = None
-        presiding_obj = None
-        karmacharya_obj = None
-        upaddhyaya_obj = None
-        samanera_obj = None
-        higher_ordination_place_obj = None
-        
-        if direct_bhikku_high.dbh_currstat:
-            status_obj = db.query(StatusData).filter(StatusData.st_statcd == direct_bhikku_high.dbh_currstat).first()
-        
-        if direct_bhikku_high.dbh_parshawaya:
-            parshawaya_obj = db.query(ParshawaData).filter(ParshawaData.pr_prn == direct_bhikku_high.dbh_parshawaya).first()
-        
-        if direct_bhikku_high.dbh_livtemple:
-            livtemple_obj = db.query(ViharaData).filter(ViharaData.vh_trn == direct_bhikku_high.dbh_livtemple).first()
-        
-        if direct_bhikku_high.dbh_residence_higher_ordination_trn:
-            residence_higher_obj = db.query(ViharaData).filter(ViharaData.vh_trn == direct_bhikku_high.dbh_residence_higher_ordination_trn).first()
-        
-        if direct_bhikku_high.dbh_residence_permanent_trn:
-            residence_permanent_obj = db.query(ViharaData).filter(ViharaData.vh_trn == direct_bhikku_high.dbh_residence_permanent_trn).first()
-        
-        if direct_bhikku_high.dbh_tutors_tutor_regn:
-            tutor_obj = db.query(Bhikku).filter(Bhikku.br_regn == direct_bhikku_high.dbh_tutors_tutor_regn).first()
-        
-        if direct_bhikku_high.dbh_presiding_bhikshu_regn:
-            presiding_obj = db.query(Bhikku).filter(Bhikku.br_regn == direct_bhikku_high.dbh_presiding_bhikshu_regn).first()
-        
-        if direct_bhikku_high.dbh_karmacharya_name:
-            karmacharya_obj = db.query(Bhikku).filter(Bhikku.br_regn == direct_bhikku_high.dbh_karmacharya_name).first()
-        
-        if direct_bhikku_high.dbh_upaddhyaya_name:
-            upaddhyaya_obj = db.query(Bhikku).filter(Bhikku.br_regn == direct_bhikku_high.dbh_upaddhyaya_name).first()
-        
-        if direct_bhikku_high.dbh_samanera_serial_no:
-            samanera_obj = db.query(Bhikku).filter(Bhikku.br_regn == direct_bhikku_high.dbh_samanera_serial_no).first()
-        
-        if direct_bhikku_high.dbh_higher_ordination_place:
-            higher_ordination_place_obj = db.query(ViharaData).filter(ViharaData.vh_trn == direct_bhikku_high.dbh_higher_ordination_place).first()
-        
+        return self.convert_direct_to_bhikku_high_dicts([direct_bhikku_high], db)[0]
+
+    def convert_direct_to_bhikku_high_dicts(self, records: list, db: Session) -> list[dict]:
+        """convert_direct_to_bhikku_high_dict for a page of records, with page-level lookups."""
+        records = list(records)
+        references = _PageReferences(db, records, "dbh")
+        return [self._build_direct_bhikku_high_dict(record, references) for record in records]
+
+    def _build_direct_bhikku_high_dict(self, direct_bhikku_high, references: "_PageReferences") -> dict:
+        bhikku_ref = lambda field: references.bhikku(direct_bhikku_high, field)
+        vihara_ref = lambda field: references.vihara(direct_bhikku_high, field)
+
         # Create the converted dictionary with bhikku_high field names
         converted_dict = {
             # Map direct bhikku high ID to bhikku high format
             "bhr_id": direct_bhikku_high.dbh_id,
             "bhr_regn": direct_bhikku_high.dbh_regn,
             "bhr_reqstdate": direct_bhikku_high.dbh_reqstdate,
-            "bhr_samanera_serial_no": temp_samanera_data if temp_samanera_data else (
-                {"br_regn": samanera_obj.br_regn, "br_mahananame": samanera_obj.br_mahananame or "", "br_upasampadaname": ""} if samanera_obj else direct_bhikku_high.dbh_samanera_serial_no
-            ),
-            "bhr_remarks": remarks_display or None,
+            "bhr_samanera_serial_no": bhikku_ref("samanera_serial_no"),
+            "bhr_remarks": references.remarks(direct_bhikku_high) or None,
             
-            "bhr_currstat": {
-                "st_statcd": status_obj.st_statcd,
-                "st_descr": status_obj.st_descr
-            } if status_obj else direct_bhikku_high.dbh_currstat,
+            "bhr_currstat": references.status(direct_bhikku_high.dbh_currstat),
             
-            "bhr_parshawaya": {
-                "code": parshawaya_obj.pr_prn,
-                "name": parshawaya_obj.pr_pname
-            } if parshawaya_obj else direct_bhikku_high.dbh_parshawaya,
+            "bhr_parshawaya": references.parshawaya(direct_bhikku_high.dbh_parshawaya),
             
-            "bhr_livtemple": temp_livtemple_data if temp_livtemple_data else (
-                {"vh_trn": livtemple_obj.vh_trn, "vh_vname": livtemple_obj.vh_vname} if livtemple_obj else direct_bhikku_high.dbh_livtemple
-            ),
+            "bhr_livtemple": vihara_ref("livtemple"),
             
             "bhr_cc_code": direct_bhikku_high.dbh_cc_code,
             "bhr_candidate_regn": None,  # Direct high bhikku doesn't have candidate_regn
-            "bhr_higher_ordination_place": temp_higher_ordination_place_data if temp_higher_ordination_place_data else (
-                {"vh_trn": higher_ordination_place_obj.vh_trn, "vh_vname": higher_ordination_place_obj.vh_vname} if higher_ordination_place_obj else direct_bhikku_high.dbh_higher_ordination_place
-            ),
+            "bhr_higher_ordination_place": vihara_ref("higher_ordination_place"),
             "bhr_higher_ordination_date": direct_bhikku_high.dbh_higher_ordination_date,
-            "bhr_karmacharya_name": temp_karmacharya_data if temp_karmacharya_data else (
-                {"br_regn": karmacharya_obj.br_regn, "br_mahananame": karmacharya_obj.br_mahananame or "", "br_upasampadaname": ""} if karmacharya_obj else direct_bhikku_high.dbh_karmacharya_name
-            ),
-            "bhr_upaddhyaya_name": temp_upaddhyaya_data if temp_upaddhyaya_data else (
-                {"br_regn": upaddhyaya_obj.br_regn, "br_mahananame": upaddhyaya_obj.br_mahananame or "", "br_upasampadaname": ""} if upaddhyaya_obj else direct_bhikku_high.dbh_upaddhyaya_name
-            ),
+            "bhr_karmacharya_name": bhikku_ref("karmacharya_name"),
+            "bhr_upaddhyaya_name": bhikku_ref("upaddhyaya_name"),
             "bhr_assumed_name": direct_bhikku_high.dbh_assumed_name,
             
-            "bhr_residence_higher_ordination_trn": temp_residence_higher_data if temp_residence_higher_data else (
-                {"vh_trn": residence_higher_obj.vh_trn, "vh_vname": residence_higher_obj.vh_vname} if residence_higher_obj else direct_bhikku_high.dbh_residence_higher_ordination_trn
-            ),
+            "bhr_residence_higher_ordination_trn": vihara_ref("residence_higher_ordination_trn"),
             
-            "bhr_residence_permanent_trn": temp_residence_permanent_data if temp_residence_permanent_data else (
-                {"vh_trn": residence_permanent_obj.vh_trn, "vh_vname": residence_permanent_obj.vh_vname} if residence_permanent_obj else direct_bhikku_high.dbh_residence_permanent_trn
-            ),
+            "bhr_residence_permanent_trn": vihara_ref("residence_permanent_trn"),
             
             "bhr_declaration_residence_address": direct_bhikku_high.dbh_declaration_residence_address,
-            "bhr_tutors_tutor_regn": temp_tutors_tutor_data if temp_tutors_tutor_data else (
-                {"br_regn": tutor_obj.br_regn, "br_mahananame": tutor_obj.br_mahananame or "", "br_upasampadaname": ""} if tutor_obj else direct_bhikku_high.dbh_tutors_tutor_regn
-            ),
-            "bhr_presiding_bhikshu_regn": temp_presiding_bhikshu_data if temp_presiding_bhikshu_data else (
-                {"br_regn": presiding_obj.br_regn, "br_mahananame": presiding_obj.br_mahananame or "", "br_upasampadaname": ""} if presiding_obj else direct_bhikku_high.dbh_presiding_bhikshu_regn
-            ),
+            "bhr_tutors_tutor_regn": bhikku_ref("tutors_tutor_regn"),
+            "bhr_presiding_bhikshu_regn": bhikku_ref("presiding_bhikshu_regn"),
             "bhr_declaration_date": direct_bhikku_high.dbh_declaration_date,
             "bhr_form_id": None,  # Direct high bhikku doesn't use form_id
             "bhr_workflow_status": direct_bhikku_high.dbh_workflow_status,
@@ -873,40 +593,10 @@ class BhikkuHighService:
         if "bhr_samanera_serial_no" in update_data and not self._has_meaningful_value(update_data.get("bhr_samanera_serial_no")):
             update_data["bhr_samanera_serial_no"] = None
 
-        # Handle temporary bhikku references - these can't be stored as FK references
-        import re
-        temp_refs = []
-        for field in ["bhr_candidate_regn", "bhr_karmacharya_name", "bhr_upaddhyaya_name", 
-                      "bhr_tutors_tutor_regn", "bhr_presiding_bhikshu_regn", "bhr_samanera_serial_no"]:
-            # Only process fields that were explicitly included in the update
-            if field not in update_data:
-                continue
-            value = update_data.get(field)
-            if value and isinstance(value, str):
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    update_data[field] = None
-        
-        # Handle temporary vihara references
-        for field in ["bhr_livtemple", "bhr_residence_higher_ordination_trn", 
-                      "bhr_residence_permanent_trn", "bhr_higher_ordination_place"]:
-            # Only process fields that were explicitly included in the update
-            if field not in update_data:
-                continue
-            value = update_data.get(field)
-            if value and isinstance(value, str):
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    update_data[field] = None
-        
-        # Append temp references to remarks if any
-        if temp_refs:
-            existing_remarks = update_data.get("bhr_remarks") or entity.bhr_remarks or ""
-            existing_remarks = re.sub(r'\[TEMP_BHR_[A-Z_]+:\d+\]', '', existing_remarks).strip()
-            temp_refs_str = " ".join(temp_refs)
-            update_data["bhr_remarks"] = f"{existing_remarks} {temp_refs_str}".strip() if existing_remarks else temp_refs_str
+        # Handle temporary bhikku / vihara references - these can't be stored as FK
+        # references. Only fields explicitly included in the update are touched;
+        # a real value (or null) drops the field's temp reference.
+        temp_references = self._take_temp_references(update_data)
 
         if "bhr_regn" in update_data and update_data["bhr_regn"]:
             new_regn = update_data["bhr_regn"]
@@ -924,7 +614,7 @@ class BhikkuHighService:
 
         patched_payload = BhikkuHighUpdate(**update_data)
         return bhikku_high_repo.update(
-            db, entity=entity, data=patched_payload, actor_id=actor_id
+            db, entity=entity, data=patched_payload, actor_id=actor_id, temp_references=temp_references
         )
 
     def delete_bhikku_high(
@@ -1181,10 +871,14 @@ class BhikkuHighService:
         
         # Handle TEMP- references
         if bhr_candidate_regn.startswith("TEMP-"):
-            # Check if there's already a high bhikku record with this TEMP- candidate in remarks
-            temp_marker = f"[TEMP_BHR_CANDIDATE_REGN:{bhr_candidate_regn[5:]}]"
+            # Check if there's already a high bhikku record with this TEMP- candidate
+            temp_id = parse_temp_id(bhr_candidate_regn)
+            if temp_id is None:
+                return
             existing = db.query(BhikkuHighRegist).filter(
-                BhikkuHighRegist.bhr_remarks.contains(temp_marker),
+                BhikkuHighRegist.bhr_id.in_(temp_reference_repo.referencing_ids(
+                    entity=ENTITY_BHIKKU_HIGH, field="bhr_candidate_regn", kind=KIND_BHIKKU, temp_id=temp_id,
+                )),
                 BhikkuHighRegist.bhr_is_deleted.is_(False),
             ).first()
             
@@ -1341,6 +1035,8 @@ class BhikkuHighService:
     ) -> None:
         if not self._has_meaningful_value(value):
             return
+        if reference_cache.has(db, "cmm_cat", "cc_code", value, include_deleted=False):
+            return
 
         from sqlalchemy import text
         exists = db.execute(
@@ -1368,6 +1064,8 @@ class BhikkuHighService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
@@ -1410,6 +1108,26 @@ class BhikkuHighService:
                 cleaned[key] = value
         return cleaned
 
+    @staticmethod
+    def _take_temp_references(data: Dict[str, Any]) -> Dict[str, TempTarget]:
+        """
+        Pop "TEMP-<id>" values of the bhikku / vihara reference fields in
+        `data` (the field is set to None) and return the temp_reference
+        changes for every reference field present in `data`.
+        """
+        changes: Dict[str, TempTarget] = {}
+        for fields, kind in ((BHIKKU_REF_FIELDS, KIND_BHIKKU), (VIHARA_REF_FIELDS, KIND_VIHARA)):
+            for field in (f"bhr_{name}" for name in fields):
+                if field not in data:
+                    continue
+                value = data[field]
+                temp_id = None
+                if isinstance(value, str) and value.startswith("TEMP-"):
+                    temp_id = parse_temp_id(value)
+                    data[field] = None
+                changes[field] = (kind, temp_id) if temp_id is not None else None
+        return changes
+
     @staticmethod
     def _has_meaningful_value(value: Any) -> bool:
         if value is None:
@@ -12,7 +12,9 @@ from app.schemas.bhikku_id_card import (
     BhikkuIDCardResponse
 )
 from app.utils.file_storage import file_storage_service
+from app.utils.image_derivatives import image_derivatives
 from app.models.bhikku_id_card import BhikkuIDCard
+from app.utils.pagination import KeysetPage
 
 
 class BhikkuIDCardService:
@@ -25,6 +27,7 @@ class BhikkuIDCardService:
         self.repository = bhikku_id_card_repository
         self.bhikku_repository = BhikkuRepository()
         self.file_storage = file_storage_service
+        self.image_derivatives = image_derivatives
 
     def create_bhikku_id_card(
         self,
@@ -135,8 +138,10 @@ class BhikkuIDCardService:
         skip: int = 0,
         limit: int = 100,
         workflow_status: Optional[str] = None,
-        search_key: Optional[str] = None
-    ) -> tuple[List[BhikkuIDCard], int]:
+        search_key: Optional[str] = None,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[BhikkuIDCard] | KeysetPage, int]:
         """
         Get all Bhikku ID Cards with filtering and pagination.
         
@@ -146,6 +151,8 @@ class BhikkuIDCardService:
             limit: Max records to return
             workflow_status: Filter by status
             search_key: Search text
+            keyset: Return a KeysetPage fetched after/before `cursor` instead of an offset page
+            cursor: next_cursor / prev_cursor of a previous keyset page
             
         Returns:
             Tuple of (list of cards, total count)
@@ -155,7 +162,9 @@ class BhikkuIDCardService:
             skip=skip,
             limit=limit,
             workflow_status=workflow_status,
-            search_key=search_key
+            search_key=search_key,
+            keyset=keyset,
+            cursor=cursor,
         )
 
     def update_bhikku_id_card(
@@ -377,6 +386,7 @@ class BhikkuIDCardService:
             "left_thumbprint",
             subdirectory="bhikku_id"
         )
+        self.image_derivatives.schedule(relative_path)
         
         # Update database
         updated_card = self.repository.update_file_paths(
@@ -428,6 +438,7 @@ class BhikkuIDCardService:
             "applicant_photo",
             subdirectory="bhikku_id"
         )
+        self.image_derivatives.schedule(relative_path)
         
         # Update database
         updated_card = self.repository.update_file_paths(
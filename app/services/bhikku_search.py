@@ -0,0 +1,142 @@
+# app/services/bhikku_search.py
+"""
+Search documents for bhikku READ_ALL `search_key` filtering.
+
+Every bhikku_regist row has a bhikku_search row whose bs_document joins the
+searchable bhikku columns and the name/address of its living and mahana
+temples with a unit separator, so one trigram-indexed
+`bs_document ILIKE '%term%'` matches exactly what the former 25 ILIKE
+predicates matched, without the temple outer join multiplying rows.
+
+Documents are rebuilt in after_flush for new/changed bhikkus and for bhikkus
+whose temple name or address changed.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Float, Select, cast, event, func, inspect, or_, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session, aliased
+
+from app.db.session import SessionLocal
+from app.models.bhikku import Bhikku
+from app.models.bhikku_search import BhikkuSearch
+from app.models.vihara import ViharaData
+
+# Cannot appear in user input, so matches never span two fields
+FIELD_SEPARATOR = "\x1f"
+
+SEARCH_COLUMNS = (
+    Bhikku.br_regn,
+    Bhikku.br_upasampada_serial_no,
+    Bhikku.br_gihiname,
+    Bhikku.br_fathrname,
+    Bhikku.br_mahananame,
+    Bhikku.br_birthpls,
+    Bhikku.br_province,
+    Bhikku.br_district,
+    Bhikku.br_korale,
+    Bhikku.br_pattu,
+    Bhikku.br_division,
+    Bhikku.br_vilage,
+    Bhikku.br_gndiv,
+    Bhikku.br_mobile,
+    Bhikku.br_email,
+    Bhikku.br_fathrsaddrs,
+    Bhikku.br_fathrsmobile,
+    Bhikku.br_parshawaya,
+    Bhikku.br_livtemple,
+    Bhikku.br_mahanatemple,
+    Bhikku.br_mahanaacharyacd,
+    Bhikku.br_currstat,
+    Bhikku.br_cat,
+)
+_SEARCH_KEYS = frozenset(col.key for col in SEARCH_COLUMNS)
+_TEMPLE_KEYS = frozenset({"vh_vname", "vh_addrs"})
+
+
+def document_select() -> Select:
+    """SELECT (br_id, document) for every bhikku; filter it to rebuild a subset."""
+    living = aliased(ViharaData)
+    mahana = aliased(ViharaData)
+    document = func.concat_ws(
+        FIELD_SEPARATOR,
+        *SEARCH_COLUMNS,
+        living.vh_vname,
+        living.vh_addrs,
+        mahana.vh_vname,
+        mahana.vh_addrs,
+    )
+    return (
+        select(Bhikku.br_id, document)
+        .outerjoin(living, living.vh_trn == Bhikku.br_livtemple)
+        .outerjoin(mahana, mahana.vh_trn == Bhikku.br_mahanatemple)
+    )
+
+
+def refresh_documents(
+    connection,
+    *,
+    br_ids: Iterable[int] = (),
+    temple_trns: Iterable[str] = (),
+) -> None:
+    """Upsert the search documents of the given bhikkus and of bhikkus living in the given temples."""
+    br_ids, temple_trns = list(br_ids), list(temple_trns)
+    if not br_ids and not temple_trns:
+        return
+    conditions = []
+    if br_ids:
+        conditions.append(Bhikku.br_id.in_(br_ids))
+    if temple_trns:
+        conditions.append(Bhikku.br_livtemple.in_(temple_trns))
+        conditions.append(Bhikku.br_mahanatemple.in_(temple_trns))
+
+    stmt = postgresql.insert(BhikkuSearch.__table__).from_select(
+        ["bs_br_id", "bs_document"], document_select().where(or_(*conditions))
+    )
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["bs_br_id"],
+            set_={"bs_document": stmt.excluded.bs_document, "bs_updated_at": func.now()},
+        )
+    )
+
+
+def apply_search(query: Query, search_key: Optional[str]) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    Filter a Bhikku query by `search_key`.
+    Returns the query and a rank expression (None when there is no search) for ORDER BY.
+    """
+    if not search_key or not search_key.strip():
+        return query, None
+    term = search_key.strip()
+    query = query.join(BhikkuSearch, BhikkuSearch.bs_br_id == Bhikku.br_id).filter(
+        BhikkuSearch.bs_document.ilike(f"%{term}%")
+    )
+    # Whole-word matches rank above substring-only matches. ts_rank() is a
+    # real (float4); as double precision the value read back into a keyset
+    # cursor compares equal to the row it came from.
+    rank = cast(func.ts_rank(BhikkuSearch.bs_tsv, func.plainto_tsquery("simple", term)), Float(53))
+    return query, rank
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def sync_bhikku_search(session: Session, flush_context) -> None:
+    br_ids = set()
+    temple_trns = set()
+    for instance in list(session.new) + list(session.dirty):
+        if isinstance(instance, Bhikku):
+            if instance in session.new or _changed(session, instance, _SEARCH_KEYS):
+                br_ids.add(instance.br_id)
+        elif isinstance(instance, ViharaData):
+            if instance in session.new or _changed(session, instance, _TEMPLE_KEYS):
+                temple_trns.add(instance.vh_trn)
+    if br_ids or temple_trns:
+        refresh_documents(session.connection(), br_ids=br_ids, temple_trns=temple_trns)
+
+
+def _changed(session: Session, instance, keys: frozenset) -> bool:
+    """True if any of `keys` was modified in this flush."""
+    committed = inspect(instance).committed_state
+    return any(key in committed for key in keys)
@@ -14,11 +14,59 @@ from app.models.bhikku import Bhikku
 from app.models.bhikku_high import BhikkuHighRegist
 from app.models.nikaya import NikayaData
 from app.models.parshawadata import ParshawaData
+from app.models.temp_reference import ENTITY_BHIKKU, KIND_BHIKKU, KIND_VIHARA
 from app.models.user import UserAccount
 from app.models.vihara import ViharaData
 from app.repositories.bhikku_repo import bhikku_repo
+from app.repositories.temp_reference_repo import (
+    ResolvedTempReference,
+    TempTarget,
+    parse_temp_id,
+    temp_reference_repo,
+)
 from app.schemas.bhikku import BhikkuCreate, BhikkuUpdate
 from app.utils.file_storage import file_storage_service
+from app.services.list_count import CountResult, list_counter
+from app.services import registration_index, report_views
+from app.services.report_views import ReportViewQuery, ReportViewRows
+from app.services.reference_cache import reference_cache
+from app.utils.batch_loading import Lookups, prime_many_to_one
+from app.utils.pagination import KeysetPage
+
+# Lookup relationships rendered as nested objects by enrich_bhikku_dict
+ENRICH_RELATIONSHIPS = (
+    "province_rel", "district_rel", "division_rel", "gndiv_rel", "status_rel",
+    "parshawaya_rel", "livtemple_rel", "mahanatemple_rel", "mahanaacharyacd_rel",
+    "category_rel", "viharadhipathi_rel", "nikaya_rel", "mahanayaka_rel",
+    "robing_tutor_residence_rel", "robing_after_residence_temple_rel",
+)
+# QR search record_type -> registration index entity type
+QR_RECORD_TYPES = {"bhikku": ("bhikku",), "silmatha": ("silmatha",), "bhikku_high": ("high_bhikku",)}
+# Fields that may reference a temporary record instead (kept in temp_reference)
+TEMP_BHIKKU_FIELDS = ("br_viharadhipathi", "br_mahanaacharyacd")
+TEMP_VIHARA_FIELDS = (
+    "br_livtemple", "br_mahanatemple", "br_robing_tutor_residence", "br_robing_after_residence_temple",
+)
+
+
+def _temp_bhikku_id(value: str) -> Optional[str]:
+    """
+    Temporary bhikku id in a br_viharadhipathi / br_mahanaacharyacd value:
+    "TEMP-17" (READ_ALL response), "TB000017" or a bare tb_id "17".
+    None for a bhikku registration number.
+    """
+    if value.startswith("TEMP-"):
+        return value[5:]
+    if value.startswith("TB"):
+        return value[2:]
+    if value.isdigit():
+        return value
+    return None
+
+
+def _split_regns(value: Optional[str]) -> list[str]:
+    # br_multi_mahanaacharyacd holds comma-separated registration numbers
+    return [r.strip() for r in value.split(',') if r.strip()] if value else []
 
 
 class BhikkuService:
@@ -35,65 +83,6 @@ class BhikkuService:
 
     def __init__(self) -> None:
         self._table_cache: Dict[Tuple[Optional[str], str], Table] = {}
-        self._mahanayaka_view_query = text(
-            """
-            SELECT regn, mahananame, currstat, vname, addrs
-            FROM bikkudtls_mahanayakalist
-            """
-        )
-        self._nikaya_view_query = text(
-            """
-            SELECT nkn, nname, prn, pname, regn
-            FROM bikkudtls_nikaya_list
-            """
-        )
-        self._acharya_view_query = text(
-            """
-            SELECT currstated, mobile, email, mahanadate, reqstdate, regn
-            FROM bikkudtls_archarya_dtls
-            """
-        )
-        self._details_view_query = text(
-            """
-            SELECT regn, birthpls, gihiname, dofb, fathrname, mahanadate,
-                   mahananame, teacher, teachadrs, mhanavh, livetemple,
-                   viharadipathi, pname, nname, nikayanayaka, effctdate,
-                   curstatus, catogry, vadescrdtls
-            FROM bikkudtls_bikkullist
-            """
-        )
-        self._certification_view_query = text(
-            """
-            SELECT regno, mahananame, issuedate, reqstdate, adminautho,
-                   prtoptn, paydate, payamount, usname, adminusr
-            FROM bikkudtls_certification_data
-            """
-        )
-        self._certification_print_view_query = text(
-            """
-            SELECT regno, mahananame, issuedate, reqstdate, adminautho,
-                   prtoptn, paydate, payamount, usname, adminusr
-            FROM bikkudtls_certification_printnow
-            """
-        )
-        self._current_status_view_query = text(
-            """
-            SELECT statcd, descr, regn
-            FROM bikkudtls_currstatus_list
-            """
-        )
-        self._district_view_query = text(
-            """
-            SELECT dcode, dname, regn
-            FROM bikkudtls_districtlist
-            """
-        )
-        self._division_sec_view_query = text(
-            """
-            SELECT dvcode, dvname, regn
-            FROM bikkudtls_divisionsec_dtls
-            """
-        )
         self._province_view_query = text(
             """
             SELECT cp_code, cp_name
@@ -102,110 +91,6 @@ class BhikkuService:
             ORDER BY cp_name
             """
         )
-        self._gn_view_query = text(
-            """
-            SELECT gnc, gnname, regn
-            FROM bikkudtls_gn_dtls
-            """
-        )
-        self._history_status_view_query = text(
-            """
-            SELECT descr, prvdate, chngdate, regno
-            FROM bikkudtls_histtystatus_list
-            """
-        )
-        self._id_all_view_query = text(
-            """
-            SELECT idn, stat, reqstdate, printdate, issuedate, mahanaacharyacd,
-                   archadrs, achambl, achamhndate, acharegdt, mahananame, vname,
-                   addrs, regn, dofb, mahanadate, gihiname, fathrdetails
-            FROM bikkudtls_id_alllist
-            """
-        )
-        self._id_district_view_query = text(
-            """
-            SELECT dcode, dname, idn
-            FROM bikkudtls_iddistrict_list
-            """
-        )
-        self._id_division_sec_view_query = text(
-            """
-            SELECT dvcode, dvname, idn
-            FROM bikkudtls_iddvsec_list
-            """
-        )
-        self._id_gn_view_query = text(
-            """
-            SELECT gnname, idn
-            FROM bikkudtls_idgn_list
-            """
-        )
-        self._nikayanayaka_view_query = text(
-            """
-            SELECT regn, mahananame, currstat, vname, addrs
-            FROM bikkudtls_nikayanayaka_list
-            """
-        )
-        self._parshawa_view_query = text(
-            """
-            SELECT prn, pname, regn
-            FROM bikkudtls_parshawa_list
-            """
-        )
-        self._status_history_composite_query = text(
-            """
-            SELECT regno, vadescrdtls
-            FROM bikkudtls_statushystry_composit
-            """
-        )
-        self._status_history_list_query = text(
-            """
-            SELECT regno, prvdate, chngdate, descr
-            FROM bikkudtls_statushystry_list
-            """
-        )
-        self._status_history_list2_query = text(
-            """
-            SELECT regno, statchgdescr
-            FROM bikkudtls_statushystry_list2
-            """
-        )
-        self._viharadipathi_view_query = text(
-            """
-            SELECT regn, mahananame
-            FROM bikkudtls_viharadipathi_list
-            """
-        )
-        self._current_status_summary_query = text(
-            """
-            SELECT statcd, descr, statcnt
-            FROM bikkusumm_currstatus_list
-            """
-        )
-        self._district_summary_query = text(
-            """
-            SELECT dcode, dname, totalbikku
-            FROM bikkusumm_district_list
-            """
-        )
-        self._gn_summary_query = text(
-            """
-            SELECT gnc, gnname, bikkucnt
-            FROM bikkusumm_gn_list
-            """
-        )
-        self._id_district_summary_query = text(
-            """
-            SELECT dcode, dname, idcnt
-            FROM bikkusumm_iddistrict_list
-            """
-        )
-        self._id_gn_summary_query = text(
-            """
-            SELECT gnname, idcnt
-            FROM bikkusumm_idgn_list
-            """
-        )
 
     # --------------------------------------------------------------------- #
     # Public API
@@ -230,48 +115,27 @@ class BhikkuService:
         # - Pure numeric strings (e.g., "17" - tb_id from temporary_bhikku table)
         # - TB* format (e.g., "TB000001" - alternative temp bhikku identifier)
         # 
-        # Store the temp bhikku reference in remarks for later retrieval and set field to NULL
-        temp_refs = []
-        for field in ["br_viharadhipathi", "br_mahanaacharyacd"]:
+        # Store the temp bhikku reference in temp_reference and set field to NULL
+        temp_references: Dict[str, TempTarget] = {}
+        for field in TEMP_BHIKKU_FIELDS:
             value = payload_dict.get(field)
             if value and isinstance(value, str):
-                value = value.strip()
-                # Extract temp bhikku ID from various formats
-                temp_id = None
-                if value.startswith("TEMP-"):
-                    # Format: "TEMP-17"
-                    temp_id = value[5:]
-                elif value.startswith("TB"):
-                    # Format: "TB000001" or "TB17" - treat as temp bhikku reference
-                    temp_id = value
-                elif value.isdigit():
-                    # Format: "17" - pure numeric tb_id
-                    temp_id = value
-                
+                temp_id = _temp_bhikku_id(value.strip())
                 if temp_id:
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
+                    if temp_id.isdigit():
+                        temp_references[field] = (KIND_BHIKKU, int(temp_id))
                     payload_dict[field] = None
         
         # Handle temporary vihara references - these can't be stored as FK references
         # Clear fields that reference temporary viharas (TEMP-* format from READ_ALL response)
         # All these fields have FK to vihaddata table
-        for field in ["br_livtemple", "br_mahanatemple", "br_robing_tutor_residence", "br_robing_after_residence_temple"]:
+        for field in TEMP_VIHARA_FIELDS:
             value = payload_dict.get(field)
-            if value and isinstance(value, str):
-                # Extract temp vihara ID from "TEMP-11" format
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    payload_dict[field] = None
-        
-        # Append temp references to remarks if any
-        if temp_refs:
-            existing_remarks = payload_dict.get("br_remarks") or ""
-            # Remove any existing temp references from remarks first
-            import re
-            existing_remarks = re.sub(r'\[TEMP_BR_[A-Z_]+:\d+\]', '', existing_remarks).strip()
-            temp_refs_str = " ".join(temp_refs)
-            payload_dict["br_remarks"] = f"{existing_remarks} {temp_refs_str}".strip() if existing_remarks else temp_refs_str
+            if value and isinstance(value, str) and value.startswith("TEMP-"):
+                temp_id = parse_temp_id(value)
+                if temp_id is not None:
+                    temp_references[field] = (KIND_VIHARA, temp_id)
+                payload_dict[field] = None
 
         # Auto-populate location from current user (location-based access control)
         if current_user and current_user.ua_location_type == "DISTRICT_BRANCH" and current_user.ua_district_branch_id:
@@ -311,7 +175,7 @@ class BhikkuService:
 
         # Create the enriched payload WITHOUT workflow_status (it will be set by the repository/model default to PENDING)
         enriched_payload = BhikkuCreate(**payload_dict)
-        created = bhikku_repo.create(db, enriched_payload)
+        created = bhikku_repo.create(db, enriched_payload, temp_references=temp_references)
         return created
 
     def list_bhikkus(
@@ -336,7 +200,9 @@ class BhikkuService:
         workflow_status: Optional[list[str]] = None,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
-    ) -> list[Bhikku]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> list[Bhikku] | KeysetPage:
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
         return bhikku_repo.get_all(
@@ -359,6 +225,8 @@ class BhikkuService:
             date_from=date_from,
             date_to=date_to,
             current_user=current_user,
+            keyset=keyset,
+            cursor=cursor,
         )
 
     def count_bhikkus(
@@ -381,14 +249,12 @@ class BhikkuService:
         workflow_status: Optional[list[str]] = None,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
-    ) -> int:
-        total = bhikku_repo.get_total_count(
-            db, 
+    ) -> CountResult:
+        filters = dict(
             search_key=search,
             province=province,
             vh_trn=vh_trn,
             district=district,
-            current_user=current_user,
             divisional_secretariat=divisional_secretariat,
             gn_division=gn_division,
             temple=temple,
@@ -399,94 +265,84 @@ class BhikkuService:
             status=status,
             workflow_status=workflow_status,
             date_from=date_from,
-            date_to=date_to
+            date_to=date_to,
+        )
+        return list_counter.count(
+            db,
+            "bhikku",
+            bhikku_repo.count_query(db, current_user=current_user, **filters),
+            filters=filters,
+            user_scope=current_user.ua_user_id if current_user else None,
         )
-        return int(total or 0)
 
-    def list_mahanayaka_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_mahanayaka_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_mahanayakalist view."""
-        result = db.execute(self._mahanayaka_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_mahanayakalist", query)
 
-    def list_nikaya_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_nikaya_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_nikaya_list view."""
-        result = db.execute(self._nikaya_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_nikaya_list", query)
 
-    def list_acharya_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_acharya_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_archarya_dtls view."""
-        result = db.execute(self._acharya_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_archarya_dtls", query)
 
-    def list_bhikku_details_view(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_bikkullist view."""
-        result = db.execute(self._details_view_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_bhikku_details_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_bikkullist view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_bikkullist", query)
 
-    def list_certification_view(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_certification_data view."""
-        result = db.execute(self._certification_view_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_certification_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_certification_data view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_certification_data", query)
 
-    def list_certification_print_view(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_certification_printnow view."""
-        result = db.execute(self._certification_print_view_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_certification_print_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_certification_printnow view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_certification_printnow", query)
 
-    def list_current_status_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_current_status_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_currstatus_list view."""
-        result = db.execute(self._current_status_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_currstatus_list", query)
 
-    def list_district_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_district_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_districtlist view."""
-        result = db.execute(self._district_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_districtlist", query)
 
     def list_province_view(self, db: Session) -> list[dict[str, Any]]:
         """Return records from the cmm_province table."""
         result = db.execute(self._province_view_query).mappings().all()
         return [dict(row) for row in result]
 
-    def list_division_sec_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_division_sec_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_divisionsec_dtls view."""
-        result = db.execute(self._division_sec_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_divisionsec_dtls", query)
 
-    def list_gn_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_gn_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_gn_dtls view."""
-        result = db.execute(self._gn_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_gn_dtls", query)
 
-    def list_history_status_view(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_histtystatus_list view."""
-        result = db.execute(self._history_status_view_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_history_status_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_histtystatus_list view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_histtystatus_list", query)
 
-    def list_id_all_view(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_id_alllist view."""
-        result = db.execute(self._id_all_view_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_id_all_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_id_alllist view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_id_alllist", query)
 
-    def list_id_district_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_id_district_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_iddistrict_list view."""
-        result = db.execute(self._id_district_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_iddistrict_list", query)
 
-    def list_id_division_sec_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_id_division_sec_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_iddvsec_list view."""
-        result = db.execute(self._id_division_sec_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_iddvsec_list", query)
 
-    def list_id_gn_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_id_gn_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_idgn_list view."""
-        result = db.execute(self._id_gn_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_idgn_list", query)
 
-    def list_nikayanayaka_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_nikayanayaka_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_nikayanayaka_list view."""
-        result = db.execute(self._nikayanayaka_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_nikayanayaka_list", query)
 
     def list_nikaya_hierarchy(self, db: Session) -> list[dict[str, Any]]:
         """
@@ -585,30 +441,25 @@ class BhikkuService:
 
         return hierarchy
 
-    def list_parshawa_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_parshawa_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_parshawa_list view."""
-        result = db.execute(self._parshawa_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_parshawa_list", query)
 
-    def list_status_history_composite(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_statushystry_composit view."""
-        result = db.execute(self._status_history_composite_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_status_history_composite(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_statushystry_composit view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_statushystry_composit", query)
 
-    def list_status_history_list(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_statushystry_list view."""
-        result = db.execute(self._status_history_list_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_status_history_list(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_statushystry_list view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_statushystry_list", query)
 
-    def list_status_history_list2(self, db: Session) -> list[dict[str, Any]]:
-        """Return records from the bikkudtls_statushystry_list2 view."""
-        result = db.execute(self._status_history_list2_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_status_history_list2(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return records from the materialized copy of the bikkudtls_statushystry_list2 view, with its refresh time."""
+        return report_views.read(db, "bikkudtls_statushystry_list2", query)
 
-    def list_viharadipathi_view(self, db: Session) -> list[dict[str, Any]]:
+    def list_viharadipathi_view(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
         """Return records from the bikkudtls_viharadipathi_list view."""
-        result = db.execute(self._viharadipathi_view_query).mappings().all()
-        return [dict(row) for row in result]
+        return report_views.read(db, "bikkudtls_viharadipathi_list", query)
 
     def list_bhikkus_by_vihara(self, db: Session, vh_trn: str) -> list[dict[str, Optional[str]]]:
         """Return bhikku regn and name for a given vihara code."""
@@ -626,30 +477,25 @@ class BhikkuService:
         )
         return [{"regn": regn, "br_mahananame": name} for regn, name in rows]
 
-    def list_current_status_summary(self, db: Session) -> list[dict[str, Any]]:
-        """Return aggregated records from the bikkusumm_currstatus_list view."""
-        result = db.execute(self._current_status_summary_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_current_status_summary(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return aggregated records from the materialized copy of the bikkusumm_currstatus_list view, with its refresh time."""
+        return report_views.read(db, "bikkusumm_currstatus_list", query)
 
-    def list_district_summary(self, db: Session) -> list[dict[str, Any]]:
-        """Return aggregated records from the bikkusumm_district_list view."""
-        result = db.execute(self._district_summary_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_district_summary(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return aggregated records from the materialized copy of the bikkusumm_district_list view, with its refresh time."""
+        return report_views.read(db, "bikkusumm_district_list", query)
 
-    def list_gn_summary(self, db: Session) -> list[dict[str, Any]]:
-        """Return aggregated records from the bikkusumm_gn_list view."""
-        result = db.execute(self._gn_summary_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_gn_summary(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return aggregated records from the materialized copy of the bikkusumm_gn_list view, with its refresh time."""
+        return report_views.read(db, "bikkusumm_gn_list", query)
 
-    def list_id_district_summary(self, db: Session) -> list[dict[str, Any]]:
-        """Return aggregated records from the bikkusumm_iddistrict_list view."""
-        result = db.execute(self._id_district_summary_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_id_district_summary(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return aggregated records from the materialized copy of the bikkusumm_iddistrict_list view, with its refresh time."""
+        return report_views.read(db, "bikkusumm_iddistrict_list", query)
 
-    def list_id_gn_summary(self, db: Session) -> list[dict[str, Any]]:
-        """Return aggregated records from the bikkusumm_idgn_list view."""
-        result = db.execute(self._id_gn_summary_query).mappings().all()
-        return [dict(row) for row in result]
+    def list_id_gn_summary(self, db: Session, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+        """Return aggregated records from the materialized copy of the bikkusumm_idgn_list view, with its refresh time."""
+        return report_views.read(db, "bikkusumm_idgn_list", query)
 
     def get_bhikku(self, db: Session, *, br_regn: str) -> Optional[Bhikku]:
         return bhikku_repo.get_by_regn(db, br_regn)
@@ -659,144 +505,77 @@ class BhikkuService:
     
     def enrich_bhikku_dict(self, bhikku: Bhikku, db: Session = None) -> dict:
         """Transform Bhikku model to dictionary with resolved foreign key names as nested objects"""
-        
-        # Parse temporary bhikku references from remarks
-        import re
-        temp_viharadhipathi_id = None
-        temp_mahanaacharyacd_id = None
-        temp_livtemple_id = None
-        temp_mahanatemple_id = None
-        temp_robing_tutor_residence_id = None
-        temp_robing_after_residence_temple_id = None
-        remarks_display = bhikku.br_remarks or ""
-        
-        if remarks_display:
-            # Extract temp viharadhipathi reference
-            viharadhipathi_match = re.search(r'\[TEMP_BR_VIHARADHIPATHI:(\d+)\]', remarks_display)
-            if viharadhipathi_match:
-                temp_viharadhipathi_id = int(viharadhipathi_match.group(1))
-            
-            # Extract temp mahanaacharyacd reference
-            mahanaacharyacd_match = re.search(r'\[TEMP_BR_MAHANAACHARYACD:(\d+)\]', remarks_display)
-            if mahanaacharyacd_match:
-                temp_mahanaacharyacd_id = int(mahanaacharyacd_match.group(1))
-            
-            # Extract temp livtemple reference (temporary vihara)
-            livtemple_match = re.search(r'\[TEMP_BR_LIVTEMPLE:(\d+)\]', remarks_display)
-            if livtemple_match:
-                temp_livtemple_id = int(livtemple_match.group(1))
-            
-            # Extract temp mahanatemple reference (temporary vihara)
-            mahanatemple_match = re.search(r'\[TEMP_BR_MAHANATEMPLE:(\d+)\]', remarks_display)
-            if mahanatemple_match:
-                temp_mahanatemple_id = int(mahanatemple_match.group(1))
-            
-            # Extract temp robing_tutor_residence reference (temporary vihara)
-            robing_tutor_match = re.search(r'\[TEMP_BR_ROBING_TUTOR_RESIDENCE:(\d+)\]', remarks_display)
-            if robing_tutor_match:
-                temp_robing_tutor_residence_id = int(robing_tutor_match.group(1))
-            
-            # Extract temp robing_after_residence_temple reference (temporary vihara)
-            robing_after_match = re.search(r'\[TEMP_BR_ROBING_AFTER_RESIDENCE_TEMPLE:(\d+)\]', remarks_display)
-            if robing_after_match:
-                temp_robing_after_residence_temple_id = int(robing_after_match.group(1))
-            
-            # Remove temp references from display remarks
-            remarks_display = re.sub(r'\[TEMP_BR_[A-Z_]+:\d+\]', '', remarks_display).strip()
-        
-        # Fetch temporary bhikku details if needed
-        temp_viharadhipathi_data = None
-        temp_mahanaacharyacd_data = None
-        
-        if db and (temp_viharadhipathi_id or temp_mahanaacharyacd_id):
-            from app.models.temporary_bhikku import TemporaryBhikku
-            
-            if temp_viharadhipathi_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(
-                    TemporaryBhikku.tb_id == temp_viharadhipathi_id
-                ).first()
-                if temp_bhikku:
-                    temp_viharadhipathi_data = {
-                        "br_regn": f"TEMP-{temp_bhikku.tb_id}",
-                        "br_mahananame": temp_bhikku.tb_name or "",
-                        "br_upasampadaname": ""
-                    }
-            
-            if temp_mahanaacharyacd_id:
-                temp_bhikku = db.query(TemporaryBhikku).filter(
-                    TemporaryBhikku.tb_id == temp_mahanaacharyacd_id
-                ).first()
-                if temp_bhikku:
-                    temp_mahanaacharyacd_data = {
-                        "br_regn": f"TEMP-{temp_bhikku.tb_id}",
-                        "br_mahananame": temp_bhikku.tb_name or "",
-                        "br_upasampadaname": ""
-                    }
-        
-        # Fetch temporary vihara details if needed
-        temp_livtemple_data = None
-        temp_mahanatemple_data = None
-        temp_robing_tutor_residence_data = None
-        temp_robing_after_residence_temple_data = None
-        
-        if db and (temp_livtemple_id or temp_mahanatemple_id or temp_robing_tutor_residence_id or temp_robing_after_residence_temple_id):
-            from app.models.temporary_vihara import TemporaryVihara
-            
-            if temp_livtemple_id:
-                temp_vihara = db.query(TemporaryVihara).filter(
-                    TemporaryVihara.tv_id == temp_livtemple_id
-                ).first()
-                if temp_vihara:
-                    temp_livtemple_data = {
-                        "vh_trn": f"TEMP-{temp_vihara.tv_id}",
-                        "vh_vname": temp_vihara.tv_name or ""
-                    }
-            
-            if temp_mahanatemple_id:
-                temp_vihara = db.query(TemporaryVihara).filter(
-                    TemporaryVihara.tv_id == temp_mahanatemple_id
-                ).first()
-                if temp_vihara:
-                    temp_mahanatemple_data = {
-                        "vh_trn": f"TEMP-{temp_vihara.tv_id}",
-                        "vh_vname": temp_vihara.tv_name or ""
-                    }
-            
-            if temp_robing_tutor_residence_id:
-                temp_vihara = db.query(TemporaryVihara).filter(
-                    TemporaryVihara.tv_id == temp_robing_tutor_residence_id
-                ).first()
-                if temp_vihara:
-                    temp_robing_tutor_residence_data = {
-                        "vh_trn": f"TEMP-{temp_vihara.tv_id}",
-                        "vh_vname": temp_vihara.tv_name or ""
-                    }
-            
-            if temp_robing_after_residence_temple_id:
-                temp_vihara = db.query(TemporaryVihara).filter(
-                    TemporaryVihara.tv_id == temp_robing_after_residence_temple_id
-                ).first()
-                if temp_vihara:
-                    temp_robing_after_residence_temple_data = {
-                        "vh_trn": f"TEMP-{temp_vihara.tv_id}",
-                        "vh_vname": temp_vihara.tv_name or ""
-                    }
-        
+        return self.enrich_bhikku_dicts([bhikku], db)[0]
+
+    def enrich_bhikku_dicts(self, bhikkus: list[Bhikku], db: Session = None) -> list[dict]:
+        """
+        enrich_bhikku_dict for a whole page. Lookup relationships and
+        multi-acharya names are resolved with one IN query per table for all
+        rows instead of per row, temporary bhikku/vihara references with one
+        temp_reference join.
+        """
+        bhikkus = list(bhikkus)
+
+        lookups: Lookups = {}
+        temp_refs: Dict[int, Dict[str, ResolvedTempReference]] = {}
+        if db is not None and bhikkus:
+            multi_regns = {
+                regn for bhikku in bhikkus for regn in _split_regns(bhikku.br_multi_mahanaacharyacd)
+            }
+            lookups = prime_many_to_one(
+                db, bhikkus, ENRICH_RELATIONSHIPS, extra_keys={(Bhikku, "br_regn"): multi_regns}
+            )
+            temp_refs = temp_reference_repo.resolve_page(
+                db, entity=ENTITY_BHIKKU, entity_ids=[bhikku.br_id for bhikku in bhikkus]
+            )
+
+        return [
+            self._build_bhikku_dict(bhikku, temp_refs.get(bhikku.br_id, {}), lookups)
+            for bhikku in bhikkus
+        ]
+
+    def _build_bhikku_dict(
+        self, bhikku: Bhikku, temp_refs: Dict[str, ResolvedTempReference], lookups: Lookups
+    ) -> dict:
+        def temp_bhikku_ref(field: str) -> Optional[dict]:
+            ref = temp_refs.get(field)
+            if ref is None or ref.kind != KIND_BHIKKU:
+                return None
+            return {
+                "br_regn": f"TEMP-{ref.temp_id}",
+                "br_mahananame": ref.name,
+                "br_upasampadaname": ""
+            }
+
+        def temp_vihara_ref(field: str) -> Optional[dict]:
+            ref = temp_refs.get(field)
+            if ref is None or ref.kind != KIND_VIHARA:
+                return None
+            return {
+                "vh_trn": f"TEMP-{ref.temp_id}",
+                "vh_vname": ref.name
+            }
+
+        temp_viharadhipathi_data = temp_bhikku_ref("br_viharadhipathi")
+        temp_mahanaacharyacd_data = temp_bhikku_ref("br_mahanaacharyacd")
+        temp_livtemple_data = temp_vihara_ref("br_livtemple")
+        temp_mahanatemple_data = temp_vihara_ref("br_mahanatemple")
+        temp_robing_tutor_residence_data = temp_vihara_ref("br_robing_tutor_residence")
+        temp_robing_after_residence_temple_data = temp_vihara_ref("br_robing_after_residence_temple")
+
         # Handle multi_mahanaacharyacd - split and resolve names
         multi_mahanaacharyacd_value = bhikku.br_multi_mahanaacharyacd
-        if bhikku.br_multi_mahanaacharyacd and db:
-            # Assuming comma-separated registration numbers
-            regns = [r.strip() for r in bhikku.br_multi_mahanaacharyacd.split(',') if r.strip()]
-            if regns:
-                # Query all at once for efficiency
-                bhikku_names = db.query(Bhikku.br_regn, Bhikku.br_mahananame).filter(
-                    Bhikku.br_regn.in_(regns),
-                    Bhikku.br_is_deleted.is_(False)
-                ).all()
-                name_map = {b.br_regn: b.br_mahananame for b in bhikku_names}
-                resolved_names = [name_map.get(regn) for regn in regns if name_map.get(regn)]
-                if resolved_names:
-                    multi_mahanaacharyacd_value = ', '.join(resolved_names)
+        regns = _split_regns(bhikku.br_multi_mahanaacharyacd)
+        if regns and (Bhikku, "br_regn") in lookups:
+            by_regn = lookups[(Bhikku, "br_regn")]
+            name_map = {
+                regn: by_regn[regn].br_mahananame
+                for regn in regns
+                if regn in by_regn and by_regn[regn].br_is_deleted is False
+            }
+            resolved_names = [name_map.get(regn) for regn in regns if name_map.get(regn)]
+            if resolved_names:
+                multi_mahanaacharyacd_value = ', '.join(resolved_names)
         
         bhikku_dict = {
             "br_id": bhikku.br_id,
@@ -826,7 +605,7 @@ class BhikkuService:
             "br_gihiname": bhikku.br_gihiname,
             "br_dofb": bhikku.br_dofb,
             "br_fathrname": bhikku.br_fathrname,
-            "br_remarks": remarks_display or None,  # Use cleaned remarks without temp references
+            "br_remarks": bhikku.br_remarks or None,
             "br_currstat": {
                 "st_statcd": bhikku.status_rel.st_statcd,
                 "st_descr": bhikku.status_rel.st_descr
@@ -955,64 +734,45 @@ class BhikkuService:
         # - Pure numeric strings (e.g., "17" - tb_id from temporary_bhikku table)
         # - TB* format (e.g., "TB000001" - alternative temp bhikku identifier)
         # 
-        # Store the temp bhikku reference in remarks for later retrieval and remove field from update
-        temp_refs = []
+        # Store the temp bhikku reference in temp_reference and remove field from update.
+        # A real value sent for one of these fields drops the field's temp reference.
+        temp_references: Dict[str, TempTarget] = {}
         removed_temp_fields = {}  # Track which fields were removed due to TEMP-* handling
-        for field in ["br_viharadhipathi", "br_mahanaacharyacd"]:
+        for field in TEMP_BHIKKU_FIELDS:
             # Only process fields that were explicitly included in the update
             if field not in update_data:
                 continue
             value = update_data.get(field)
-            if value and isinstance(value, str):
-                value = value.strip()
-                # Extract temp bhikku ID from various formats
-                temp_id = None
-                if value.startswith("TEMP-"):
-                    # Format: "TEMP-17"
-                    temp_id = value[5:]
-                elif value.startswith("TB"):
-                    # Format: "TB000001" or "TB17" - treat as temp bhikku reference
-                    temp_id = value
-                elif value.isdigit():
-                    # Format: "17" - pure numeric tb_id
-                    temp_id = value
-                
-                if temp_id:
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    # Remove the field from update_data instead of setting to None
-                    # This prevents overwriting the database field with NULL
-                    removed_temp_fields[field] = value
-                    del update_data[field]
+            temp_id = _temp_bhikku_id(value.strip()) if isinstance(value, str) else None
+            if temp_id:
+                temp_references[field] = (KIND_BHIKKU, int(temp_id)) if temp_id.isdigit() else None
+                # Remove the field from update_data instead of setting to None
+                # This prevents overwriting the database field with NULL
+                removed_temp_fields[field] = value
+                del update_data[field]
+            else:
+                temp_references[field] = None
         
         # Handle temporary vihara references - these can't be stored as FK references
         # Clear fields that reference temporary viharas (TEMP-* format from READ_ALL response)
         # All these fields have FK to vihaddata table
-        for field in ["br_livtemple", "br_mahanatemple", "br_robing_tutor_residence", "br_robing_after_residence_temple"]:
+        for field in TEMP_VIHARA_FIELDS:
             # Only process fields that were explicitly included in the update
             if field not in update_data:
                 continue
             value = update_data.get(field)
-            if value and isinstance(value, str):
-                # Extract temp vihara ID from "TEMP-11" format
-                if value.startswith("TEMP-"):
-                    temp_id = value[5:]  # Remove "TEMP-" prefix
-                    temp_refs.append(f"[TEMP_{field.upper()}:{temp_id}]")
-                    # Remove the field from update_data instead of setting to None
-                    # This prevents overwriting the database field with NULL
-                    removed_temp_fields[field] = value
-                    del update_data[field]
+            if isinstance(value, str) and value.startswith("TEMP-"):
+                temp_id = parse_temp_id(value)
+                temp_references[field] = (KIND_VIHARA, temp_id) if temp_id is not None else None
+                # Remove the field from update_data instead of setting to None
+                # This prevents overwriting the database field with NULL
+                removed_temp_fields[field] = value
+                del update_data[field]
+            else:
+                temp_references[field] = None
         
         # Validate field preservation to catch unintended field clearing
         self._validate_field_preservation(entity, update_data, removed_temp_fields)
-        
-        # Append temp references to remarks if any
-        if temp_refs:
-            existing_remarks = update_data.get("br_remarks") or entity.br_remarks or ""
-            # Remove any existing temp references from remarks first
-            import re
-            existing_remarks = re.sub(r'\[TEMP_BR_[A-Z_]+:\d+\]', '', existing_remarks).strip()
-            temp_refs_str = " ".join(temp_refs)
-            update_data["br_remarks"] = f"{existing_remarks} {temp_refs_str}".strip() if existing_remarks else temp_refs_str
 
         if "br_regn" in update_data and update_data["br_regn"]:
             new_regn = update_data["br_regn"]
@@ -1045,7 +805,9 @@ class BhikkuService:
         }
         
         # Check if any non-workflow fields are being updated
-        data_fields_updated = any(key not in workflow_fields for key in update_data.keys())
+        data_fields_updated = bool(removed_temp_fields) or any(
+            key not in workflow_fields for key in update_data.keys()
+        )
         
         if data_fields_updated:
             # Reset workflow status to PENDING when actual data is edited
@@ -1057,7 +819,9 @@ class BhikkuService:
         # entity.br_version_number will be incremented by repository
 
         update_payload = BhikkuUpdate(**update_data)
-        updated = bhikku_repo.update(db, br_regn=br_regn, bhikku_update=update_payload)
+        updated = bhikku_repo.update(
+            db, br_regn=br_regn, bhikku_update=update_payload, temp_references=temp_references
+        )
         if not updated:
             raise ValueError("Bhikku record not found.")
         
@@ -1679,6 +1443,8 @@ class BhikkuService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
@@ -1872,36 +1638,26 @@ class BhikkuService:
         """
         from app.models.silmatha_regist import SilmathaRegist
         
-        # If record type is specified, search only that type
-        if record_type == "bhikku":
-            entity = db.query(Bhikku).filter(Bhikku.br_regn == record_id).first()
+        # One registration index probe finds the record; if record type is
+        # specified only that type is searched, otherwise bhikku, silmatha
+        # and bhikku high are tried in that order
+        entity_types = QR_RECORD_TYPES.get(record_type, registration_index.QR_ENTITY_TYPES)
+        entry = registration_index.lookup(db, record_id, entity_types)
+        if entry is None:
+            return None
+
+        if entry.ri_entity_type == "bhikku":
+            entity = db.query(Bhikku).filter(Bhikku.br_id == entry.ri_entity_id).first()
             if entity:
                 return self._format_bhikku_qr_response(db, entity)
                 
-        elif record_type == "silmatha":
-            entity = db.query(SilmathaRegist).filter(SilmathaRegist.sil_regn == record_id).first()
+        elif entry.ri_entity_type == "silmatha":
+            entity = db.query(SilmathaRegist).filter(SilmathaRegist.sil_id == entry.ri_entity_id).first()
             if entity:
                 return self._format_silmatha_qr_response(db, entity)
                 
-        elif record_type == "bhikku_high":
-            entity = db.query(BhikkuHighRegist).options(noload('*')).filter(BhikkuHighRegist.bhr_regn == record_id).first()
-            if entity:
-                return self._format_bhikku_high_qr_response(db, entity)
-        
-        else:
-            # Auto-detect: Try all types
-            # Try Bhikku first
-            entity = db.query(Bhikku).filter(Bhikku.br_regn == record_id).first()
-            if entity:
-                return self._format_bhikku_qr_response(db, entity)
-            
-            # Try Silmatha
-            entity = db.query(SilmathaRegist).filter(SilmathaRegist.sil_regn == record_id).first()
-            if entity:
-                return self._format_silmatha_qr_response(db, entity)
-            
-            # Try Bhikku High
-            entity = db.query(BhikkuHighRegist).options(noload('*')).filter(BhikkuHighRegist.bhr_regn == record_id).first()
+        elif entry.ri_entity_type == "high_bhikku":
+            entity = db.query(BhikkuHighRegist).options(noload('*')).filter(BhikkuHighRegist.bhr_id == entry.ri_entity_id).first()
             if entity:
                 return self._format_bhikku_high_qr_response(db, entity)
         
@@ -2049,3 +1805,4 @@ class BhikkuService:
 
 
 bhikku_service = BhikkuService()
+list_counter.track("bhikku", Bhikku)
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from app.models.certificate import CertificateData
 from app.repositories.certificate_repo import certificate_repo
 from app.schemas.certificate import CertificateCreate, CertificateUpdate
+from app.services.reference_cache import reference_cache
 
 
 class CertificateService:
@@ -98,6 +99,8 @@ class CertificateService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
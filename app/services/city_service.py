@@ -10,6 +10,7 @@ from app.models.city import City
 from app.models.user import UserAccount
 from app.repositories.city_repo import city_repo
 from app.schemas.city import CityCreate, CityUpdate
+from app.services.reference_cache import reference_cache
 
 
 class CityService:
@@ -167,6 +168,8 @@ class CityService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from app.models.devala import DevalaData
 from app.repositories.devala_repo import devala_repo
 from app.schemas.devala import DevalaCreate, DevalaCreatePayload, DevalaUpdate
+from app.services.reference_cache import reference_cache
+from app.utils.pagination import KeysetPage
 
 
 class DevalaService:
@@ -120,7 +122,9 @@ class DevalaService:
         date_from: Optional[Any] = None,
         date_to: Optional[Any] = None,
         current_user = None,
-    ) -> list[DevalaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> list[DevalaData] | KeysetPage:
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
         return devala_repo.list(
@@ -143,6 +147,8 @@ class DevalaService:
             date_from=date_from,
             date_to=date_to,
             current_user=current_user,
+            keyset=keyset,
+            cursor=cursor,
         )
 
     def count_devalas(
@@ -600,6 +606,8 @@ class DevalaService:
         column_name: str,
         value: Any,
     ) -> bool:
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         metadata = MetaData()
         table = Table(table_name, metadata, schema=schema, autoload_with=db.get_bind())
         column = table.c.get(column_name)
@@ -6,12 +6,15 @@ Handles business logic, workflow transitions, and file uploads
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, object_session
 from fastapi import UploadFile
 
 from app.models.direct_bhikku_high import DirectBhikkuHigh
 from app.repositories.direct_bhikku_high_repo import direct_bhikku_high_repo
 from app.schemas.direct_bhikku_high import DirectBhikkuHighCreate, DirectBhikkuHighUpdate
+from app.services.reference_cache import reference_cache
+from app.utils.batch_loading import prime_many_to_one
+from app.utils.pagination import KeysetPage
 
 
 class DirectBhikkuHighService:
@@ -127,7 +130,10 @@ class DirectBhikkuHighService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         current_user=None,
-    ) -> list[DirectBhikkuHigh]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        from_end: bool = False,
+    ) -> list[DirectBhikkuHigh] | KeysetPage:
         """List direct high bhikku records with filters"""
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
@@ -147,6 +153,9 @@ class DirectBhikkuHighService:
             date_from=date_from,
             date_to=date_to,
             current_user=current_user,
+            keyset=keyset,
+            cursor=cursor,
+            from_end=from_end,
         )
 
     def count_direct_bhikku_highs(
@@ -445,6 +454,11 @@ class DirectBhikkuHighService:
         """Transform DirectBhikkuHigh model to dictionary with all foreign key relationships as nested objects"""
         from app.schemas.direct_bhikku_high import DirectBhikkuHighOut
         
+        # Location, status, parshawa, category and nikaya names come from the reference cache
+        session = db or object_session(entity)
+        if session is not None:
+            prime_many_to_one(session, [entity], reference_cache.relationships(DirectBhikkuHigh))
+        
         # Convert model to dict using the schema
         entity_dict = DirectBhikkuHighOut.model_validate(entity).model_dump()
         
@@ -9,6 +9,7 @@ from app.models.user import UserAccount
 from app.repositories.district_repo import district_repo
 from app.repositories.province_repo import province_repo
 from app.schemas.district import DistrictCreate, DistrictUpdate
+from app.services.reference_cache import reference_cache
 
 
 class DistrictService:
@@ -124,6 +125,8 @@ class DistrictService:
     def _validate_province_reference(self, db: Session, dd_prcode: Optional[str]) -> None:
         if not self._has_value(dd_prcode):
             return
+        if reference_cache.has(db, "cmm_province", "cp_code", dd_prcode, include_deleted=False):
+            return
         province = province_repo.get_by_code(db, dd_prcode)
         if not province:
             raise ValueError(f"Invalid reference: dd_prcode '{dd_prcode}' not found.")
@@ -14,6 +14,7 @@ from app.schemas.divisional_secretariat import (
     DivisionalSecretariatCreate,
     DivisionalSecretariatUpdate,
 )
+from app.services.reference_cache import reference_cache
 
 
 class DivisionalSecretariatService:
@@ -153,6 +154,8 @@ class DivisionalSecretariatService:
     def _validate_district_reference(self, db: Session, dv_distrcd: Optional[str]) -> None:
         if not self._has_value(dv_distrcd):
             return
+        if reference_cache.has(db, "cmm_districtdata", "dd_dcode", dv_distrcd, include_deleted=False):
+            return
         district = district_repo.get_by_code(db, dv_distrcd)
         if not district:
             raise ValueError(f"Invalid reference: dv_distrcd '{dv_distrcd}' not found.")
@@ -11,6 +11,7 @@ from app.models.gramasewaka import Gramasewaka
 from app.models.user import UserAccount
 from app.repositories.gramasewaka_repo import gramasewaka_repo
 from app.schemas.gramasewaka import GramasewakaCreate, GramasewakaUpdate
+from app.services.reference_cache import reference_cache
 
 
 class GramasewakaService:
@@ -257,6 +258,8 @@ class GramasewakaService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
@@ -0,0 +1,226 @@
+# app/services/list_count.py
+"""
+totalRecords strategies for list endpoints.
+
+READ_ALL responses carry a total next to the page. Counting runs the same
+filters as the page query, so list services ask the shared `list_counter`
+instead of calling `query.count()` themselves. Per list, one of:
+
+- exact:    COUNT(*) on every request (default)
+- estimate: the PostgreSQL planner's row estimate when it is at least
+            LIST_COUNT_ESTIMATE_THRESHOLD, an exact count below that
+- cached:   exact count kept for LIST_COUNT_CACHE_TTL_SECONDS, keyed by the
+            normalized filters and the requesting user's scope
+
+Configured with LIST_COUNT_STRATEGY plus per-list overrides in
+LIST_COUNT_STRATEGIES, e.g. "bhikku=estimate,vihara=cached".
+CountResult.exact is False only for planner estimates; the UI shows those
+as approximate. Cached totals are dropped when a tracked model of the list
+is committed, so they are at most TTL seconds old only for changes made
+outside this process.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from threading import Lock
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    CACHED = "cached"
+
+
+@dataclass(frozen=True, slots=True)
+class CountResult:
+    total: int
+    exact: bool = True
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted({str(v) for v in (_normalize(v) for v in value) if v is not None})
+        return tuple(items) or None
+    return value
+
+
+def _parse_strategies(raw: str) -> Dict[str, CountStrategy]:
+    strategies: Dict[str, CountStrategy] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            strategies[name.strip()] = CountStrategy(value.strip().lower())
+        except ValueError:
+            logger.warning("Ignoring unknown count strategy %r for list %r", value, name)
+    return strategies
+
+
+def _parse_default_strategy(raw: str) -> CountStrategy:
+    try:
+        return CountStrategy(raw.strip().lower())
+    except ValueError:
+        logger.warning("Ignoring unknown default count strategy %r, using exact counts", raw)
+        return CountStrategy.EXACT
+
+
+class ListCounter:
+    """Resolves totals for list queries; the count cache is thread-safe and process-local."""
+
+    def __init__(
+        self,
+        default_strategy: CountStrategy,
+        strategies: Mapping[str, CountStrategy],
+        estimate_threshold: int,
+        ttl_seconds: int,
+    ) -> None:
+        self.default_strategy = default_strategy
+        self.strategies = dict(strategies)
+        self.estimate_threshold = estimate_threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[int, float]] = {}
+        self._tracked: Dict[type, set] = {}
+        self._lock = Lock()
+        self.metrics = {"exact": 0, "estimated": 0, "hits": 0, "misses": 0, "invalidations": 0}
+
+    def strategy_for(self, list_name: str) -> CountStrategy:
+        return self.strategies.get(list_name, self.default_strategy)
+
+    def track(self, list_name: str, *models: type) -> None:
+        """Drop cached totals of `list_name` whenever rows of `models` are committed."""
+        for model in models:
+            self._tracked.setdefault(model, set()).add(list_name)
+
+    def count(
+        self,
+        db: Session,
+        list_name: str,
+        query: Query,
+        *,
+        filters: Optional[Mapping[str, Any]] = None,
+        user_scope: Optional[str] = None,
+    ) -> CountResult:
+        """
+        Total rows of `query`, a row query (entities or columns, no aggregate,
+        no ORDER BY) carrying the same filters as the page.
+        """
+        strategy = self.strategy_for(list_name)
+
+        if strategy is CountStrategy.ESTIMATE:
+            estimate = self.estimate(db, query)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.metrics["estimated"] += 1
+                return CountResult(total=estimate, exact=False)
+            return CountResult(total=self._exact(query))
+
+        if strategy is CountStrategy.CACHED and self.ttl_seconds > 0:
+            key = self.cache_key(list_name, filters or {}, user_scope)
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self.metrics["hits"] += 1
+                    return CountResult(total=entry[0])
+                self.metrics["misses"] += 1
+            total = self._exact(query)
+            with self._lock:
+                self._entries[key] = (total, now + self.ttl_seconds)
+            return CountResult(total=total)
+
+        return CountResult(total=self._exact(query))
+
+    def _exact(self, query: Query) -> int:
+        self.metrics["exact"] += 1
+        return int(query.order_by(None).count() or 0)
+
+    @staticmethod
+    def cache_key(list_name: str, filters: Mapping[str, Any], user_scope: Optional[str]) -> Tuple[Hashable, ...]:
+        normalized = {name: _normalize(value) for name, value in filters.items()}
+        items = tuple(sorted((name, value) for name, value in normalized.items() if value is not None))
+        return (list_name, user_scope or "", items)
+
+    @staticmethod
+    def estimate(db: Session, query: Query) -> Optional[int]:
+        """Planner row estimate for `query`; None where EXPLAIN estimates are unavailable."""
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        compiled = query.order_by(None).statement.compile(
+            dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        try:
+            # A failed statement aborts the whole transaction; the savepoint keeps it usable
+            with db.begin_nested():
+                raw = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        except Exception:
+            logger.exception("Row estimate failed, falling back to an exact count")
+            return None
+        plan = json.loads(raw) if isinstance(raw, str) else raw
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def invalidate(self, list_name: Optional[str] = None) -> None:
+        with self._lock:
+            if list_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == list_name]:
+                    del self._entries[key]
+            self.metrics["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.metrics,
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "default_strategy": self.default_strategy.value,
+            }
+
+
+list_counter = ListCounter(
+    default_strategy=_parse_default_strategy(settings.LIST_COUNT_STRATEGY),
+    strategies=_parse_strategies(settings.LIST_COUNT_STRATEGIES),
+    estimate_threshold=settings.LIST_COUNT_ESTIMATE_THRESHOLD,
+    ttl_seconds=settings.LIST_COUNT_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changed_lists(session: Session, flush_context) -> None:
+    if not list_counter._tracked:
+        return
+    changed = session.info.setdefault("list_count_changed", set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        changed.update(list_counter._tracked.get(type(instance), ()))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_changed_lists(session: Session) -> None:
+    for list_name in session.info.pop("list_count_changed", ()):
+        list_counter.invalidate(list_name)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changed_lists(session: Session) -> None:
+    session.info.pop("list_count_changed", None)
@@ -10,6 +10,7 @@ from app.models.district import District
 from app.models.divisional_secretariat import DivisionalSecretariat
 from app.models.gramasewaka import Gramasewaka
 from app.models.sasanarakshaka import SasanarakshakaBalaMandalaya
+from app.services.reference_cache import reference_cache
 
 
 class LocationHierarchyService:
@@ -21,11 +22,11 @@ class LocationHierarchyService:
         Get all provinces with human-readable names
         Returns: [{"code": "WP", "name": "Western Province"}, ...]
         """
-        provinces = db.query(Province).filter(Province.pr_is_deleted == False).order_by(Province.pr_pcode).all()
+        provinces = sorted(reference_cache.rows(db, "province"), key=lambda p: p["cp_code"])
         return [
             {
-                "code": p.pr_pcode,
-                "name": p.pr_pname or p.pr_pcode
+                "code": p["cp_code"],
+                "name": p["cp_name"] or p["cp_code"]
             }
             for p in provinces
         ]
@@ -37,19 +38,14 @@ class LocationHierarchyService:
         Args: province_code (e.g., "WP")
         Returns: [{"code": "DC001", "name": "කොළඹ (Colombo)"}, ...]
         """
-        districts = (
-            db.query(District)
-            .filter(
-                District.dd_prcode == province_code,
-                District.dd_is_deleted == False
-            )
-            .order_by(District.dd_dcode)
-            .all()
+        districts = sorted(
+            (d for d in reference_cache.rows(db, "district") if d["dd_prcode"] == province_code),
+            key=lambda d: d["dd_dcode"],
         )
         return [
             {
-                "code": d.dd_dcode,
-                "name": d.dd_dname or d.dd_dcode  # e.g., "කොළඹ (Colombo)"
+                "code": d["dd_dcode"],
+                "name": d["dd_dname"] or d["dd_dcode"]  # e.g., "කොළඹ (Colombo)"
             }
             for d in districts
         ]
@@ -61,19 +57,14 @@ class LocationHierarchyService:
         Args: district_code (e.g., "DC001")
         Returns: [{"code": "DV0001", "name": "Colombo North", ...}, ...]
         """
-        dvs = (
-            db.query(DivisionalSecretariat)
-            .filter(
-                DivisionalSecretariat.dv_distrcd == district_code,
-                DivisionalSecretariat.dv_is_deleted == False
-            )
-            .order_by(DivisionalSecretariat.dv_dvcode)
-            .all()
+        dvs = sorted(
+            (dv for dv in reference_cache.rows(db, "divisional_secretariat") if dv["dv_distrcd"] == district_code),
+            key=lambda dv: dv["dv_dvcode"],
         )
         return [
             {
-                "code": dv.dv_dvcode,
-                "name": dv.dv_dvname or dv.dv_dvcode
+                "code": dv["dv_dvcode"],
+                "name": dv["dv_dvname"] or dv["dv_dvcode"]
             }
             for dv in dvs
         ]
@@ -88,19 +79,14 @@ class LocationHierarchyService:
         Args: divisional_secretariat_code (e.g., "DV0001")
         Returns: [{"code": "GN001", "name": "Colombo North - GN 01"}, ...]
         """
-        gns = (
-            db.query(Gramasewaka)
-            .filter(
-                Gramasewaka.gn_dvcode == divisional_secretariat_code,
-                Gramasewaka.gn_is_deleted == False
-            )
-            .order_by(Gramasewaka.gn_gnc)
-            .all()
+        gns = sorted(
+            (gn for gn in reference_cache.rows(db, "gramasewaka") if gn["gn_dvcode"] == divisional_secretariat_code),
+            key=lambda gn: gn["gn_gnc"],
         )
         return [
             {
-                "code": gn.gn_gnc,
-                "name": gn.gn_gnname or gn.gn_gnc
+                "code": gn["gn_gnc"],
+                "name": gn["gn_gnname"] or gn["gn_gnc"]
             }
             for gn in gns
         ]
@@ -185,41 +171,35 @@ class LocationHierarchyService:
         
         # Build district mapping for each province
         districts_by_province = {}
-        all_districts = db.query(District).filter(District.dd_is_deleted == False).all()
-        
-        for district in all_districts:
-            pcode = district.dd_prcode
+        for district in reference_cache.rows(db, "district"):
+            pcode = district["dd_prcode"]
             if pcode not in districts_by_province:
                 districts_by_province[pcode] = []
             districts_by_province[pcode].append({
-                "code": district.dd_dcode,
-                "name": district.dd_dname or district.dd_dcode
+                "code": district["dd_dcode"],
+                "name": district["dd_dname"] or district["dd_dcode"]
             })
         
         # Build DV mapping for each district
         dvs_by_district = {}
-        all_dvs = db.query(DivisionalSecretariat).filter(DivisionalSecretariat.dv_is_deleted == False).all()
-        
-        for dv in all_dvs:
-            dcode = dv.dv_distrcd
+        for dv in reference_cache.rows(db, "divisional_secretariat"):
+            dcode = dv["dv_distrcd"]
             if dcode not in dvs_by_district:
                 dvs_by_district[dcode] = []
             dvs_by_district[dcode].append({
-                "code": dv.dv_dvcode,
-                "name": dv.dv_dvname or dv.dv_dvcode
+                "code": dv["dv_dvcode"],
+                "name": dv["dv_dvname"] or dv["dv_dvcode"]
             })
         
         # Build GN mapping for each DV
         gns_by_dv = {}
-        all_gns = db.query(Gramasewaka).filter(Gramasewaka.gn_is_deleted == False).all()
-        
-        for gn in all_gns:
-            dvcode = gn.gn_dvcode
+        for gn in reference_cache.rows(db, "gramasewaka"):
+            dvcode = gn["gn_dvcode"]
             if dvcode not in gns_by_dv:
                 gns_by_dv[dvcode] = []
             gns_by_dv[dvcode].append({
-                "code": gn.gn_gnc,
-                "name": gn.gn_gnname or gn.gn_gnc
+                "code": gn["gn_gnc"],
+                "name": gn["gn_gnname"] or gn["gn_gnc"]
             })
         
         # Build SSBM mapping for each DV
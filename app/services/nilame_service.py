@@ -10,6 +10,7 @@ from app.models.nilame import NilameRegist
 from app.models.vihara import ViharaData
 from app.repositories.nilame_repo import nilame_repo
 from app.schemas.nilame import NilameCreate, NilameUpdate
+from app.services.reference_cache import reference_cache
 
 
 class NilameService:
@@ -89,6 +90,8 @@ class NilameService:
         value: Any,
     ) -> bool:
         schema, table_name, column_name = target
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         try:
             table = self._get_table(db, schema, table_name)
         except (NoSuchTableError, SQLAlchemyError) as exc:
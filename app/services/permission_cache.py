@@ -0,0 +1,101 @@
+# app/services/permission_cache.py
+"""
+Per-user effective permission cache.
+
+Stores the compiled permission set, active role ids and levels and the
+SUPER_ADMIN flag for a user so that authorization dependencies do not have to re-resolve
+roles, role permissions and user overrides on every request.
+
+Entries expire after PERMISSION_CACHE_TTL_SECONDS and are invalidated
+explicitly by the RBAC admin operations that change a user's access.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, FrozenSet, Optional
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class EffectivePermissions:
+    """Compiled access rights for a single user."""
+    permissions: FrozenSet[str]
+    is_super_admin: bool
+    role_ids: FrozenSet[str]
+    role_levels: FrozenSet[str]
+    expires_at: float
+
+    def allows(self, *permissions: str) -> bool:
+        """True if the user is a super admin or holds any of the given permissions."""
+        if self.is_super_admin:
+            return True
+        return any(perm in self.permissions for perm in permissions)
+
+
+class PermissionCache:
+    """Thread-safe, TTL-bound cache of EffectivePermissions keyed by user id."""
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, EffectivePermissions] = {}
+        self._lock = Lock()
+        self.metrics = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: str) -> Optional[EffectivePermissions]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.metrics["misses"] += 1
+                return None
+            self.metrics["hits"] += 1
+            return entry
+
+    def set(
+        self,
+        user_id: str,
+        permissions: FrozenSet[str],
+        is_super_admin: bool,
+        role_ids: FrozenSet[str] = frozenset(),
+        role_levels: FrozenSet[str] = frozenset(),
+    ) -> EffectivePermissions:
+        entry = EffectivePermissions(
+            permissions=frozenset(permissions),
+            is_super_admin=is_super_admin,
+            role_ids=frozenset(role_ids),
+            role_levels=frozenset(role_levels),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.enabled:
+            with self._lock:
+                self._entries[user_id] = entry
+        return entry
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self.metrics["invalidations"] += 1
+
+    def invalidate_all(self) -> None:
+        """Drop every entry, e.g. after a role's permission set or a permission name changes."""
+        with self._lock:
+            self._entries.clear()
+            self.metrics["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.metrics, "size": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+permission_cache = PermissionCache(ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS)
@@ -4,6 +4,7 @@ from app.models.user_roles import UserRole
 from app.schemas.permission import PermissionCreate, PermissionUpdate
 from app.utils.http_exceptions import validation_error
 from app.models.role_permissions import RolePermission
+from app.services.permission_cache import permission_cache
 from datetime import datetime
 
 class PermissionService:
@@ -43,6 +44,8 @@ class PermissionService:
         
         db.commit()
         db.refresh(existing_permission)
+        # Permission names are cached per user; drop them all after a rename
+        permission_cache.invalidate_all()
         return existing_permission
 
     def get_permission_by_id(self, db: Session, permission_id: str):
@@ -57,6 +60,7 @@ class PermissionService:
         
         db.delete(permission_to_delete)
         db.commit()
+        permission_cache.invalidate_all()
         return permission_to_delete
     
     def get_user_permissions(self, db: Session, user_id: str):
@@ -16,6 +16,7 @@ from app.models.roles import Role
 from app.models.group import Group
 from app.models.permissions import Permission
 from app.api.auth_dependencies import get_user_access_context
+from app.services.permission_cache import permission_cache
 
 
 class RBACService:
@@ -74,6 +75,8 @@ class RBACService:
             db.commit()
             is_new = True
         
+        permission_cache.invalidate_user(user_id)
+        
         return is_new, {
             "user_id": user_id,
             "username": user.ua_username,
@@ -106,6 +109,7 @@ class RBACService:
         user_role.ur_is_active = False
         user_role.ur_assigned_by = actor_id
         db.commit()
+        permission_cache.invalidate_user(user_id)
         
         user = db.query(UserAccount).filter(UserAccount.ua_user_id == user_id).first()
         
@@ -273,6 +277,8 @@ class RBACService:
             db.commit()
             is_new = True
         
+        permission_cache.invalidate_user(user_id)
+        
         return is_new, {
             "user_id": user_id,
             "username": user.ua_username,
@@ -305,6 +311,7 @@ class RBACService:
         user_permission.up_is_active = False
         user_permission.up_assigned_by = actor_id
         db.commit()
+        permission_cache.invalidate_user(user_id)
         
         user = db.query(UserAccount).filter(UserAccount.ua_user_id == user_id).first()
         permission = db.query(Permission).filter(Permission.pe_permission_id == permission_id).first()
@@ -324,8 +331,8 @@ class RBACService:
         
         context = get_user_access_context(db, user)
         
-        # Get permission overrides
-        overrides = db.query(UserPermission).join(
+        # Get permission overrides with their names in one query
+        overrides = db.query(UserPermission, Permission.pe_name).join(
             Permission,
             Permission.pe_permission_id == UserPermission.up_permission_id
         ).filter(
@@ -336,13 +343,11 @@ class RBACService:
         override_list = [
             {
                 "permission_id": ov.up_permission_id,
-                "permission_name": db.query(Permission.pe_name).filter(
-                    Permission.pe_permission_id == ov.up_permission_id
-                ).scalar(),
+                "permission_name": permission_name,
                 "granted": ov.up_granted,
                 "expires_date": ov.up_expires_date.isoformat() if ov.up_expires_date else None
             }
-            for ov in overrides
+            for ov, permission_name in overrides
         ]
         
         full_name = f"{user.ua_first_name or ''} {user.ua_last_name or ''}".strip() or user.ua_username
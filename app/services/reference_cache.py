@@ -0,0 +1,281 @@
+# app/services/reference_cache.py
+"""
+Process-wide cache of reference (master) data.
+
+Provinces, districts, divisional secretariats, GN divisions, nikayas,
+parshawas, statuses and bhikku categories change a few times a year but are
+resolved on almost every request: enrichment of list pages, foreign key
+validation on writes and the location pickers. Each table is bulk-loaded
+into a snapshot with a code -> row map and served from memory for
+REFERENCE_CACHE_TTL_SECONDS.
+
+- A commit that wrote a cached model drops that table's snapshot (session
+  listeners below, so every *_service / repository write path is covered).
+  A session holding uncommitted reference changes bypasses the cache.
+- Loads are versioned: a snapshot whose table was invalidated while it was
+  being loaded is used for that call but not stored.
+- Only positive answers are trusted. A code missing from a snapshot may have
+  been added by another process, so has() / lookup() callers fall back to
+  the database for it.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import MANYTOONE
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.bhikku_category import BhikkuCategory
+from app.models.district import District
+from app.models.divisional_secretariat import DivisionalSecretariat
+from app.models.gramasewaka import Gramasewaka
+from app.models.nikaya import NikayaData
+from app.models.parshawadata import ParshawaData
+from app.models.province import Province
+from app.models.status import StatusData
+
+# session.info key: reference tables with uncommitted changes in that session
+_CHANGED_KEY = "reference_cache_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class ReferenceTable:
+    name: str
+    model: type
+    code_attr: str
+    deleted_attr: str
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__table__.name
+
+
+@dataclass(frozen=True, slots=True)
+class ReferenceSnapshot:
+    version: int
+    bind: Any
+    expires_at: float
+    # code -> column values of the first row (by primary key) with that code
+    rows: Mapping[Any, Mapping[str, Any]]
+    # non-deleted rows in primary key order, and their codes
+    live: Tuple[Mapping[str, Any], ...]
+    live_codes: FrozenSet[Any]
+
+
+REFERENCE_TABLES: Tuple[ReferenceTable, ...] = (
+    ReferenceTable("province", Province, "cp_code", "cp_is_deleted"),
+    ReferenceTable("district", District, "dd_dcode", "dd_is_deleted"),
+    ReferenceTable("divisional_secretariat", DivisionalSecretariat, "dv_dvcode", "dv_is_deleted"),
+    ReferenceTable("gramasewaka", Gramasewaka, "gn_gnc", "gn_is_deleted"),
+    ReferenceTable("nikaya", NikayaData, "nk_nkn", "nk_is_deleted"),
+    ReferenceTable("parshawa", ParshawaData, "pr_prn", "pr_is_deleted"),
+    ReferenceTable("status", StatusData, "st_statcd", "st_is_deleted"),
+    ReferenceTable("category", BhikkuCategory, "cc_code", "cc_is_deleted"),
+)
+
+
+class ReferenceCache:
+    """Thread-safe snapshots of the reference tables, one per table."""
+
+    def __init__(self, tables: Sequence[ReferenceTable], ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.tables: Dict[str, ReferenceTable] = {table.name: table for table in tables}
+        self._by_model: Dict[type, ReferenceTable] = {table.model: table for table in tables}
+        self._by_column: Dict[Tuple[str, str], ReferenceTable] = {
+            (table.table_name, table.model.__table__.c[table.code_attr].name): table for table in tables
+        }
+        self._snapshots: Dict[str, ReferenceSnapshot] = {}
+        self._versions: Dict[str, int] = {table.name: 0 for table in tables}
+        self._lock = Lock()
+        self.metrics = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def table_for_model(self, model: type) -> Optional[ReferenceTable]:
+        return self._by_model.get(model)
+
+    # ------------------------------------------------------------------ #
+    # Snapshots
+    # ------------------------------------------------------------------ #
+    def snapshot(self, db: Session, name: str) -> ReferenceSnapshot:
+        """Current snapshot of a reference table, loaded through `db` when missing or stale."""
+        table = self.tables[name]
+        bind = db.get_bind()
+        cacheable = self._usable(db, table)
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            if (
+                cacheable
+                and snapshot is not None
+                and snapshot.bind is bind
+                and snapshot.expires_at > time.monotonic()
+            ):
+                self.metrics["hits"] += 1
+                return snapshot
+            self.metrics["misses"] += 1
+            version = self._versions[name]
+
+        snapshot = self._load(db, table, bind, version)
+        with self._lock:
+            self.metrics["loads"] += 1
+            if cacheable and self._versions[name] == version:
+                self._snapshots[name] = snapshot
+        return snapshot
+
+    def _usable(self, db: Session, table: ReferenceTable) -> bool:
+        return self.enabled and table.name not in db.info.get(_CHANGED_KEY, ())
+
+    def _load(self, db: Session, table: ReferenceTable, bind: Any, version: int) -> ReferenceSnapshot:
+        mapper = inspect(table.model)
+        keys = [prop.key for prop in mapper.column_attrs]
+        stmt = select(*[getattr(table.model, key) for key in keys]).order_by(*mapper.primary_key)
+
+        rows: Dict[Any, Mapping[str, Any]] = {}
+        live: List[Mapping[str, Any]] = []
+        for row in db.execute(stmt):
+            values = MappingProxyType(dict(zip(keys, row)))
+            code = values[table.code_attr]
+            rows.setdefault(code, values)
+            if not values[table.deleted_attr]:
+                live.append(values)
+        return ReferenceSnapshot(
+            version=version,
+            bind=bind,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            rows=MappingProxyType(rows),
+            live=tuple(live),
+            live_codes=frozenset(values[table.code_attr] for values in live),
+        )
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def has(
+        self,
+        db: Session,
+        table_name: str,
+        column_name: str,
+        value: Any,
+        *,
+        include_deleted: bool = True,
+    ) -> bool:
+        """
+        True if `value` is a known code of a cached table/column. False means
+        "not known here" (uncached table, cache off or code not in the
+        snapshot) and the caller checks the database.
+        """
+        table = self._by_column.get((table_name, column_name))
+        if table is None or value is None or not self._usable(db, table):
+            return False
+        snapshot = self.snapshot(db, table.name)
+        return value in (snapshot.rows if include_deleted else snapshot.live_codes)
+
+    def get(self, db: Session, name: str, code: Any) -> Optional[Mapping[str, Any]]:
+        """Column values of the row with `code` (deleted rows included), None if unknown."""
+        if code is None:
+            return None
+        return self.snapshot(db, name).rows.get(code)
+
+    def rows(self, db: Session, name: str) -> Tuple[Mapping[str, Any], ...]:
+        """Non-deleted rows of a reference table in primary key order."""
+        return self.snapshot(db, name).live
+
+    def lookup(self, db: Session, model: type, attr: str, values: Iterable[Any]) -> Dict[Any, Any]:
+        """
+        {value: instance} for the `values` of a cached model's code attribute
+        that the cache knows, as instances of `db`; unknown values are left out.
+        """
+        table = self._by_model.get(model)
+        if table is None or table.code_attr != attr or not self._usable(db, table):
+            return {}
+        snapshot = self.snapshot(db, table.name)
+        found: Dict[Any, Any] = {}
+        for value in values:
+            row = snapshot.rows.get(value) if value is not None else None
+            if row is not None:
+                found[value] = self._attach(db, table, row)
+        return found
+
+    def relationships(self, model: type) -> List[str]:
+        """Names of the simple many-to-one relationships of `model` that point at a cached code column."""
+        names = []
+        for relationship in inspect(model).relationships:
+            if relationship.direction is not MANYTOONE or len(relationship.local_remote_pairs) != 1:
+                continue
+            table = self._by_model.get(relationship.mapper.class_)
+            (_, remote), = relationship.local_remote_pairs
+            if table is not None and relationship.mapper.get_property_by_column(remote).key == table.code_attr:
+                names.append(relationship.key)
+        return names
+
+    @staticmethod
+    def _attach(db: Session, table: ReferenceTable, row: Mapping[str, Any]) -> Any:
+        mapper = inspect(table.model)
+        identity = mapper.identity_key_from_primary_key(
+            [row[mapper.get_property_by_column(column).key] for column in mapper.primary_key]
+        )
+        existing = db.identity_map.get(identity)
+        if existing is not None:
+            return existing
+        # A fresh persistent copy per session; cached rows are never attached themselves
+        instance = table.model(**row)
+        make_transient_to_detached(instance)
+        db.add(instance)
+        return instance
+
+    # ------------------------------------------------------------------ #
+    # Invalidation
+    # ------------------------------------------------------------------ #
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            names = list(self.tables) if name is None else [name]
+            for table_name in names:
+                self._snapshots.pop(table_name, None)
+                self._versions[table_name] += 1
+            self.metrics["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.metrics,
+                "tables": {
+                    name: {"version": snapshot.version, "rows": len(snapshot.rows)}
+                    for name, snapshot in self._snapshots.items()
+                },
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+reference_cache = ReferenceCache(REFERENCE_TABLES, ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changed_references(session: Session, flush_context) -> None:
+    changed = {
+        table.name
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted)
+        if (table := reference_cache.table_for_model(type(instance))) is not None
+    }
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_changed_references(session: Session) -> None:
+    for name in session.info.pop(_CHANGED_KEY, ()):
+        reference_cache.invalidate(name)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changed_references(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
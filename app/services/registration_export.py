@@ -0,0 +1,205 @@
+# app/services/registration_export.py
+"""
+Full exports of the bhikku, silmatha, vihara, arama and devala registries.
+
+The /export endpoints take the same filters as /manage READ_ALL. The
+repository builds the same filtered, location-scoped and ordered query it
+pages for READ_ALL (`unpaged=True`); the export counts it once and streams
+every row:
+
+- rows are read through a server-side cursor, EXPORT_BATCH_SIZE at a time,
+  in a session of their own (the request session is closed before a
+  StreamingResponse body is iterated);
+- each batch is enriched at once: the name behind every code column
+  (province, district, status, temple, ...) is resolved with one IN query
+  per lookup table, served from the reference cache where possible, and
+  temporary record references with one temp_reference query;
+- the batch is then expunged, so memory does not grow with the export.
+
+Each row is a flat dict of the table's columns, in table order, with a
+`<code column>_name` column after every resolved code.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session, noload
+
+from app.db.session import SessionLocal
+from app.models.arama import AramaData
+from app.models.bhikku import Bhikku
+from app.models.bhikku_category import BhikkuCategory
+from app.models.devala import DevalaData
+from app.models.district import District
+from app.models.divisional_secretariat import DivisionalSecretariat
+from app.models.gramasewaka import Gramasewaka
+from app.models.nikaya import NikayaData
+from app.models.parshawadata import ParshawaData
+from app.models.province import Province
+from app.models.silmatha_regist import SilmathaRegist
+from app.models.status import StatusData
+from app.models.temp_reference import ENTITY_BHIKKU
+from app.models.vihara import ViharaData
+from app.repositories.temp_reference_repo import temp_reference_repo
+from app.utils.batch_loading import load_by_keys
+from app.utils.streaming import stream_rows
+
+EXPORT_BATCH_SIZE = 500
+
+# Download formats of the /export endpoints
+EXPORT_FORMAT_PATTERN = "^(csv|ndjson)$"
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """Where the name behind a code lives: `model.name_attr` of the row whose `code_attr` matches."""
+    model: type
+    code_attr: str
+    name_attr: str
+
+
+PROVINCE = Lookup(Province, "cp_code", "cp_name")
+DISTRICT = Lookup(District, "dd_dcode", "dd_dname")
+DIVISION = Lookup(DivisionalSecretariat, "dv_dvcode", "dv_dvname")
+GN_DIVISION = Lookup(Gramasewaka, "gn_gnc", "gn_gnname")
+NIKAYA = Lookup(NikayaData, "nk_nkn", "nk_nname")
+PARSHAWA = Lookup(ParshawaData, "pr_prn", "pr_pname")
+STATUS = Lookup(StatusData, "st_statcd", "st_descr")
+CATEGORY = Lookup(BhikkuCategory, "cc_code", "cc_catogry")
+VIHARA = Lookup(ViharaData, "vh_trn", "vh_vname")
+ARAMA = Lookup(AramaData, "ar_trn", "ar_vname")
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type
+    id_attr: str
+    # code column -> where its name is looked up
+    names: Tuple[Tuple[str, Lookup], ...]
+    # temp_reference entity, for registries whose code columns may hold "TEMP-<id>"
+    temp_entity: Optional[str] = None
+
+    @property
+    def columns(self) -> List[str]:
+        named = dict(self.names)
+        columns = []
+        for attr in self.model.__mapper__.column_attrs.keys():
+            columns.append(attr)
+            if attr in named:
+                columns.append(f"{attr}_name")
+        return columns
+
+
+EXPORTS: Dict[str, ExportSpec] = {
+    "bhikku": ExportSpec(
+        Bhikku,
+        "br_id",
+        (
+            ("br_province", PROVINCE), ("br_district", DISTRICT), ("br_division", DIVISION),
+            ("br_gndiv", GN_DIVISION), ("br_currstat", STATUS), ("br_parshawaya", PARSHAWA),
+            ("br_cat", CATEGORY), ("br_nikaya", NIKAYA), ("br_livtemple", VIHARA),
+            ("br_mahanatemple", VIHARA),
+        ),
+        temp_entity=ENTITY_BHIKKU,
+    ),
+    "silmatha": ExportSpec(
+        SilmathaRegist,
+        "sil_id",
+        (
+            ("sil_province", PROVINCE), ("sil_district", DISTRICT), ("sil_division", DIVISION),
+            ("sil_gndiv", GN_DIVISION), ("sil_currstat", STATUS), ("sil_cat", CATEGORY),
+            ("sil_mahanatemple", ARAMA),
+        ),
+    ),
+    **{
+        entity: ExportSpec(
+            model,
+            f"{prefix}_id",
+            (
+                (f"{prefix}_province", PROVINCE), (f"{prefix}_district", DISTRICT),
+                (f"{prefix}_divisional_secretariat", DIVISION), (f"{prefix}_gndiv", GN_DIVISION),
+                (f"{prefix}_nikaya", NIKAYA), (f"{prefix}_parshawa", PARSHAWA),
+            ),
+        )
+        for entity, model, prefix in (
+            ("vihara", ViharaData, "vh"),
+            ("arama", AramaData, "ar"),
+            ("devala", DevalaData, "dv"),
+        )
+    },
+}
+
+
+def count(query: Query) -> int:
+    """Exact number of rows an export of `query` will produce."""
+    return query.order_by(None).count()
+
+
+def _enrich(db: Session, spec: ExportSpec, batch: List[Any]) -> List[Dict[str, Any]]:
+    found: Dict[Lookup, Dict[Any, Any]] = {}
+    for lookup in {lookup for _, lookup in spec.names}:
+        codes = {getattr(row, attr) for row in batch for attr, target in spec.names if target == lookup}
+        codes.discard(None)
+        found[lookup] = load_by_keys(db, lookup.model, lookup.code_attr, codes) if codes else {}
+    temp_refs = {}
+    if spec.temp_entity:
+        temp_refs = temp_reference_repo.resolve_page(
+            db, entity=spec.temp_entity, entity_ids=[getattr(row, spec.id_attr) for row in batch]
+        )
+
+    named = dict(spec.names)
+    rows = []
+    for row in batch:
+        refs = temp_refs.get(getattr(row, spec.id_attr), {})
+        out: Dict[str, Any] = {}
+        for attr in spec.model.__mapper__.column_attrs.keys():
+            value = getattr(row, attr)
+            out[attr] = value
+            if attr in named:
+                lookup = named[attr]
+                target = found[lookup].get(value) if value is not None else None
+                if target is not None:
+                    out[f"{attr}_name"] = getattr(target, lookup.name_attr)
+                else:
+                    out[f"{attr}_name"] = refs[attr].name if attr in refs else None
+        rows.append(out)
+    return rows
+
+
+def stream(entity: str, query: Query) -> Iterator[Dict[str, Any]]:
+    """
+    Enriched rows of `query` (built on any session; re-run on a session of
+    its own) in batches of EXPORT_BATCH_SIZE.
+    """
+    spec = EXPORTS[entity]
+    db = SessionLocal()
+    try:
+        rows = iter(query.with_session(db).options(noload("*")).yield_per(EXPORT_BATCH_SIZE))
+        while batch := list(islice(rows, EXPORT_BATCH_SIZE)):
+            enriched = _enrich(db, spec, batch)
+            # One by one: expunge_all() would swap out the identity map the cursor loads into
+            for instance in list(db):
+                db.expunge(instance)
+            yield from enriched
+    finally:
+        db.close()
+
+
+def response(entity: str, query: Query, fmt: str = "csv") -> StreamingResponse:
+    """
+    Download of every row of `query` as CSV or NDJSON. X-Total-Count is the
+    number of rows that will follow, so clients can show progress as lines
+    arrive.
+    """
+    total = count(query)
+    return stream_rows(
+        fmt,
+        EXPORTS[entity].columns,
+        stream(entity, query),
+        filename=f"{entity}_export_{date.today():%Y%m%d}",
+        headers={"X-Total-Count": str(total)},
+    )
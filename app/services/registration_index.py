@@ -0,0 +1,281 @@
+# app/services/registration_index.py
+"""
+Registration number index for QR lookups and reprint search.
+
+Every bhikku, silmatha, high bhikku, direct high bhikku, vihara, arama and
+devala row has a registration_index row (regn / trn, entity type, primary
+key, display name, searchable names, date of birth, workflow status), so
+"which record is UPS2025025?" and "completed registrations matching '2025'"
+are one indexed query instead of one query per table.
+
+Rows are rebuilt in after_flush for new, changed and deleted records. A high
+bhikku's date of birth comes from its candidate bhikku, so a bhikku whose
+date of birth changes also rebuilds the high bhikku rows pointing at it.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Set
+
+from sqlalchemy import Select, delete, event, false, func, insert, inspect, literal, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.db.session import SessionLocal
+from app.models.arama import AramaData
+from app.models.bhikku import Bhikku
+from app.models.bhikku_high import BhikkuHighRegist
+from app.models.devala import DevalaData
+from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.registration_index import RegistrationIndex
+from app.models.silmatha_regist import SilmathaRegist
+from app.models.vihara import ViharaData
+
+# Cannot appear in user input, so a name match never spans two names
+FIELD_SEPARATOR = "\x1f"
+
+# Person registrations the QR search resolves, in the order it used to probe them
+QR_ENTITY_TYPES = ("bhikku", "silmatha", "high_bhikku")
+# Entity types without a date of birth; the birth date filter does not apply to them
+PLACE_ENTITY_TYPES = ("vihara", "arama", "devala")
+
+INDEX_COLUMNS = (
+    "ri_entity_type", "ri_entity_id", "ri_regn", "ri_display_name",
+    "ri_names", "ri_dob", "ri_workflow_status", "ri_is_deleted",
+)
+
+
+@dataclass(frozen=True)
+class RegistrationSource:
+    entity_type: str
+    model: type
+    id_attr: str
+    # SELECT of the INDEX_COLUMNS values, without a WHERE clause
+    rows: Callable[[], Select]
+    # Attributes whose change rebuilds the row
+    keys: frozenset
+
+    @property
+    def id_column(self):
+        return getattr(self.model, self.id_attr)
+
+
+def _names(*columns):
+    names = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        names = names + FIELD_SEPARATOR + func.coalesce(column, "")
+    return names
+
+
+def _deleted(column):
+    return func.coalesce(column, false())
+
+
+def _person_source(entity_type, model, prefix, display_name, name_attrs, dob_attr, keys=()) -> RegistrationSource:
+    def rows() -> Select:
+        return select(
+            literal(entity_type),
+            getattr(model, f"{prefix}_id"),
+            getattr(model, f"{prefix}_regn"),
+            display_name(),
+            _names(*[getattr(model, attr) for attr in name_attrs]),
+            getattr(model, dob_attr),
+            getattr(model, f"{prefix}_workflow_status"),
+            _deleted(getattr(model, f"{prefix}_is_deleted")),
+        )
+
+    return RegistrationSource(
+        entity_type=entity_type,
+        model=model,
+        id_attr=f"{prefix}_id",
+        rows=rows,
+        keys=frozenset({
+            f"{prefix}_regn", f"{prefix}_workflow_status", f"{prefix}_is_deleted", dob_attr, *name_attrs, *keys,
+        }),
+    )
+
+
+def _place_source(entity_type, model, prefix) -> RegistrationSource:
+    def rows() -> Select:
+        name = getattr(model, f"{prefix}_vname")
+        return select(
+            literal(entity_type),
+            getattr(model, f"{prefix}_id"),
+            getattr(model, f"{prefix}_trn"),
+            name,
+            _names(name),
+            literal(None, type_=RegistrationIndex.ri_dob.type),
+            getattr(model, f"{prefix}_workflow_status"),
+            _deleted(getattr(model, f"{prefix}_is_deleted")),
+        )
+
+    return RegistrationSource(
+        entity_type=entity_type,
+        model=model,
+        id_attr=f"{prefix}_id",
+        rows=rows,
+        keys=frozenset({f"{prefix}_trn", f"{prefix}_vname", f"{prefix}_workflow_status", f"{prefix}_is_deleted"}),
+    )
+
+
+def _high_bhikku_rows() -> Select:
+    # Date of birth of the candidate bhikku
+    return select(
+        literal("high_bhikku"),
+        BhikkuHighRegist.bhr_id,
+        BhikkuHighRegist.bhr_regn,
+        BhikkuHighRegist.bhr_assumed_name,
+        _names(BhikkuHighRegist.bhr_assumed_name),
+        Bhikku.br_dofb,
+        BhikkuHighRegist.bhr_workflow_status,
+        _deleted(BhikkuHighRegist.bhr_is_deleted),
+    ).outerjoin(Bhikku, Bhikku.br_regn == BhikkuHighRegist.bhr_candidate_regn)
+
+
+SOURCES: Dict[str, RegistrationSource] = {
+    source.entity_type: source
+    for source in (
+        _person_source(
+            "bhikku", Bhikku, "br", lambda: Bhikku.br_mahananame,
+            ("br_mahananame", "br_gihiname"), "br_dofb",
+        ),
+        _person_source(
+            "silmatha", SilmathaRegist, "sil", lambda: SilmathaRegist.sil_mahananame,
+            ("sil_mahananame", "sil_gihiname"), "sil_dofb",
+        ),
+        RegistrationSource(
+            entity_type="high_bhikku",
+            model=BhikkuHighRegist,
+            id_attr="bhr_id",
+            rows=_high_bhikku_rows,
+            keys=frozenset({
+                "bhr_regn", "bhr_assumed_name", "bhr_candidate_regn", "bhr_workflow_status", "bhr_is_deleted",
+            }),
+        ),
+        _person_source(
+            "direct_high_bhikku", DirectBhikkuHigh, "dbh",
+            lambda: func.coalesce(DirectBhikkuHigh.dbh_assumed_name, DirectBhikkuHigh.dbh_mahananame),
+            ("dbh_mahananame", "dbh_assumed_name", "dbh_gihiname"), "dbh_dofb",
+        ),
+        _place_source("vihara", ViharaData, "vh"),
+        _place_source("arama", AramaData, "ar"),
+        _place_source("devala", DevalaData, "dv"),
+    )
+}
+ENTITY_TYPES = tuple(SOURCES)
+_SOURCES_BY_MODEL = {source.model: source for source in SOURCES.values()}
+# Bhikku attributes copied into the index rows of the high bhikkus it is the candidate of
+_CANDIDATE_KEYS = frozenset({"br_regn", "br_dofb"})
+
+
+# --------------------------------------------------------------------------- #
+# Maintenance
+# --------------------------------------------------------------------------- #
+def refresh_entries(
+    connection,
+    ids_by_type: Mapping[str, Iterable[int]],
+    *,
+    candidate_regns: Iterable[str] = (),
+) -> None:
+    """
+    Rebuild the index rows of the given records (deleted records lose theirs)
+    and of the high bhikkus whose candidate is one of `candidate_regns`.
+    """
+    pending: Dict[str, Set[int]] = {
+        entity_type: {entity_id for entity_id in ids if entity_id is not None}
+        for entity_type, ids in ids_by_type.items()
+    }
+    candidate_regns = [regn for regn in candidate_regns if regn]
+    if candidate_regns:
+        pending.setdefault("high_bhikku", set()).update(connection.execute(
+            select(BhikkuHighRegist.bhr_id).where(BhikkuHighRegist.bhr_candidate_regn.in_(candidate_regns))
+        ).scalars())
+
+    for entity_type, ids in pending.items():
+        if not ids:
+            continue
+        source = SOURCES[entity_type]
+        ids = sorted(ids)
+        connection.execute(delete(RegistrationIndex).where(
+            RegistrationIndex.ri_entity_type == entity_type,
+            RegistrationIndex.ri_entity_id.in_(ids),
+        ))
+        connection.execute(insert(RegistrationIndex).from_select(
+            list(INDEX_COLUMNS), source.rows().where(source.id_column.in_(ids))
+        ))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def sync_registration_index(session: Session, flush_context) -> None:
+    ids_by_type: Dict[str, Set[int]] = defaultdict(set)
+    candidate_regns = set()
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        source = _SOURCES_BY_MODEL.get(type(instance))
+        if source is None:
+            continue
+        changed = instance not in session.dirty or _changed(instance, source.keys)
+        if changed:
+            ids_by_type[source.entity_type].add(getattr(instance, source.id_attr))
+        if isinstance(instance, Bhikku) and (instance not in session.dirty or _changed(instance, _CANDIDATE_KEYS)):
+            candidate_regns.add(instance.br_regn)
+    if ids_by_type or candidate_regns:
+        refresh_entries(session.connection(), ids_by_type, candidate_regns=candidate_regns)
+
+
+def _changed(instance, keys: frozenset) -> bool:
+    """True if any of `keys` was modified in this flush."""
+    committed = inspect(instance).committed_state
+    return any(key in committed for key in keys)
+
+
+# --------------------------------------------------------------------------- #
+# Reads
+# --------------------------------------------------------------------------- #
+def lookup(
+    db: Session, regn: str, entity_types: Sequence[str] = ENTITY_TYPES
+) -> Optional[RegistrationIndex]:
+    """
+    Index row of a registration number. When several entity types share the
+    number, the first of `entity_types` wins.
+    """
+    if not regn:
+        return None
+    entries = db.query(RegistrationIndex).filter(
+        RegistrationIndex.ri_regn == regn,
+        RegistrationIndex.ri_entity_type.in_(entity_types),
+    ).all()
+    rank = {entity_type: i for i, entity_type in enumerate(entity_types)}
+    return min(entries, key=lambda e: (rank[e.ri_entity_type], e.ri_entity_id), default=None)
+
+
+def search(
+    db: Session,
+    *,
+    registration_number: Optional[str] = None,
+    name: Optional[str] = None,
+    birth_date: Optional[date] = None,
+    entity_types: Sequence[str] = ENTITY_TYPES,
+    workflow_status: Optional[str] = "COMPLETED",
+) -> Query:
+    """
+    Non-deleted index rows matching the reprint search filters, without an
+    ORDER BY. `registration_number` and `name` are substring matches; the
+    birth date filter only applies to person registrations.
+    """
+    query = db.query(RegistrationIndex).filter(
+        RegistrationIndex.ri_is_deleted.is_(False),
+        RegistrationIndex.ri_entity_type.in_(entity_types),
+    )
+    if workflow_status is not None:
+        query = query.filter(RegistrationIndex.ri_workflow_status == workflow_status)
+    if registration_number:
+        query = query.filter(RegistrationIndex.ri_regn.ilike(f"%{registration_number}%"))
+    if name:
+        query = query.filter(RegistrationIndex.ri_names.ilike(f"%{name}%"))
+    if birth_date:
+        query = query.filter(or_(
+            RegistrationIndex.ri_dob == birth_date,
+            RegistrationIndex.ri_entity_type.in_(PLACE_ENTITY_TYPES),
+        ))
+    return query
@@ -0,0 +1,364 @@
+# app/services/report_views.py
+"""
+Bhikku report views (bikkudtls_* / bikkusumm_*) and materialized copies of
+the heavy ones.
+
+Reads: read() returns a view's rows with optional column filters, a
+substring search over all columns and offset paging (with the filtered
+total); stream() iterates the same rows through a server-side cursor in its
+own session, so a response of any size is produced in constant memory.
+
+The detail lists and summaries marked `materialized` join and aggregate the
+whole registry on every call. Each has a materialized copy, mv_<view>, with
+a unique index (required by REFRESH ... CONCURRENTLY, which keeps the copy
+readable while it is rebuilt): on the view's natural `key` where it has one,
+so a refresh only rewrites changed rows; otherwise the copy adds mv_row, a
+row number in a fixed column order, and the index is on that. Copies are
+read in key (or mv_row) order and report when they were refreshed
+("as_of"); the other views are read live, ordered by all their columns.
+
+Freshness:
+- Each copy lists the tables its view reads (`sources`, following the views
+  it is built on). A flush that writes a row of one of them inserts a
+  report_view_dirty_mark row naming the table, once per table and
+  transaction.
+- refresh_report_views() runs when marks exist: in one transaction it
+  deletes the marks it can see and refreshes the copies reading a marked
+  table. Marks of writers still in flight are not visible, survive, and
+  trigger the next refresh.
+- statchange, iddata and legacy_user_mapping have no model, so writes to
+  them are not marked; a forced refresh (refresh_report_views.py --force,
+  e.g. nightly from cron) picks them up.
+- ReportViewRefresher runs that every REPORT_VIEW_REFRESH_INTERVAL_SECONDS
+  in a daemon thread; app/utils/refresh_report_views.py runs it once (cron).
+  A transaction-level advisory lock keeps concurrent workers from
+  refreshing at the same time.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import Select, String, cast, column, delete, event, func, insert, or_, select, table, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.report_view_state import ReportViewDirtyMark, ReportViewState
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key of the refresh
+REFRESH_LOCK_KEY = 0x6D765F72  # "mv_r"
+
+_SESSION_MARKED_KEY = "report_views_marked"
+
+# Rows fetched per round trip by stream()
+STREAM_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ReportView:
+    name: str
+    # Selected columns; mv_row orders by them (see the migration creating the copies)
+    columns: Tuple[str, ...]
+    materialized: bool = True
+    # Natural unique key of the materialized copy; empty when it is keyed on mv_row
+    key: Tuple[str, ...] = ()
+    # Tables the view reads, directly or through other views; writes to them mark the copy stale
+    sources: FrozenSet[str] = frozenset()
+
+    @property
+    def matview(self) -> str:
+        return f"mv_{self.name}"
+
+
+@dataclass
+class ReportViewQuery:
+    # Exact matches on view columns, compared as text
+    filters: Dict[str, str] = field(default_factory=dict)
+    # Case-insensitive substring of any column
+    search: Optional[str] = None
+    offset: int = 0
+    # None returns every row
+    limit: Optional[int] = None
+
+
+@dataclass
+class ReportViewRows:
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # When the materialized copy was last refreshed
+    as_of: Optional[datetime] = None
+    # Filtered row count, only for paginated reads
+    total: Optional[int] = None
+
+
+# Source tables shared by several views (from the view definitions)
+_STATUS_HISTORY = frozenset({"bhikku_regist_old", "statchange", "statusdata"})
+_CERTIFICATION = frozenset({"bhikku_regist_old", "bikku_certification", "legacy_user_mapping"})
+_GN_LOCATION = frozenset({"bhikku_regist_old", "vihaddata", "cmm_gndata"})
+_DISTRICT_LOCATION = _GN_LOCATION | {"cmm_districtdata", "cmm_dvsec"}
+
+REPORT_VIEWS: Dict[str, ReportView] = {
+    view.name: view
+    for view in (
+        # Read from mv_<view>
+        ReportView(
+            "bikkudtls_bikkullist",
+            (
+                "regn", "birthpls", "gihiname", "dofb", "fathrname", "mahanadate",
+                "mahananame", "teacher", "teachadrs", "mhanavh", "livetemple",
+                "viharadipathi", "pname", "nname", "nikayanayaka", "effctdate",
+                "curstatus", "catogry", "vadescrdtls",
+            ),
+            key=("regn",),
+            sources=_STATUS_HISTORY | {"vihaddata", "cmm_cat", "cmm_nikayadata", "cmm_parshawadata"},
+        ),
+        ReportView(
+            "bikkudtls_certification_data",
+            (
+                "regno", "mahananame", "issuedate", "reqstdate", "adminautho",
+                "prtoptn", "paydate", "payamount", "usname", "adminusr",
+            ),
+            sources=_CERTIFICATION,
+        ),
+        ReportView(
+            "bikkudtls_certification_printnow",
+            (
+                "regno", "mahananame", "issuedate", "reqstdate", "adminautho",
+                "prtoptn", "paydate", "payamount", "usname", "adminusr",
+            ),
+            sources=_CERTIFICATION,
+        ),
+        ReportView(
+            "bikkudtls_histtystatus_list", ("descr", "prvdate", "chngdate", "regno"),
+            sources=frozenset({"statchange", "statusdata"}),
+        ),
+        ReportView(
+            "bikkudtls_id_alllist",
+            (
+                "idn", "stat", "reqstdate", "printdate", "issuedate", "mahanaacharyacd",
+                "archadrs", "achambl", "achamhndate", "acharegdt", "mahananame", "vname",
+                "addrs", "regn", "dofb", "mahanadate", "gihiname", "fathrdetails",
+            ),
+            key=("regn", "idn"),
+            sources=frozenset({"bhikku_regist_old", "iddata", "vihaddata"}),
+        ),
+        ReportView("bikkudtls_statushystry_composit", ("regno", "vadescrdtls"), sources=_STATUS_HISTORY),
+        ReportView("bikkudtls_statushystry_list", ("regno", "prvdate", "chngdate", "descr"), sources=_STATUS_HISTORY),
+        ReportView("bikkudtls_statushystry_list2", ("regno", "statchgdescr"), sources=_STATUS_HISTORY),
+        ReportView(
+            "bikkusumm_currstatus_list", ("statcd", "descr", "statcnt"), key=("statcd",),
+            sources=frozenset({"bhikku_regist_old", "statusdata"}),
+        ),
+        ReportView(
+            "bikkusumm_district_list", ("dcode", "dname", "totalbikku"), key=("dcode",), sources=_DISTRICT_LOCATION
+        ),
+        ReportView("bikkusumm_gn_list", ("gnc", "gnname", "bikkucnt"), key=("gnc",), sources=_GN_LOCATION),
+        ReportView(
+            "bikkusumm_iddistrict_list", ("dcode", "dname", "idcnt"), key=("dcode",),
+            sources=_DISTRICT_LOCATION | {"iddata"},
+        ),
+        ReportView("bikkusumm_idgn_list", ("gnname", "idcnt"), sources=_GN_LOCATION | {"iddata"}),
+        # Read live
+        ReportView(
+            "bikkudtls_mahanayakalist", ("regn", "mahananame", "currstat", "vname", "addrs"), materialized=False
+        ),
+        ReportView("bikkudtls_nikaya_list", ("nkn", "nname", "prn", "pname", "regn"), materialized=False),
+        ReportView(
+            "bikkudtls_archarya_dtls", ("currstated", "mobile", "email", "mahanadate", "reqstdate", "regn"),
+            materialized=False,
+        ),
+        ReportView("bikkudtls_currstatus_list", ("statcd", "descr", "regn"), materialized=False),
+        ReportView("bikkudtls_districtlist", ("dcode", "dname", "regn"), materialized=False),
+        ReportView("bikkudtls_divisionsec_dtls", ("dvcode", "dvname", "regn"), materialized=False),
+        ReportView("bikkudtls_gn_dtls", ("gnc", "gnname", "regn"), materialized=False),
+        ReportView("bikkudtls_iddistrict_list", ("dcode", "dname", "idn"), materialized=False),
+        ReportView("bikkudtls_iddvsec_list", ("dvcode", "dvname", "idn"), materialized=False),
+        ReportView("bikkudtls_idgn_list", ("gnname", "idn"), materialized=False),
+        ReportView(
+            "bikkudtls_nikayanayaka_list", ("regn", "mahananame", "currstat", "vname", "addrs"), materialized=False
+        ),
+        ReportView("bikkudtls_parshawa_list", ("prn", "pname", "regn"), materialized=False),
+        ReportView("bikkudtls_viharadipathi_list", ("regn", "mahananame"), materialized=False),
+    )
+}
+MATERIALIZED_VIEWS: Dict[str, ReportView] = {name: view for name, view in REPORT_VIEWS.items() if view.materialized}
+# Writes to these tables can change a materialized copy
+SOURCE_TABLES: FrozenSet[str] = frozenset().union(*(view.sources for view in MATERIALIZED_VIEWS.values()))
+
+
+# --------------------------------------------------------------------------- #
+# Reads
+# --------------------------------------------------------------------------- #
+def _statement(view: ReportView, query: ReportViewQuery) -> Select:
+    """Filtered, ordered SELECT of a view's columns, without paging."""
+    if view.materialized and view.key:
+        source = table(view.matview, *(column(c) for c in view.columns))
+        # The other columns only break ties between rows with NULL keys
+        order = [source.c[c].nulls_last() for c in view.key + tuple(c for c in view.columns if c not in view.key)]
+    elif view.materialized:
+        source = table(view.matview, *(column(c) for c in view.columns + ("mv_row",)))
+        order = [source.c.mv_row]
+    else:
+        source = table(view.name, *(column(c) for c in view.columns))
+        order = [source.c[c] for c in view.columns]
+
+    stmt = select(*(source.c[c] for c in view.columns))
+    for key, value in query.filters.items():
+        stmt = stmt.where(cast(source.c[key], String) == value)
+    if query.search:
+        pattern = f"%{query.search}%"
+        stmt = stmt.where(or_(*(cast(source.c[c], String).ilike(pattern) for c in view.columns)))
+    return stmt.order_by(*order)
+
+
+def as_of(db: Session, name: str) -> Optional[datetime]:
+    """Refresh time of a view's materialized copy; None for views read live."""
+    if not REPORT_VIEWS[name].materialized:
+        return None
+    return db.execute(
+        select(ReportViewState.rvs_refreshed_at).where(ReportViewState.rvs_view == name)
+    ).scalar()
+
+
+def read(db: Session, name: str, query: Optional[ReportViewQuery] = None) -> ReportViewRows:
+    """
+    Rows of a report view (all of them unless `query.limit` is set), in key
+    or mv_row order for materialized views and by all columns otherwise.
+    """
+    view = REPORT_VIEWS[name]
+    query = query or ReportViewQuery()
+    # Read before the rows so a refresh committing in between only makes as_of older
+    result = ReportViewRows(as_of=as_of(db, name))
+    stmt = _statement(view, query)
+    if query.limit is not None:
+        result.total = db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar()
+        stmt = stmt.offset(query.offset).limit(query.limit)
+    result.rows = [dict(row) for row in db.execute(stmt).mappings()]
+    return result
+
+
+def stream(name: str, query: Optional[ReportViewQuery] = None) -> Iterator[Mapping[str, Any]]:
+    """
+    Rows of a report view like read(), fetched STREAM_BATCH_SIZE at a time
+    through a server-side cursor. Uses its own session, so it can be
+    consumed after the request's session is closed (streaming responses).
+    """
+    stmt = _statement(REPORT_VIEWS[name], query or ReportViewQuery())
+    if query and query.limit is not None:
+        stmt = stmt.offset(query.offset).limit(query.limit)
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE))
+        yield from result.mappings()
+    finally:
+        db.close()
+
+
+# --------------------------------------------------------------------------- #
+# Dirty marks
+# --------------------------------------------------------------------------- #
+@event.listens_for(SessionLocal, "after_flush")
+def mark_report_views_dirty(session: Session, flush_context) -> None:
+    transaction = session.get_transaction()
+    marked_transaction, marked = session.info.get(_SESSION_MARKED_KEY, (None, set()))
+    if marked_transaction is not transaction:
+        marked = set()
+    tables = {
+        instance.__table__.name
+        for instances in (session.new, session.dirty, session.deleted)
+        for instance in instances
+        if instance.__table__.name in SOURCE_TABLES
+        and (instance not in session.dirty or session.is_modified(instance))
+    } - marked
+    if tables:
+        session.connection().execute(
+            insert(ReportViewDirtyMark).values(
+                [{"rvd_table": name, "rvd_marked_at": func.now()} for name in sorted(tables)]
+            )
+        )
+    session.info[_SESSION_MARKED_KEY] = (transaction, marked | tables)
+
+
+# --------------------------------------------------------------------------- #
+# Refresh
+# --------------------------------------------------------------------------- #
+def refresh_report_views(db: Session, *, force: bool = False) -> Dict[str, int]:
+    """
+    Refresh the materialized copies reading a table written since the last
+    refresh (all of them with `force`). Returns {view: refresh ms}; empty if
+    nothing was due or another process holds the refresh lock.
+    """
+    if not db.execute(select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_KEY))).scalar():
+        db.rollback()
+        return {}
+
+    # Only marks committed before this point are deleted; later ones stay for the next run
+    written: Set[str] = set(
+        db.execute(delete(ReportViewDirtyMark).returning(ReportViewDirtyMark.rvd_table)).scalars()
+    )
+    if not written and not force:
+        db.rollback()
+        return {}
+
+    timings: Dict[str, int] = {}
+    for name, view in MATERIALIZED_VIEWS.items():
+        if not force and not view.sources & written:
+            continue
+        start = time.perf_counter()
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.matview}"))
+        timings[name] = int((time.perf_counter() - start) * 1000)
+        db.execute(
+            update(ReportViewState)
+            .where(ReportViewState.rvs_view == name)
+            .values(rvs_refreshed_at=func.now(), rvs_refresh_ms=timings[name])
+        )
+    db.commit()
+    return timings
+
+
+class ReportViewRefresher:
+    """Daemon thread calling refresh_report_views() every `interval_seconds`."""
+
+    def __init__(self, *, interval_seconds: int) -> None:
+        self.interval = max(interval_seconds, 1)
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="report-view-refresher", daemon=True)
+            self._thread.start()
+        logger.info("Report view refresher started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread:
+            thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                timings = refresh_report_views(db)
+                if timings:
+                    logger.info("Refreshed %d report views in %d ms", len(timings), sum(timings.values()))
+            except Exception:
+                db.rollback()
+                logger.exception("Report view refresh failed")
+            finally:
+                db.close()
+
+
+report_view_refresher = ReportViewRefresher(interval_seconds=settings.REPORT_VIEW_REFRESH_INTERVAL_SECONDS)
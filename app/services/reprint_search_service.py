@@ -3,10 +3,10 @@
 Service for unified reprint search across all entity types.
 Searches: Bhikku, Silmatha, High Bhikku, Direct High Bhikku, Vihara, Arama, Devala
 """
-from typing import Optional, List, Tuple
+from collections import defaultdict
+from typing import Dict, Optional, List, Tuple, Union
 from datetime import date
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session, noload
 
 from app.models.bhikku import Bhikku
 from app.models.silmatha_regist import SilmathaRegist
@@ -17,7 +17,19 @@ from app.models.arama import AramaData
 from app.models.devala import DevalaData
 from app.models.status import StatusData
 from app.models.bhikku_category import BhikkuCategory
+from app.models.registration_index import RegistrationIndex
 from app.schemas.reprint_search import ReprintSearchResultItem, QRStyleDetailItem
+from app.services import registration_index
+from app.utils.batch_loading import load_by_keys
+from app.utils.pagination import KeysetPage, keyset_paginate
+
+# Shared sort key of search results across entity types
+SEARCH_ORDER = (
+    RegistrationIndex.ri_regn,
+    RegistrationIndex.ri_entity_type,
+    RegistrationIndex.ri_entity_id,
+)
+SEARCH_KEYSET_ORDER = [(column, False) for column in SEARCH_ORDER]
 
 
 class ReprintSearchService:
@@ -31,113 +43,83 @@ class ReprintSearchService:
         birth_date: Optional[date] = None,
         entity_type: Optional[str] = None,
         skip: int = 0,
-        limit: int = 50
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
+        limit: int = 50,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Union[List[ReprintSearchResultItem], KeysetPage], int]:
         """
         Search across all entity types with optional filters.
+        Matches come from the registration index ordered by registration
+        number, so pages and totals are exact across types.
+        
+        Args:
+            keyset: Return a KeysetPage fetched after/before `cursor` instead of an offset page
+            cursor: next_cursor / prev_cursor of a previous keyset page
         
         Returns:
             Tuple of (results, total_count)
         """
-        results = []
-        
-        # If entity type is specified, search only that type
-        if entity_type:
-            if entity_type == "bhikku":
-                results, total = self._search_bhikku(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "silmatha":
-                results, total = self._search_silmatha(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "high_bhikku":
-                results, total = self._search_high_bhikku(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "direct_high_bhikku":
-                results, total = self._search_direct_high_bhikku(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "vihara":
-                results, total = self._search_vihara(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "arama":
-                results, total = self._search_arama(db, registration_number, name, birth_date, skip, limit)
-            elif entity_type == "devala":
-                results, total = self._search_devala(db, registration_number, name, birth_date, skip, limit)
-            else:
-                results, total = [], 0
-        else:
-            # Search all types and combine results
-            all_results = []
-            
-            bhikku_results, _ = self._search_bhikku(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(bhikku_results)
-            
-            silmatha_results, _ = self._search_silmatha(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(silmatha_results)
-            
-            high_bhikku_results, _ = self._search_high_bhikku(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(high_bhikku_results)
-            
-            direct_high_results, _ = self._search_direct_high_bhikku(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(direct_high_results)
-            
-            vihara_results, _ = self._search_vihara(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(vihara_results)
-            
-            arama_results, _ = self._search_arama(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(arama_results)
-            
-            devala_results, _ = self._search_devala(db, registration_number, name, birth_date, 0, limit * 2)
-            all_results.extend(devala_results)
-            
-            total = len(all_results)
-            results = all_results[skip:skip + limit]
-        
-        return results, total
-    
-    def _search_bhikku(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Bhikku records"""
-        query = db.query(Bhikku).filter(
-            Bhikku.br_is_deleted == False,
-            Bhikku.br_workflow_status == 'COMPLETED'
+        if entity_type and entity_type not in registration_index.ENTITY_TYPES:
+            return (KeysetPage() if keyset else []), 0
+        entity_types = (entity_type,) if entity_type else registration_index.ENTITY_TYPES
+
+        query = registration_index.search(
+            db,
+            registration_number=registration_number,
+            name=name,
+            birth_date=birth_date,
+            entity_types=entity_types,
         )
-        
-        if registration_number:
-            query = query.filter(Bhikku.br_regn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(
-                or_(
-                    Bhikku.br_mahananame.ilike(f"%{name}%"),
-                    Bhikku.br_gihiname.ilike(f"%{name}%")
-                )
-            )
-        if birth_date:
-            query = query.filter(Bhikku.br_dofb == birth_date)
-        
         total = query.count()
-        entities = query.offset(skip).limit(limit).all()
+        if keyset:
+            # (ri_regn, ri_entity_type, ri_entity_id) is the index order, so deep pages cost the same as page 1
+            page = keyset_paginate(query, SEARCH_KEYSET_ORDER, limit, cursor)
+            page.items = self._result_items(db, page.items)
+            return page, total
+        entries = query.order_by(*SEARCH_ORDER).offset(skip).limit(limit).all()
+        return self._result_items(db, entries), total
+
+    def _result_items(self, db: Session, entries: List[RegistrationIndex]) -> List[ReprintSearchResultItem]:
+        """Result items for a page of index rows, in the same order; one query per entity type."""
+        ids_by_type: Dict[str, List[int]] = defaultdict(list)
+        for entry in entries:
+            ids_by_type[entry.ri_entity_type].append(entry.ri_entity_id)
+
+        builders = {
+            "bhikku": self._bhikku_items,
+            "silmatha": self._silmatha_items,
+            "high_bhikku": self._high_bhikku_items,
+            "direct_high_bhikku": self._direct_high_bhikku_items,
+            "vihara": self._vihara_items,
+            "arama": self._arama_items,
+            "devala": self._devala_items,
+        }
+        items: Dict[Tuple[str, int], ReprintSearchResultItem] = {}
+        for entity_type, ids in ids_by_type.items():
+            for entity_id, item in builders[entity_type](db, ids).items():
+                items[(entity_type, entity_id)] = item
+        # Rows removed since the index was read are skipped
+        return [
+            items[key]
+            for key in ((entry.ri_entity_type, entry.ri_entity_id) for entry in entries)
+            if key in items
+        ]
+
+    @staticmethod
+    def _status_text(statuses: Dict[str, StatusData], code: Optional[str]) -> Optional[str]:
+        status = statuses.get(code) if code else None
+        return status.st_descr if status else code
+
+    def _bhikku_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Bhikku result items by br_id"""
+        entities = db.query(Bhikku).options(noload('*')).filter(Bhikku.br_id.in_(ids)).all()
+        temples = load_by_keys(db, ViharaData, "vh_trn", {e.br_livtemple for e in entities if e.br_livtemple})
+        statuses = load_by_keys(db, StatusData, "st_statcd", {e.br_currstat for e in entities if e.br_currstat})
         
-        results = []
+        results = {}
         for entity in entities:
-            # Get temple info
-            temple_name = None
-            temple_address = None
-            if entity.br_livtemple:
-                temple = db.query(ViharaData).filter(ViharaData.vh_trn == entity.br_livtemple).first()
-                if temple:
-                    temple_name = temple.vh_vname
-                    temple_address = temple.vh_addrs
-            
-            # Get status
-            status_text = entity.br_currstat
-            if entity.br_currstat:
-                status = db.query(StatusData).filter(StatusData.st_statcd == entity.br_currstat).first()
-                if status:
-                    status_text = status.st_descr
-            
-            results.append(ReprintSearchResultItem(
+            temple = temples.get(entity.br_livtemple) if entity.br_livtemple else None
+            results[entity.br_id] = ReprintSearchResultItem(
                 entity_type="bhikku",
                 registration_number=entity.br_regn,
                 form_id=entity.br_form_id,
@@ -147,65 +129,29 @@ class ReprintSearchService:
                 birth_place=entity.br_birthpls,
                 mobile=entity.br_mobile,
                 email=entity.br_email,
-                temple_name=temple_name,
-                temple_address=temple_address,
-                current_status=status_text,
+                temple_name=temple.vh_vname if temple else None,
+                temple_address=temple.vh_addrs if temple else None,
+                current_status=self._status_text(statuses, entity.br_currstat),
                 workflow_status=entity.br_workflow_status,
                 ordination_date=entity.br_mahanadate,
                 request_date=entity.br_reqstdate
-            ))
+            )
         
-        return results, total
+        return results
     
-    def _search_silmatha(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Silmatha records"""
-        query = db.query(SilmathaRegist).filter(
-            SilmathaRegist.sil_is_deleted == False,
-            SilmathaRegist.sil_workflow_status == 'COMPLETED'
+    def _silmatha_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Silmatha result items by sil_id"""
+        entities = db.query(SilmathaRegist).options(noload('*')).filter(SilmathaRegist.sil_id.in_(ids)).all()
+        aramas = load_by_keys(
+            db, AramaData, "ar_trn", {e.sil_mahanatemple for e in entities if e.sil_mahanatemple}
         )
+        statuses = load_by_keys(db, StatusData, "st_statcd", {e.sil_currstat for e in entities if e.sil_currstat})
         
-        if registration_number:
-            query = query.filter(SilmathaRegist.sil_regn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(
-                or_(
-                    SilmathaRegist.sil_mahananame.ilike(f"%{name}%"),
-                    SilmathaRegist.sil_gihiname.ilike(f"%{name}%")
-                )
-            )
-        if birth_date:
-            query = query.filter(SilmathaRegist.sil_dofb == birth_date)
-        
-        total = query.count()
-        entities = query.offset(skip).limit(limit).all()
-        
-        results = []
+        results = {}
         for entity in entities:
-            # Get arama info
-            temple_name = None
-            temple_address = None
-            if entity.sil_mahanatemple:
-                temple = db.query(AramaData).filter(AramaData.ar_trn == entity.sil_mahanatemple).first()
-                if temple:
-                    temple_name = temple.ar_vname
-                    temple_address = temple.ar_addrs
-            
-            # Get status
-            status_text = entity.sil_currstat
-            if entity.sil_currstat:
-                status = db.query(StatusData).filter(StatusData.st_statcd == entity.sil_currstat).first()
-                if status:
-                    status_text = status.st_descr
-            
-            results.append(ReprintSearchResultItem(
+            # Silmatha temples are aramas
+            temple = aramas.get(entity.sil_mahanatemple) if entity.sil_mahanatemple else None
+            results[entity.sil_id] = ReprintSearchResultItem(
                 entity_type="silmatha",
                 registration_number=entity.sil_regn,
                 form_id=entity.sil_form_id,
@@ -215,208 +161,85 @@ class ReprintSearchService:
                 birth_place=entity.sil_birthpls,
                 mobile=entity.sil_mobile,
                 email=entity.sil_email,
-                temple_name=temple_name,
-                temple_address=temple_address,
-                current_status=status_text,
+                temple_name=temple.ar_vname if temple else None,
+                temple_address=temple.ar_addrs if temple else None,
+                current_status=self._status_text(statuses, entity.sil_currstat),
                 workflow_status=entity.sil_workflow_status,
                 ordination_date=entity.sil_mahanadate,
                 request_date=entity.sil_reqstdate
-            ))
+            )
         
-        return results, total
+        return results
     
-    def _search_high_bhikku(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search High Bhikku records"""
-        from sqlalchemy.orm import lazyload
-        
-        query = db.query(BhikkuHighRegist).options(lazyload('*')).filter(
-            BhikkuHighRegist.bhr_is_deleted == False,
-            BhikkuHighRegist.bhr_workflow_status == 'COMPLETED'
+    def _high_bhikku_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """High Bhikku result items by bhr_id; personal details come from the candidate bhikku"""
+        entities = db.query(BhikkuHighRegist).options(noload('*')).filter(BhikkuHighRegist.bhr_id.in_(ids)).all()
+        candidates = load_by_keys(
+            db, Bhikku, "br_regn", {e.bhr_candidate_regn for e in entities if e.bhr_candidate_regn}
         )
+        temples = load_by_keys(db, ViharaData, "vh_trn", {e.bhr_livtemple for e in entities if e.bhr_livtemple})
+        statuses = load_by_keys(db, StatusData, "st_statcd", {e.bhr_currstat for e in entities if e.bhr_currstat})
         
-        if registration_number:
-            query = query.filter(BhikkuHighRegist.bhr_regn.ilike(f"%{registration_number}%"))
-        if name:
-            # For high bhikku, search in assumed_name only if not null
-            query = query.filter(
-                and_(
-                    BhikkuHighRegist.bhr_assumed_name.isnot(None),
-                    BhikkuHighRegist.bhr_assumed_name.ilike(f"%{name}%")
-                )
-            )
-        if birth_date:
-            # High bhikku gets birth date from related bhikku record
-            query = query.join(Bhikku, BhikkuHighRegist.bhr_candidate_regn == Bhikku.br_regn).filter(
-                Bhikku.br_dofb == birth_date
-            )
-        
-        total = query.count()
-        entities = query.offset(skip).limit(limit).all()
-        
-        results = []
+        results = {}
         for entity in entities:
-            # Get bhikku info for names
-            ordained_name = entity.bhr_assumed_name
-            birth_name = None
-            dob = None
-            birth_place = None
-            mobile = None
-            email = None
-            
-            if entity.bhr_candidate_regn:
-                bhikku = db.query(Bhikku).filter(Bhikku.br_regn == entity.bhr_candidate_regn).first()
-                if bhikku:
-                    birth_name = bhikku.br_gihiname
-                    dob = bhikku.br_dofb
-                    birth_place = bhikku.br_birthpls
-                    mobile = bhikku.br_mobile
-                    email = bhikku.br_email
-            
-            # Get temple info
-            temple_name = None
-            temple_address = None
-            if entity.bhr_livtemple:
-                temple = db.query(ViharaData).filter(ViharaData.vh_trn == entity.bhr_livtemple).first()
-                if temple:
-                    temple_name = temple.vh_vname
-                    temple_address = temple.vh_addrs
-            
-            # Get status
-            status_text = entity.bhr_currstat
-            if entity.bhr_currstat:
-                status = db.query(StatusData).filter(StatusData.st_statcd == entity.bhr_currstat).first()
-                if status:
-                    status_text = status.st_descr
-            
-            results.append(ReprintSearchResultItem(
+            bhikku = candidates.get(entity.bhr_candidate_regn) if entity.bhr_candidate_regn else None
+            temple = temples.get(entity.bhr_livtemple) if entity.bhr_livtemple else None
+            results[entity.bhr_id] = ReprintSearchResultItem(
                 entity_type="high_bhikku",
                 registration_number=entity.bhr_regn,
                 form_id=entity.bhr_form_id,
-                ordained_name=ordained_name,
-                birth_name=birth_name,
-                date_of_birth=dob,
-                birth_place=birth_place,
-                mobile=mobile,
-                email=email,
-                temple_name=temple_name,
-                temple_address=temple_address,
-                current_status=status_text,
+                ordained_name=entity.bhr_assumed_name,
+                birth_name=bhikku.br_gihiname if bhikku else None,
+                date_of_birth=bhikku.br_dofb if bhikku else None,
+                birth_place=bhikku.br_birthpls if bhikku else None,
+                mobile=bhikku.br_mobile if bhikku else None,
+                email=bhikku.br_email if bhikku else None,
+                temple_name=temple.vh_vname if temple else None,
+                temple_address=temple.vh_addrs if temple else None,
+                current_status=self._status_text(statuses, entity.bhr_currstat),
                 workflow_status=entity.bhr_workflow_status,
                 ordination_date=entity.bhr_higher_ordination_date,
                 request_date=entity.bhr_reqstdate
-            ))
-        
-        return results, total
-    
-    def _search_direct_high_bhikku(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Direct High Bhikku records"""
-        from sqlalchemy.orm import lazyload
-        
-        query = db.query(DirectBhikkuHigh).options(lazyload('*')).filter(
-            DirectBhikkuHigh.dbh_is_deleted == False,
-            DirectBhikkuHigh.dbh_workflow_status == 'COMPLETED'
-        )
-        
-        if registration_number:
-            query = query.filter(DirectBhikkuHigh.dbh_regn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(
-                or_(
-                    DirectBhikkuHigh.dbh_mahananame.ilike(f"%{name}%"),
-                    DirectBhikkuHigh.dbh_assumed_name.ilike(f"%{name}%"),
-                    DirectBhikkuHigh.dbh_gihiname.ilike(f"%{name}%")
-                )
             )
-        if birth_date:
-            query = query.filter(DirectBhikkuHigh.dbh_dofb == birth_date)
         
-        total = query.count()
-        entities = query.offset(skip).limit(limit).all()
+        return results
+    
+    def _direct_high_bhikku_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Direct High Bhikku result items by dbh_id"""
+        entities = db.query(DirectBhikkuHigh).options(noload('*')).filter(DirectBhikkuHigh.dbh_id.in_(ids)).all()
+        temples = load_by_keys(db, ViharaData, "vh_trn", {e.dbh_livtemple for e in entities if e.dbh_livtemple})
+        statuses = load_by_keys(db, StatusData, "st_statcd", {e.dbh_currstat for e in entities if e.dbh_currstat})
         
-        results = []
+        results = {}
         for entity in entities:
-            # Get temple info
-            temple_name = None
-            temple_address = None
-            if entity.dbh_livtemple:
-                temple = db.query(ViharaData).filter(ViharaData.vh_trn == entity.dbh_livtemple).first()
-                if temple:
-                    temple_name = temple.vh_vname
-                    temple_address = temple.vh_addrs
-            
-            # Get status
-            status_text = entity.dbh_currstat
-            if entity.dbh_currstat:
-                status = db.query(StatusData).filter(StatusData.st_statcd == entity.dbh_currstat).first()
-                if status:
-                    status_text = status.st_descr
-            
-            # Use assumed name if available, otherwise mahana name
-            ordained_name = entity.dbh_assumed_name or entity.dbh_mahananame
-            
-            results.append(ReprintSearchResultItem(
+            temple = temples.get(entity.dbh_livtemple) if entity.dbh_livtemple else None
+            results[entity.dbh_id] = ReprintSearchResultItem(
                 entity_type="direct_high_bhikku",
                 registration_number=entity.dbh_regn,
                 form_id=None,  # DirectBhikkuHigh doesn't have form_id field
-                ordained_name=ordained_name,
+                # Use assumed name if available, otherwise mahana name
+                ordained_name=entity.dbh_assumed_name or entity.dbh_mahananame,
                 birth_name=entity.dbh_gihiname,
                 date_of_birth=entity.dbh_dofb,
                 birth_place=entity.dbh_birthpls,
                 mobile=entity.dbh_mobile,
                 email=entity.dbh_email,
-                temple_name=temple_name,
-                temple_address=temple_address,
-                current_status=status_text,
+                temple_name=temple.vh_vname if temple else None,
+                temple_address=temple.vh_addrs if temple else None,
+                current_status=self._status_text(statuses, entity.dbh_currstat),
                 workflow_status=entity.dbh_workflow_status,
                 ordination_date=entity.dbh_higher_ordination_date,
                 request_date=entity.dbh_reqstdate
-            ))
+            )
         
-        return results, total
+        return results
     
-    def _search_vihara(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Vihara records"""
-        query = db.query(ViharaData).filter(
-            ViharaData.vh_is_deleted == False,
-            ViharaData.vh_workflow_status == 'COMPLETED'
-        )
-        
-        if registration_number:
-            query = query.filter(ViharaData.vh_trn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(ViharaData.vh_vname.ilike(f"%{name}%"))
-        # birth_date filter doesn't apply to vihara
-        
-        total = query.count()
-        entities = query.offset(skip).limit(limit).all()
+    def _vihara_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Vihara result items by vh_id"""
+        entities = db.query(ViharaData).options(noload('*')).filter(ViharaData.vh_id.in_(ids)).all()
         
-        results = []
-        for entity in entities:
-            results.append(ReprintSearchResultItem(
+        return {
+            entity.vh_id: ReprintSearchResultItem(
                 entity_type="vihara",
                 registration_number=entity.vh_trn,
                 form_id=entity.vh_form_id,
@@ -432,37 +255,16 @@ class ReprintSearchService:
                 workflow_status=entity.vh_workflow_status,
                 ordination_date=entity.vh_bgndate,  # Begin date
                 request_date=None
-            ))
-        
-        return results, total
+            )
+            for entity in entities
+        }
     
-    def _search_arama(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Arama records"""
-        query = db.query(AramaData).filter(
-            AramaData.ar_is_deleted == False,
-            AramaData.ar_workflow_status == 'COMPLETED'
-        )
+    def _arama_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Arama result items by ar_id"""
+        entities = db.query(AramaData).options(noload('*')).filter(AramaData.ar_id.in_(ids)).all()
         
-        if registration_number:
-            query = query.filter(AramaData.ar_trn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(AramaData.ar_vname.ilike(f"%{name}%"))
-        # birth_date filter doesn't apply to arama
-        
-        total = query.count()
-        entities = query.offset(skip).limit(limit).all()
-        
-        results = []
-        for entity in entities:
-            results.append(ReprintSearchResultItem(
+        return {
+            entity.ar_id: ReprintSearchResultItem(
                 entity_type="arama",
                 registration_number=entity.ar_trn,
                 form_id=entity.ar_form_id,
@@ -478,37 +280,15 @@ class ReprintSearchService:
                 workflow_status=entity.ar_workflow_status,
                 ordination_date=entity.ar_bgndate,  # Begin date
                 request_date=None
-            ))
-        
-        return results, total
+            )
+            for entity in entities
+        }
     
-    def _search_devala(
-        self,
-        db: Session,
-        registration_number: Optional[str],
-        name: Optional[str],
-        birth_date: Optional[date],
-        skip: int,
-        limit: int
-    ) -> Tuple[List[ReprintSearchResultItem], int]:
-        """Search Devala records"""
-        from sqlalchemy import func as sqlfunc
-        
-        # Build count query separately to avoid column issues
-        count_query = db.query(sqlfunc.count(DevalaData.dv_id)).filter(
-            DevalaData.dv_is_deleted == False,
-            DevalaData.dv_workflow_status == 'COMPLETED'
-        )
-        
-        if registration_number:
-            count_query = count_query.filter(DevalaData.dv_trn.ilike(f"%{registration_number}%"))
-        if name:
-            count_query = count_query.filter(DevalaData.dv_vname.ilike(f"%{name}%"))
-        
-        total = count_query.scalar()
-        
-        # Query with specific columns only
-        query = db.query(
+    def _devala_items(self, db: Session, ids: List[int]) -> Dict[int, ReprintSearchResultItem]:
+        """Devala result items by dv_id"""
+        # Query with specific columns only to avoid column issues
+        rows = db.query(
+            DevalaData.dv_id,
             DevalaData.dv_trn,
             DevalaData.dv_vname,
             DevalaData.dv_addrs,
@@ -516,40 +296,33 @@ class ReprintSearchService:
             DevalaData.dv_email,
             DevalaData.dv_form_id,
             DevalaData.dv_workflow_status
-        ).filter(
-            DevalaData.dv_is_deleted == False,
-            DevalaData.dv_workflow_status == 'COMPLETED'
-        )
-        
-        if registration_number:
-            query = query.filter(DevalaData.dv_trn.ilike(f"%{registration_number}%"))
-        if name:
-            query = query.filter(DevalaData.dv_vname.ilike(f"%{name}%"))
+        ).filter(DevalaData.dv_id.in_(ids)).all()
         
-        entities = query.offset(skip).limit(limit).all()
-        
-        results = []
-        for row in entities:
-            # row is a tuple: (dv_trn, dv_vname, dv_addrs, dv_mobile, dv_email, dv_form_id, dv_workflow_status)
-            results.append(ReprintSearchResultItem(
+        return {
+            row.dv_id: ReprintSearchResultItem(
                 entity_type="devala",
-                registration_number=row[0],  # dv_trn
-                form_id=row[5],  # dv_form_id
-                ordained_name=row[1],  # dv_vname
+                registration_number=row.dv_trn,
+                form_id=row.dv_form_id,
+                ordained_name=row.dv_vname,
                 birth_name=None,
                 date_of_birth=None,
                 birth_place=None,
-                mobile=row[3],  # dv_mobile
-                email=row[4],  # dv_email
-                temple_name=row[1],  # dv_vname
-                temple_address=row[2],  # dv_addrs
+                mobile=row.dv_mobile,
+                email=row.dv_email,
+                temple_name=row.dv_vname,
+                temple_address=row.dv_addrs,
                 current_status=None,
-                workflow_status=row[6],  # dv_workflow_status
+                workflow_status=row.dv_workflow_status,
                 ordination_date=None,
                 request_date=None
-            ))
-        
-        return results, total
+            )
+            for row in rows
+        }
+    
+    def resolve_entity_type(self, db: Session, registration_number: str) -> Optional[str]:
+        """Entity type of a registration number from the registration index, None if unknown."""
+        entry = registration_index.lookup(db, registration_number)
+        return entry.ri_entity_type if entry else None
     
     def get_entity_detail(
         self,
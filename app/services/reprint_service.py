@@ -15,6 +15,7 @@ from app.schemas.reprint import (
     ReprintSubject,
     ReprintType,
 )
+from app.services.list_count import CountResult, list_counter
 
 
 class ReprintService:
@@ -164,7 +165,8 @@ class ReprintService:
         page: Optional[int] = None,
         limit: Optional[int] = None,
         search_key: Optional[str] = None,
-    ) -> tuple[List[ReprintRequest], int]:
+        current_user=None,
+    ) -> tuple[List[ReprintRequest], CountResult]:
         query = db.query(ReprintRequest)
         if flow_status:
             query = query.filter(ReprintRequest.flow_status == flow_status.value)
@@ -210,7 +212,13 @@ class ReprintService:
                 )
             )
 
-        total_records = query.count()
+        total_records = list_counter.count(
+            db,
+            "reprint",
+            query,
+            filters=dict(flow_status=flow_status, request_type=request_type, regn=regn, search_key=search_key),
+            user_scope=current_user.ua_user_id if current_user else None,
+        )
         page_num = page or 1
         page_size = limit or 50
         offset = max((page_num - 1) * page_size, 0)
@@ -603,3 +611,4 @@ class ReprintService:
 
 
 reprint_service = ReprintService()
+list_counter.track("reprint", ReprintRequest)
@@ -12,6 +12,7 @@ from app.schemas.sasanarakshaka import (
     DivisionalSecretariatResponse,
     BhikkuNayakahimiResponse,
 )
+from app.services.reference_cache import reference_cache
 
 
 class SasanarakshakaBalaMandalayaService:
@@ -24,7 +25,7 @@ class SasanarakshakaBalaMandalayaService:
         - sr_sbmnayakahimi -> bhikku_regist.br_regn
         """
         # Validate divisional secretariat code
-        if sr_dvcd:
+        if sr_dvcd and not reference_cache.has(db, "cmm_dvsec", "dv_dvcode", sr_dvcd, include_deleted=False):
             from sqlalchemy import text
             result = db.execute(
                 text("SELECT 1 FROM cmm_dvsec WHERE dv_dvcode = :code AND dv_is_deleted = false LIMIT 1"),
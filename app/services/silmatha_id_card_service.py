@@ -12,7 +12,9 @@ from app.schemas.silmatha_id_card import (
     SilmathaIDCardResponse
 )
 from app.utils.file_storage import file_storage_service
+from app.utils.image_derivatives import image_derivatives
 from app.models.silmatha_id_card import SilmathaIDCard
+from app.utils.pagination import KeysetPage
 
 
 class SilmathaIDCardService:
@@ -25,6 +27,7 @@ class SilmathaIDCardService:
         self.repository = silmatha_id_card_repository
         self.silmatha_repository = silmatha_regist_repo
         self.file_storage = file_storage_service
+        self.image_derivatives = image_derivatives
 
     def create_silmatha_id_card(
         self,
@@ -135,8 +138,10 @@ class SilmathaIDCardService:
         skip: int = 0,
         limit: int = 100,
         workflow_status: Optional[str] = None,
-        search_key: Optional[str] = None
-    ) -> tuple[List[SilmathaIDCard], int]:
+        search_key: Optional[str] = None,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[SilmathaIDCard] | KeysetPage, int]:
         """
         Get all Silmatha ID Cards with filtering and pagination.
         
@@ -146,11 +151,13 @@ class SilmathaIDCardService:
             limit: Max records to return
             workflow_status: Filter by status
             search_key: Search text
+            keyset: Return a KeysetPage fetched after/before `cursor` instead of an offset page
+            cursor: next_cursor / prev_cursor of a previous keyset page
             
         Returns:
             Tuple of (list of records, total count)
         """
-        return self.repository.get_all(db, skip, limit, workflow_status, search_key)
+        return self.repository.get_all(db, skip, limit, workflow_status, search_key, keyset=keyset, cursor=cursor)
 
     def update_silmatha_id_card(
         self,
@@ -245,6 +252,8 @@ class SilmathaIDCardService:
                 detail=f"File upload failed: {str(e)}"
             )
         
+        self.image_derivatives.schedule(relative_path)
+        
         # 3. Update database
         updated_card = self.repository.update_thumbprint_url(db, sic_id, relative_path)
         if not updated_card:
@@ -292,6 +301,8 @@ class SilmathaIDCardService:
                 detail=f"File upload failed: {str(e)}"
             )
         
+        self.image_derivatives.schedule(relative_path)
+        
         # 3. Update database
         updated_card = self.repository.update_photo_url(db, sic_id, relative_path)
         if not updated_card:
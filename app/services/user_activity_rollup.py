@@ -0,0 +1,427 @@
+# app/services/user_activity_rollup.py
+"""
+Incremental daily rollups of audit_log and login_history.
+
+refresh_rollups() folds every source row above the stored high-water mark
+(al_id / lh_id) into user_activity_daily and user_login_daily with an
+additive upsert, so each run only reads rows written since the last one.
+Rows are bucketed by the day of their own timestamp, which keeps late rows
+(e.g. replayed from the audit spill file) in the right day.
+
+Each source also records `complete_until`: every row timestamped before it
+is already in the rollup. Reports read the rollup for whole days before
+that point and the raw tables only for the remainder (normally just today).
+
+- audit_log rows are folded up to ACTIVITY_ROLLUP_LAG_MINUTES ago. A
+  transaction still in flight can commit a row below the high-water mark
+  later; ids missing within ACTIVITY_ROLLUP_REFOLD_IDS of the mark are kept
+  as pending and folded in whenever they appear.
+- login_history rows are folded only once the session is settled (logged
+  out, or older than ACTIVITY_ROLLUP_LOGIN_SETTLE_HOURS), because working
+  time is only known after logout.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, and_, case, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+from app.models.user import LoginHistory
+from app.models.user_activity_rollup import ActivityRollupState, UserActivityDaily, UserLoginDaily
+
+AUDIT_SOURCE = "audit_log"
+LOGIN_SOURCE = "login_history"
+
+# Request-level rows are not record activity
+_EXCLUDED_AUDIT_TABLES = ("__api_call__",)
+
+
+@dataclass
+class LoginTotals:
+    total_sessions: int = 0
+    total_seconds: float = 0.0
+    first_login: Optional[datetime] = None
+    last_login: Optional[datetime] = None
+
+
+def _insert(db: Session, table):
+    """Dialect insert supporting ON CONFLICT (PostgreSQL in production, SQLite in benchmarks)."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+
+def _least(db: Session, *args):
+    # SQLite spells LEAST / GREATEST as multi-argument MIN / MAX
+    return (func.least if db.get_bind().dialect.name == "postgresql" else func.min)(*args)
+
+
+def _greatest(db: Session, *args):
+    return (func.greatest if db.get_bind().dialect.name == "postgresql" else func.max)(*args)
+
+
+def _day(column):
+    return func.date(column, type_=Date)
+
+
+def _working_seconds():
+    return case(
+        (
+            and_(LoginHistory.lh_logout_time.isnot(None), LoginHistory.lh_login_time.isnot(None)),
+            func.extract("epoch", LoginHistory.lh_logout_time)
+            - func.extract("epoch", LoginHistory.lh_login_time),
+        ),
+        else_=literal(0),
+    )
+
+
+# ---------------------------------------------------------------------------
+# High-water mark state
+# ---------------------------------------------------------------------------
+def get_state(db: Session, source: str) -> Tuple[int, Optional[datetime]]:
+    row = db.execute(
+        select(ActivityRollupState.ars_last_id, ActivityRollupState.ars_complete_until).where(
+            ActivityRollupState.ars_source == source
+        )
+    ).first()
+    if row is None:
+        return 0, None
+    return row[0] or 0, row[1]
+
+
+def _pending_ids(db: Session, source: str) -> List[int]:
+    pending = db.execute(
+        select(ActivityRollupState.ars_pending_ids).where(ActivityRollupState.ars_source == source)
+    ).scalar()
+    return list(pending or [])
+
+
+def _save_state(
+    db: Session,
+    source: str,
+    last_id: int,
+    complete_until: Optional[datetime],
+    pending_ids: Optional[List[int]] = None,
+) -> None:
+    values = {
+        "ars_last_id": last_id,
+        "ars_complete_until": complete_until,
+        "ars_pending_ids": pending_ids or None,
+        "ars_updated_at": func.now(),
+    }
+    stmt = _insert(db, ActivityRollupState.__table__).values(ars_source=source, **values)
+    db.execute(stmt.on_conflict_do_update(index_elements=["ars_source"], set_=values))
+
+
+# ---------------------------------------------------------------------------
+# Incremental refresh
+# ---------------------------------------------------------------------------
+def _fold_audit_rows(db: Session, *conditions) -> int:
+    """Add the audit_log rows matching `conditions` to user_activity_daily."""
+    day = _day(AuditLog.al_timestamp)
+    source = (
+        select(
+            AuditLog.al_user_id,
+            day,
+            AuditLog.al_table_name,
+            AuditLog.al_operation,
+            func.count(),
+        )
+        .where(
+            *conditions,
+            AuditLog.al_user_id.isnot(None),
+            AuditLog.al_table_name.notin_(_EXCLUDED_AUDIT_TABLES),
+        )
+        .group_by(AuditLog.al_user_id, day, AuditLog.al_table_name, AuditLog.al_operation)
+    )
+    stmt = _insert(db, UserActivityDaily.__table__).from_select(
+        ["uad_user_id", "uad_day", "uad_table_name", "uad_operation", "uad_count"], source
+    )
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["uad_user_id", "uad_day", "uad_table_name", "uad_operation"],
+            set_={"uad_count": UserActivityDaily.uad_count + stmt.excluded.uad_count},
+        )
+    )
+    return max(result.rowcount or 0, 0)
+
+
+def _missing_ids(db: Session, start: int, end: int) -> List[int]:
+    """Ids in (start, end] with no visible audit_log row."""
+    if end <= start:
+        return []
+    present = set(
+        db.execute(select(AuditLog.al_id).where(AuditLog.al_id > start, AuditLog.al_id <= end)).scalars()
+    )
+    if len(present) == end - start:
+        return []
+    return [al_id for al_id in range(start + 1, end + 1) if al_id not in present]
+
+
+def refresh_audit_rollup(db: Session, *, now: Optional[datetime] = None) -> int:
+    """Fold new audit_log rows into user_activity_daily. Returns the number of groups upserted."""
+    last_id, complete_until = get_state(db, AUDIT_SOURCE)
+    pending = _pending_ids(db, AUDIT_SOURCE)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(minutes=settings.ACTIVITY_ROLLUP_LAG_MINUTES)
+    folded = 0
+
+    # Rows committed since the last run below the high-water mark
+    if pending:
+        arrived = set(db.execute(select(AuditLog.al_id).where(AuditLog.al_id.in_(pending))).scalars())
+        if arrived:
+            folded += _fold_audit_rows(db, AuditLog.al_id.in_(arrived))
+            pending = [al_id for al_id in pending if al_id not in arrived]
+            _save_state(db, AUDIT_SOURCE, last_id, complete_until, pending)
+            db.commit()
+
+    # The newest row timestamped before the cutoff. Transactions still in
+    # flight may hold lower ids and commit later; ids missing within
+    # ACTIVITY_ROLLUP_REFOLD_IDS below it stay pending for the next runs.
+    upper = db.execute(
+        select(func.max(AuditLog.al_id)).where(AuditLog.al_id > last_id, AuditLog.al_timestamp < cutoff)
+    ).scalar()
+
+    batch = max(settings.ACTIVITY_ROLLUP_BATCH_IDS, 1)
+    start = last_id
+    if upper is not None:
+        window_start = upper - max(settings.ACTIVITY_ROLLUP_REFOLD_IDS, 0)
+        pending = [al_id for al_id in pending if al_id > window_start]
+    while upper is not None and start < upper:
+        end = min(start + batch, upper)
+        folded += _fold_audit_rows(db, AuditLog.al_id > start, AuditLog.al_id <= end)
+        pending += _missing_ids(db, max(start, window_start), end)
+        _save_state(db, AUDIT_SOURCE, end, cutoff if end == upper else complete_until, pending)
+        db.commit()
+        start = end
+
+    if upper is None:
+        _save_state(db, AUDIT_SOURCE, last_id, cutoff, pending)
+        db.commit()
+    return folded
+
+
+def refresh_login_rollup(db: Session, *, now: Optional[datetime] = None) -> int:
+    """Fold settled login_history rows into user_login_daily. Returns the number of groups upserted."""
+    last_id, _ = get_state(db, LOGIN_SOURCE)
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(minutes=settings.ACTIVITY_ROLLUP_LAG_MINUTES)
+    settle_before = now - timedelta(hours=settings.ACTIVITY_ROLLUP_LOGIN_SETTLE_HOURS)
+
+    # The oldest still-open session stops the high-water mark until it settles
+    first_open = db.execute(
+        select(LoginHistory.lh_id, LoginHistory.lh_login_time)
+        .where(
+            LoginHistory.lh_id > last_id,
+            LoginHistory.lh_success.is_(True),
+            LoginHistory.lh_logout_time.is_(None),
+            LoginHistory.lh_login_time >= settle_before,
+        )
+        .order_by(LoginHistory.lh_id)
+        .limit(1)
+    ).first()
+
+    upper_q = select(func.max(LoginHistory.lh_id)).where(
+        LoginHistory.lh_id > last_id, LoginHistory.lh_login_time < cutoff
+    )
+    complete_until = cutoff
+    if first_open is not None:
+        upper_q = upper_q.where(LoginHistory.lh_id < first_open[0])
+        complete_until = min(cutoff, first_open[1])
+    upper = db.execute(upper_q).scalar()
+
+    if upper is None:
+        _save_state(db, LOGIN_SOURCE, last_id, complete_until)
+        db.commit()
+        return 0
+
+    day = _day(LoginHistory.lh_login_time)
+    source = (
+        select(
+            LoginHistory.lh_user_id,
+            day,
+            func.count(),
+            func.sum(_working_seconds()),
+            func.min(LoginHistory.lh_login_time),
+            func.max(LoginHistory.lh_login_time),
+        )
+        .where(
+            LoginHistory.lh_id > last_id,
+            LoginHistory.lh_id <= upper,
+            LoginHistory.lh_success.is_(True),
+        )
+        .group_by(LoginHistory.lh_user_id, day)
+    )
+    stmt = _insert(db, UserLoginDaily.__table__).from_select(
+        [
+            "uld_user_id",
+            "uld_day",
+            "uld_sessions",
+            "uld_working_seconds",
+            "uld_first_login",
+            "uld_last_login",
+        ],
+        source,
+    )
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["uld_user_id", "uld_day"],
+            set_={
+                "uld_sessions": UserLoginDaily.uld_sessions + stmt.excluded.uld_sessions,
+                "uld_working_seconds": UserLoginDaily.uld_working_seconds + stmt.excluded.uld_working_seconds,
+                "uld_first_login": _least(db, UserLoginDaily.uld_first_login, stmt.excluded.uld_first_login),
+                "uld_last_login": _greatest(db, UserLoginDaily.uld_last_login, stmt.excluded.uld_last_login),
+            },
+        )
+    )
+    _save_state(db, LOGIN_SOURCE, upper, complete_until)
+    db.commit()
+    return max(result.rowcount or 0, 0)
+
+
+def refresh_rollups(db: Session, *, now: Optional[datetime] = None) -> Dict[str, int]:
+    return {
+        AUDIT_SOURCE: refresh_audit_rollup(db, now=now),
+        LOGIN_SOURCE: refresh_login_rollup(db, now=now),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Report reads: rollup for whole days, raw rows for the rest
+# ---------------------------------------------------------------------------
+def _split_range(
+    complete_until: Optional[datetime],
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> Tuple[Optional[date], bool, Optional[datetime]]:
+    """
+    Returns (last rollup day, raw rows needed, first raw timestamp).
+    The rollup covers [date_from, last rollup day] (None: not used); raw rows
+    cover [first raw timestamp, date_to], where None means unbounded.
+    """
+    if complete_until is None:
+        return None, True, datetime.combine(date_from, time.min) if date_from else None
+
+    rollup_end: Optional[date] = complete_until.date() - timedelta(days=1)
+    if date_to is not None and date_to < rollup_end:
+        rollup_end = date_to
+    if date_from is not None and rollup_end < date_from:
+        rollup_end = None
+
+    raw_day = complete_until.date()
+    if date_from is not None and date_from > raw_day:
+        raw_day = date_from
+    if date_to is not None and raw_day > date_to:
+        return rollup_end, False, None
+    return rollup_end, True, datetime.combine(raw_day, time.min)
+
+
+def get_record_counts(
+    db: Session,
+    user_ids: Sequence[str],
+    tables: Iterable[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> List[Tuple[str, str, str, int]]:
+    """(user_id, table, operation, count) over the inclusive date range."""
+    tables = tuple(tables)
+    _, complete_until = get_state(db, AUDIT_SOURCE)
+    rollup_end, raw_needed, raw_from = _split_range(complete_until, date_from, date_to)
+    totals: Dict[Tuple[str, str, str], int] = {}
+
+    if rollup_end is not None:
+        q = select(
+            UserActivityDaily.uad_user_id,
+            UserActivityDaily.uad_table_name,
+            UserActivityDaily.uad_operation,
+            func.sum(UserActivityDaily.uad_count),
+        ).where(
+            UserActivityDaily.uad_user_id.in_(user_ids),
+            UserActivityDaily.uad_table_name.in_(tables),
+            UserActivityDaily.uad_day <= rollup_end,
+        )
+        if date_from:
+            q = q.where(UserActivityDaily.uad_day >= date_from)
+        q = q.group_by(
+            UserActivityDaily.uad_user_id, UserActivityDaily.uad_table_name, UserActivityDaily.uad_operation
+        )
+        for uid, table, op, cnt in db.execute(q):
+            totals[(uid, table, op)] = totals.get((uid, table, op), 0) + int(cnt or 0)
+
+    if raw_needed:
+        q = select(
+            AuditLog.al_user_id, AuditLog.al_table_name, AuditLog.al_operation, func.count()
+        ).where(
+            AuditLog.al_user_id.in_(user_ids),
+            AuditLog.al_table_name.in_(tables),
+        )
+        if raw_from:
+            q = q.where(AuditLog.al_timestamp >= raw_from)
+        if date_to:
+            q = q.where(AuditLog.al_timestamp <= datetime.combine(date_to, time.max))
+        q = q.group_by(AuditLog.al_user_id, AuditLog.al_table_name, AuditLog.al_operation)
+        for uid, table, op, cnt in db.execute(q):
+            totals[(uid, table, op)] = totals.get((uid, table, op), 0) + int(cnt or 0)
+
+    return [(uid, table, op, cnt) for (uid, table, op), cnt in totals.items()]
+
+
+def get_login_totals(
+    db: Session,
+    user_ids: Sequence[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict[str, LoginTotals]:
+    """Successful sessions, working seconds and first/last login per user over the date range."""
+    _, complete_until = get_state(db, LOGIN_SOURCE)
+    rollup_end, raw_needed, raw_from = _split_range(complete_until, date_from, date_to)
+    totals: Dict[str, LoginTotals] = {}
+
+    def _merge(uid, sessions, seconds, first_login, last_login) -> None:
+        entry = totals.setdefault(uid, LoginTotals())
+        entry.total_sessions += int(sessions or 0)
+        entry.total_seconds += float(seconds or 0)
+        if first_login is not None and (entry.first_login is None or first_login < entry.first_login):
+            entry.first_login = first_login
+        if last_login is not None and (entry.last_login is None or last_login > entry.last_login):
+            entry.last_login = last_login
+
+    if rollup_end is not None:
+        q = select(
+            UserLoginDaily.uld_user_id,
+            func.sum(UserLoginDaily.uld_sessions),
+            func.sum(UserLoginDaily.uld_working_seconds),
+            func.min(UserLoginDaily.uld_first_login),
+            func.max(UserLoginDaily.uld_last_login),
+        ).where(
+            UserLoginDaily.uld_user_id.in_(user_ids),
+            UserLoginDaily.uld_day <= rollup_end,
+        )
+        if date_from:
+            q = q.where(UserLoginDaily.uld_day >= date_from)
+        for row in db.execute(q.group_by(UserLoginDaily.uld_user_id)):
+            _merge(*row)
+
+    if raw_needed:
+        q = select(
+            LoginHistory.lh_user_id,
+            func.count(),
+            func.sum(_working_seconds()),
+            func.min(LoginHistory.lh_login_time),
+            func.max(LoginHistory.lh_login_time),
+        ).where(
+            LoginHistory.lh_user_id.in_(user_ids),
+            LoginHistory.lh_success.is_(True),
+        )
+        if raw_from:
+            q = q.where(LoginHistory.lh_login_time >= raw_from)
+        if date_to:
+            q = q.where(LoginHistory.lh_login_time <= datetime.combine(date_to, time.max))
+        for row in db.execute(q.group_by(LoginHistory.lh_user_id)):
+            _merge(*row)
+
+    return totals
@@ -8,6 +8,9 @@ from sqlalchemy.orm import Session
 from app.models.vihara import ViharaData
 from app.repositories.vihara_repo import vihara_repo
 from app.schemas.vihara import ViharaCreate, ViharaCreatePayload, ViharaUpdate
+from app.services.list_count import CountResult, list_counter
+from app.services.reference_cache import reference_cache
+from app.utils.pagination import KeysetPage
 
 
 class ViharaService:
@@ -855,7 +858,9 @@ class ViharaService:
         sort_dir: Optional[str] = "asc",
         record_type: Optional[str] = "all",
         current_user = None,
-    ) -> list[ViharaData]:
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+    ) -> list[ViharaData] | KeysetPage:
         limit = max(1, min(limit, 200))
         skip = max(0, skip)
         return vihara_repo.list(
@@ -882,6 +887,8 @@ class ViharaService:
             sort_dir=sort_dir,
             record_type=record_type,
             current_user=current_user,
+            keyset=keyset,
+            cursor=cursor,
         )
 
     def count_viharas(
@@ -906,9 +913,8 @@ class ViharaService:
         date_to: Optional[Any] = None,
         record_type: Optional[str] = "all",
         current_user = None,
-    ) -> int:
-        return vihara_repo.count(
-            db,
+    ) -> CountResult:
+        filters = dict(
             search=search,
             vh_trn=vh_trn,
             province=province,
@@ -926,7 +932,13 @@ class ViharaService:
             date_from=date_from,
             date_to=date_to,
             record_type=record_type,
-            current_user=current_user,
+        )
+        return list_counter.count(
+            db,
+            "vihara",
+            vihara_repo.count_query(db, current_user=current_user, **filters),
+            filters=filters,
+            user_scope=current_user.ua_user_id if current_user else None,
         )
 
     def get_vihara(self, db: Session, vh_id: int) -> Optional[ViharaData]:
@@ -1290,6 +1302,8 @@ class ViharaService:
         column_name: str,
         value: Any,
     ) -> bool:
+        if reference_cache.has(db, table_name, column_name, value):
+            return True
         metadata = MetaData()
         table = Table(table_name, metadata, schema=schema, autoload_with=db.get_bind())
         column = table.c.get(column_name)
@@ -1415,3 +1429,4 @@ class ViharaService:
 
 
 vihara_service = ViharaService()
+list_counter.track("vihara", ViharaData)
@@ -0,0 +1,196 @@
+"""
+Partition maintenance for the monthly-partitioned audit_log table.
+
+- ensure_partitions: creates the partitions for the current month and the
+  next AUDIT_LOG_PARTITION_MONTHS_AHEAD months. Rows that already landed in
+  audit_log_default for such a month are moved into the new partition.
+- apply_retention: detaches partitions whose whole month is older than
+  AUDIT_LOG_RETENTION_MONTHS, then moves them into the archive schema
+  (AUDIT_LOG_ARCHIVE_SCHEMA) or drops them when no archive schema is set.
+
+Partitioned indexes on audit_log are inherited by every new partition.
+
+Schedule it daily (e.g. a Railway cron job):
+    python -m app.utils.audit_log_maintenance
+    python -m app.utils.audit_log_maintenance --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+PARENT_TABLE = "audit_log"
+DEFAULT_PARTITION = "audit_log_default"
+_PARTITION_NAME = re.compile(r"^audit_log_y(\d{4})m(\d{2})$")
+
+
+@dataclass
+class AuditPartition:
+    name: str
+    month_start: date
+
+    @property
+    def month_end(self) -> date:
+        return _add_months(self.month_start, 1)
+
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"audit_log_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def list_partitions(db: Session) -> List[AuditPartition]:
+    """Monthly partitions currently attached to audit_log, oldest first."""
+    rows = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+
+    partitions = []
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append(AuditPartition(name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p.month_start)
+
+
+def ensure_partitions(
+    db: Session,
+    *,
+    months_ahead: int,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """Create missing partitions from the current month to `months_ahead` months out."""
+    current_month = (today or date.today()).replace(day=1)
+    existing = {p.name for p in list_partitions(db)}
+    created: List[str] = []
+
+    for offset in range(months_ahead + 1):
+        month_start = _add_months(current_month, offset)
+        name = partition_name(month_start)
+        if name in existing:
+            continue
+        created.append(name)
+        if dry_run:
+            continue
+        _create_partition(db, name, month_start, _add_months(month_start, 1))
+
+    if not dry_run:
+        db.commit()
+    return created
+
+
+def _create_partition(db: Session, name: str, month_start: date, month_end: date) -> None:
+    bounds = {"start": month_start, "end": month_end}
+    # Build the partition as a standalone table first so rows that fell into the
+    # DEFAULT partition for this month can be moved before it is attached.
+    db.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE al_timestamp >= :start AND al_timestamp < :end
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """
+        ),
+        bounds,
+    )
+    db.execute(
+        text(
+            f"""ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{name}" """
+            f"""FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"""
+        )
+    )
+
+
+def apply_retention(
+    db: Session,
+    *,
+    retain_months: int,
+    archive_schema: Optional[str],
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Detach partitions that ended before the retention window.
+    Detached partitions are archived into `archive_schema`, or dropped if it is empty.
+    """
+    if retain_months <= 0:
+        return []
+    cutoff = _add_months((today or date.today()).replace(day=1), -retain_months)
+    expired = [p for p in list_partitions(db) if p.month_end <= cutoff]
+    if dry_run or not expired:
+        return [p.name for p in expired]
+
+    if archive_schema:
+        db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+    for partition in expired:
+        db.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{partition.name}"'))
+        if archive_schema:
+            db.execute(text(f'ALTER TABLE "{partition.name}" SET SCHEMA "{archive_schema}"'))
+        else:
+            db.execute(text(f'DROP TABLE "{partition.name}"'))
+    db.commit()
+    return [p.name for p in expired]
+
+
+def run_rollover(db: Session, *, dry_run: bool = False) -> dict:
+    """Create upcoming partitions, then apply retention to the oldest ones."""
+    created = ensure_partitions(
+        db, months_ahead=settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD, dry_run=dry_run
+    )
+    retired = apply_retention(
+        db,
+        retain_months=settings.AUDIT_LOG_RETENTION_MONTHS,
+        archive_schema=settings.AUDIT_LOG_ARCHIVE_SCHEMA or None,
+        dry_run=dry_run,
+    )
+    return {"created": created, "retired": retired}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="audit_log partition rollover and retention")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without applying them")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = run_rollover(db, dry_run=args.dry_run)
+        prefix = "[DRY RUN] " if args.dry_run else ""
+        action = "archive" if settings.AUDIT_LOG_ARCHIVE_SCHEMA else "drop"
+        print(f"{prefix}Created partitions: {', '.join(result['created']) or 'none'}")
+        print(f"{prefix}Retired partitions ({action}): {', '.join(result['retired']) or 'none'}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# app/utils/batch_loading.py
+"""
+Page-level loading of lookup relationships.
+
+List endpoints render a page of rows with several simple many-to-one
+relationships each (`foreign(Model.code) == Target.code`, lazy="select").
+Touching them row by row costs one query per relationship per row.
+prime_many_to_one() resolves them for the whole page with one IN query per
+target column and stores the results on the instances, so reading
+`row.province_rel` afterwards hits no database. The loaded rows are the
+same ones the lazy loader would have returned. Reference tables are served
+from the process-wide reference cache; only codes it does not know are
+queried.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.services.reference_cache import reference_cache
+
+# (target model class, attribute name) -> {attribute value: target instance}
+LookupKey = Tuple[type, str]
+Lookups = Dict[LookupKey, Dict[Any, Any]]
+
+IN_CHUNK_SIZE = 1000
+
+
+def load_by_keys(db: Session, model: type, attr: str, values: Iterable[Any]) -> Dict[Any, Any]:
+    """{value: instance} for rows of `model` whose `attr` is in `values` (first row wins)."""
+    column = getattr(model, attr)
+    pending = sorted({v for v in values if v is not None}, key=str)
+    found: Dict[Any, Any] = reference_cache.lookup(db, model, attr, pending)
+    pending = [v for v in pending if v not in found]
+    for start in range(0, len(pending), IN_CHUNK_SIZE):
+        chunk = pending[start:start + IN_CHUNK_SIZE]
+        for row in db.query(model).filter(column.in_(chunk)).all():
+            found.setdefault(getattr(row, attr), row)
+    return found
+
+
+def prime_many_to_one(
+    db: Session,
+    instances: Sequence[Any],
+    relationships: Sequence[str],
+    extra_keys: Optional[Mapping[LookupKey, Iterable[Any]]] = None,
+) -> Lookups:
+    """
+    Load `relationships` (simple many-to-one, one column pair each) for all
+    `instances` with one query per target column and set them as loaded.
+    `extra_keys` adds values to fetch from a target column in the same query.
+    Returns the lookups per (target model, attribute).
+    """
+    if not instances:
+        return {}
+    mapper = inspect(type(instances[0]))
+
+    plan = []
+    wanted: Dict[LookupKey, set] = defaultdict(set)
+    for name in relationships:
+        relationship = mapper.relationships[name]
+        (local, remote), = relationship.local_remote_pairs
+        local_attr = mapper.get_property_by_column(local).key
+        target = relationship.mapper
+        key = (target.class_, target.get_property_by_column(remote).key)
+        plan.append((name, local_attr, key))
+        wanted[key].update(getattr(instance, local_attr) for instance in instances)
+    for key, values in (extra_keys or {}).items():
+        wanted[key].update(values)
+
+    lookups: Lookups = {
+        key: load_by_keys(db, key[0], key[1], values) for key, values in wanted.items()
+    }
+    for name, local_attr, key in plan:
+        found = lookups[key]
+        for instance in instances:
+            value = getattr(instance, local_attr)
+            set_committed_value(instance, name, found.get(value) if value is not None else None)
+    return lookups
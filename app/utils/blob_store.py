@@ -0,0 +1,169 @@
+# app/utils/blob_store.py
+"""
+Content-addressed blob layer under STORAGE_DIR.
+
+Every stored file's content is kept once, as a blob named after its SHA-256:
+
+    <STORAGE_DIR>/_blobs/<aa>/<bb>/<sha256>
+
+The /storage/... paths saved in the database stay what they were: each one
+is a hard link to its blob. Re-uploading a scan or photo that is already
+stored only adds a directory entry, serving, renaming and deleting a path
+work exactly as for a plain file, and existing paths need no rewrite.
+
+- refcount: the blob's link count minus its own entry (st_nlink - 1), so
+  it is kept by the filesystem and cannot drift from the references.
+- Deleting a reference is unlinking the path. A blob whose link count is
+  back to 1 is unreferenced; prune() removes those not linked or unlinked
+  for a grace period (the inode's ctime), so an upload linking to a blob
+  at the same moment is not raced.
+- Blobs are never written after they are published; a reference must be
+  replaced (rename a new file over it), never rewritten in place.
+- On filesystems without hard links (or when a blob has reached the link
+  limit) the upload is stored as a plain file, as before.
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import logging
+import os
+import time
+import uuid
+from contextlib import suppress
+from pathlib import Path
+from typing import Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory under STORAGE_DIR holding the blobs
+BLOB_DIRECTORY = "_blobs"
+
+# Errors of os.link() that mean "no hard link here", not "something is wrong"
+_NO_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+def _default_file_mode() -> int:
+    # The umask can only be read by setting it
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Mode of a file created with open(); tempfile.mkstemp() creates them 0600
+FILE_MODE = _default_file_mode()
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read `chunk_size` bytes at a time."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        while chunk := source.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """SHA-256 keyed blobs, referenced by hard links."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def refcount(self, digest: str) -> int:
+        """Number of paths referencing a blob; 0 if it is not stored."""
+        try:
+            return self.path(digest).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def store(self, temp_path: Path, digest: str, dest: Path) -> bool:
+        """
+        Move a complete temporary file (same filesystem) to `dest` as a
+        reference to the blob of `digest`. If the blob already exists the
+        temporary file is dropped and `dest` links to it. Returns whether
+        the content was already stored.
+        """
+        blob = self.path(digest)
+        # Published files must be readable like any other upload (e.g. by a static file server)
+        os.chmod(temp_path, FILE_MODE)
+        try:
+            if self._link_existing(blob, dest):
+                os.unlink(temp_path)
+                return True
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                # link, not rename: never replace a blob another upload has just published
+                os.link(temp_path, blob)
+            except FileExistsError:
+                if self._link_existing(blob, dest):
+                    os.unlink(temp_path)
+                    return True
+        except OSError as e:
+            if e.errno not in _NO_LINK_ERRNOS:
+                raise
+            logger.warning("Storing %s without deduplication: %s", dest, e)
+        os.replace(temp_path, dest)
+        return False
+
+    def adopt(self, path: Path, digest: str) -> bool:
+        """
+        Make an existing plain file a reference: link it as the blob of
+        `digest`, or if that blob exists, atomically replace the file with a
+        link to it. Returns whether the file's bytes were a duplicate.
+        """
+        blob = self.path(digest)
+        if blob.exists():
+            if os.path.samefile(blob, path):
+                return False
+            temp = path.with_name(f".dedup_{uuid.uuid4().hex}.part")
+            os.link(blob, temp)
+            try:
+                os.replace(temp, path)
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.unlink(temp)
+                raise
+            return True
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            # Published by an upload since the check above
+            return self.adopt(path, digest)
+        return False
+
+    def blobs(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Every stored blob with its stat."""
+        if not self.root.is_dir():
+            return
+        for path in self.root.glob("*/*/*"):
+            with suppress(FileNotFoundError):
+                yield path, path.stat()
+
+    def unreferenced(self, grace_seconds: int = 0) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Blobs no path links to, unchanged for at least `grace_seconds`."""
+        cutoff = time.time() - grace_seconds
+        for path, st in self.blobs():
+            if st.st_nlink == 1 and st.st_ctime <= cutoff:
+                yield path, st
+
+    def prune(self, grace_seconds: int) -> Tuple[int, int]:
+        """Remove unreferenced blobs (see unreferenced()). Returns (blobs, bytes) removed."""
+        removed = freed = 0
+        for path, st in list(self.unreferenced(grace_seconds)):
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+                removed += 1
+                freed += st.st_size
+        return removed, freed
+
+    @staticmethod
+    def _link_existing(blob: Path, dest: Path) -> bool:
+        try:
+            os.link(blob, dest)
+        except FileNotFoundError:
+            return False
+        return True
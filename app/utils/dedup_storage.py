@@ -0,0 +1,80 @@
+"""
+Moves files stored before the blob store (app/utils/blob_store.py) into it:
+every plain file under STORAGE_DIR becomes a hard link to the blob of its
+content, so identical scans and photos are kept once. The /storage/... paths
+do not change, and the tool can be re-run at any time (linked files are
+skipped). Reports how many bytes the duplicates took.
+Usage: python -m app.utils.dedup_storage [--dry-run]
+"""
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Set
+
+from app.utils.blob_store import BLOB_DIRECTORY, BlobStore, sha256_file
+from app.utils.file_storage import FileStorageService, file_storage_service
+
+
+@dataclass
+class DedupReport:
+    files: int = 0
+    # Already a reference (link count > 1)
+    linked: int = 0
+    # Became the blob of their content
+    new_blobs: int = 0
+    # Replaced by a link to an existing blob
+    duplicates: int = 0
+    bytes_saved: int = 0
+
+
+def _stored_files(base: Path) -> Iterator[Path]:
+    for directory, subdirectories, filenames in os.walk(base):
+        if Path(directory) == base and BLOB_DIRECTORY in subdirectories:
+            subdirectories.remove(BLOB_DIRECTORY)
+        for name in filenames:
+            # Uploads and replacements still being written
+            if name.endswith(".part"):
+                continue
+            path = Path(directory) / name
+            if path.is_file() and not path.is_symlink():
+                yield path
+
+
+def dedup_storage(storage: FileStorageService, *, dry_run: bool = False) -> DedupReport:
+    blobs: BlobStore = storage.blobs
+    report = DedupReport()
+    # Contents seen in this run, so a dry run counts duplicates among new blobs too
+    seen: Set[str] = set()
+    for path in _stored_files(storage.base_storage_path):
+        report.files += 1
+        st = path.stat()
+        if st.st_nlink > 1:
+            report.linked += 1
+            continue
+        digest = sha256_file(path, FileStorageService.CHUNK_SIZE)
+        duplicate = digest in seen or blobs.path(digest).exists()
+        if not dry_run:
+            duplicate = blobs.adopt(path, digest)
+        seen.add(digest)
+        if duplicate:
+            report.duplicates += 1
+            report.bytes_saved += st.st_size
+        else:
+            report.new_blobs += 1
+    return report
+
+
+def main() -> None:
+    dry_run = "--dry-run" in sys.argv[1:]
+    report = dedup_storage(file_storage_service, dry_run=dry_run)
+    print(f"{'Would deduplicate' if dry_run else 'Deduplicated'} {file_storage_service.base_storage_path}")
+    print(f"  files scanned:      {report.files}")
+    print(f"  already linked:     {report.linked}")
+    print(f"  new blobs:          {report.new_blobs}")
+    print(f"  duplicates:         {report.duplicates}")
+    print(f"  bytes saved:        {report.bytes_saved} ({report.bytes_saved / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,43 @@
 # app/utils/file_storage.py
+import hashlib
 import os
+import tempfile
 import uuid
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.blob_store import BLOB_DIRECTORY, BlobStore
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    """A file written by FileStorageService.store_file()."""
+    relative_path: str  # "/storage/..." as stored in the database
+    absolute_path: str
+    size: int
+    sha256: str
+    # The same content was already stored; the path references the existing blob
+    deduplicated: bool = False
+
+
+def upload_size(file: UploadFile) -> int:
+    """
+    Size in bytes of an upload, without reading it into memory. The multipart
+    parser has already spooled the body, so this only looks at its length.
+    """
+    if file.size is not None:
+        return file.size
+    position = file.file.tell()
+    size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(position)
+    return size
 
 
 class FileStorageService:
@@ -19,8 +52,15 @@ class FileStorageService:
     - Use structured directory hierarchy for organization
     - Generate unique filenames to prevent conflicts
     - Return relative paths for database storage
+    - Stream uploads to disk in chunks, off the event loop, and rename
+      them into place only when complete
+    - Keep each distinct content once: stored paths are hard links to
+      SHA-256 named blobs under <base>/_blobs (see app/utils/blob_store.py)
     """
     
+    # Bytes copied per read while saving an upload
+    CHUNK_SIZE = 1024 * 1024
+    
     def __init__(self, base_storage_path: str = "app/storage"):
         """
         Initialize the file storage service.
@@ -29,6 +69,7 @@ class FileStorageService:
             base_storage_path: Base directory for file storage
         """
         self.base_storage_path = Path(base_storage_path)
+        self.blobs = BlobStore(self.base_storage_path / BLOB_DIRECTORY)
         
         # Ensure base directory exists
         self.base_storage_path.mkdir(parents=True, exist_ok=True)
@@ -95,7 +136,8 @@ class FileStorageService:
         file: UploadFile,
         br_regn: str,
         file_type: str = "general",
-        subdirectory: str = None
+        subdirectory: str = None,
+        max_size: int = MAX_FILE_SIZE,
     ) -> Tuple[str, str]:
         """
         Save an uploaded file to disk.
@@ -105,6 +147,7 @@ class FileStorageService:
             br_regn: Bhikku registration number
             file_type: Type of file (e.g., 'thumbprint', 'photo', 'scanned_document')
             subdirectory: Optional subdirectory (e.g., 'bhikku_update', 'bhikku_id_card')
+            max_size: Maximum size in bytes (default 10MB)
             
         Returns:
             Tuple of (relative_path, absolute_path)
@@ -112,71 +155,111 @@ class FileStorageService:
         Raises:
             HTTPException: If file validation fails or save fails
         """
+        stored = await self.store_file(file, br_regn, file_type, subdirectory, max_size=max_size)
+        return stored.relative_path, stored.absolute_path
+
+    async def store_file(
+        self,
+        file: UploadFile,
+        br_regn: str,
+        file_type: str = "general",
+        subdirectory: str = None,
+        max_size: int = MAX_FILE_SIZE,
+    ) -> StoredFile:
+        """
+        save_file() returning the size and SHA-256 of the stored file as well.
+
+        The upload is copied CHUNK_SIZE bytes at a time into a temporary file
+        next to its destination, in a worker thread so the event loop is not
+        blocked by disk I/O. The size limit is checked as the bytes arrive
+        and the checksum computed on the way; the temporary file is renamed
+        into place only once complete, so a failed or oversized upload never
+        leaves a partial file behind. If the same content is already stored,
+        the path is linked to its blob and the copy dropped.
+        """
         if not file:
             raise HTTPException(status_code=400, detail="No file provided")
         
         if not file.filename:
             raise HTTPException(status_code=400, detail="File has no filename")
         
-        # Validate file size (max 10MB)
-        MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size > MAX_FILE_SIZE:
+        # Validate extension - support both images and PDFs
+        file_extension = Path(file.filename).suffix.lower()
+        allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".pdf"}
+        if file_extension not in allowed_extensions:
             raise HTTPException(
                 status_code=400,
-                detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024)}MB"
+                detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
             )
         
-        if file_size == 0:
-            raise HTTPException(status_code=400, detail="File is empty")
-        
-        # Reset file pointer
-        await file.seek(0)
-        
-        # Generate storage directory with optional subdirectory
-        storage_dir = self._get_storage_directory(br_regn, subdirectory)
-        
         # Generate safe filename with type prefix
-        original_filename = file.filename
-        file_extension = Path(original_filename).suffix.lower()
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         unique_id = uuid.uuid4().hex[:8]
-        
-        # Create filename with type prefix
         safe_filename = f"{file_type}_{timestamp}_{unique_id}{file_extension}"
         
-        # Validate extension - support both images and PDFs
-        allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".pdf"}
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
-            )
-        
-        # Full path for saving
-        file_path = storage_dir / safe_filename
+        return await run_in_threadpool(
+            self._write_upload, file.file, br_regn, subdirectory, safe_filename, max_size
+        )
+
+    def _write_upload(
+        self,
+        source: BinaryIO,
+        br_regn: str,
+        subdirectory: Optional[str],
+        filename: str,
+        max_size: int,
+    ) -> StoredFile:
+        """Blocking part of store_file(): chunked copy to a temporary file, then into the blob store."""
+        storage_dir = self._get_storage_directory(br_regn, subdirectory)
+        file_path = storage_dir / filename
+        digest = hashlib.sha256()
+        size = 0
         
+        source.seek(0)
+        fd, temp_path = tempfile.mkstemp(dir=storage_dir, prefix=".upload_", suffix=".part")
         try:
-            # Save file to disk
-            with open(file_path, "wb") as buffer:
-                buffer.write(file_content)
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to save file: {str(e)}"
-            )
+            with os.fdopen(fd, "wb") as buffer:
+                while chunk := source.read(self.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File too large. Maximum size is {max_size / (1024*1024)}MB"
+                        )
+                    digest.update(chunk)
+                    buffer.write(chunk)
+                buffer.flush()
+                os.fsync(buffer.fileno())
+            
+            if size == 0:
+                raise HTTPException(status_code=400, detail="File is empty")
+            
+            deduplicated = self.blobs.store(Path(temp_path), digest.hexdigest(), file_path)
+        except BaseException as e:
+            with suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            if isinstance(e, OSError):
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to save file: {str(e)}"
+                ) from e
+            raise
         
         # Generate relative path for database storage
         relative_path = str(file_path.relative_to(self.base_storage_path))
         
-        # Return both relative and absolute paths
-        return f"/storage/{relative_path}", str(file_path)
+        return StoredFile(
+            relative_path=f"/storage/{relative_path}",
+            absolute_path=str(file_path),
+            size=size,
+            sha256=digest.hexdigest(),
+            deduplicated=deduplicated,
+        )
     
     def delete_file(self, relative_path: str) -> bool:
         """
-        Delete a file from storage.
+        Delete a file from storage. Only this reference is removed; its
+        blob stays until no path references it and it is pruned.
         
         Args:
             relative_path: Relative path to the file (as stored in database)
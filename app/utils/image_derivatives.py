@@ -0,0 +1,213 @@
+# app/utils/image_derivatives.py
+"""
+Thumbnails of uploaded images (ID-card photos and thumbprints).
+
+Every image stored under /storage/... has a fixed set of derivatives, each
+fitted inside a square box (VARIANTS) and encoded as
+IMAGE_DERIVATIVE_FORMAT (WebP by default):
+
+    /storage/<path>.jpg -> /storage/_derivatives/<variant>/<path>.jpg.<format>
+
+The URL follows from the original path alone, so responses carry it without
+touching the disk (derivative_urls()). Stored paths are unique and never
+rewritten, so a derivative never goes stale and is served as immutable.
+
+- On upload, the services schedule() the new path; a worker thread renders
+  its derivatives off the request path.
+- Anything not rendered yet (files stored before this existed, a restart
+  with a queued path, a new variant) is rendered on first request by the
+  /storage/_derivatives route (ensure()).
+- Derivatives go through the blob store like uploads, so identical photos
+  share their thumbnails too.
+
+Pillow is optional: without it (or for a file it cannot decode) the
+derivative route redirects to the original.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.utils.blob_store import BLOB_DIRECTORY
+from app.utils.file_storage import FileStorageService, file_storage_service
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # pragma: no cover - Pillow is an optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Directory under STORAGE_DIR holding the derivatives
+DERIVATIVE_DIRECTORY = "_derivatives"
+
+# variant -> longest side in pixels
+VARIANTS: Dict[str, int] = {"thumb": 160, "preview": 480}
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+
+# Pillow format name and file extension of each IMAGE_DERIVATIVE_FORMAT
+_FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+_FORMAT, _EXTENSION = _FORMATS.get(settings.IMAGE_DERIVATIVE_FORMAT.lower(), _FORMATS["webp"])
+_QUALITY = 80
+
+
+def _storage_relative(relative_path: str) -> str:
+    return relative_path[len("/storage/"):] if relative_path.startswith("/storage/") else relative_path.lstrip("/")
+
+
+def derivative_url(relative_path: Optional[str], variant: str) -> Optional[str]:
+    """URL of one derivative of a stored file; None if it is not an image."""
+    if not relative_path or Path(relative_path).suffix.lower() not in IMAGE_EXTENSIONS:
+        return None
+    return f"/storage/{DERIVATIVE_DIRECTORY}/{variant}/{_storage_relative(relative_path)}.{_EXTENSION}"
+
+
+def derivative_urls(relative_path: Optional[str]) -> Optional[Dict[str, str]]:
+    """{variant: URL} for a stored image, for responses next to its path; None otherwise."""
+    if derivative_url(relative_path, "thumb") is None:
+        return None
+    return {variant: derivative_url(relative_path, variant) for variant in VARIANTS}
+
+
+class ImageDerivatives:
+    """Renders derivatives of the images in a FileStorageService."""
+
+    def __init__(self, storage: FileStorageService) -> None:
+        self.storage = storage
+        self.root = storage.base_storage_path / DERIVATIVE_DIRECTORY
+        self._queue: "Queue[str]" = Queue()
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def path(self, relative_path: str, variant: str) -> Path:
+        return self.root / variant / f"{_storage_relative(relative_path)}.{_EXTENSION}"
+
+    def original_of(self, variant: str, derivative: str) -> Optional[str]:
+        """
+        /storage/... path of the original behind a derivative URL path
+        (<path>.<format> under a variant); None if it names no stored image.
+        """
+        suffix = f".{_EXTENSION}"
+        if variant not in VARIANTS or not derivative.endswith(suffix):
+            return None
+        relative = derivative[: -len(suffix)]
+        if Path(relative).suffix.lower() not in IMAGE_EXTENSIONS:
+            return None
+        base = self.storage.base_storage_path.resolve()
+        original = (base / relative).resolve()
+        if base not in original.parents or not original.is_file():
+            return None
+        if original.relative_to(base).parts[0] in (BLOB_DIRECTORY, DERIVATIVE_DIRECTORY):
+            return None
+        return f"/storage/{original.relative_to(base).as_posix()}"
+
+    def ensure(self, relative_path: str, variant: str) -> Optional[Path]:
+        """A derivative's file, rendered now if needed; None if it cannot be rendered."""
+        dest = self.path(relative_path, variant)
+        if dest.is_file():
+            return dest
+        self.generate(relative_path)
+        return dest if dest.is_file() else None
+
+    def generate(self, relative_path: str) -> Dict[str, Path]:
+        """Render the missing derivatives of a stored image. Returns {variant: file}."""
+        source = self.storage.get_file_path(relative_path)
+        if not self.available or source is None or source.suffix.lower() not in IMAGE_EXTENSIONS:
+            return {}
+        rendered: Dict[str, Path] = {}
+        missing = {variant: self.path(relative_path, variant) for variant in VARIANTS}
+        for variant, dest in list(missing.items()):
+            if dest.is_file():
+                rendered[variant] = missing.pop(variant)
+        if not missing:
+            return rendered
+        try:
+            with Image.open(source) as image:
+                # JPEG: decode at a reduced scale close to the largest box, much cheaper than full size
+                image.draft("RGB", (max(VARIANTS.values()),) * 2)
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ("RGB", "RGBA", "L"):
+                    image = image.convert("RGBA" if _FORMAT == "WEBP" else "RGB")
+                for variant, dest in missing.items():
+                    thumbnail = image.copy()
+                    thumbnail.thumbnail((VARIANTS[variant],) * 2, Image.LANCZOS)
+                    if _FORMAT == "JPEG" and thumbnail.mode == "RGBA":
+                        thumbnail = thumbnail.convert("RGB")
+                    buffer = io.BytesIO()
+                    thumbnail.save(buffer, _FORMAT, quality=_QUALITY)
+                    self._write(dest, buffer.getvalue())
+                    rendered[variant] = dest
+        except (UnidentifiedImageError, OSError, ValueError) as e:
+            logger.warning("Cannot render derivatives of %s: %s", relative_path, e)
+        return rendered
+
+    def _write(self, dest: Path, content: bytes) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=dest.parent, prefix=".derivative_", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                buffer.write(content)
+            try:
+                self.storage.blobs.store(Path(temp_path), hashlib.sha256(content).hexdigest(), dest)
+            except FileExistsError:
+                # Rendered by a concurrent request
+                os.unlink(temp_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temp_path)
+            raise
+
+    # ----------------------------------------------------------------------- #
+    # Worker
+    # ----------------------------------------------------------------------- #
+    def schedule(self, relative_path: Optional[str]) -> None:
+        """Render a new upload's derivatives in the background (no-op for non-images)."""
+        if derivative_url(relative_path, "thumb") is None or not self.available:
+            return
+        if self._thread and self._thread.is_alive():
+            self._queue.put(relative_path)
+
+    def start(self) -> None:
+        with self._lock:
+            if not self.available or (self._thread and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="image-derivatives", daemon=True)
+            self._thread.start()
+        logger.info("Image derivative worker started")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread:
+            thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                relative_path = self._queue.get(timeout=1)
+            except Empty:
+                continue
+            try:
+                self.generate(relative_path)
+            except Exception:
+                logger.exception("Rendering derivatives of %s failed", relative_path)
+
+
+image_derivatives = ImageDerivatives(file_storage_service)
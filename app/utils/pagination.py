@@ -0,0 +1,202 @@
+# app/utils/pagination.py
+"""
+Keyset (cursor) pagination for list queries.
+
+A repository describes its ordering as a list of (expression, descending)
+pairs ending with the primary key, builds the filtered query WITHOUT an
+ORDER BY, and calls keyset_paginate(). Pages are fetched with
+`WHERE (sort key, pk) > (last seen)` instead of OFFSET, so deep pages cost
+the same as the first one and rows inserted concurrently never shift a page.
+
+Cursors are opaque url-safe strings carrying the sort key values of the
+boundary row, the direction and a signature of the ordering; a cursor issued
+for one ordering is rejected (CursorError) if the ordering changes.
+In cursor mode NULLs always sort last.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, false, or_, true, tuple_
+from sqlalchemy.orm import Query
+
+OrderSpec = Sequence[Tuple[Any, bool]]
+
+
+class CursorError(ValueError):
+    """Raised for malformed cursors or cursors issued for a different ordering."""
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Cursor encoding
+# ---------------------------------------------------------------------------
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$dec" in value:
+            return Decimal(value["$dec"])
+    return value
+
+
+def _signature(order: OrderSpec) -> str:
+    spec = "|".join(f"{expr}{' DESC' if desc else ''}" for expr, desc in order)
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(order: OrderSpec, key: Sequence[Any], backward: bool = False) -> str:
+    payload = {"s": _signature(order), "k": [_encode_value(v) for v in key], "b": backward}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(order: OrderSpec, cursor: str) -> Tuple[List[Any], bool]:
+    """Returns (sort key values, backward) for a cursor issued for `order`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        key = [_decode_value(v) for v in payload["k"]]
+        backward = bool(payload.get("b", False))
+        signature = payload["s"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise CursorError("Invalid pagination cursor") from exc
+    if signature != _signature(order) or len(key) != len(order):
+        raise CursorError("Pagination cursor does not match the current sort order")
+    return key, backward
+
+
+# ---------------------------------------------------------------------------
+# Query building
+# ---------------------------------------------------------------------------
+def _nullable(expr: Any) -> bool:
+    column = getattr(expr, "expression", expr)
+    return getattr(column, "nullable", True)
+
+
+def _order_clause(expr: Any, desc: bool, backward: bool):
+    # Forward pages sort NULLs last; walking backwards mirrors the whole ordering
+    if desc != backward:
+        clause = expr.desc()
+    else:
+        clause = expr.asc()
+    return clause.nulls_first() if backward else clause.nulls_last()
+
+
+def _after_clause(order: OrderSpec, key: Sequence[Any], backward: bool):
+    """Rows strictly after `key` in the (possibly reversed) ordering."""
+    descending = [desc != backward for _, desc in order]
+    if (
+        all(not _nullable(expr) for expr, _ in order)
+        and all(v is not None for v in key)
+        and len(set(descending)) == 1
+    ):
+        # Row-value comparison lets PostgreSQL walk a composite index directly
+        left = tuple_(*[expr for expr, _ in order])
+        right = tuple_(*key)
+        return left < right if descending[0] else left > right
+
+    branches = []
+    equal_so_far = []
+    for (expr, _), desc, value in zip(order, descending, key):
+        if value is None:
+            # NULLs sort last forward / first backward
+            after = expr.isnot(None) if backward else false()
+            equal = expr.is_(None)
+        else:
+            after = expr < value if desc else expr > value
+            if _nullable(expr) and not backward:
+                after = or_(after, expr.is_(None))
+            equal = expr == value
+        branches.append(and_(*equal_so_far, after) if equal_so_far else after)
+        equal_so_far.append(equal)
+    return or_(*branches) if branches else true()
+
+
+def keyset_paginate(
+    query: Query,
+    order: OrderSpec,
+    limit: int,
+    cursor: Optional[str] = None,
+    from_end: bool = False,
+) -> KeysetPage:
+    """
+    Fetch one page of `query` (an ORM query for a single entity, without ORDER BY).
+    `order` must end with a unique column so the key identifies exactly one row.
+    Without a cursor the first page is returned, or the last one with `from_end`.
+    """
+    limit = max(int(limit), 1)
+    key: Optional[List[Any]] = None
+    backward = from_end and not cursor
+    if cursor:
+        key, backward = decode_cursor(order, cursor)
+
+    keyed = query.add_columns(*[expr.label(f"_keyset_{i}") for i, (expr, _) in enumerate(order)])
+    if key is not None:
+        keyed = keyed.filter(_after_clause(order, key, backward))
+    keyed = keyed.order_by(*[_order_clause(expr, desc, backward) for expr, desc in order])
+
+    rows = keyed.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    items = [row[0] for row in rows]
+    if not rows:
+        return KeysetPage(items=items)
+
+    first_key, last_key = list(rows[0][1:]), list(rows[-1][1:])
+    if backward:
+        next_cursor = encode_cursor(order, last_key) if key is not None else None
+        prev_cursor = encode_cursor(order, first_key, backward=True) if has_more else None
+    else:
+        next_cursor = encode_cursor(order, last_key) if has_more else None
+        prev_cursor = encode_cursor(order, first_key, backward=True) if key is not None else None
+    return KeysetPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+# ---------------------------------------------------------------------------
+# Lists concatenated from several sources
+# ---------------------------------------------------------------------------
+START_OF_SOURCE = ""
+END_OF_SOURCE = "$end"
+
+
+def source_cursor(source: str, cursor: str = START_OF_SOURCE) -> str:
+    """Tag a cursor with the source it belongs to, for lists served as consecutive sources."""
+    return f"{source}:{cursor}"
+
+
+def split_source_cursor(cursor: Optional[str], sources: Sequence[str]) -> Tuple[str, str]:
+    """(source, inner cursor) for a tagged cursor; no cursor means the start of the first source."""
+    if not cursor:
+        return sources[0], START_OF_SOURCE
+    source, sep, inner = cursor.partition(":")
+    if not sep or source not in sources:
+        raise CursorError("Invalid pagination cursor")
+    return source, inner
@@ -0,0 +1,26 @@
+"""
+Folds new audit_log and login_history rows into the daily user-activity rollups
+read by the vihara user activity report. Safe to run as often as needed; the
+first run backfills the full history in batches.
+Usage: python -m app.utils.refresh_activity_rollup
+"""
+from app.db.session import SessionLocal
+from app.services.user_activity_rollup import get_state, refresh_rollups
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        result = refresh_rollups(db)
+        for source, folded in result.items():
+            last_id, complete_until = get_state(db, source)
+            print(f"{source}: {folded} group(s) upserted, high-water id {last_id}, complete until {complete_until}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
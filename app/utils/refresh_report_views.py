@@ -0,0 +1,29 @@
+"""
+Refreshes the materialized bhikku report views (mv_bikkudtls_* / mv_bikkusumm_*)
+that read a table written since their last refresh. For deployments that run it
+from cron instead of the in-process refresher (REPORT_VIEW_REFRESH_INTERVAL_SECONDS=0).
+Usage: python -m app.utils.refresh_report_views [--force]
+"""
+import sys
+
+from app.db.session import SessionLocal
+from app.services.report_views import refresh_report_views
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        timings = refresh_report_views(db, force="--force" in sys.argv[1:])
+        if not timings:
+            print("No changes since the last refresh (or a refresh is already running)")
+        for view, ms in timings.items():
+            print(f"mv_{view}: refreshed in {ms} ms")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# app/utils/storage_files.py
+"""
+ASGI app serving STORAGE_DIR at /storage (uploaded scans, photos and their
+thumbnails), in place of Starlette's StaticFiles:
+
+- ETag: the SHA-256 of the content (strong), so identical files share it and
+  it survives renames and re-uploads. Hashes are computed once per inode
+  (deduplicated files share one) and kept in memory. If-None-Match and
+  If-Modified-Since answer 304.
+- Range: a single "bytes=" range answers 206 with Content-Range (PDF viewers
+  fetch large documents page by page); If-Range is honoured; several ranges
+  get the whole file; unsatisfiable ranges answer 416.
+- Cache-Control: paths whose content never changes - upload names
+  (<type>_<YYYYmmdd>_<HHMMSS>_<8 hex>.<ext>, see FileStorageService) and
+  derivatives - are cacheable for a year as immutable; anything else must
+  be revalidated (no-cache), which the ETag makes a cheap 304.
+- Body: handed to the server as a path or file when it supports the ASGI
+  pathsend / zero-copy send extensions (sendfile), read in chunks in a
+  worker thread otherwise.
+
+Blobs (_blobs) and dot files (uploads still being written) are not served.
+Requests under /storage are not audited (AUDIT_EXCLUDED_PREFIXES).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import stat
+from collections import OrderedDict
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Tuple
+
+import anyio
+from starlette._utils import get_route_path
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.utils.blob_store import BLOB_DIRECTORY
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Bytes read per body message when the server has no zero-copy send
+CHUNK_SIZE = 256 * 1024
+
+# Name FileStorageService.store_file() gives an upload; never reused for other content
+_UPLOAD_NAME = re.compile(r"_\d{8}_\d{6}_[0-9a-f]{8}\.[A-Za-z0-9]+$")
+_IMMUTABLE_DIRECTORIES = ("_derivatives",)
+
+
+class ContentHashes:
+    """SHA-256 of stored files by inode, most recently used first."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = Lock()
+
+    def digest(self, path: str, stat_result: os.stat_result) -> str:
+        key = (stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            if key in self._digests:
+                self._digests.move_to_end(key)
+                return self._digests[key]
+        sha = hashlib.sha256()
+        with open(path, "rb") as source:
+            while chunk := source.read(CHUNK_SIZE):
+                sha.update(chunk)
+        with self._lock:
+            self._digests[key] = sha.hexdigest()
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return sha.hexdigest()
+
+
+content_hashes = ContentHashes()
+
+
+def _cache_control(relative_path: str) -> str:
+    if relative_path.split("/", 1)[0] in _IMMUTABLE_DIRECTORIES or _UPLOAD_NAME.search(relative_path):
+        return IMMUTABLE_CACHE_CONTROL
+    return REVALIDATE_CACHE_CONTROL
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive of a single-range "bytes=" header. None to serve
+    the whole file; (size, size) when unsatisfiable.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, sep, last = ranges.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return (size, size)
+            return (max(size - suffix, 0), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return (size, size)
+    if end < start:
+        return None
+    return (start, min(end, size - 1))
+
+
+class StorageFileResponse(Response):
+    """
+    A stored file answered to a GET/HEAD with the given request headers:
+    200, 206 (range), 304 (not modified) or 416 (range not satisfiable).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        digest: str,
+        request_headers: Headers,
+        cache_control: str = REVALIDATE_CACHE_CONTROL,
+    ) -> None:
+        self.path = path
+        self.range: Optional[Tuple[int, int]] = None
+        self.background = None
+        size = stat_result.st_size
+        etag = f'"{digest}"'
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": cache_control,
+            "accept-ranges": "bytes",
+        }
+
+        if self._not_modified(request_headers, etag, stat_result.st_mtime):
+            self.status_code = 304
+            self.init_headers(headers)
+            return
+
+        media_type = guess_type(path)[0] or "application/octet-stream"
+        headers["content-type"] = media_type
+        requested = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if requested and (if_range is None or if_range.strip() == etag):
+            self.range = _parse_range(requested, size)
+        if self.range == (size, size):
+            self.status_code = 416
+            self.range = None
+            headers.update({"content-range": f"bytes */{size}", "content-length": "0"})
+            del headers["content-type"]
+        elif self.range:
+            start, end = self.range
+            self.status_code = 206
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(end - start + 1)
+        else:
+            self.status_code = 200
+            headers["content-length"] = str(size)
+        self.init_headers(headers)
+
+    @staticmethod
+    def _not_modified(request_headers: Headers, etag: str, mtime: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        since = parsedate(request_headers.get("if-modified-since", ""))
+        return since is not None and since >= parsedate(formatdate(mtime, usegmt=True))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.status_code not in (200, 206):
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if self.range is None and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+        start, end = self.range or (0, int(self.headers["content-length"]) - 1)
+        count = end - start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if "http.response.zerocopysend" in extensions:
+                await send(
+                    {"type": "http.response.zerocopysend", "file": file.wrapped, "offset": start, "count": count}
+                )
+                return
+            await file.seek(start)
+            more_body = True
+            while more_body:
+                chunk = await file.read(min(CHUNK_SIZE, count)) if count > 0 else b""
+                count -= len(chunk)
+                # An empty read (empty file, or one that shrank) ends the body rather than hang
+                more_body = bool(chunk) and count > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def storage_file_response(
+    path: Path, relative_path: str, request_headers: Headers, cache_control: Optional[str] = None
+) -> Optional[StorageFileResponse]:
+    """
+    Blocking (stat and, on first sight of the inode, hash): response for a
+    file under the storage directory, None if it is not a regular file.
+    """
+    try:
+        stat_result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    digest = content_hashes.digest(str(path), stat_result)
+    return StorageFileResponse(
+        str(path), stat_result, digest, request_headers, cache_control or _cache_control(relative_path)
+    )
+
+
+class StorageFiles:
+    """ASGI app serving a storage directory (see the module docstring)."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.realpath(directory)
+
+    def resolve(self, route_path: str) -> Optional[Tuple[Path, str]]:
+        """(file, path relative to the directory) of a request path; None if it may not be served."""
+        parts = [part for part in route_path.split("/") if part]
+        if not parts or parts[0] == BLOB_DIRECTORY or any(part.startswith(".") for part in parts):
+            return None
+        full_path = os.path.realpath(os.path.join(self.directory, *parts))
+        if os.path.commonpath([full_path, self.directory]) != self.directory:
+            return None
+        return Path(full_path), "/".join(parts)
+
+    def _response(self, route_path: str, request_headers: Headers) -> Optional[StorageFileResponse]:
+        resolved = self.resolve(route_path)
+        if resolved is None:
+            return None
+        return storage_file_response(*resolved, request_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"}
+            )
+        else:
+            found = await anyio.to_thread.run_sync(self._response, get_route_path(scope), Headers(scope=scope))
+            response = found or PlainTextResponse("Not Found", status_code=404)
+        await response(scope, receive, send)
@@ -0,0 +1,307 @@
+"""
+Garbage collection and usage report for STORAGE_DIR.
+
+Walks the storage directory with os.scandir and matches every file against
+the /storage/... paths the registries store (REFERENCE_COLUMNS, one bulk
+query per column, soft-deleted rows included):
+
+- referenced: some row stores its path;
+- kept: unreferenced by design - ID-card signatures (the card only flags
+  that one was uploaded) and versions archived by
+  vihara_service._archive_old_file (<name>_v<N>.<ext>) unless
+  --include-archived;
+- unreferenced: any other name FileStorageService produces
+  ([<type>_]<YYYYmmdd>_<HHMMSS>_<8hex>.<ext> and its _v<N> archives),
+  thumbnails of originals that are gone and temporary files left by
+  interrupted uploads (.upload_*.part, .derivative_*.part, .dedup_*.part);
+- foreign: a file FileStorageService did not name (e.g. the app/storage
+  package's own modules when STORAGE_DIR is left at its default). Reported,
+  never deleted.
+
+Files whose inode changed within the grace period (STORAGE_GC_GRACE_HOURS)
+are never collected: an upload is on disk before the row referencing it
+commits, and a deduplicated upload links to an older blob (so mtime is not
+its age).
+
+Without --delete nothing is changed. With it, unreferenced files past the
+grace period are removed, then directories left empty, then blobs no path
+links to any more (which is when the space is actually freed).
+
+Usage per entity (top-level directory: bhikku_regist, vihara_data, ...)
+counts each file's bytes; "on disk" counts every inode once, so bytes
+shared through the blob store are not counted twice.
+
+Schedule it daily (e.g. a Railway cron job):
+    python -m app.utils.storage_gc
+    python -m app.utils.storage_gc --delete [--include-archived] [--grace-hours N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.arama import AramaData
+from app.models.bhikku import Bhikku
+from app.models.bhikku_high import BhikkuHighRegist
+from app.models.bhikku_id_card import BhikkuIDCard
+from app.models.dayakasaba_regist import DayakasabaRegist
+from app.models.devala import DevalaData
+from app.models.direct_bhikku_high import DirectBhikkuHigh
+from app.models.silmatha_id_card import SilmathaIDCard
+from app.models.silmatha_regist import SilmathaRegist
+from app.models.vihara import ViharaData
+from app.utils.blob_store import BLOB_DIRECTORY
+from app.utils.file_storage import FileStorageService, file_storage_service
+from app.utils.image_derivatives import DERIVATIVE_DIRECTORY
+
+# Columns holding /storage/... paths of uploaded files
+REFERENCE_COLUMNS = (
+    Bhikku.br_scanned_document_path,
+    BhikkuHighRegist.bhr_scanned_document_path,
+    DirectBhikkuHigh.dbh_scanned_document_path,
+    SilmathaRegist.sil_scanned_document_path,
+    ViharaData.vh_scanned_document_path,
+    ViharaData.vh_stage2_document_path,
+    AramaData.ar_scanned_document_path,
+    DevalaData.dv_scanned_document_path,
+    DayakasabaRegist.ds_scanned_document_path,
+    BhikkuIDCard.bic_left_thumbprint_url,
+    BhikkuIDCard.bic_applicant_photo_url,
+    SilmathaIDCard.sic_left_thumbprint_url,
+    SilmathaIDCard.sic_applicant_photo_url,
+)
+
+# Rows fetched per round trip while loading references
+REFERENCE_BATCH_SIZE = 5000
+
+# Stored without a path column (bhikku_id_card_service.upload_signature / upload_authorized_signature)
+_UNTRACKED_NAME = re.compile(r"^(signature|authorized_signature)_")
+# vihara_service._archive_old_file
+_ARCHIVED_NAME = re.compile(r"_v\d+\.[A-Za-z0-9]+$")
+# FileStorageService.store_file / _sanitize_filename, optionally archived as _v<N>
+_STORED_NAME = re.compile(r"^(?:\w+_)?\d{8}_\d{6}_[0-9a-f]{8}(?:_v\d+)?\.[A-Za-z0-9]+$")
+# Temporary files of store_file, image_derivatives and BlobStore.adopt
+_TEMPORARY_NAME = re.compile(r"^\.(?:upload|derivative|dedup)_.+\.part$")
+
+REFERENCED, KEPT, UNREFERENCED, FOREIGN = "referenced", "kept", "unreferenced", "foreign"
+
+
+@dataclass
+class Usage:
+    files: int = 0
+    bytes: int = 0
+
+    def add(self, size: int) -> None:
+        self.files += 1
+        self.bytes += size
+
+
+@dataclass
+class StorageReport:
+    # entity -> status -> usage
+    entities: Dict[str, Dict[str, Usage]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(Usage))
+    )
+    # Every inode once (hard links share one)
+    on_disk_bytes: int = 0
+    # Referenced by a row but not on disk
+    missing: List[str] = field(default_factory=list)
+    # Unreferenced but inside the grace period
+    recent: Usage = field(default_factory=Usage)
+    deleted: Usage = field(default_factory=Usage)
+    removed_directories: int = 0
+    pruned_blobs: Usage = field(default_factory=Usage)
+
+
+def _storage_relative(value: str) -> str:
+    value = value.strip()
+    if value.startswith("/storage/"):
+        return value[len("/storage/"):]
+    return value.lstrip("/")
+
+
+def load_references(db: Session) -> Set[str]:
+    """Storage-relative path of every file a registry row refers to."""
+    references: Set[str] = set()
+    for column in REFERENCE_COLUMNS:
+        stmt = select(column).where(column.isnot(None), column != "")
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=REFERENCE_BATCH_SIZE))
+        references.update(_storage_relative(value) for value in result.scalars())
+    return references
+
+
+def _scan(directory: str, relative: str = "") -> Iterator[Tuple[str, os.stat_result]]:
+    """(storage-relative path, stat) of every file below `directory`, skipping the blob store."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            path = f"{relative}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if path != BLOB_DIRECTORY:
+                    yield from _scan(entry.path, f"{path}/")
+            elif entry.is_file(follow_symlinks=False):
+                yield path, entry.stat(follow_symlinks=False)
+
+
+def _entity(path: str) -> str:
+    top = path.split("/", 1)[0]
+    if "/" not in path or top.isdigit():
+        # Saved without a subdirectory (<year>/<month>/...)
+        return "(no subdirectory)"
+    return top
+
+
+def _derivative_original(path: str) -> str:
+    # _derivatives/<variant>/<original>.<format>
+    return path.split("/", 2)[2].rsplit(".", 1)[0] if path.count("/") >= 2 else ""
+
+
+def _status(path: str, references: Set[str], originals: Set[str], include_archived: bool) -> str:
+    name = path.rsplit("/", 1)[-1]
+    if path.startswith(f"{DERIVATIVE_DIRECTORY}/"):
+        return REFERENCED if _derivative_original(path) in originals else UNREFERENCED
+    if path in references:
+        return REFERENCED
+    if _TEMPORARY_NAME.match(name):
+        return UNREFERENCED
+    if not _STORED_NAME.match(name):
+        return FOREIGN
+    if _UNTRACKED_NAME.match(name) or (_ARCHIVED_NAME.search(name) and not include_archived):
+        return KEPT
+    return UNREFERENCED
+
+
+def collect_garbage(
+    storage: FileStorageService,
+    references: Set[str],
+    *,
+    delete: bool = False,
+    include_archived: bool = False,
+    grace_seconds: int = 0,
+) -> StorageReport:
+    base = storage.base_storage_path
+    report = StorageReport()
+    files = list(_scan(str(base)))
+    inodes: Set[Tuple[int, int]] = set()
+
+    cutoff = time.time() - grace_seconds
+
+    # Originals that stay, for their thumbnails
+    originals: Set[str] = set()
+    statuses: Dict[str, str] = {}
+    for path, st in files:
+        if not path.startswith(f"{DERIVATIVE_DIRECTORY}/"):
+            statuses[path] = _status(path, references, originals, include_archived)
+            if statuses[path] != UNREFERENCED or st.st_ctime > cutoff:
+                originals.add(path)
+    for path, _ in files:
+        if path.startswith(f"{DERIVATIVE_DIRECTORY}/"):
+            statuses[path] = _status(path, references, originals, include_archived)
+
+    for path, st in files:
+        status = statuses[path]
+        entity = DERIVATIVE_DIRECTORY if path.startswith(f"{DERIVATIVE_DIRECTORY}/") else _entity(path)
+        report.entities[entity][status].add(st.st_size)
+        if (st.st_dev, st.st_ino) not in inodes:
+            inodes.add((st.st_dev, st.st_ino))
+            report.on_disk_bytes += st.st_size
+        if status != UNREFERENCED:
+            continue
+        if st.st_ctime > cutoff:
+            report.recent.add(st.st_size)
+        elif delete:
+            try:
+                os.unlink(base / path)
+            except FileNotFoundError:
+                continue
+            report.deleted.add(st.st_size)
+
+    on_disk = set(statuses)
+    report.missing = sorted(path for path in references if path not in on_disk)
+
+    if delete:
+        report.removed_directories = _remove_empty_directories(base)
+        report.pruned_blobs.files, report.pruned_blobs.bytes = storage.blobs.prune(grace_seconds)
+    return report
+
+
+def _remove_empty_directories(base: Path) -> int:
+    removed = 0
+    for directory, subdirectories, filenames in os.walk(base, topdown=False):
+        path = Path(directory)
+        if path == base or path.relative_to(base).parts[0] == BLOB_DIRECTORY:
+            continue
+        if not filenames and not any((path / name).exists() for name in subdirectories):
+            try:
+                path.rmdir()
+                removed += 1
+            except OSError:
+                # Not empty any more (an upload just landed) or not removable
+                pass
+    return removed
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="storage garbage collection and usage report")
+    parser.add_argument(
+        "--delete", action="store_true", help="delete unreferenced files past the grace period"
+    )
+    parser.add_argument(
+        "--include-archived", action="store_true", help="collect archived <name>_v<N> versions too"
+    )
+    parser.add_argument(
+        "--grace-hours", type=int, default=settings.STORAGE_GC_GRACE_HOURS,
+        help="leave files changed more recently than this alone",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        references = load_references(db)
+    finally:
+        db.close()
+    report = collect_garbage(
+        file_storage_service,
+        references,
+        delete=args.delete,
+        include_archived=args.include_archived,
+        grace_seconds=args.grace_hours * 3600,
+    )
+
+    print(f"Storage usage of {file_storage_service.base_storage_path}")
+    statuses = (REFERENCED, KEPT, UNREFERENCED, FOREIGN)
+    print(f"  {'entity':<24}" + "".join(f"{status:>22}" for status in statuses))
+    for entity in sorted(report.entities):
+        cells = "".join(
+            f"{f'{usage.files} / {_mb(usage.bytes)}':>22}"
+            for usage in (report.entities[entity][status] for status in statuses)
+        )
+        print(f"  {entity:<24}{cells}")
+    print(f"  on disk (each inode once): {_mb(report.on_disk_bytes)}")
+    print(f"  referenced but missing: {len(report.missing)}")
+    print(f"  unreferenced within the grace period: {report.recent.files} ({_mb(report.recent.bytes)})")
+    if args.delete:
+        print(f"Deleted {report.deleted.files} files ({_mb(report.deleted.bytes)}), "
+              f"{report.removed_directories} empty directories")
+        pruned = report.pruned_blobs
+        print(f"Pruned {pruned.files} unreferenced blobs, freeing {_mb(pruned.bytes)}")
+    else:
+        print("Report only; run with --delete to remove unreferenced files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# app/utils/streaming.py
+"""
+Chunked NDJSON / CSV encoding of row iterators for StreamingResponse.
+
+Rows are encoded as they arrive and emitted in chunks of CHUNK_ROWS rows, so
+the memory used does not depend on how many rows are streamed.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+CHUNK_ROWS = 500
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def ndjson_chunks(rows: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    """One JSON object per line."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(row), default=_json_default, ensure_ascii=False))
+        if len(lines) >= CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def csv_chunks(columns: Sequence[str], rows: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    """Header line, then one line per row; the leading BOM lets Excel detect UTF-8."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        pending += 1
+        if pending >= CHUNK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_rows(
+    fmt: str,
+    columns: Sequence[str],
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    filename: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """StreamingResponse of `rows` as "ndjson" or "csv", downloaded as `filename`.<fmt>."""
+    chunks = csv_chunks(columns, rows) if fmt == "csv" else ndjson_chunks(rows)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"', **(headers or {})},
+    )